@@ -19,6 +19,8 @@ from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session, SessionTransaction
 
 from apps.answers.deps.preprocess_arbitrary import get_answer_session, get_answer_session_by_subject
+from apps.applets.tasks import notify_applet_respondents
+from apps.mailing.services import send_mails
 from apps.mailing.services import TestMail
 from apps.shared.test.client import TestClient
 from broker import broker
@@ -26,7 +28,7 @@ from config import settings
 from infrastructure.app import create_app
 from infrastructure.database.core import build_engine
 from infrastructure.database.deps import get_session
-from infrastructure.utility.notification_client import FCMNotificationTest
+from infrastructure.utility.notification_client import FCMNotificationTest, FirebaseMessage
 from infrastructure.utility.redis_client import RedisCacheTest
 
 # from infrastructure.utility import FCMNotificationTest, RedisCacheTest
@@ -320,6 +322,38 @@ async def mock_kiq_report(mocker) -> AsyncGenerator[Any, Any]:
     yield mock
 
 
+@pytest.fixture
+async def mock_kiq_answer_events(mocker) -> AsyncGenerator[Any, Any]:
+    mock = mocker.patch("apps.answers.tasks.process_answer_events.kiq")
+    yield mock
+
+
+@pytest.fixture(autouse=True)
+async def mock_kiq_mails(mocker) -> AsyncGenerator[Any, Any]:
+    # Queued mails are sent at once, tests check them right after the request
+    async def _send(messages: list[dict]):
+        await send_mails(messages)
+
+    mock = mocker.patch("apps.mailing.services.send_mails.kiq", side_effect=_send)
+    yield mock
+
+
+@pytest.fixture
+async def mock_kiq_applet_notification(mocker, session: AsyncSession) -> AsyncGenerator[Any, Any]:
+    # Queued pushes are sent at once on the test session
+    async def _send(applet_id, message: dict, device_ids=None, respondent_ids=None):
+        await notify_applet_respondents(
+            session,
+            applet_id,
+            FirebaseMessage.model_validate(message),
+            device_ids=device_ids,
+            respondent_ids=respondent_ids,
+        )
+
+    mock = mocker.patch("apps.applets.tasks.send_applet_notification.kiq", side_effect=_send)
+    yield mock
+
+
 @pytest.fixture
 async def mock_report_server_response(mocker) -> AsyncGenerator[Any, Any]:
     Recipients = list[str]
@@ -7,6 +7,7 @@ from apps.activities.db.schemas import ActivityHistorySchema
 from apps.activities.domain import ActivityHistory, ActivityHistoryFull
 from apps.activities.errors import ActivityHistoryDoeNotExist
 from apps.applets.db.schemas import AppletHistorySchema
+from apps.applets.history_cache import invalidate_activity_version
 from apps.shared.domain import parse_obj_as
 from infrastructure.database import BaseCRUD
 
@@ -133,8 +134,10 @@ class ActivityHistoriesCRUD(BaseCRUD[ActivityHistorySchema]):
         query = update(ActivityHistorySchema)
         query = query.where(ActivityHistorySchema.id_version.in_(select([subquery])))
         query = query.values(**values)
-        query = query.returning(ActivityHistorySchema)
-        await self._execute(query)
+        query = query.returning(ActivityHistorySchema.id_version, ActivityHistorySchema.applet_id)
+        db_result = await self._execute(query)
+        for id_version, applet_id_version in db_result.all():
+            await invalidate_activity_version(self.session, id_version, applet_id_version)
 
     async def load_full(self, id_versions: list[str]) -> list[ActivityHistoryFull]:
         if not id_versions:
@@ -165,6 +165,7 @@ class ActivityAssignmentService:
     ) -> None:
         service = MailingService()
         applet = await AppletsCRUD(self.session).get_by_id(applet_id)
+        messages = []
         for respondent_subject_id, activities in respondent_activities.items():
             respondent_subject: SubjectSchema = subjects[respondent_subject_id]
 
@@ -196,7 +197,8 @@ class ActivityAssignmentService:
                     activity_or_flows_names=activities,
                 ),
             )
-            _ = asyncio.create_task(service.send(message))
+            messages.append(message)
+        await service.enqueue(messages)
 
     async def exist(self, assignment: ActivityAssignmentCreate) -> ActivityAssigmentSchema | None:
         """
@@ -37,19 +37,15 @@ class AlertCRUD(BaseCRUD[AlertSchema]):
     async def create_many(self, schemas: list[AlertSchema]) -> list[AlertSchema]:
         return await self._create_many(schemas)
 
-    async def get_all_for_user(
-        self, user_id: uuid.UUID, page: int, limit: int
-    ) -> list[
-        tuple[
-            AlertSchema,
-            AppletHistorySchema,
-            UserAppletAccessSchema,
-            AppletSchema,
-            UserWorkspaceSchema,
-            SubjectSchema,
-            IntegrationsSchema,
-        ]
-    ]:
+    async def get_answer_ids(self, answer_ids: list[uuid.UUID]) -> set[uuid.UUID]:
+        """Returns ids of the answers which have alerts"""
+        query: Query = select(AlertSchema.answer_id).where(AlertSchema.answer_id.in_(answer_ids)).distinct()
+        db_result = await self._execute(query)
+        return set(db_result.scalars().all())
+
+    @staticmethod
+    def _alerts_query() -> Query:
+        """Alerts with the applet, workspace and subject data shown with them"""
         query: Query = select(
             AlertSchema,
             AppletHistorySchema,
@@ -86,12 +82,46 @@ class AlertCRUD(BaseCRUD[AlertSchema]):
         )
         query = query.outerjoin(SubjectSchema, SubjectSchema.id == AlertSchema.subject_id)
         query = query.outerjoin(IntegrationsSchema, IntegrationsSchema.applet_id == UserAppletAccessSchema.applet_id)
+        return query
+
+    async def get_all_for_user(
+        self, user_id: uuid.UUID, page: int, limit: int
+    ) -> list[
+        tuple[
+            AlertSchema,
+            AppletHistorySchema,
+            UserAppletAccessSchema,
+            AppletSchema,
+            UserWorkspaceSchema,
+            SubjectSchema,
+            IntegrationsSchema,
+        ]
+    ]:
+        query = self._alerts_query()
         query = query.where(AlertSchema.user_id == user_id, AppletSchema.is_deleted.is_(False))
         query = query.order_by(AlertSchema.created_at.desc())
         query = paging(query, page, limit)
         db_result = await self._execute(query)
         return db_result.all()
 
+    async def get_by_ids(
+        self, ids: list[uuid.UUID]
+    ) -> list[
+        tuple[
+            AlertSchema,
+            AppletHistorySchema,
+            UserAppletAccessSchema,
+            AppletSchema,
+            UserWorkspaceSchema,
+            SubjectSchema,
+            IntegrationsSchema,
+        ]
+    ]:
+        query = self._alerts_query()
+        query = query.where(AlertSchema.id.in_(ids))
+        db_result = await self._execute(query)
+        return db_result.all()
+
     async def get_all_for_user_count(self, user_id: uuid.UUID) -> dict:
         query: Query = select(AlertSchema.is_watched, func.count(AlertSchema.id).label("count"))
         query = query.join(AppletSchema, AppletSchema.id == AlertSchema.applet_id)
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+
+import sentry_sdk
+from pydantic import ValidationError
+
+from apps.alerts.domain import AlertHandlerResult, AlertMessage
+from apps.applets.crud import AppletHistoriesCRUD, AppletsCRUD
+from apps.integrations.crud.integrations import IntegrationsCRUD
+from apps.shared.domain import InternalModel
+from apps.subjects.crud import SubjectsCrud
+from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
+from apps.workspaces.crud.workspaces import UserWorkspaceCRUD
+from config import settings
+from infrastructure.cache import MISSING, LRUCache
+from infrastructure.database import session_manager
+from infrastructure.logger import logger
+from infrastructure.utility.redis_client import RedisCache
+
+__all__ = ["AlertHub", "AlertSubscription", "alert_hub"]
+
+CHANNEL_PREFIX = "channel_"
+
+
+class _AppletMetadata(InternalModel):
+    applet_name: str
+    image: str
+    encryption: dict
+    workspace: str
+    loris: bool
+
+
+class AlertSubscription:
+    """Published alerts of one websocket connection, waiting to be sent"""
+
+    def __init__(self, user_id: uuid.UUID, size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(size)
+        self.overflowed = False
+
+    @property
+    def channel(self) -> str:
+        return f"{CHANNEL_PREFIX}{self.user_id}"
+
+
+class _AlertEnricher:
+    """Fills in bare alert messages with the applet, workspace and subject data.
+
+    Producers publish alerts with the data already, this covers alerts they
+    could not load it for. The data is read with a short-lived session and
+    kept for a short time, alerts of one applet usually come in bursts.
+    """
+
+    def __init__(self) -> None:
+        self._applets = LRUCache[_AppletMetadata](
+            maxsize=settings.alerts.metadata_cache_size, ttl=settings.alerts.metadata_cache_ttl
+        )
+        self._secret_ids = LRUCache[str | None](
+            maxsize=settings.alerts.metadata_cache_size, ttl=settings.alerts.metadata_cache_ttl
+        )
+
+    async def enrich(self, message: AlertMessage) -> AlertHandlerResult:
+        applet = self._applets.get((message.applet_id, message.version))
+        secret_id = self._secret_ids.get(message.subject_id) if message.subject_id else None
+        if applet is MISSING or secret_id is MISSING:
+            session_maker = session_manager.get_session()
+            async with session_maker() as session:
+                if applet is MISSING:
+                    applet = await self._load_applet(session, message.applet_id, message.version)
+                    self._applets.set((message.applet_id, message.version), applet)
+                if secret_id is MISSING:
+                    subject = await SubjectsCrud(session).get_by_id(message.subject_id)
+                    secret_id = subject.secret_user_id if subject else None
+                    self._secret_ids.set(message.subject_id, secret_id)
+
+        if applet.loris:
+            secret_id = "Loris Integration"
+        return AlertHandlerResult(
+            id=str(message.id),
+            applet_id=str(message.applet_id),
+            applet_name=applet.applet_name,
+            version=message.version,
+            secret_id=secret_id or "Anonymous",
+            activity_id=str(message.activity_id),
+            activity_item_id=str(message.activity_item_id),
+            message=message.message,
+            created_at=message.created_at.isoformat(),
+            answer_id=str(message.answer_id),
+            encryption=applet.encryption,
+            image=applet.image,
+            workspace=applet.workspace,
+            respondent_id=str(message.respondent_id),
+            subject_id=str(message.subject_id),
+            type=message.type,
+        )
+
+    @staticmethod
+    async def _load_applet(session, applet_id: uuid.UUID, version: str) -> _AppletMetadata:
+        applet_history = await AppletHistoriesCRUD(session).retrieve_by_applet_version(f"{applet_id}_{version}")
+        applet = await AppletsCRUD(session).get_by_id(applet_id)
+        owner = await UserAppletAccessCRUD(session).get_applet_owner(applet_id)
+        workspace = await UserWorkspaceCRUD(session).get_by_user_id(owner.user_id)
+        integrations = await IntegrationsCRUD(session).retrieve_list_by_applet(applet_id)
+        return _AppletMetadata(
+            applet_name=applet_history.display_name,
+            image=applet_history.image,
+            encryption=applet.encryption,
+            workspace=workspace.workspace_name,
+            loris="loris" in integrations,
+        )
+
+
+class AlertHub:
+    """Fans out alerts of a single Redis subscription to the local websockets.
+
+    One pattern subscription serves all connections of the process, it is
+    opened with the first connection and reopened with a backoff when it
+    fails. Alerts for users without connections in this process are dropped
+    before any work is done for them.
+
+    Every connection has a bounded queue. A connection which falls behind
+    by `ws_queue_size` alerts is closed instead of buffering without a
+    limit, the client reconnects and reads the missed alerts from the API.
+    """
+
+    pattern = f"{CHANNEL_PREFIX}*"
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, set[AlertSubscription]] = defaultdict(set)
+        self._listener: asyncio.Task | None = None
+        self._enricher = _AlertEnricher()
+
+    def subscribe(self, user_id: uuid.UUID) -> AlertSubscription:
+        subscription = AlertSubscription(user_id, settings.alerts.ws_queue_size)
+        self._subscriptions[subscription.channel].add(subscription)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: AlertSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.channel)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.channel]
+
+    async def close(self) -> None:
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    def metrics(self) -> dict[str, int]:
+        return dict(
+            users=len(self._subscriptions),
+            connections=sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+        )
+
+    async def _listen(self) -> None:
+        failures = 0
+        while True:
+            try:
+                async for channel, data in RedisCache().pattern_messages(
+                    self.pattern, settings.alerts.ws_heartbeat_interval
+                ):
+                    failures = 0
+                    await self.dispatch(channel, data)
+            except Exception as e:
+                logger.warning(f"Alert hub subscription failed: {type(e).__name__}: {e}")
+                sentry_sdk.capture_exception(e)
+            failures += 1
+            await asyncio.sleep(min(2**failures, 30))
+
+    async def dispatch(self, channel: str, data: str) -> None:
+        """Puts the alert to the queues of the channel connections.
+
+        No queries are run here, the listener serves all connections. The
+        connections enrich bare alerts with `payload` before sending them.
+        """
+        subscriptions = self._subscriptions.get(channel)
+        if not subscriptions:
+            return
+        try:
+            alert = json.loads(data)
+        except ValueError as e:
+            logger.warning(f"Alert on {channel} skipped: {type(e).__name__}: {e}")
+            return
+        for subscription in list(subscriptions):
+            try:
+                subscription.queue.put_nowait(alert)
+            except asyncio.QueueFull:
+                logger.warning(f"Alert websocket of {subscription.user_id} fell behind, closing")
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+
+    async def payload(self, data: dict) -> dict:
+        """Websocket payload of the published alert"""
+        try:
+            return AlertHandlerResult.model_validate(data).model_dump()
+        except ValidationError:
+            pass
+        alert = await self._enricher.enrich(AlertMessage.model_validate(data))
+        return alert.model_dump()
+
+
+alert_hub = AlertHub()
@@ -1,8 +1,59 @@
 import uuid
 
 from apps.alerts.crud.alert import AlertCRUD
-from apps.alerts.domain import Alert, AlertTypes
+from apps.alerts.db.schemas import AlertSchema
+from apps.alerts.domain import Alert, AlertHandlerResult, AlertMessage, AlertTypes
 from apps.shared.query_params import QueryParams
+from infrastructure.utility.redis_client import RedisCache
+
+
+def _alert_from_row(row) -> Alert:
+    alert, applet_history, access, applet, workspace, subject, integrations = row
+    if integrations and "LORIS" in integrations:
+        _secret_id = "Loris Integration"
+    else:
+        _secret_id = subject.secret_user_id if subject else "Anonymous"
+    return Alert(
+        id=alert.id,
+        is_watched=alert.is_watched,
+        applet_id=alert.applet_id,
+        applet_name=applet_history.display_name,
+        version=alert.version,
+        secret_id=_secret_id,
+        activity_id=alert.activity_id,
+        activity_item_id=alert.activity_item_id,
+        message=alert.alert_message,
+        created_at=alert.created_at,
+        answer_id=alert.answer_id,
+        encryption=applet.encryption,
+        image=applet_history.image,
+        workspace=workspace.workspace_name,
+        respondent_id=alert.respondent_id,
+        subject_id=alert.subject_id,
+        type=alert.type if alert.type else AlertTypes.ANSWER_ALERT,
+    )
+
+
+def alert_handler_result(alert: Alert) -> AlertHandlerResult:
+    """The websocket payload of the alert"""
+    return AlertHandlerResult(
+        id=str(alert.id),
+        applet_id=str(alert.applet_id),
+        applet_name=alert.applet_name,
+        version=alert.version,
+        secret_id=alert.secret_id,
+        activity_id=str(alert.activity_id),
+        activity_item_id=str(alert.activity_item_id),
+        message=alert.message,
+        created_at=alert.created_at.isoformat(),
+        answer_id=str(alert.answer_id),
+        encryption=alert.encryption,
+        image=alert.image,
+        workspace=alert.workspace,
+        respondent_id=str(alert.respondent_id),
+        subject_id=str(alert.subject_id),
+        type=alert.type,
+    )
 
 
 class AlertService:
@@ -11,35 +62,8 @@ class AlertService:
         self.session = session
 
     async def get_all_alerts(self, filters: QueryParams) -> list[Alert]:
-        alerts = []
         schemas = await AlertCRUD(self.session).get_all_for_user(self.user_id, filters.page, filters.limit)
-        for alert, applet_history, access, applet, workspace, subject, integrations in schemas:
-            if integrations and "LORIS" in integrations:
-                _secret_id = "Loris Integration"
-            else:
-                _secret_id = subject.secret_user_id if subject else "Anonymous"
-            alerts.append(
-                Alert(
-                    id=alert.id,
-                    is_watched=alert.is_watched,
-                    applet_id=alert.applet_id,
-                    applet_name=applet_history.display_name,
-                    version=alert.version,
-                    secret_id=_secret_id,
-                    activity_id=alert.activity_id,
-                    activity_item_id=alert.activity_item_id,
-                    message=alert.alert_message,
-                    created_at=alert.created_at,
-                    answer_id=alert.answer_id,
-                    encryption=applet.encryption,
-                    image=applet_history.image,
-                    workspace=workspace.workspace_name,
-                    respondent_id=alert.respondent_id,
-                    subject_id=alert.subject_id,
-                    type=alert.type if alert.type else AlertTypes.ANSWER_ALERT,
-                )
-            )
-        return alerts
+        return [_alert_from_row(row) for row in schemas]
 
     async def get_all_alerts_count(self) -> dict:
         count = await AlertCRUD(self.session).get_all_for_user_count(self.user_id)
@@ -47,3 +71,40 @@ class AlertService:
 
     async def watch(self, alert_id: uuid.UUID):
         await AlertCRUD(self.session).watch(self.user_id, alert_id)
+
+    async def publish(self, alerts: list[AlertSchema]) -> None:
+        """Publishes the alerts to the websocket channels of their recipients"""
+        await RedisCache().publish_many(await self.messages(alerts))
+
+    async def messages(self, alerts: list[AlertSchema]) -> list[tuple[str, dict]]:
+        """Channel and payload of the alerts to publish to their recipients.
+
+        Alerts are published with the applet, workspace and subject data, so
+        the websocket hub sends them as is. An alert the listing query does
+        not return is published as a bare message for the hub to fill in.
+        """
+        enriched: dict[uuid.UUID, Alert] = {}
+        for row in await AlertCRUD(self.session).get_by_ids([alert.id for alert in alerts]):
+            alert = _alert_from_row(row)
+            if alert.id not in enriched or alert.secret_id == "Loris Integration":
+                enriched[alert.id] = alert
+        messages = []
+        for alert in alerts:
+            if alert.id in enriched:
+                payload = alert_handler_result(enriched[alert.id]).model_dump()
+            else:
+                payload = AlertMessage(
+                    id=alert.id,
+                    respondent_id=alert.respondent_id,
+                    subject_id=alert.subject_id,
+                    applet_id=alert.applet_id,
+                    version=alert.version,
+                    message=alert.alert_message,
+                    created_at=alert.created_at,
+                    activity_id=alert.activity_id,
+                    activity_item_id=alert.activity_item_id,
+                    answer_id=alert.answer_id,
+                    type=alert.type,
+                ).model_dump()
+            messages.append((f"channel_{alert.user_id}", payload))
+        return messages
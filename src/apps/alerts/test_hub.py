@@ -0,0 +1,109 @@
+import datetime
+import json
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+
+from apps.alerts.domain import AlertHandlerResult, AlertMessage
+from apps.alerts.hub import AlertHub, _AlertEnricher, _AppletMetadata
+from config import settings
+
+
+@pytest.fixture
+async def hub():
+    hub = AlertHub()
+    yield hub
+    await hub.close()
+
+
+@pytest.fixture
+def alert_message() -> AlertMessage:
+    return AlertMessage(
+        id=uuid.uuid4(),
+        respondent_id=uuid.uuid4(),
+        applet_id=uuid.uuid4(),
+        version="1.0.0",
+        message="Alert",
+        created_at=datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+    )
+
+
+@pytest.fixture
+def alert_payload(alert_message: AlertMessage) -> dict:
+    return AlertHandlerResult(
+        id=str(alert_message.id),
+        applet_id=str(alert_message.applet_id),
+        applet_name="Applet",
+        version=alert_message.version,
+        secret_id="secret",
+        activity_id=str(uuid.uuid4()),
+        activity_item_id=str(uuid.uuid4()),
+        message=alert_message.message,
+        created_at=alert_message.created_at.isoformat(),
+        answer_id=str(uuid.uuid4()),
+        encryption={},
+        image="",
+        workspace="Workspace",
+        respondent_id=str(alert_message.respondent_id),
+    ).model_dump()
+
+
+async def test_dispatch__enriched_alert_sent_to_user_connections(hub: AlertHub, alert_payload: dict):
+    user_id = uuid.uuid4()
+    first, second = hub.subscribe(user_id), hub.subscribe(user_id)
+    other = hub.subscribe(uuid.uuid4())
+
+    await hub.dispatch(f"channel_{user_id}", json.dumps(alert_payload))
+
+    assert await hub.payload(first.queue.get_nowait()) == alert_payload
+    assert await hub.payload(second.queue.get_nowait()) == alert_payload
+    assert other.queue.empty()
+    assert hub.metrics() == dict(users=2, connections=3)
+
+
+async def test_dispatch__alert_without_connections_is_skipped(
+    hub: AlertHub, alert_message: AlertMessage, mocker: MockerFixture
+):
+    enrich = mocker.patch.object(_AlertEnricher, "enrich")
+
+    await hub.dispatch(f"channel_{uuid.uuid4()}", alert_message.model_dump_json())
+
+    enrich.assert_not_called()
+
+
+async def test_dispatch__lagging_connection_is_dropped(hub: AlertHub, alert_payload: dict, mocker: MockerFixture):
+    mocker.patch.object(settings.alerts, "ws_queue_size", 1)
+    user_id = uuid.uuid4()
+    subscription = hub.subscribe(user_id)
+
+    for _ in range(2):
+        await hub.dispatch(f"channel_{user_id}", json.dumps(alert_payload))
+
+    assert subscription.overflowed
+    assert hub.metrics() == dict(users=0, connections=0)
+
+
+async def test_dispatch__bare_alert_is_enriched_once_per_applet(
+    hub: AlertHub, alert_message: AlertMessage, mocker: MockerFixture
+):
+    load_applet = mocker.patch.object(
+        _AlertEnricher,
+        "_load_applet",
+        return_value=_AppletMetadata(applet_name="Applet", image="", encryption={}, workspace="Workspace", loris=False),
+    )
+    user_id = uuid.uuid4()
+    subscription = hub.subscribe(user_id)
+
+    for _ in range(2):
+        await hub.dispatch(f"channel_{user_id}", alert_message.model_dump_json())
+    # The listener only queues the alerts, the connections enrich them
+    load_applet.assert_not_awaited()
+    payloads = [await hub.payload(subscription.queue.get_nowait()) for _ in range(2)]
+
+    load_applet.assert_awaited_once()
+    payload = payloads[0]
+    assert payload["id"] == str(alert_message.id)
+    assert payload["applet_name"] == "Applet"
+    assert payload["workspace"] == "Workspace"
+    assert payload["secret_id"] == "Anonymous"
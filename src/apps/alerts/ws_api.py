@@ -1,23 +1,16 @@
 import asyncio
-import json
-import traceback
 
 from fastapi import Depends
 from starlette.websockets import WebSocket, WebSocketDisconnect
 from websockets.exceptions import ConnectionClosed
 
-from apps.alerts.domain import AlertHandlerResult, AlertMessage
-from apps.applets.crud import AppletHistoriesCRUD, AppletsCRUD
+from apps.alerts.hub import AlertSubscription, alert_hub
 from apps.authentication.deps import get_current_user_for_ws
-from apps.integrations.crud.integrations import IntegrationsCRUD
-from apps.shared.exception import ValidationError
-from apps.subjects.services import SubjectsService
 from apps.users import User
-from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
-from apps.workspaces.crud.workspaces import UserWorkspaceCRUD
-from apps.workspaces.domain.constants import Role
-from infrastructure.database.deps import pass_session
-from infrastructure.utility.redis_client import RedisCache
+from infrastructure.logger import logger
+
+# NOTE: "Try Again Later", the client should reconnect and reload alerts
+_OVERFLOW_CLOSE_CODE = 1013
 
 
 async def ws_get_alert_messages(
@@ -25,7 +18,8 @@ async def ws_get_alert_messages(
     user: User = Depends(get_current_user_for_ws),
 ):
     await websocket.accept(websocket.headers.get("sec-websocket-protocol"))
-    task = asyncio.create_task(_handle_websocket(websocket, user.id))
+    subscription = alert_hub.subscribe(user.id)
+    task = asyncio.create_task(_handle_websocket(websocket, subscription))
     try:
         while True:
             await websocket.receive_text()
@@ -33,62 +27,25 @@ async def ws_get_alert_messages(
         pass
     finally:
         task.cancel()
+        alert_hub.unsubscribe(subscription)
 
 
-@pass_session
-async def _handle_websocket(websocket, user_id, session):
-    channel = f"channel_{user_id}"
-
-    cache = RedisCache()
-    async for raw_message in cache.messages(channel):
-        data = raw_message["data"]
-        try:
-            alert_message = AlertMessage(**json.loads(data))
-        except (ValidationError, TypeError):
-            continue
-        try:
-            respondent_access = await UserAppletAccessCRUD(session).get_applet_role_by_user_id(
-                alert_message.applet_id,
-                alert_message.respondent_id,
-                Role.RESPONDENT,
-            )
+async def _handle_websocket(websocket: WebSocket, subscription: AlertSubscription):
+    """Sends queued alerts, bare alerts are enriched here so a slow query
+    delays only this connection.
 
-            applet_history, applet, workspace, subject, integrations = await asyncio.gather(
-                AppletHistoriesCRUD(session).retrieve_by_applet_version(
-                    f"{alert_message.applet_id}_{alert_message.version}"
-                ),
-                AppletsCRUD(session).get_by_id(alert_message.applet_id),
-                UserWorkspaceCRUD(session).get_by_user_id(respondent_access.owner_id),
-                SubjectsService(session, respondent_access.owner_id).get(alert_message.subject_id),
-                IntegrationsCRUD(session).retrieve_list_by_applet(alert_message.applet_id),
-            )
-        except Exception as e:
-            traceback.print_tb(e.__traceback__)
-            continue
-        try:
-            if integrations and "loris" in integrations:
-                _secret_id = "Loris Integration"
-            else:
-                _secret_id = subject.secret_user_id if subject else "Anonymous"
-
-            applet_alert = AlertHandlerResult(
-                id=str(alert_message.id),
-                applet_id=str(alert_message.applet_id),
-                applet_name=applet_history.display_name,
-                version=alert_message.version,
-                secret_id=_secret_id,
-                activity_id=str(alert_message.activity_id),
-                activity_item_id=str(alert_message.activity_item_id),
-                message=alert_message.message,
-                created_at=alert_message.created_at.isoformat(),
-                answer_id=str(alert_message.answer_id),
-                encryption=applet.encryption,
-                image=applet_history.image,
-                workspace=workspace.workspace_name,
-                respondent_id=str(alert_message.respondent_id),
-                subject_id=str(alert_message.subject_id),
-                type=alert_message.type,
-            )
-            await websocket.send_json(applet_alert.model_dump())
-        except ConnectionClosed:
-            break
+    Idle connections are kept open and checked by the ping frames of the
+    server, the alert messages are the only messages of the protocol.
+    """
+    try:
+        while not subscription.overflowed:
+            data = await subscription.queue.get()
+            try:
+                payload = await alert_hub.payload(data)
+            except Exception as e:
+                logger.warning(f"Alert of {subscription.user_id} skipped: {type(e).__name__}: {e}")
+                continue
+            await websocket.send_json(payload)
+        await websocket.close(code=_OVERFLOW_CLOSE_CODE)
+    except (ConnectionClosed, WebSocketDisconnect, RuntimeError):
+        return
@@ -2,7 +2,6 @@ import asyncio
 import base64
 import datetime
 import http
-import io
 import uuid
 import zipfile
 from typing import Annotated
@@ -10,20 +9,26 @@ from typing import Annotated
 from fastapi import Body, Depends, Header, Query
 from fastapi import Response as FastAPIResponse
 from fastapi.responses import Response as FastApiResponse
+from fastapi.responses import StreamingResponse
 
 from apps.activities.services import ActivityHistoryService
 from apps.answers.deps.preprocess_arbitrary import get_answer_session, get_arbitraries_map
 from apps.answers.domain import (
     ActivitySubmissionResponse,
+    AnswerBatchItemResult,
     AnswerEHRFull,
     AnswerExistenceResponse,
     AnswerExport,
+    AnswerExportCursor,
+    AnswerExportFormat,
+    AnswerExportJobPublic,
     AnswerNote,
     AnswerNoteDetailPublic,
     AnswerReviewPublic,
     AnswersCheck,
     AppletActivityAnswerPublic,
     AppletAnswerCreate,
+    AppletAnswersBatchCreate,
     AppletCompletedEntities,
     AssessmentAnswerCreate,
     AssessmentAnswerPublic,
@@ -44,6 +49,8 @@ from apps.answers.domain.answers import (
     MultiinformantAssessmentValidationResponse,
     PublicSubmissionsResponse,
 )
+from apps.answers.export_job import AnswerExportJobService
+from apps.answers.export_stream import EXPORT_STREAM_BATCH_SIZE, export_media_type, export_stream
 from apps.answers.filters import (
     AnswerEHRExportFilters,
     AnswerExportFilters,
@@ -53,12 +60,14 @@ from apps.answers.filters import (
     ReviewAppletItemFilter,
     SummaryActivityFilter,
 )
+from apps.answers.outbox import notify_answer_events
 from apps.answers.service import AnswerService
+from apps.answers.tasks import export_answers
 from apps.applets.crud import AppletsCRUD
 from apps.applets.db.schemas import AppletSchema
 from apps.applets.domain.applet_history import VersionPublic
-from apps.applets.errors import InvalidVersionError, NotValidAppletHistory
-from apps.applets.service import AppletHistoryService, AppletService
+from apps.applets.errors import InvalidVersionError
+from apps.applets.service import AppletService
 from apps.authentication.deps import get_current_user
 from apps.integrations.oneup_health.service.domain import EHRData
 from apps.integrations.oneup_health.service.ehr_storage import create_ehr_storage
@@ -70,11 +79,13 @@ from apps.shared.domain import Response, ResponseMulti, TruncatedDate, parse_obj
 from apps.shared.exception import AccessDeniedError, NotFoundError, ValidationError
 from apps.shared.locale import I18N
 from apps.shared.query_params import BaseQueryParams, QueryParams, parse_query_params
+from apps.shared.zip_stream import stream_zip
 from apps.subjects.services import SubjectsService
 from apps.users import UsersCRUD
 from apps.users.domain import User
 from apps.users.services.prolific_user import ProlificUserService
 from apps.workspaces.domain.constants import Role
+from apps.workspaces.errors import AnswerCreateAccessDenied
 from apps.workspaces.service.check_access import CheckAccessService
 from apps.workspaces.service.workspace import WorkspaceService
 from config import Settings, get_settings
@@ -93,10 +104,11 @@ async def create_answer(
     device_id: Annotated[str | None, Header()] = None,
 ) -> None:
     async with atomic(session):
-        await CheckAccessService(session, user.id).check_answer_create_access(schema.applet_id)
-        try:
-            await AppletHistoryService(session, schema.applet_id, schema.version).get()
-        except NotValidAppletHistory:
+        service = AnswerService(session, user.id, answer_session)
+        context = await service.get_submission_context(schema)
+        if Role.RESPONDENT not in context.roles:
+            raise AnswerCreateAccessDenied()
+        if not context.applet or not context.applet.version_exists:
             raise InvalidVersionError()
 
         if schema.event_history_id:
@@ -119,13 +131,12 @@ async def create_answer(
             if device is None:
                 logger.info(f"Invalid device_id {device_id} provided")
 
-        service = AnswerService(session, user.id, answer_session)
         if tz_offset is not None and schema.answer.tz_offset is None:
             schema.answer.tz_offset = tz_offset // 60  # value in minutes
 
         try:
             async with atomic(answer_session):
-                answer = await service.create_answer(schema, device.device_id if device else None)
+                await service.create_answer(schema, device.device_id if device else None, context)
         except Exception as e:
             logger.error(
                 f"Answer creation failed: applet_id={schema.applet_id}, user_id={user.id}, \
@@ -133,15 +144,39 @@ async def create_answer(
             )
             raise
 
-        await service.create_report_from_answer(answer)
-        if schema.allowed_ehr_ingest:
-            await service.trigger_ehr_ingestion(
-                user_id=user.id,
-                target_subject_id=answer.target_subject_id,
-                applet_id=answer.applet_id,
-                submit_id=answer.submit_id,
-                activity_id=schema.activity_id,
+    await notify_answer_events(schema.applet_id)
+
+
+async def create_answers_batch(
+    applet_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    schema: AppletAnswersBatchCreate = Body(...),
+    tz_offset: int | None = Depends(get_tz_utc_offset()),
+    session=Depends(get_session),
+    answer_session=Depends(get_answer_session),
+    device_id: Annotated[str | None, Header()] = None,
+) -> ResponseMulti[AnswerBatchItemResult]:
+    if any(answer.applet_id != applet_id for answer in schema.answers):
+        raise ValidationError("All answers of the batch must belong to the applet")
+
+    for answer_create in schema.answers:
+        if tz_offset is not None and answer_create.answer.tz_offset is None:
+            answer_create.answer.tz_offset = tz_offset // 60  # value in minutes
+
+    async with atomic(session):
+        service = AnswerService(session, user.id, answer_session)
+        try:
+            async with atomic(answer_session):
+                results = await service.create_answers_batch(schema.answers, device_id)
+        except Exception as e:
+            logger.error(
+                f"Answers batch creation failed: applet_id={applet_id}, user_id={user.id}, \
+                    size={len(schema.answers)}, error={type(e).__name__}: {e}"
             )
+            raise
+
+    await notify_answer_events(applet_id)
+    return ResponseMulti(result=results, count=len(results))
 
 
 async def create_anonymous_answer(
@@ -168,9 +203,9 @@ async def create_anonymous_answer(
         if tz_offset is not None and schema.answer.tz_offset is None:
             schema.answer.tz_offset = tz_offset // 60  # value in minutes
         async with atomic(answer_session):
-            answer = await service.create_answer(schema)
-        await service.create_report_from_answer(answer)
-    return
+            await service.create_answer(schema)
+
+    await notify_answer_events(schema.applet_id)
 
 
 async def review_activity_list(
@@ -766,9 +801,71 @@ async def applet_answers_export(
     return PublicAnswerExportResponse(
         result=PublicAnswerExport.model_validate(data).translate(i18n),
         count=total_answers,
+        has_more=data.has_more,
     )
 
 
+async def applet_answers_export_stream(
+    applet_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    query_params: QueryParams = Depends(parse_query_params(AnswerExportFilters)),
+    export_format: AnswerExportFormat = Query(AnswerExportFormat.NDJSON, alias="format"),
+    cursor: str | None = Query(None),
+    session=Depends(get_session),
+    answer_session=Depends(get_answer_session),
+) -> StreamingResponse:
+    """Streams all answers matching the filters as NDJSON or CSV.
+
+    Pagination parameters are ignored, rows are read through a server-side
+    cursor in batches. Activities are not included, use the regular export
+    endpoint to fetch them.
+    """
+    await AppletService(session, user.id).exist_by_id(applet_id)
+    await CheckAccessService(session, user.id).check_answers_export_access(applet_id)
+    after = AnswerExportCursor.decode(cursor) if cursor else None
+    batches = AnswerService(session, user.id, answer_session).stream_export_data(
+        applet_id, query_params, after, batch_size=EXPORT_STREAM_BATCH_SIZE
+    )
+    headers = {"Content-Disposition": f"attachment; filename=answers-{applet_id}.{export_format}"}
+    return StreamingResponse(
+        export_stream(batches, export_format),
+        headers=headers,
+        media_type=export_media_type(export_format),
+    )
+
+
+async def applet_answers_export_job_create(
+    applet_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    filters: AnswerExportFilters = Depends(),
+    session=Depends(get_session),
+) -> Response[AnswerExportJobPublic]:
+    """Starts a background export of all answers matching the filters.
+
+    The result is uploaded as gzipped NDJSON parts, poll the job to get
+    download links once it is finished.
+    """
+    await AppletService(session, user.id).exist_by_id(applet_id)
+    await CheckAccessService(session, user.id).check_answers_export_access(applet_id)
+    service = AnswerExportJobService(session, user.id)
+    async with atomic(session):
+        job = await service.start(applet_id, filters)
+    await export_answers.kiq(job.id, user.id)
+    return Response(result=await service.get_public(applet_id, job.id))
+
+
+async def applet_answers_export_job_retrieve(
+    applet_id: uuid.UUID,
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    session=Depends(get_session),
+) -> Response[AnswerExportJobPublic]:
+    await AppletService(session, user.id).exist_by_id(applet_id)
+    await CheckAccessService(session, user.id).check_answers_export_access(applet_id)
+    data = await AnswerExportJobService(session, user.id).get_public(applet_id, job_id)
+    return Response(result=data)
+
+
 async def applet_completed_entities(
     applet_id: uuid.UUID,
     from_date: TruncatedDate = Query(..., alias="fromDate"),
@@ -944,14 +1041,16 @@ async def applet_submissions_list(
 ) -> PublicSubmissionsResponse:
     await AppletService(session, user.id).exist_by_id(applet_id)
     await CheckAccessService(session, user.id).check_answer_access(applet_id)
-    submissions, submissions_count = await AnswerService(session, user.id, answer_session).get_applet_submissions(
-        applet_id, query_params
-    )
+    service = AnswerService(session, user.id, answer_session)
+    submissions, submissions_count, has_more = await service.get_applet_submissions(applet_id, query_params)
 
     participants_count = await WorkspaceService(session, user.id).get_workspace_applet_respondents_total(applet_id)
 
     return PublicSubmissionsResponse(
-        submissions=submissions, submissions_count=submissions_count, participants_count=participants_count
+        submissions=submissions,
+        submissions_count=submissions_count,
+        participants_count=participants_count,
+        has_more=has_more,
     )
 
 
@@ -974,33 +1073,21 @@ async def applet_ehr_answers_export(
         return FastAPIResponse(status_code=http.HTTPStatus.NO_CONTENT)
 
     ehr_storage = await create_ehr_storage(session=session, applet_id=applet_id, app_settings=app_settings)
-    zip_buffer = io.BytesIO()
-    try:
-        with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
-            ehr_answer: AnswerEHRFull
-            for ehr_answer in ehr_answers:
-                data = EHRData(
-                    target_subject_id=ehr_answer.target_subject_id,
-                    activity_id=ehr_answer.activity_id,
-                    submit_id=ehr_answer.submit_id,
-                    date=ehr_answer.date,
-                    user_id=user.id,
-                )
-                ehr_zip_buffer = io.BytesIO()
-
-                try:
-                    ehr_zip_filename = ehr_storage.download_ehr_zip(
-                        storage_path=ehr_answer.ehr_storage_uri,  # type: ignore
-                        data=data,
-                        file_buffer=ehr_zip_buffer,
-                    )
-
-                    zip_file.writestr(ehr_zip_filename, ehr_zip_buffer.getvalue())
-                finally:
-                    ehr_zip_buffer.close()
-
-        zip_buffer.seek(0)
-        headers = {"Content-Disposition": "attachment; filename=EHR.zip"}
-        return FastAPIResponse(zip_buffer.getvalue(), headers=headers, media_type="application/zip")
-    finally:
-        zip_buffer.close()
+    items = [
+        (
+            ehr_answer.ehr_storage_uri,
+            EHRData(
+                target_subject_id=ehr_answer.target_subject_id,
+                activity_id=ehr_answer.activity_id,
+                submit_id=ehr_answer.submit_id,
+                date=ehr_answer.date,
+                user_id=user.id,
+            ),
+        )
+        for ehr_answer in ehr_answers
+    ]
+    export_settings = app_settings.task_answers_export
+    entries = ehr_storage.iter_ehr_zips(items, export_settings.ehr_download_concurrency)  # type: ignore[arg-type]
+    compression = zipfile.ZIP_DEFLATED if export_settings.ehr_deflate else zipfile.ZIP_STORED
+    headers = {"Content-Disposition": "attachment; filename=EHR.zip"}
+    return StreamingResponse(stream_zip(entries, compression), headers=headers, media_type="application/zip")
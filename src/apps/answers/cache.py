@@ -0,0 +1,77 @@
+import hashlib
+import json
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.answers.domain import AnswersTotal
+from config import settings
+from infrastructure.cache import BaseCacheService
+from infrastructure.cache.domain import CacheEntry
+from infrastructure.database.core import after_commit
+from infrastructure.logger import logger
+
+__all__ = ["AnswersCountCache"]
+
+# Seconds to keep the revision of an applet without changes, on top of the totals TTL
+REVISION_TTL = 24 * 60 * 60
+
+
+class AnswersCountCache(BaseCacheService[AnswersTotal]):
+    """Totals of the answers export/submissions lists.
+
+    Totals are estimates which may miss the answers submitted in the last
+    `answers_count_cache_ttl` seconds, new answers do not drop them. Every
+    applet has a revision counter which is incremented by bulk deletions of
+    the applet answers. The revision is a part of every total key, so totals
+    cached before a deletion are not read anymore and expire by TTL.
+    Deletions increment it once more after they are committed, totals
+    counted by concurrent requests before the commit are dropped too.
+    A revision expires `REVISION_TTL` seconds after the last total keyed by
+    it, so it outlives the totals and does not restart while they are cached.
+
+    The example of a key:
+        AnswersCountCache:<applet id>:<revision>:<filters digest>
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.default_ttl = settings.service.answers_count_cache_ttl
+        self.revision_ttl = self.default_ttl + REVISION_TTL
+
+    @staticmethod
+    def digest(include_assessments: bool, filters: dict) -> str:
+        payload = json.dumps(dict(filters, include_assessments=include_assessments), sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _revision_key(self, applet_id: uuid.UUID) -> str:
+        return self._build_key(f"{applet_id}:revision")
+
+    async def revision(self, applet_id: uuid.UUID) -> int:
+        value = await self.redis_client.get(self._revision_key(applet_id))
+        return int(value) if value else 0
+
+    async def invalidate(self, applet_id: uuid.UUID) -> None:
+        # `incr` returns 0 when Redis fails
+        if not await self.redis_client.incr(self._revision_key(applet_id)):
+            logger.warning(f"Failed to drop cached answers totals of {applet_id}")
+            return
+        await self.redis_client.expire(self._revision_key(applet_id), self.revision_ttl)
+
+    async def invalidate_on_commit(self, session: AsyncSession, applet_id: uuid.UUID) -> None:
+        await self.invalidate(applet_id)
+        after_commit(session, lambda: self.invalidate(applet_id))
+
+    async def get(self, applet_id: uuid.UUID, digest: str) -> CacheEntry[AnswersTotal]:
+        revision = await self.revision(applet_id)
+        cache_record: dict = await self._get(f"{applet_id}:{revision}:{digest}")
+        return CacheEntry[AnswersTotal](**cache_record)
+
+    async def set_total(self, applet_id: uuid.UUID, digest: str, total: int) -> None:
+        try:
+            revision = await self.revision(applet_id)
+            await self.redis_client.expire(self._revision_key(applet_id), self.revision_ttl)
+            await self.set(f"{applet_id}:{revision}:{digest}", AnswersTotal(total=total))
+        except Exception as e:
+            # The total is counted already, it is cached by the next request
+            logger.warning(f"Failed to cache the answers total of {applet_id}: {e}")
@@ -0,0 +1,79 @@
+import datetime
+import uuid
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import Query
+
+from apps.answers.db.schemas import AnswerEventSchema
+from infrastructure.database.crud import BaseCRUD
+
+__all__ = ["AnswerEventsCRUD"]
+
+
+class AnswerEventsCRUD(BaseCRUD[AnswerEventSchema]):
+    schema_class = AnswerEventSchema
+
+    async def create(self, event: AnswerEventSchema) -> AnswerEventSchema:
+        return await self._create(event)
+
+    async def create_many(self, events: list[AnswerEventSchema]) -> list[AnswerEventSchema]:
+        return await self._create_many(events)
+
+    async def claim(self, limit: int, lease: int, max_attempts: int) -> list[AnswerEventSchema]:
+        """Leases a batch of pending events, the oldest first.
+
+        Events locked by other workers are skipped, events whose lease expired
+        (the worker died) are claimed again until `max_attempts` is reached.
+        """
+        now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+        pending: Query = select(AnswerEventSchema.id)
+        pending = pending.where(
+            AnswerEventSchema.processed_at.is_(None),
+            AnswerEventSchema.attempts < max_attempts,
+            or_(AnswerEventSchema.locked_until.is_(None), AnswerEventSchema.locked_until < now),
+        )
+        pending = pending.order_by(AnswerEventSchema.created_at).limit(limit).with_for_update(skip_locked=True)
+        query = (
+            update(AnswerEventSchema)
+            .where(AnswerEventSchema.id.in_(pending.scalar_subquery()))
+            .values(
+                attempts=AnswerEventSchema.attempts + 1,
+                locked_until=now + datetime.timedelta(seconds=lease),
+            )
+            .returning(AnswerEventSchema)
+            .execution_options(synchronize_session=False)
+        )
+        # Events of the session are refreshed, a retry reads the steps done by the last attempt
+        claimed = select(AnswerEventSchema).from_statement(query).execution_options(populate_existing=True)
+        db_result = await self._execute(claimed)
+        return sorted(db_result.scalars().all(), key=lambda event: event.created_at)
+
+    async def mark_processed(self, ids: list[uuid.UUID]) -> None:
+        query = (
+            update(AnswerEventSchema)
+            .where(AnswerEventSchema.id.in_(ids))
+            .values(processed_at=datetime.datetime.now(datetime.UTC).replace(tzinfo=None), locked_until=None)
+        )
+        await self._execute(query)
+
+    async def mark_steps_done(self, id_: uuid.UUID, report_done: bool, ehr_done: bool) -> None:
+        query = update(AnswerEventSchema).where(AnswerEventSchema.id == id_)
+        query = query.values(report_done=report_done, ehr_done=ehr_done)
+        await self._execute(query)
+
+    async def delete_finished(self, before: datetime.datetime, max_attempts: int) -> list[uuid.UUID]:
+        """Removes events processed before the date and events created before
+        it which failed all `max_attempts`, returns ids of the failed ones.
+        """
+        exhausted = and_(
+            AnswerEventSchema.processed_at.is_(None),
+            AnswerEventSchema.attempts >= max_attempts,
+            AnswerEventSchema.created_at < before,
+        )
+        query = (
+            delete(AnswerEventSchema)
+            .where(or_(AnswerEventSchema.processed_at < before, exhausted))
+            .returning(AnswerEventSchema.id, AnswerEventSchema.processed_at)
+        )
+        db_result = await self._execute(query)
+        return [id_ for id_, processed_at in db_result.all() if processed_at is None]
@@ -47,6 +47,9 @@ class AnswerItemsCRUD(BaseCRUD[AnswerItemSchema]):
         schema = await self._create(schema)
         return schema
 
+    async def create_many(self, schemas: list[AnswerItemSchema]) -> list[AnswerItemSchema]:
+        return await self._create_many(schemas)
+
     async def update(self, schema: AnswerItemSchema) -> AnswerItemSchema:
         schema = await self._update_one("id", schema.id, schema)
         return schema
@@ -1,11 +1,10 @@
-import asyncio
 import datetime
 import uuid
 from collections import defaultdict
 from itertools import chain
-from typing import Collection
+from typing import AsyncIterator, Collection
 
-from sqlalchemy import Text, and_, case, column, delete, func, null, or_, select, text, update
+from sqlalchemy import Text, and_, case, column, delete, func, null, or_, select, text, tuple_, update
 from sqlalchemy.dialects.postgresql import UUID, insert
 from sqlalchemy.orm import InstrumentedAttribute, Query, aliased, contains_eager
 from sqlalchemy.sql import Values
@@ -17,6 +16,7 @@ from apps.answers.db.schemas import AnswerEHRSchema, AnswerItemSchema, AnswerSch
 from apps.answers.domain import (
     Answer,
     AnswerEHR,
+    AnswerExportCursor,
     AnswerItemDataEncrypted,
     AppletCompletedEntities,
     CompletedEntity,
@@ -34,7 +34,8 @@ from apps.applets.db.schemas import AppletHistorySchema
 from apps.applets.domain.applet_history import Version
 from apps.shared.domain import parse_obj_as
 from apps.shared.filtering import Comparisons, FilterField, Filtering
-from apps.shared.paging import paging
+from apps.shared.paging import paging, paging_lookahead
+from infrastructure.database import ReadFanOut
 from infrastructure.database.crud import BaseCRUD
 from infrastructure.database.mixins import HistoryAware
 
@@ -231,9 +232,9 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
 
         query_count = select(func.count()).select_from(query.with_only_columns(AnswerSchema.submit_id).subquery())
 
-        coro_data = self._execute(query_data)
-        coro_count = self._execute(query_count)
-        result_data, result_count = await asyncio.gather(coro_data, coro_count)
+        result_data, result_count = await ReadFanOut(self.session).gather(
+            lambda session: session.execute(query_data), lambda session: session.execute(query_count)
+        )
 
         data = result_data.all()
         count = result_count.scalar()
@@ -289,6 +290,12 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
             raise AnswerNotFoundError()
         return schema
 
+    async def get_by_ids(self, ids: list[uuid.UUID]) -> list[AnswerSchema]:
+        query: Query = select(AnswerSchema)
+        query = query.where(AnswerSchema.id.in_(ids))
+        db_result = await self._execute(query)
+        return db_result.scalars().all()
+
     async def delete_by_applet_user(self, applet_id: uuid.UUID, respondent_id: uuid.UUID | None = None):
         query: Query = delete(AnswerSchema)
         query = query.where(AnswerSchema.applet_id == applet_id)
@@ -303,15 +310,13 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
             else_=col,
         )
 
-    async def get_applet_answers(
+    def _applet_answers_query(
         self,
         applet_id: uuid.UUID,
         *,
         include_assessments: bool = True,
-        page=None,
-        limit=None,
         **filters,
-    ) -> tuple[list[RespondentAnswerData], int]:
+    ) -> Query:
         reviewed_answer_id = case(
             (AnswerItemSchema.is_assessment.is_(True), AnswerSchema.id),
             else_=null(),
@@ -380,22 +385,98 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
         if not include_assessments:
             query = query.where(AnswerItemSchema.is_assessment.isnot(True))
 
+        return query
+
+    async def get_applet_answers(
+        self,
+        applet_id: uuid.UUID,
+        *,
+        include_assessments: bool = True,
+        page=None,
+        limit=None,
+        **filters,
+    ) -> tuple[list[RespondentAnswerData], int]:
+        query = self._applet_answers_query(applet_id, include_assessments=include_assessments, **filters)
         query_count = query.with_only_columns(func.count())
 
         query = query.order_by(AnswerItemSchema.created_at.desc())
         query = paging(query, page, limit)
-        coro_data, coro_count = (
-            self._execute(query),
-            self._execute(query_count),
+        res, res_count = await ReadFanOut(self.session).gather(
+            lambda session: session.execute(query), lambda session: session.execute(query_count)
         )
-
-        res, res_count = await asyncio.gather(coro_data, coro_count)
         answers = res.all()
 
         total = res_count.scalars().one()
 
         return parse_obj_as(list[RespondentAnswerData], answers), total
 
+    async def get_applet_answers_page(
+        self,
+        applet_id: uuid.UUID,
+        *,
+        include_assessments: bool = True,
+        page=None,
+        limit=None,
+        **filters,
+    ) -> tuple[list[RespondentAnswerData], bool]:
+        """Returns a page of export rows and whether there are more rows.
+
+        One extra row is fetched instead of counting all matching rows.
+        """
+        query = self._applet_answers_query(applet_id, include_assessments=include_assessments, **filters)
+        query = query.order_by(AnswerItemSchema.created_at.desc())
+        query, limit = paging_lookahead(query, page, limit)
+
+        res = await self._execute(query)
+        answers = res.all()
+        return parse_obj_as(list[RespondentAnswerData], answers[:limit]), len(answers) > limit
+
+    async def count_applet_answers(
+        self,
+        applet_id: uuid.UUID,
+        *,
+        include_assessments: bool = True,
+        **filters,
+    ) -> int:
+        query = self._applet_answers_query(applet_id, include_assessments=include_assessments, **filters)
+        res = await self._execute(query.with_only_columns(func.count()))
+        return res.scalars().one()
+
+    async def stream_applet_answers(
+        self,
+        applet_id: uuid.UUID,
+        *,
+        include_assessments: bool = True,
+        after: AnswerExportCursor | None = None,
+        batch_size: int = 1000,
+        **filters,
+    ) -> AsyncIterator[list[tuple[RespondentAnswerData, AnswerExportCursor]]]:
+        """Streams export rows through a server-side cursor in batches.
+
+        Rows are ordered by `(created_at, answer item id)` descending, so the
+        cursor of any yielded row can be passed as `after` to resume the
+        export right after it.
+        """
+        query = self._applet_answers_query(applet_id, include_assessments=include_assessments, **filters)
+        query = query.add_columns(AnswerItemSchema.id.label("item_id"))
+        if after:
+            query = query.where(tuple_(AnswerItemSchema.created_at, AnswerItemSchema.id) < (after.created_at, after.id))
+        query = query.order_by(AnswerItemSchema.created_at.desc(), AnswerItemSchema.id.desc())
+        query = query.execution_options(yield_per=batch_size)
+
+        result = await self.session.stream(query)
+        try:
+            async for partition in result.partitions(batch_size):
+                batch = []
+                for row in partition:
+                    data = dict(row._mapping)
+                    item_id = data.pop("item_id")
+                    answer = RespondentAnswerData.model_validate(data)
+                    batch.append((answer, AnswerExportCursor(created_at=answer.created_at, id=item_id)))
+                yield batch
+        finally:
+            await result.close()
+
     async def get_item_history_by_activity_history(self, activity_hist_ids: list[str]) -> list[ActivityItemHistoryFull]:
         query: Query = (
             select(ActivityItemHistorySchema)
@@ -516,6 +597,13 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
         db_result = await self._execute(query)
         return db_result.scalars().all()
 
+    async def get_by_submit_ids(self, submit_ids: list[uuid.UUID]) -> list[AnswerSchema]:
+        query: Query = select(AnswerSchema)
+        query = query.where(AnswerSchema.submit_id.in_(submit_ids))
+        query = query.order_by(AnswerSchema.created_at.asc(), AnswerSchema.updated_at)
+        db_result = await self._execute(query)
+        return db_result.scalars().all()
+
     async def get_by_applet_activity_submit_or_user_id(
         self,
         applet_id: uuid.UUID,
@@ -920,8 +1008,9 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
         return res[0] if res else None
 
     async def get_applet_user_answer_items(
-        self, applet_id: uuid.UUID, user_id: uuid.UUID, page=None, limit=None
+        self, applet_id: uuid.UUID, user_id: uuid.UUID, after_id: uuid.UUID | None = None, limit=None
     ) -> list[UserAnswerItemData]:
+        """Returns the user answer items ordered by id, the page after `after_id`"""
         query: Query = (
             select(
                 AnswerItemSchema.id,
@@ -939,7 +1028,10 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
             )
             .order_by(AnswerItemSchema.id)
         )
-        query = paging(query, page, limit)
+        if after_id:
+            query = query.where(AnswerItemSchema.id > after_id)
+        if limit:
+            query = query.limit(limit)
 
         db_result = await self._execute(query)
 
@@ -4,6 +4,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -109,3 +110,23 @@ class AnswerEHRSchema(Base):
     meta = Column(JSONB())
 
     __table_args__ = (UniqueConstraint("submit_id", "activity_id", name="answers_ehr_submit_activity_key"),)
+
+
+class AnswerEventSchema(Base):
+    """Outbox of answer side effects, written in the transaction of the answer"""
+
+    __tablename__ = "answer_events"
+
+    type = Column(String(), nullable=False)
+    applet_id = Column(UUID(as_uuid=True), nullable=False)
+    answer_id = Column(UUID(as_uuid=True), nullable=False)
+    respondent_id = Column(UUID(as_uuid=True), nullable=False)
+    payload = Column(JSONB(), nullable=False)
+    attempts = Column(Integer(), nullable=False, default=0, server_default=text("0"))
+    locked_until = Column(DateTime(), nullable=True)
+    processed_at = Column(DateTime(), nullable=True)
+    # Steps of a failed event which are not repeated by the retry
+    report_done = Column(Boolean(), nullable=False, default=False, server_default=text("false"))
+    ehr_done = Column(Boolean(), nullable=False, default=False, server_default=text("false"))
+
+    __table_args__ = (Index("ix_answer_events_pending", "created_at", postgresql_where=text("processed_at IS NULL")),)
@@ -6,8 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.answers.domain import ArbitraryPreprocessor
 from apps.subjects.services import SubjectsService
+from apps.workspaces.service.arbitrary_registry import arbitrary_registry
 from apps.workspaces.service.workspace import WorkspaceService
-from infrastructure.database.core import session_manager
 from infrastructure.database.deps import get_session
 
 __all__ = ["get_arbitrary_info", "preprocess_arbitrary_url", "get_answer_session", "get_answer_session_by_subject"]
@@ -15,8 +15,7 @@ __all__ = ["get_arbitrary_info", "preprocess_arbitrary_url", "get_answer_session
 
 async def get_arbitrary_info(applet_id: uuid.UUID | None, session: AsyncSession) -> str | None:
     if applet_id:
-        service = WorkspaceService(session, uuid.uuid4())
-        server_info = await service.get_arbitrary_info_if_use_arbitrary(applet_id)
+        server_info = await arbitrary_registry.get_by_applet_id(session, applet_id)
         if server_info:
             return server_info.database_uri
     return None
@@ -44,7 +43,7 @@ async def get_answer_session(url=Depends(preprocess_arbitrary_url)):
     if not url:
         yield None
     else:
-        session_maker = session_manager.get_session(url)
+        session_maker = await arbitrary_registry.get_session_maker(url)
         async with session_maker() as session:
             yield session
 
@@ -53,14 +52,13 @@ async def get_answer_session_by_owner_id(
     owner_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
 ):
-    service = WorkspaceService(session, uuid.uuid4())
-    server_info = await service.get_arbitrary_info_by_owner_id_if_use_arbitrary(owner_id)
+    server_info = await arbitrary_registry.get_by_owner_id(session, owner_id)
     if server_info:
         url = server_info.database_uri
         if not url:
             yield None
         else:
-            session_maker = session_manager.get_session(url)
+            session_maker = await arbitrary_registry.get_session_maker(url)
             async with session_maker() as session:
                 yield session
     else:
@@ -71,15 +69,14 @@ async def get_answer_session_by_subject(subject_id: uuid.UUID, session: AsyncSes
     subject = await SubjectsService(session, uuid.uuid4()).get(subject_id)
     if not subject:
         yield None
-    service = WorkspaceService(session, uuid.uuid4())
     assert subject
-    server_info = await service.get_arbitrary_info_if_use_arbitrary(subject.applet_id)
+    server_info = await arbitrary_registry.get_by_applet_id(session, subject.applet_id)
     if server_info and server_info.use_arbitrary:
         url = server_info.database_uri
         if not url:
             yield None
         else:
-            session_maker = session_manager.get_session(url)
+            session_maker = await arbitrary_registry.get_session_maker(url)
             async with session_maker() as session:
                 yield session
     else:
@@ -1,3 +1,5 @@
+import base64
+import binascii
 import datetime
 import enum
 import uuid
@@ -17,6 +19,7 @@ from apps.activities.domain.response_type_config import ResponseType
 from apps.activities.domain.scores_reports import SubscaleSetting
 from apps.activity_flows.domain.flow_full import FlowFull, FlowHistoryWithActivityFlat, FlowHistoryWithActivityFull
 from apps.answers.domain.answer_items import AnswerItem, ItemAnswerCreate
+from apps.answers.errors import InvalidExportCursorError
 from apps.applets.domain.base import AppletBaseInfo
 from apps.integrations.oneup_health.service.domain import EHRMetadata
 from apps.integrations.prolific.domain import ProlificParamsActivityAnswer
@@ -124,6 +127,43 @@ class AppletAnswerCreate(InternalModel):
     _dates_from_ms = field_validator("created_at", mode="before")(datetime_from_ms)
 
 
+ANSWERS_BATCH_MAX_SIZE = 500
+
+
+class AppletAnswersBatchCreate(InternalModel):
+    answers: Annotated[list[AppletAnswerCreate], Field(min_length=1, max_length=ANSWERS_BATCH_MAX_SIZE)]
+
+
+class AnswerBatchItemResult(PublicModel):
+    submit_id: uuid.UUID
+    activity_id: uuid.UUID
+    answer_id: uuid.UUID | None = None
+    error: str | None = None
+
+
+class AnswerEventType(enum.StrEnum):
+    ANSWER_SUBMITTED = "answer_submitted"
+
+
+class AnswerSideEffects(InternalModel):
+    """Alerts, report and EHR ingestion to run for a created answer.
+
+    Stored as the payload of the `answer_submitted` outbox event.
+    """
+
+    answer_id: uuid.UUID
+    applet_id: uuid.UUID
+    submit_id: uuid.UUID
+    activity_id: uuid.UUID
+    target_subject_id: uuid.UUID
+    version: str
+    alerts: Annotated[list[AnswerAlert], Field(default_factory=list)]
+    allowed_ehr_ingest: bool = False
+    # Steps done by the earlier attempts, kept on the event row instead of the payload
+    report_done: bool = False
+    ehr_done: bool = False
+
+
 class AssessmentAnswerCreate(InternalModel):
     answer: str
     item_ids: list[uuid.UUID]
@@ -618,6 +658,7 @@ class AnswerExport(InternalModel):
     answers: Annotated[list[RespondentAnswerData], Field(default_factory=list)]
     activities: Annotated[list[ActivityHistoryFull], Field(default_factory=list)]
     total_answers: int = 0
+    has_more: bool = False
 
 
 class PublicAnswerExportTranslated(PublicModel):
@@ -638,6 +679,77 @@ class PublicAnswerExport(PublicModel):
 
 class PublicAnswerExportResponse(Response[PublicAnswerExportTranslated]):
     count: int = 0
+    has_more: bool = False
+
+
+class AnswerExportFormat(enum.StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class AnswersTotal(InternalModel):
+    total: int
+
+
+class AnswerExportTotal(enum.StrEnum):
+    """How the total of a paginated export is computed.
+
+    Without the mode the total is counted on every page.
+    """
+
+    # Counted on the first page, later pages get the cached total
+    EXACT = "exact"
+    # Cached total, counted only when there is no cached value, it may miss the latest answers
+    ESTIMATE = "estimate"
+
+
+class AnswerExportJobPart(InternalModel):
+    key: str
+    rows: int
+
+
+class AnswerExportJobDetails(InternalModel):
+    """Progress of a background answers export, stored in the job details"""
+
+    applet_id: uuid.UUID
+    filters: dict
+    rows: int = 0
+    parts: Annotated[list[AnswerExportJobPart], Field(default_factory=list)]
+    # Cursor of the last uploaded row, the export is resumed after it
+    cursor: str | None = None
+    attempts: int = 0
+    # Code of the error shown to the client, the exception is logged
+    error: str | None = None
+
+
+class AnswerExportJobPartPublic(PublicModel):
+    url: str
+    rows: int
+
+
+class AnswerExportJobPublic(PublicModel):
+    id: uuid.UUID
+    status: str
+    rows: int = 0
+    parts: Annotated[list[AnswerExportJobPartPublic], Field(default_factory=list)]
+    error: str | None = None
+
+
+class AnswerExportCursor(InternalModel):
+    """Position of an exported row, the export can be resumed right after it."""
+
+    created_at: datetime.datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "AnswerExportCursor":
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(token.encode()))
+        except (ValueError, binascii.Error):
+            raise InvalidExportCursorError()
 
 
 class SafeApplet(AppletBaseInfo, InternalModel):
@@ -819,6 +931,7 @@ class PublicSubmissionsResponse(PublicModel):
     submissions: Annotated[list[AppletSubmission], Field(default_factory=list)]
     submissions_count: int = 0
     participants_count: int = 0
+    has_more: bool = False
 
 
 class AnswersCopyCheckResult(InternalModel):
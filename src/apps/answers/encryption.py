@@ -0,0 +1,184 @@
+"""Answer encryption with the applet keys.
+
+Re-encryption of answer items is CPU bound, so it runs in a process pool.
+The pool processes import this module, so it depends on the settings, the
+shared crypto helpers and the logger only. Answer items are passed as plain
+dicts, importing the answers domain package would pull in most of the app.
+"""
+
+import asyncio
+import functools
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from json import JSONDecodeError
+from typing import Callable, TypeVar
+
+from apps.shared.encryption import decrypt_cbc, encrypt_cbc, generate_dh_aes_key, generate_dh_public_key
+from apps.shared.exception import EncryptionError
+from config import settings
+from infrastructure.logger import logger
+
+__all__ = [
+    "AnswerEncryptor",
+    "CryptoExecutor",
+    "ReencryptionKeys",
+    "crypto_executor",
+    "derive_reencryption_keys",
+    "reencrypt_answer_items",
+]
+
+_Result = TypeVar("_Result")
+
+
+class AnswerEncryptor:
+    def __init__(self, key: list | bytes):
+        if isinstance(key, list):
+            key = bytes(key)
+        self.key: bytes = key
+
+    def encrypt(self, data: str, iv: bytes | None = None):
+        try:
+            ct, iv = encrypt_cbc(self.key, data.encode("utf-8"), iv)
+        except Exception as e:
+            raise EncryptionError("Cannot encrypt answer data") from e
+        return f"{iv.hex()}:{ct.hex()}"
+
+    def decrypt(self, encrypted_data: str) -> str:
+        """
+        @param encrypted_data: data in hex format "iv:text"
+        """
+        try:
+            iv_hex, text_hex = encrypted_data.split(":", 1)
+            data = bytes.fromhex(text_hex)
+            iv = bytes.fromhex(iv_hex)
+
+            return decrypt_cbc(self.key, data, iv).decode("utf-8")
+        except Exception as e:
+            raise EncryptionError("Cannot decrypt answer data") from e
+
+
+class ReencryptionKeys:
+    def __init__(self, old_public_key: list, new_public_key: list, old_aes_key: list, new_aes_key: list):
+        self.old_public_key = old_public_key
+        self.new_public_key = new_public_key
+        self.decryptor = AnswerEncryptor(old_aes_key)
+        self.encryptor = AnswerEncryptor(new_aes_key)
+
+
+def derive_reencryption_keys(
+    old_private_key: list, new_private_key: list, prime: list, base: list, applet_public_key: list
+) -> ReencryptionKeys:
+    """Derives the user keys of the applet before and after the password change"""
+    return ReencryptionKeys(
+        old_public_key=generate_dh_public_key(old_private_key, prime, base),
+        new_public_key=generate_dh_public_key(new_private_key, prime, base),
+        old_aes_key=generate_dh_aes_key(old_private_key, applet_public_key, prime),
+        new_aes_key=generate_dh_aes_key(new_private_key, applet_public_key, prime),
+    )
+
+
+def _is_public_key_match(answer_id, stored_public_key, generated_public_key) -> bool:
+    if not stored_public_key:
+        logger.error(
+            f'Reencryption:  Answer item "{answer_id}": wrong public key, skip'  # noqa: E501
+        )
+    try:
+        stored_public_key = json.loads(stored_public_key)
+    except JSONDecodeError as e:
+        logger.error(
+            f'Reencryption:  Answer item "{answer_id}": wrong public key, skip'  # noqa: E501
+        )
+        logger.exception(str(e))
+        return False
+
+    if stored_public_key != generated_public_key:
+        logger.error(
+            f'Reencryption: Answer item "{answer_id}": public key doesn\'t match, skip'  # noqa: E501
+        )
+        return False
+
+    return True
+
+
+def reencrypt_answer_items(
+    answers: list[dict],
+    old_public_key: list,
+    decryptor: AnswerEncryptor,
+    encryptor: AnswerEncryptor,
+) -> list[dict]:
+    """Re-encrypts the items encrypted with the old key, skips the others.
+
+    Takes dumped `UserAnswerItemData` and returns `AnswerItemDataEncrypted`
+    fields of the re-encrypted items.
+    """
+    data_to_update: list[dict] = []
+    for answer in answers:
+        if not _is_public_key_match(answer["id"], answer["user_public_key"], old_public_key):
+            continue
+
+        try:
+            encrypted_answer = encryptor.encrypt(decryptor.decrypt(answer["answer"]))
+            encrypted_events, encrypted_identifier = None, None
+            if answer["events"]:
+                encrypted_events = encryptor.encrypt(decryptor.decrypt(answer["events"]))
+            if answer["identifier"]:
+                migrated_data = answer["migrated_data"]
+                if migrated_data and migrated_data.get("is_identifier_encrypted") is False:
+                    encrypted_identifier = encrypted_identifier
+                else:
+                    encrypted_identifier = encryptor.encrypt(decryptor.decrypt(answer["identifier"]))
+
+            data_to_update.append(
+                dict(
+                    id=answer["id"],
+                    answer=encrypted_answer,
+                    events=encrypted_events,
+                    identifier=encrypted_identifier,
+                )
+            )
+        except EncryptionError as e:
+            logger.error(
+                f'Reencryption: Skip answer item "{answer["id"]}": cannot decrypt answer'  # noqa: E501
+            )
+            logger.exception(str(e))
+            continue
+    return data_to_update
+
+
+class CryptoExecutor:
+    """Process pool for CPU bound encryption off the event loop.
+
+    Processes are spawned, not forked, the worker has threads and open
+    connections which must not be copied. The pool is created lazily and
+    recreated after `shutdown`.
+
+    NOTE: `max_workers=0` runs the functions in the default thread pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    async def run(self, func: Callable[..., _Result], *args, **kwargs) -> _Result:
+        if not self.max_workers:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+crypto_executor = CryptoExecutor(settings.task_answer_encryption.crypto_workers)
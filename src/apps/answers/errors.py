@@ -90,3 +90,7 @@ class MultiinformantAssessmentNoAccessApplet(ValidationError):
 class MultiinformantAssessmentInvalidActivityOrFlow(ValidationError):
     message = _("Activity or Flow not found")
     code = _("invalid_activity_or_flow_id")
+
+
+class InvalidExportCursorError(ValidationError):
+    message = _("Export cursor is not valid.")
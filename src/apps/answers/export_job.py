@@ -0,0 +1,229 @@
+"""Background answers export.
+
+The export is started as a job, a worker streams answers in keyset order
+and uploads gzipped NDJSON parts to the answer bucket. Progress and the
+cursor of the last uploaded row are stored in the job details, so an
+interrupted export continues from the last uploaded part.
+
+A failed run leaves the job to retry, the scheduled sweep kicks it again
+together with the jobs whose worker died, until `max_attempts` runs. A run
+claims the job first, so a redelivered or doubly kicked job runs once, and
+bumps the job while it reads rows, so a slow run is not taken as dead.
+"""
+
+import datetime
+import gzip
+import io
+import time
+import uuid
+
+import sentry_sdk
+
+from apps.answers.domain import (
+    AnswerExportCursor,
+    AnswerExportJobDetails,
+    AnswerExportJobPart,
+    AnswerExportJobPartPublic,
+    AnswerExportJobPublic,
+)
+from apps.answers.export_stream import ndjson_row
+from apps.answers.filters import AnswerExportFilters
+from apps.answers.service import AnswerService
+from apps.job.constants import JobStatus
+from apps.job.crud import JobCRUD
+from apps.job.domain import Job
+from apps.job.errors import JobNotFoundError
+from apps.job.service import JobService
+from apps.shared.query_params import QueryParams, parse_query_params
+from apps.workspaces.service.arbitrary_registry import arbitrary_registry
+from config import settings
+from infrastructure.database import atomic, session_manager
+from infrastructure.logger import logger
+from infrastructure.storage.storage import create_answer_client
+from infrastructure.storage.storage_client import StorageClient
+
+__all__ = ["AnswerExportJobService", "run_export_job", "sweep_export_jobs"]
+
+EXPORT_JOB_PREFIX = "answers_export"
+# Error of a job which failed all attempts, the exceptions are logged only
+EXPORT_FAILED_ERROR = "export_failed"
+
+
+class AnswerExportJobService:
+    def __init__(self, session, user_id: uuid.UUID):
+        self.session = session
+        self.user_id = user_id
+
+    async def start(self, applet_id: uuid.UUID, filters: AnswerExportFilters) -> Job:
+        details = AnswerExportJobDetails(applet_id=applet_id, filters=filters.model_dump(mode="json"))
+        return await JobService(self.session, self.user_id).get_or_create_owned(
+            f"{EXPORT_JOB_PREFIX}:{applet_id}:{uuid.uuid4()}",
+            JobStatus.pending,
+            details.model_dump(mode="json"),
+        )
+
+    async def get(self, applet_id: uuid.UUID, job_id: uuid.UUID) -> Job:
+        job = await JobService(self.session, self.user_id).get_owned(job_id)
+        if not job.name.startswith(f"{EXPORT_JOB_PREFIX}:{applet_id}:"):
+            raise JobNotFoundError()
+        return job
+
+    async def get_public(self, applet_id: uuid.UUID, job_id: uuid.UUID) -> AnswerExportJobPublic:
+        job = await self.get(applet_id, job_id)
+        details = AnswerExportJobDetails.model_validate(job.details)
+        parts = []
+        if job.status == JobStatus.success:
+            storage = await _get_storage(self.session, applet_id)
+            for part in details.parts:
+                url = await storage.generate_presigned_url(part.key)
+                parts.append(AnswerExportJobPartPublic(url=url, rows=part.rows))
+        return AnswerExportJobPublic(
+            id=job.id,
+            status=job.status,
+            rows=details.rows,
+            parts=parts,
+            error=details.error,
+        )
+
+
+async def _get_storage(session, applet_id: uuid.UUID) -> StorageClient:
+    info = await arbitrary_registry.get_by_applet_id(session, applet_id)
+    return create_answer_client(settings, info)
+
+
+def _part_key(details: AnswerExportJobDetails, job_id: uuid.UUID, index: int) -> str:
+    return f"{EXPORT_JOB_PREFIX}/{details.applet_id}/{job_id}/part-{index:05d}.ndjson.gz"
+
+
+class _PartWriter:
+    """Collects NDJSON rows into a gzipped in-memory part of bounded size"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self.file = gzip.GzipFile(fileobj=self.buffer, mode="wb")
+        self.rows = 0
+
+    def write(self, row: bytes) -> None:
+        self.file.write(row)
+        self.rows += 1
+
+    def close(self) -> io.BytesIO:
+        self.file.close()
+        self.buffer.seek(0)
+        return self.buffer
+
+
+def _stale_before() -> datetime.datetime:
+    """Jobs in progress without updates since the date lost their worker"""
+    stale_timeout = datetime.timedelta(seconds=settings.task_answers_export.stale_timeout)
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None) - stale_timeout
+
+
+async def run_export_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    session_maker = session_manager.get_session()
+    async with session_maker() as session:
+        job_service = JobService(session, user_id)
+        async with atomic(session):
+            job = await JobCRUD(session).claim(job_id, user_id, _stale_before())
+            if not job:
+                logger.info(f"Answers export {job_id} is done or run by another worker, skip")
+                return
+            details = AnswerExportJobDetails.model_validate(job.details)
+            details.attempts += 1
+            await job_service.change_status(job_id, JobStatus.in_progress, details.model_dump(mode="json"))
+
+        arbitrary = await arbitrary_registry.get_by_applet_id(session, details.applet_id)
+        storage = create_answer_client(settings, arbitrary)
+        answer_session_maker = session_maker
+        if arbitrary:
+            answer_session_maker = await arbitrary_registry.get_session_maker(arbitrary.database_uri)
+
+        async def _upload(part: _PartWriter, cursor: AnswerExportCursor) -> None:
+            key = _part_key(details, job_id, len(details.parts) + 1)
+            await storage.upload(key, part.close())
+            details.parts.append(AnswerExportJobPart(key=key, rows=part.rows))
+            details.rows += part.rows
+            details.cursor = cursor.encode()
+            async with atomic(session):
+                await job_service.change_status(job_id, JobStatus.in_progress, details.model_dump(mode="json"))
+
+        heartbeat_at = time.monotonic()
+
+        async def _heartbeat() -> None:
+            nonlocal heartbeat_at
+            if time.monotonic() - heartbeat_at < settings.task_answers_export.heartbeat_interval:
+                return
+            heartbeat_at = time.monotonic()
+            async with atomic(session):
+                await job_service.change_status(job_id, JobStatus.in_progress)
+
+        try:
+            filters = AnswerExportFilters.model_validate(details.filters)
+            query_params: QueryParams = parse_query_params(AnswerExportFilters)(filters)
+            after = AnswerExportCursor.decode(details.cursor) if details.cursor else None
+            part_rows = settings.task_answers_export.part_rows
+            part, cursor = _PartWriter(), after
+
+            # NOTE: Rows are read on a separate session, because job progress commits
+            #       on the main session would close the server-side cursor.
+            async with answer_session_maker() as answer_session:
+                service = AnswerService(session, user_id, answer_session)
+                batches = service.stream_export_data(
+                    details.applet_id,
+                    query_params,
+                    after,
+                    batch_size=settings.task_answers_export.batch_size,
+                )
+                async for batch in batches:
+                    for answer, cursor in batch:
+                        part.write(ndjson_row(answer, cursor))
+                        if part.rows >= part_rows:
+                            await _upload(part, cursor)
+                            part = _PartWriter()
+                    await _heartbeat()
+
+            if part.rows and cursor:
+                await _upload(part, cursor)
+        except Exception:
+            logger.exception(f"Answers export {job_id} failed, attempt {details.attempts}")
+            status = JobStatus.retry
+            if details.attempts >= settings.task_answers_export.max_attempts:
+                status, details.error = JobStatus.error, EXPORT_FAILED_ERROR
+            async with atomic(session):
+                await job_service.change_status(job_id, status, details.model_dump(mode="json"))
+            raise
+
+        async with atomic(session):
+            await job_service.change_status(job_id, JobStatus.success, details.model_dump(mode="json"))
+
+
+async def sweep_export_jobs() -> int:
+    """Kicks the export jobs to retry and the jobs which lost their worker,
+    fails the jobs without attempts left, returns the number of kicked jobs.
+    """
+    from apps.answers.tasks import export_answers
+
+    config = settings.task_answers_export
+    session_maker = session_manager.get_session()
+    async with session_maker() as session:
+        to_kick = []
+        async with atomic(session):
+            for job in await JobCRUD(session).get_to_resume(f"{EXPORT_JOB_PREFIX}:", _stale_before()):
+                details = AnswerExportJobDetails.model_validate(job.details)
+                if details.attempts >= config.max_attempts:
+                    logger.error(f"Answers export {job.id} failed all {details.attempts} attempts")
+                    details.error = EXPORT_FAILED_ERROR
+                    await JobService(session, job.creator_id).change_status(
+                        job.id, JobStatus.error, details.model_dump(mode="json")
+                    )
+                    continue
+                # Pending again, the job is not kicked twice before the worker picks it up
+                await JobService(session, job.creator_id).change_status(job.id, JobStatus.pending)
+                to_kick.append(job)
+
+    for job in to_kick:
+        try:
+            await export_answers.kiq(job.id, job.creator_id)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+    return len(to_kick)
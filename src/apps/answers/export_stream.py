@@ -0,0 +1,76 @@
+"""Serializers for the streaming answers export.
+
+Every exported row carries a `cursor` token, passing it back as the
+`cursor` query parameter resumes the export right after that row.
+"""
+
+import csv
+import io
+from typing import AsyncIterator
+
+import orjson
+
+from apps.answers.domain import AnswerExportCursor, AnswerExportFormat, RespondentAnswerData, RespondentAnswerDataPublic
+from apps.shared.domain.base import to_camelcase
+
+__all__ = ["EXPORT_STREAM_BATCH_SIZE", "export_stream", "export_media_type", "ndjson_row"]
+
+EXPORT_STREAM_BATCH_SIZE = 1000
+CURSOR_FIELD = "cursor"
+
+ExportBatches = AsyncIterator[list[tuple[RespondentAnswerData, AnswerExportCursor]]]
+
+
+def _public_row(answer: RespondentAnswerData, cursor: AnswerExportCursor) -> dict:
+    if answer.is_manager:
+        answer.respondent_secret_id = f"[admin account] ({answer.respondent_secret_id})"
+    row = RespondentAnswerDataPublic.model_validate(answer).model_dump(by_alias=True, mode="json")
+    row[CURSOR_FIELD] = cursor.encode()
+    return row
+
+
+def ndjson_row(answer: RespondentAnswerData, cursor: AnswerExportCursor) -> bytes:
+    return orjson.dumps(_public_row(answer, cursor)) + b"\n"
+
+
+def _csv_header() -> list[str]:
+    fields = RespondentAnswerDataPublic.model_fields
+    return [field.alias or to_camelcase(name) for name, field in fields.items()] + [CURSOR_FIELD]
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+async def _ndjson(batches: ExportBatches) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(ndjson_row(answer, cursor) for answer, cursor in batch)
+
+
+async def _csv(batches: ExportBatches) -> AsyncIterator[bytes]:
+    header = _csv_header()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue().encode()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for answer, cursor in batch:
+            row = _public_row(answer, cursor)
+            writer.writerow([_csv_value(row.get(key)) for key in header])
+        yield buffer.getvalue().encode()
+
+
+def export_stream(batches: ExportBatches, export_format: AnswerExportFormat) -> AsyncIterator[bytes]:
+    if export_format == AnswerExportFormat.CSV:
+        return _csv(batches)
+    return _ndjson(batches)
+
+
+def export_media_type(export_format: AnswerExportFormat) -> str:
+    if export_format == AnswerExportFormat.CSV:
+        return "text/csv"
+    return "application/x-ndjson"
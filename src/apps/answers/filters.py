@@ -5,6 +5,7 @@ from typing import Annotated, Self
 from fastapi import Query
 from pydantic import Field, field_validator, model_validator
 
+from apps.answers.domain import AnswerExportTotal
 from apps.shared.domain.base import InternalModel
 from apps.shared.domain.custom_validations import array_from_string
 from apps.shared.domain.types import TruncatedDate
@@ -56,6 +57,7 @@ class AnswerExportFilters(BaseQueryParams):
     to_date: datetime.datetime | None = None
     limit: int = 10000
     include_ehr: bool = False
+    total: AnswerExportTotal | None = None
 
 
 class AnswerIdentifierVersionFilter(BaseQueryParams):
@@ -6,7 +6,10 @@ from typing import Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.activity_flows.crud import FlowsHistoryCRUD
+from apps.activity_flows.domain.flow_full import FlowHistoryWithActivityFull
 from apps.answers.crud.answers import AnswersCRUD
+from apps.answers.db.schemas import AnswerSchema
+from apps.applets.history_cache import flow_history_cache
 
 
 class FlowSubmissionProgress:
@@ -20,21 +23,28 @@ class FlowSubmissionProgress:
         self._submitted_counts: Counter[str] = Counter()
         self._has_flow_history: bool = False
 
-    async def load(self, flow_history_id: str, submit_id) -> None:
-        """Load flow structure and existing submissions for the submit id."""
-        flow_histories = await FlowsHistoryCRUD(self._session).load_full([flow_history_id], load_activities=False)
-        if not flow_histories:
+    async def load(self, flow_history_id: str, submit_id, existing_answers: list[AnswerSchema] | None = None) -> None:
+        """Load flow structure and existing submissions for the submit id.
+
+        Already loaded answers of the submission can be passed as `existing_answers`.
+        """
+        flow_history = await flow_history_cache.get_or_load(flow_history_id, lambda: self._load_flow(flow_history_id))
+        if not flow_history:
             self._has_flow_history = False
             return
 
-        flow_history = flow_histories[0]
         self._expected_counts = Counter(item.activity_id for item in flow_history.items)
         self._expected_ids = set(self._expected_counts.keys())
         self._has_flow_history = True
 
-        existing_answers = await AnswersCRUD(self._answer_session).get_by_submit_id(submit_id)
+        if existing_answers is None:
+            existing_answers = await AnswersCRUD(self._answer_session).get_by_submit_id(submit_id)
         self._submitted_counts = Counter(answer.activity_history_id for answer in existing_answers or [])
 
+    async def _load_flow(self, flow_history_id: str) -> FlowHistoryWithActivityFull | None:
+        flow_histories = await FlowsHistoryCRUD(self._session).load_full([flow_history_id], load_activities=False)
+        return flow_histories[0] if flow_histories else None
+
     @property
     def has_flow_history(self) -> bool:
         return self._has_flow_history
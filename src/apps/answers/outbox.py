@@ -0,0 +1,164 @@
+"""Outbox of answer side effects.
+
+An answer is written together with an `answer_submitted` event in the same
+transaction of the answers database. Alerts, pubsub notifications, alert
+mails, the report check and EHR ingestion are done by workers: a worker is
+woken up after the answer is committed, a scheduled sweep processes events
+which were not picked up (the kick failed, the worker died). The report
+and EHR steps of a failed event which succeeded are flagged on the event,
+the retry runs the failed steps only.
+
+Events are leased in batches with `FOR UPDATE SKIP LOCKED`, so concurrent
+workers do not process the same events. An event whose processing failed
+is retried after its lease expires, up to `max_attempts` times. Events which
+failed all attempts are reported and removed by the sweep with processed
+events after the retention period.
+"""
+
+import datetime
+import uuid
+from collections import defaultdict
+
+import sentry_sdk
+
+from apps.answers.crud.answer_events import AnswerEventsCRUD
+from apps.answers.db.schemas import AnswerEventSchema
+from apps.answers.domain import AnswerEventType, AnswerSideEffects
+from apps.answers.service import AnswerService
+from apps.workspaces.service.arbitrary_registry import arbitrary_registry
+from apps.workspaces.service.workspace import WorkspaceService
+from config import settings
+from infrastructure.database import atomic, session_manager
+from infrastructure.logger import logger
+
+__all__ = ["AnswerEventsProcessor", "notify_answer_events", "process_answer_events", "sweep_answer_events"]
+
+
+class AnswerEventsProcessor:
+    def __init__(self, session, answer_session):
+        self.session = session
+        self.answer_session = answer_session
+
+    async def process_pending(self) -> int:
+        """Processes pending events batch by batch, returns the number of processed events"""
+        config = settings.task_answer_events
+        processed = 0
+        while True:
+            async with atomic(self.answer_session):
+                events = await AnswerEventsCRUD(self.answer_session).claim(
+                    config.batch_size, config.lease, config.max_attempts
+                )
+            if not events:
+                return processed
+
+            failed = await self._process(events)
+            self._report_exhausted([event for event in events if event.id in failed], config.max_attempts)
+            done = [event.id for event in events if event.id not in failed]
+            if done:
+                async with atomic(self.answer_session):
+                    await AnswerEventsCRUD(self.answer_session).mark_processed(done)
+            processed += len(done)
+            # Failed events stay leased, they are retried after the lease expires
+            if len(events) < config.batch_size or not done:
+                return processed
+
+    @staticmethod
+    def _report_exhausted(failed: list[AnswerEventSchema], max_attempts: int) -> None:
+        exhausted = [str(event.id) for event in failed if event.attempts >= max_attempts]
+        if exhausted:
+            message = f"Answer events failed all {max_attempts} attempts and are not retried: {', '.join(exhausted)}"
+            logger.error(message)
+            sentry_sdk.capture_message(message)
+
+    async def _process(self, events: list[AnswerEventSchema]) -> set[uuid.UUID]:
+        """Runs side effects of the events grouped by respondent, returns ids of failed events"""
+        events_by_respondent: dict[uuid.UUID, list[AnswerEventSchema]] = defaultdict(list)
+        for event in events:
+            if event.type != AnswerEventType.ANSWER_SUBMITTED:
+                logger.warning(f"Unknown answer event type {event.type}, event {event.id} is skipped")
+                continue
+            events_by_respondent[event.respondent_id].append(event)
+
+        failed: set[uuid.UUID] = set()
+        for respondent_id, respondent_events in events_by_respondent.items():
+            service = AnswerService(self.session, respondent_id, self.answer_session)
+            side_effects = [
+                AnswerSideEffects.model_validate(
+                    dict(event.payload, report_done=event.report_done, ehr_done=event.ehr_done)
+                )
+                for event in respondent_events
+            ]
+            try:
+                failed_answer_ids = await service.process_answers_side_effects(side_effects)
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                failed.update(event.id for event in respondent_events)
+                continue
+            for event, effects in zip(respondent_events, side_effects):
+                if event.answer_id not in failed_answer_ids:
+                    continue
+                failed.add(event.id)
+                if (effects.report_done, effects.ehr_done) != (event.report_done, event.ehr_done):
+                    async with atomic(self.answer_session):
+                        await AnswerEventsCRUD(self.answer_session).mark_steps_done(
+                            event.id, effects.report_done, effects.ehr_done
+                        )
+        return failed
+
+
+async def process_answer_events(applet_id: uuid.UUID | None) -> int:
+    """Processes pending events of the answers database of the applet"""
+    session_maker = session_manager.get_session()
+    async with session_maker() as session:
+        info = await arbitrary_registry.get_by_applet_id(session, applet_id) if applet_id else None
+        if not info:
+            return await AnswerEventsProcessor(session, session).process_pending()
+        arb_session_maker = await arbitrary_registry.get_session_maker(info.database_uri)
+        async with arb_session_maker() as arb_session:
+            return await AnswerEventsProcessor(session, arb_session).process_pending()
+
+
+async def _delete_finished(answer_session, before: datetime.datetime) -> None:
+    async with atomic(answer_session):
+        exhausted = await AnswerEventsCRUD(answer_session).delete_finished(
+            before, settings.task_answer_events.max_attempts
+        )
+    if exhausted:
+        # Including events whose last attempt was lost with its worker
+        logger.warning(f"Removed {len(exhausted)} answer events which failed all attempts: {exhausted}")
+
+
+async def sweep_answer_events() -> None:
+    """Processes pending events of all answers databases, removes old processed and failed events"""
+    retention = datetime.timedelta(days=settings.task_answer_events.retention_days)
+    before = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) - retention
+
+    session_maker = session_manager.get_session()
+    async with session_maker() as session:
+        await AnswerEventsProcessor(session, session).process_pending()
+        await _delete_finished(session, before)
+
+        workspaces = await WorkspaceService(session, uuid.uuid4()).get_arbitrary_list()
+        for uri in {workspace.database_uri for workspace in workspaces if workspace.use_arbitrary}:
+            try:
+                arb_session_maker = await arbitrary_registry.get_session_maker(uri)
+                async with arb_session_maker() as arb_session:
+                    await AnswerEventsProcessor(session, arb_session).process_pending()
+                    await _delete_finished(arb_session, before)
+            except Exception as e:
+                # An unreachable arbitrary server must not block the others
+                sentry_sdk.capture_exception(e)
+
+
+async def notify_answer_events(applet_id: uuid.UUID) -> None:
+    """Wakes up a worker to process events of the committed answers.
+
+    The answer is already saved, a failed kick is not an error of the
+    request, the events are processed by the scheduled sweep then.
+    """
+    from apps.answers.tasks import process_answer_events as process_answer_events_task
+
+    try:
+        await process_answer_events_task.kiq(applet_id)
+    except Exception as e:
+        sentry_sdk.capture_exception(e)
@@ -16,6 +16,9 @@ from apps.answers.api import (
     applet_answer_assessment_delete,
     applet_answer_reviews_retrieve,
     applet_answers_export,
+    applet_answers_export_job_create,
+    applet_answers_export_job_retrieve,
+    applet_answers_export_stream,
     applet_completed_entities,
     applet_ehr_answers_export,
     applet_flow_answer_retrieve,
@@ -31,6 +34,7 @@ from apps.answers.api import (
     applets_completed_entities,
     create_anonymous_answer,
     create_answer,
+    create_answers_batch,
     review_activity_list,
     review_flow_list,
     submission_note_add,
@@ -44,7 +48,9 @@ from apps.answers.api import (
 )
 from apps.answers.domain import (
     ActivitySubmissionResponse,
+    AnswerBatchItemResult,
     AnswerExistenceResponse,
+    AnswerExportJobPublic,
     AnswerNoteDetailPublic,
     AnswerReviewPublic,
     AppletActivityAnswerPublic,
@@ -78,6 +84,17 @@ router.post(
     },
 )(create_answer)
 
+# Answers uploaded at once, e.g. an offline queue of a mobile client
+router.post(
+    "/applet/{applet_id}/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=ResponseMulti[AnswerBatchItemResult],
+    responses={
+        **DEFAULT_OPENAPI_RESPONSE,
+        **AUTHENTICATION_ERROR_RESPONSES,
+    },
+)(create_answers_batch)
+
 # Anonymous Answers for activity item create
 public_router.post(
     "",
@@ -400,6 +417,39 @@ router.get(
     },
 )(applet_answers_export)
 
+router.get(
+    "/applet/{applet_id}/data/stream",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Stream of exported answers, every row has a cursor to resume the export after it",
+        },
+        **DEFAULT_OPENAPI_RESPONSE,
+        **AUTHENTICATION_ERROR_RESPONSES,
+    },
+)(applet_answers_export_stream)
+
+router.post(
+    "/applet/{applet_id}/data/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_202_ACCEPTED: {"model": Response[AnswerExportJobPublic]},
+        **DEFAULT_OPENAPI_RESPONSE,
+        **AUTHENTICATION_ERROR_RESPONSES,
+    },
+)(applet_answers_export_job_create)
+
+router.get(
+    "/applet/{applet_id}/data/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": Response[AnswerExportJobPublic]},
+        **DEFAULT_OPENAPI_RESPONSE,
+        **AUTHENTICATION_ERROR_RESPONSES,
+    },
+)(applet_answers_export_job_retrieve)
+
 
 router.get(
     "/applet/{applet_id}/ehr-data",
@@ -6,10 +6,10 @@ import os
 import time
 import uuid
 from collections import defaultdict
+from contextlib import suppress
 from itertools import chain, groupby
-from json import JSONDecodeError
 from operator import attrgetter
-from typing import Callable, List, Mapping
+from typing import AsyncIterator, Callable, List, Mapping, NamedTuple
 
 import aiohttp
 import sentry_sdk
@@ -20,28 +20,32 @@ from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.activities.crud import ActivitiesCRUD, ActivityHistoriesCRUD, ActivityItemHistoriesCRUD
-from apps.activities.db.schemas import ActivityItemHistorySchema
-from apps.activities.domain.activity_history import ActivityHistoryFull
+from apps.activities.domain.activity_full import ActivityItemHistoryFull
+from apps.activities.domain.activity_history import ActivityHistory, ActivityHistoryFull
 from apps.activities.errors import ActivityDoeNotExist, ActivityHistoryDoeNotExist, FlowDoesNotExist
-from apps.activity_assignments.domain.assignments import ActivityAssignmentCreate
-from apps.activity_assignments.service import ActivityAssignmentService
 from apps.activity_flows.crud import FlowsCRUD, FlowsHistoryCRUD
 from apps.alerts.crud.alert import AlertCRUD
 from apps.alerts.db.schemas import AlertSchema
-from apps.alerts.domain import AlertMessage, AlertTypes
+from apps.alerts.domain import AlertTypes
+from apps.alerts.service import AlertService
+from apps.answers.cache import AnswersCountCache
 from apps.answers.crud import AnswerItemsCRUD
+from apps.answers.crud.answer_events import AnswerEventsCRUD
 from apps.answers.crud.answers import AnswersCRUD, AnswersEHRCRUD
 from apps.answers.crud.notes import AnswerNotesCRUD
-from apps.answers.db.schemas import AnswerItemSchema, AnswerNoteSchema, AnswerSchema
+from apps.answers.db.schemas import AnswerEventSchema, AnswerItemSchema, AnswerNoteSchema, AnswerSchema
 from apps.answers.domain import (
     ActivityAnswer,
     ActivitySubmission,
-    AnswerAlert,
+    AnswerBatchItemResult,
     AnswerDate,
+    AnswerEventType,
     AnswerExport,
+    AnswerExportTotal,
     AnswerItemDataEncrypted,
     AnswerNoteDetail,
     AnswerReview,
+    AnswerSideEffects,
     AppletActivityAnswer,
     AppletAnswerCreate,
     AppletCompletedEntities,
@@ -64,6 +68,7 @@ from apps.answers.domain import (
 from apps.answers.domain.answers import (
     Answer,
     AnswerEHRFull,
+    AnswerExportCursor,
     AnswersCopyCheckResult,
     AppletSubmission,
     FilesCopyCheckResult,
@@ -71,6 +76,7 @@ from apps.answers.domain.answers import (
     SubmissionsActivityMetadataBySubject,
     SubmissionsSubjectCounters,
 )
+from apps.answers.encryption import ReencryptionKeys, crypto_executor, reencrypt_answer_items
 from apps.answers.errors import (
     ActivityIsNotAssessment,
     AnswerAccessDeniedError,
@@ -90,10 +96,13 @@ from apps.answers.errors import (
 )
 from apps.answers.filters import AppletSubmitDateFilter, ReviewAppletItemFilter, SummaryActivityFilter
 from apps.answers.flow_submission_progress import FlowSubmissionProgress
+from apps.answers.submission_context import SubmissionContext
 from apps.answers.tasks import create_report
 from apps.applets.crud import AppletsCRUD
 from apps.applets.domain.applet_history import Version
 from apps.applets.domain.base import Encryption
+from apps.applets.errors import InvalidVersionError, NotValidAppletHistory
+from apps.applets.history_cache import activity_history_cache, activity_items_history_cache
 from apps.applets.service import AppletHistoryService
 from apps.file.enums import FileScopeEnum
 from apps.integrations.oneup_health.service.domain import EHRData
@@ -101,9 +110,11 @@ from apps.integrations.oneup_health.service.ehr_storage import EHRStorage
 from apps.integrations.oneup_health.service.task import task_ingest_user_data
 from apps.mailing.domain import MessageSchema
 from apps.mailing.services import MailingService
+from apps.schedule.crud.schedule_history import ScheduleHistoryCRUD
+from apps.schedule.crud.user_device_events_history import UserDeviceEventsHistoryCRUD
 from apps.shared.domain import parse_obj_as
-from apps.shared.encryption import decrypt_cbc, encrypt_cbc
-from apps.shared.exception import EncryptionError, ValidationError
+from apps.shared.exception import BaseError, ValidationError
+from apps.shared.paging import page_limit
 from apps.shared.query_params import QueryParams
 from apps.shared.subjects import is_take_now_relation, is_valid_take_now_relation
 from apps.subjects.constants import Relation
@@ -116,13 +127,32 @@ from apps.workspaces.crud.applet_access import AppletAccessCRUD
 from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
 from apps.workspaces.domain.constants import Role
 from apps.workspaces.domain.workspace import WorkspaceRespondent
+from apps.workspaces.errors import AnswerCreateAccessDenied
 from apps.workspaces.service.user_applet_access import UserAppletAccessService
-from infrastructure.database import atomic
+from config import settings
+from infrastructure.cache import CacheNotFound
+from infrastructure.database import ReadFanOut, atomic
 from infrastructure.database.mixins import HistoryAware
 from infrastructure.logger import logger
 from infrastructure.storage.storage_client import StorageClient
 from infrastructure.utility.redis_client import RedisCache
 
+# Set while the alert mail window of the user is open
+ALERT_MAIL_KEY = "alert_mail:{user_id}"
+# Number of the alerts of the window, sent in the digest mail
+ALERT_MAIL_DIGEST_KEY = "alert_mail_digest:{user_id}"
+# Users with alerts counted for the digest mail
+ALERT_MAIL_DIGEST_USERS_KEY = "alert_mail_digest_users"
+ALERT_MAIL_DIGEST_TTL = 24 * 60 * 60  # sec
+
+
+class _PreparedAnswer(NamedTuple):
+    answer: AnswerSchema
+    item: AnswerItemSchema
+    respondent_subject: SubjectSchema
+    target_subject: SubjectSchema
+    source_subject: SubjectSchema
+
 
 class AnswerService:
     def __init__(self, session, user_id: uuid.UUID | None = None, arbitrary_session=None):
@@ -141,66 +171,91 @@ class AnswerService:
 
         return key_generator
 
-    async def create_answer(self, activity_answer: AppletAnswerCreate, device_id: str | None = None) -> AnswerSchema:
+    async def get_submission_context(self, applet_answer: AppletAnswerCreate) -> SubmissionContext:
+        assert self.user_id
+        return await SubmissionContext.load(self.session, self.answer_session, self.user_id, applet_answer)
+
+    async def create_answer(
+        self,
+        activity_answer: AppletAnswerCreate,
+        device_id: str | None = None,
+        context: SubmissionContext | None = None,
+    ) -> AnswerSchema:
+        if context is None:
+            context = await self.get_submission_context(activity_answer)
         # Check for prolific parameters in the answer helping to identify whether the respondent comes from prolific
         is_prolific_respondent = activity_answer.prolific_params is not None
         if self.user_id and not is_prolific_respondent:
-            return await self._create_respondent_answer(activity_answer, device_id)
+            return await self._create_respondent_answer(activity_answer, device_id, context)
         else:
-            return await self._create_anonymous_answer(activity_answer, device_id)
+            return await self._create_anonymous_answer(activity_answer, device_id, context)
 
     async def _create_respondent_answer(
-        self, activity_answer: AppletAnswerCreate, device_id: str | None
+        self, activity_answer: AppletAnswerCreate, device_id: str | None, context: SubmissionContext
     ) -> AnswerSchema:
-        flow_progress = await self._validate_respondent_answer(activity_answer)
-        return await self._create_answer(activity_answer, device_id, flow_progress)
+        flow_progress = await self._validate_respondent_answer(activity_answer, context)
+        return await self._create_answer(
+            activity_answer, device_id, flow_progress, context, bool(activity_answer.allowed_ehr_ingest)
+        )
 
     async def _create_anonymous_answer(
-        self, activity_answer: AppletAnswerCreate, device_id: str | None
+        self, activity_answer: AppletAnswerCreate, device_id: str | None, context: SubmissionContext
     ) -> AnswerSchema:
-        flow_progress = await self._validate_anonymous_answer(activity_answer)
-        return await self._create_answer(activity_answer, device_id, flow_progress)
+        flow_progress = await self._validate_anonymous_answer(activity_answer, context)
+        return await self._create_answer(activity_answer, device_id, flow_progress, context, allowed_ehr_ingest=False)
 
-    async def _validate_respondent_answer(self, activity_answer: AppletAnswerCreate) -> FlowSubmissionProgress | None:
-        flow_progress = await self._validate_answer(activity_answer)
-        await self._validate_applet_for_user_response(activity_answer.applet_id)
+    async def _validate_respondent_answer(
+        self, activity_answer: AppletAnswerCreate, context: SubmissionContext
+    ) -> FlowSubmissionProgress | None:
+        flow_progress = await self._validate_answer(activity_answer, context)
+        self._validate_applet_for_user_response(context)
 
         return flow_progress
 
-    async def _validate_anonymous_answer(self, activity_answer: AppletAnswerCreate) -> FlowSubmissionProgress | None:
-        await self._validate_applet_for_anonymous_response(activity_answer.applet_id, activity_answer.version)
-        return await self._validate_answer(activity_answer)
+    async def _validate_anonymous_answer(
+        self, activity_answer: AppletAnswerCreate, context: SubmissionContext
+    ) -> FlowSubmissionProgress | None:
+        self._validate_applet_for_anonymous_response(context)
+        return await self._validate_answer(activity_answer, context)
 
-    async def _validate_answer(self, applet_answer: AppletAnswerCreate) -> FlowSubmissionProgress | None:  # noqa: C901
+    async def _load_flow_progress(
+        self,
+        flow_history_id: str,
+        activity_history_id: str,
+        applet_answer: AppletAnswerCreate,
+        context: SubmissionContext,
+    ) -> FlowSubmissionProgress:
+        flow_progress = FlowSubmissionProgress(self.session, self.answer_session)
+        await flow_progress.load(flow_history_id, applet_answer.submit_id, context.existing_answers)
+        if not flow_progress.has_flow_history:
+            raise ValidationError("Flow not found")
+        if not flow_progress.contains_activity(activity_history_id):
+            raise ValidationError("Activity not found in the flow")
+        return flow_progress
+
+    async def _validate_answer(  # noqa: C901
+        self, applet_answer: AppletAnswerCreate, context: SubmissionContext
+    ) -> FlowSubmissionProgress | None:
         pk = self._generate_history_id(applet_answer.version)
 
         # Timestamp-based duplicate detection: when created_at provided, check for exact duplicate
         # Each unique timestamp represents a distinct submission, bypassing occurrence limits
         if applet_answer.created_at is not None:
             created_at_ms = int(applet_answer.created_at.replace(tzinfo=datetime.timezone.utc).timestamp() * 1000)
-            existing_with_timestamp = await AnswersCRUD(self.answer_session).get_by_applet_activity_submit_or_user_id(
-                applet_answer.applet_id,
-                str(applet_answer.activity_id),
-                None,
-                applet_answer.submit_id,
-                created_at_ms,
+            created_at = datetime.datetime.fromtimestamp(created_at_ms / 1000.0, tz=datetime.timezone.utc).replace(
+                tzinfo=None
             )
-            if existing_with_timestamp:
+            if context.has_answer_created_at(applet_answer.applet_id, applet_answer.activity_id, created_at):
                 raise ValidationError("Duplicate answer with same timestamp already exists")
 
-        existed_answers = await AnswersCRUD(self.answer_session).get_by_submit_id(applet_answer.submit_id)
+        existed_answers = context.existing_answers
 
         activity_history_id = pk(applet_answer.activity_id)
         flow_history_id = pk(applet_answer.flow_id) if applet_answer.flow_id else None
         flow_progress: FlowSubmissionProgress | None = None
         # Only use occurrence-based flow validation when created_at is NOT provided
         if flow_history_id and applet_answer.created_at is None:
-            flow_progress = FlowSubmissionProgress(self.session, self.answer_session)
-            await flow_progress.load(flow_history_id, applet_answer.submit_id)
-            if not flow_progress.has_flow_history:
-                raise ValidationError("Flow not found")
-            if not flow_progress.contains_activity(activity_history_id):
-                raise ValidationError("Activity not found in the flow")
+            flow_progress = await self._load_flow_progress(flow_history_id, activity_history_id, applet_answer, context)
 
         if existed_answers:
             # check uniqueness for activities (duplicated for flow submission only)
@@ -228,12 +283,9 @@ class AnswerService:
                     )
 
                     # Re-validate flow progress with the corrected version's history IDs
-                    flow_progress = FlowSubmissionProgress(self.session, self.answer_session)
-                    await flow_progress.load(flow_history_id, applet_answer.submit_id)
-                    if not flow_progress.has_flow_history:
-                        raise ValidationError("Flow not found")
-                    if not flow_progress.contains_activity(activity_history_id):
-                        raise ValidationError("Activity not found in the flow")
+                    flow_progress = await self._load_flow_progress(
+                        flow_history_id, activity_history_id, applet_answer, context
+                    )
                 else:
                     raise WrongAnswerGroupVersion()
             elif existed_answer.respondent_id != self.user_id:
@@ -257,42 +309,41 @@ class AnswerService:
                     applet_answer.submit_id,
                 )
 
-        activity_history = await ActivityHistoriesCRUD(self.session).get_by_id(activity_history_id)
+        activity_history = await self._get_activity_history(activity_history_id)
 
         if not activity_history.applet_id.startswith(f"{applet_answer.applet_id}"):
             raise ActivityHistoryDoeNotExist()
 
         return flow_progress
 
-    async def _validate_applet_for_anonymous_response(self, applet_id: uuid.UUID, version: str) -> None:
-        await AppletHistoryService(self.session, applet_id, version).get()
+    @staticmethod
+    def _validate_applet_for_anonymous_response(context: SubmissionContext) -> None:
+        if not context.applet or not context.applet.version_exists:
+            raise NotValidAppletHistory()
         # Validate applet for anonymous answer
-        schema = await AppletsCRUD(self.session).get_by_id(applet_id)
-        if not schema.link:
+        if not context.applet.is_public:
             raise NonPublicAppletError()
 
-    async def _validate_applet_for_user_response(self, applet_id: uuid.UUID) -> None:
-        assert self.user_id
-
-        roles = await UserAppletAccessService(self.session, self.user_id, applet_id).get_roles()
-        if not roles:
+    @staticmethod
+    def _validate_applet_for_user_response(context: SubmissionContext) -> None:
+        if not context.roles:
             raise UserDoesNotHavePermissionError()
 
-    async def _validate_temp_take_now_relation_between_subjects(
-        self, respondent_subject_id: uuid.UUID, source_subject_id: uuid.UUID, target_subject_id: uuid.UUID
+    @staticmethod
+    def _validate_temp_take_now_relation_between_subjects(
+        context: SubmissionContext,
+        respondent_subject_id: uuid.UUID,
+        source_subject_id: uuid.UUID,
+        target_subject_id: uuid.UUID,
     ) -> None:
-        relation_respondent_source = await SubjectsCrud(self.session).get_relation(
-            respondent_subject_id, source_subject_id
-        )
+        relation_respondent_source = context.get_relation(respondent_subject_id, source_subject_id)
 
         if is_take_now_relation(relation_respondent_source) and not is_valid_take_now_relation(
             relation_respondent_source
         ):
             raise ValidationError("Invalid temp take now relation between subjects")
 
-        relation_respondent_target = await SubjectsCrud(self.session).get_relation(
-            respondent_subject_id, target_subject_id
-        )
+        relation_respondent_target = context.get_relation(respondent_subject_id, target_subject_id)
 
         if is_take_now_relation(relation_respondent_target) and not is_valid_take_now_relation(
             relation_respondent_target
@@ -300,14 +351,14 @@ class AnswerService:
             raise ValidationError("Invalid temp take now relation between subjects")
 
     async def _delete_temp_take_now_relation_if_exists(
-        self, respondent_subject: SubjectSchema, target_subject: SubjectSchema, source_subject: SubjectSchema
+        self,
+        context: SubmissionContext,
+        respondent_subject: SubjectSchema,
+        target_subject: SubjectSchema,
+        source_subject: SubjectSchema,
     ):
-        relation_respondent_target = await SubjectsCrud(self.session).get_relation(
-            source_subject_id=respondent_subject.id, target_subject_id=target_subject.id
-        )
-        relation_respondent_source = await SubjectsCrud(self.session).get_relation(
-            source_subject_id=respondent_subject.id, target_subject_id=source_subject.id
-        )
+        relation_respondent_target = context.get_relation(respondent_subject.id, target_subject.id)
+        relation_respondent_source = context.get_relation(respondent_subject.id, source_subject.id)
 
         if relation_respondent_target and (
             is_take_now_relation(relation_respondent_target) and is_valid_take_now_relation(relation_respondent_target)
@@ -319,8 +370,9 @@ class AnswerService:
         ):
             await SubjectsCrud(self.session).delete_relation(source_subject.id, respondent_subject.id)
 
-    async def _get_answer_relation(
-        self,
+    @staticmethod
+    def _get_answer_relation(
+        context: SubmissionContext,
         respondent_subject: SubjectSchema,
         source_subject: SubjectSchema,
         target_subject: SubjectSchema,
@@ -328,15 +380,11 @@ class AnswerService:
         if respondent_subject.id == target_subject.id:
             return None
 
-        is_admin = await AppletAccessCRUD(self.session).has_any_roles_for_applet(
-            respondent_subject.applet_id,
-            respondent_subject.user_id,
-            Role.managers(),
-        )
+        is_admin = any(role in Role.managers() for role in context.roles)
         if source_subject.id == target_subject.id:
             return Relation.self
 
-        relation = await SubjectsCrud(self.session).get_relation(source_subject.id, target_subject.id)
+        relation = context.get_relation(source_subject.id, target_subject.id)
         if not relation:
             if is_admin:
                 return Relation.admin
@@ -348,16 +396,27 @@ class AnswerService:
 
         return relation.relation
 
-    async def _create_answer(
+    @staticmethod
+    def _get_answer_subject(
+        context: SubmissionContext, applet_id: uuid.UUID, subject_id: uuid.UUID | None
+    ) -> SubjectSchema:
+        subject = context.subject(subject_id)
+        if subject_id and (not subject or not subject.soft_exists() or subject.applet_id != applet_id):
+            raise ValidationError(f"Subject {subject_id} not found")
+        assert subject
+        return subject
+
+    def _prepare_answer(
         self,
         applet_answer: AppletAnswerCreate,
         device_id: str | None,
         flow_progress: FlowSubmissionProgress | None,
-    ) -> AnswerSchema:
+        context: SubmissionContext,
+    ) -> _PreparedAnswer:
+        """Builds answer rows of a validated submission without writing them"""
         assert self.user_id
         pk = self._generate_history_id(applet_answer.version)
         created_at = applet_answer.created_at or datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
-        subject_crud = SubjectsCrud(self.session)
 
         activity_history_id = pk(applet_answer.activity_id)
         flow_history_id = pk(applet_answer.flow_id) if applet_answer.flow_id else None
@@ -383,82 +442,43 @@ class AnswerService:
         if client_flow_completed_flag is not None:
             migrated_data = {"client_flow_completed_flag": client_flow_completed_flag}
 
-        respondent_subject = await subject_crud.get_user_subject(
-            user_id=self.user_id, applet_id=applet_answer.applet_id
-        )
+        respondent_subject = context.respondent_subject
         if not respondent_subject or not respondent_subject.soft_exists():
             raise ValidationError("Respondent subject not found")
 
-        if applet_answer.input_subject_id:
-            input_subject = await subject_crud.get_by_id(applet_answer.input_subject_id)
-            if (
-                not input_subject
-                or not input_subject.soft_exists()
-                or input_subject.applet_id != applet_answer.applet_id
-            ):
-                raise ValidationError(f"Subject {applet_answer.input_subject_id} not found")
-        else:
-            input_subject = respondent_subject
-
-        if applet_answer.target_subject_id:
-            target_subject = await subject_crud.get_by_id(applet_answer.target_subject_id)
-            if (
-                not target_subject
-                or not target_subject.soft_exists()
-                or target_subject.applet_id != applet_answer.applet_id
-            ):
-                raise ValidationError(f"Subject {applet_answer.target_subject_id} not found")
-        else:
-            target_subject = respondent_subject
+        input_subject = self._get_answer_subject(context, applet_answer.applet_id, applet_answer.input_subject_id)
+        target_subject = self._get_answer_subject(context, applet_answer.applet_id, applet_answer.target_subject_id)
+        source_subject = self._get_answer_subject(context, applet_answer.applet_id, applet_answer.source_subject_id)
 
-        if applet_answer.source_subject_id:
-            source_subject = await subject_crud.get_by_id(applet_answer.source_subject_id)
-            if (
-                not source_subject
-                or not source_subject.soft_exists()
-                or source_subject.applet_id != applet_answer.applet_id
-            ):
-                raise ValidationError(f"Subject {applet_answer.source_subject_id} not found")
-        else:
-            source_subject = respondent_subject
-
-        # Check if source subject is manually assigned to target subject.
-        assignment = ActivityAssignmentCreate(
-            activity_id=applet_answer.activity_id if applet_answer.flow_id is None else None,
-            activity_flow_id=applet_answer.flow_id,
-            respondent_subject_id=source_subject.id,
-            target_subject_id=target_subject.id,
-        )
-        assignment_exists = await ActivityAssignmentService(self.session).exist(assignment)
-        # If no assignment exists, ensure valid temp take now relation between the subjects.
-        if not assignment_exists:
-            await self._validate_temp_take_now_relation_between_subjects(
-                respondent_subject.id, source_subject.id, target_subject.id
+        # If source subject is not manually assigned to target subject,
+        # ensure valid temp take now relation between the subjects.
+        if not context.assignment_exists:
+            self._validate_temp_take_now_relation_between_subjects(
+                context, respondent_subject.id, source_subject.id, target_subject.id
             )
 
-        relation = await self._get_answer_relation(respondent_subject, source_subject, target_subject)
-
-        answer = await AnswersCRUD(self.answer_session).create(
-            AnswerSchema(
-                submit_id=applet_answer.submit_id,
-                created_at=created_at,
-                applet_id=applet_answer.applet_id,
-                version=applet_answer.version,
-                applet_history_id=pk(applet_answer.applet_id),
-                flow_history_id=flow_history_id,
-                activity_history_id=activity_history_id,
-                respondent_id=self.user_id,
-                client=applet_answer.client.model_dump(),
-                is_flow_completed=is_flow_completed_backend,
-                target_subject_id=target_subject.id,
-                source_subject_id=source_subject.id,
-                input_subject_id=input_subject.id,
-                relation=relation,
-                consent_to_share=applet_answer.consent_to_share,
-                event_history_id=applet_answer.event_history_id,
-                device_id=device_id,
-                migrated_data=migrated_data,
-            )
+        relation = self._get_answer_relation(context, respondent_subject, source_subject, target_subject)
+
+        answer = AnswerSchema(
+            id=uuid.uuid4(),
+            submit_id=applet_answer.submit_id,
+            created_at=created_at,
+            applet_id=applet_answer.applet_id,
+            version=applet_answer.version,
+            applet_history_id=pk(applet_answer.applet_id),
+            flow_history_id=flow_history_id,
+            activity_history_id=activity_history_id,
+            respondent_id=self.user_id,
+            client=applet_answer.client.model_dump(),
+            is_flow_completed=is_flow_completed_backend,
+            target_subject_id=target_subject.id,
+            source_subject_id=source_subject.id,
+            input_subject_id=input_subject.id,
+            relation=relation,
+            consent_to_share=applet_answer.consent_to_share,
+            event_history_id=applet_answer.event_history_id,
+            device_id=device_id,
+            migrated_data=migrated_data,
         )
         item_answer = applet_answer.answer
 
@@ -479,21 +499,206 @@ class AnswerService:
             local_end_time=item_answer.local_end_time,
             tz_offset=item_answer.tz_offset,
         )
+        return _PreparedAnswer(answer, item_answer, respondent_subject, target_subject, source_subject)
+
+    def _answer_submitted_event(
+        self, applet_answer: AppletAnswerCreate, prepared: _PreparedAnswer, allowed_ehr_ingest: bool
+    ) -> AnswerEventSchema:
+        assert self.user_id
+        side_effects = AnswerSideEffects(
+            answer_id=prepared.answer.id,
+            applet_id=applet_answer.applet_id,
+            submit_id=applet_answer.submit_id,
+            activity_id=applet_answer.activity_id,
+            target_subject_id=prepared.target_subject.id,
+            version=applet_answer.version,
+            alerts=applet_answer.alerts,
+            allowed_ehr_ingest=allowed_ehr_ingest,
+        )
+        return AnswerEventSchema(
+            type=AnswerEventType.ANSWER_SUBMITTED,
+            applet_id=applet_answer.applet_id,
+            answer_id=prepared.answer.id,
+            respondent_id=self.user_id,
+            payload=side_effects.model_dump(mode="json", exclude={"report_done", "ehr_done"}),
+        )
+
+    async def _create_answer(
+        self,
+        applet_answer: AppletAnswerCreate,
+        device_id: str | None,
+        flow_progress: FlowSubmissionProgress | None,
+        context: SubmissionContext,
+        allowed_ehr_ingest: bool,
+    ) -> AnswerSchema:
+        prepared = self._prepare_answer(applet_answer, device_id, flow_progress, context)
 
-        await AnswerItemsCRUD(self.answer_session).create(item_answer)
-        await self._create_alerts(
-            target_subject.id,
-            answer.id,
-            answer.applet_id,
-            applet_answer.activity_id,
-            answer.version,
-            applet_answer.alerts,
+        answer = await AnswersCRUD(self.answer_session).create(prepared.answer)
+        await AnswerItemsCRUD(self.answer_session).create(prepared.item)
+        # Alerts, report and EHR ingestion are run by a worker, see `apps.answers.outbox`
+        await AnswerEventsCRUD(self.answer_session).create(
+            self._answer_submitted_event(applet_answer, prepared, allowed_ehr_ingest)
         )
 
-        await self._delete_temp_take_now_relation_if_exists(respondent_subject, target_subject, source_subject)
+        await self._delete_temp_take_now_relation_if_exists(
+            context, prepared.respondent_subject, prepared.target_subject, prepared.source_subject
+        )
 
         return answer
 
+    async def create_answers_batch(
+        self, applet_answers: list[AppletAnswerCreate], device_id: str | None = None
+    ) -> list[AnswerBatchItemResult]:
+        """Creates answers uploaded at once, e.g. by a client syncing its offline queue.
+
+        Answers are validated in order against contexts loaded for the whole
+        batch, an invalid answer gets an error in its result and does not
+        stop the others. Valid answers and their outbox events are inserted
+        with multi-row inserts.
+        """
+        assert self.user_id
+        contexts = await SubmissionContext.load_many(self.session, self.answer_session, self.user_id, applet_answers)
+        device_ids = await self._get_batch_device_ids(applet_answers, device_id)
+
+        results: list[AnswerBatchItemResult] = []
+        prepared_answers: list[tuple[_PreparedAnswer, SubmissionContext]] = []
+        events: list[AnswerEventSchema] = []
+        for applet_answer, context, answer_device_id in zip(applet_answers, contexts, device_ids):
+            result = AnswerBatchItemResult(submit_id=applet_answer.submit_id, activity_id=applet_answer.activity_id)
+            results.append(result)
+            try:
+                if Role.RESPONDENT not in context.roles:
+                    raise AnswerCreateAccessDenied()
+                if not context.applet or not context.applet.version_exists:
+                    raise InvalidVersionError()
+                flow_progress = await self._validate_respondent_answer(applet_answer, context)
+                prepared = self._prepare_answer(applet_answer, answer_device_id, flow_progress, context)
+            except BaseError as e:
+                result.error = e.error
+                continue
+
+            # Answers of the same submission share the list, following answers are validated against this one
+            context.existing_answers.append(prepared.answer)
+            prepared_answers.append((prepared, context))
+            result.answer_id = prepared.answer.id
+            events.append(self._answer_submitted_event(applet_answer, prepared, bool(applet_answer.allowed_ehr_ingest)))
+
+        if not prepared_answers:
+            return results
+
+        await AnswersCRUD(self.answer_session).create_many([prepared.answer for prepared, _ in prepared_answers])
+        await AnswerItemsCRUD(self.answer_session).create_many([prepared.item for prepared, _ in prepared_answers])
+        await AnswerEventsCRUD(self.answer_session).create_many(events)
+
+        deleted_relations: set[tuple[uuid.UUID, uuid.UUID, uuid.UUID]] = set()
+        for prepared, context in prepared_answers:
+            key = (prepared.respondent_subject.id, prepared.target_subject.id, prepared.source_subject.id)
+            if key not in deleted_relations:
+                deleted_relations.add(key)
+                await self._delete_temp_take_now_relation_if_exists(
+                    context, prepared.respondent_subject, prepared.target_subject, prepared.source_subject
+                )
+
+        return results
+
+    async def _get_batch_device_ids(
+        self, applet_answers: list[AppletAnswerCreate], device_id: str | None
+    ) -> list[str | None]:
+        """Drops invalid event histories of the answers and returns the device ids to store.
+
+        Batched version of the event history and device checks of a single answer upload.
+        """
+        assert self.user_id
+        event_history_ids = {answer.event_history_id for answer in applet_answers if answer.event_history_id}
+        if not event_history_ids:
+            return [None] * len(applet_answers)
+
+        events = await ScheduleHistoryCRUD(self.session).get_by_ids(list(event_history_ids))
+        events_map = {event.id_version: event for event in events}
+        for applet_answer in applet_answers:
+            if not applet_answer.event_history_id:
+                continue
+            event = events_map.get(applet_answer.event_history_id)
+            if (
+                event is None
+                or (event.activity_flow_id != applet_answer.flow_id and event.activity_id != applet_answer.activity_id)
+                or (event.user_id is not None and event.user_id != self.user_id)
+            ):
+                logger.info(f"Invalid event_history_id {applet_answer.event_history_id} provided")
+                applet_answer.event_history_id = None
+
+        if not device_id:
+            return [None] * len(applet_answers)
+
+        event_versions = {
+            (uuid.UUID(answer.event_history_id.split("_")[0]), answer.event_history_id.split("_")[1])
+            for answer in applet_answers
+            if answer.event_history_id
+        }
+        recorded = set()
+        if event_versions:
+            recorded = await UserDeviceEventsHistoryCRUD(self.session).get_recorded_event_versions(
+                device_id, self.user_id, list(event_versions)
+            )
+        device_ids: list[str | None] = []
+        for applet_answer in applet_answers:
+            if not applet_answer.event_history_id:
+                device_ids.append(None)
+                continue
+            event_id, event_version = applet_answer.event_history_id.split("_")[:2]
+            if (uuid.UUID(event_id), event_version) in recorded:
+                device_ids.append(device_id)
+            else:
+                logger.info(f"Invalid device_id {device_id} provided")
+                device_ids.append(None)
+        return device_ids
+
+    async def process_answers_side_effects(self, side_effects: list[AnswerSideEffects]) -> set[uuid.UUID]:
+        """Creates alerts, reports and EHR ingestion of the respondent answers.
+
+        Alerts of all the answers are created at once, an error fails the whole
+        call. Report and EHR ingestion errors are reported per answer, ids of
+        the failed answers are returned. Each of the steps is flagged as done
+        on the side effects once it succeeds, flagged steps are skipped, so a
+        retry does not queue the report or the ingestion again.
+        """
+        assert self.user_id
+        async with atomic(self.session):
+            alert_messages, alert_recipients = await self._create_alerts(side_effects)
+        # Alerts are published and mailed once they are committed, a failure does not retry them
+        try:
+            if alert_messages:
+                await RedisCache().publish_many(alert_messages)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+        try:
+            await self.send_alert_mail(alert_recipients)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+
+        answer_ids = [effects.answer_id for effects in side_effects]
+        answers = {answer.id: answer for answer in await AnswersCRUD(self.answer_session).get_by_ids(answer_ids)}
+        failed: set[uuid.UUID] = set()
+        for effects in side_effects:
+            try:
+                if not effects.report_done:
+                    if answer := answers.get(effects.answer_id):
+                        await self.create_report_from_answer(answer)
+                    effects.report_done = True
+                if effects.allowed_ehr_ingest and not effects.ehr_done:
+                    await self.trigger_ehr_ingestion(
+                        user_id=self.user_id,
+                        target_subject_id=effects.target_subject_id,
+                        applet_id=effects.applet_id,
+                        submit_id=effects.submit_id,
+                        activity_id=effects.activity_id,
+                    )
+                effects.ehr_done = True
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+                failed.add(effects.answer_id)
+        return failed
+
     async def validate_multiinformant_assessment(
         self,
         applet_id: uuid.UUID,
@@ -521,13 +726,14 @@ class AnswerService:
                 raise MultiinformantAssessmentInvalidSourceSubject()
 
         if activity_or_flow_id:
-            activity_future = ActivitiesCRUD(self.session).get_by_applet_id_and_activity_id(
+            activity = await ActivitiesCRUD(self.session).get_by_applet_id_and_activity_id(
                 applet_id=applet_id, activity_id=activity_or_flow_id
             )
-            flow_future = FlowsCRUD(self.session).get_by_applet_id_and_flow_id(
-                applet_id=applet_id, flow_id=activity_or_flow_id
-            )
-            activity, flow = await asyncio.gather(activity_future, flow_future)
+            flow = None
+            if not activity:
+                flow = await FlowsCRUD(self.session).get_by_applet_id_and_flow_id(
+                    applet_id=applet_id, flow_id=activity_or_flow_id
+                )
             if not activity and not flow:
                 raise MultiinformantAssessmentInvalidActivityOrFlow()
 
@@ -570,11 +776,10 @@ class AnswerService:
     ) -> list[ReviewActivity]:
         await self._validate_applet_activity_access(applet_id, filters.target_subject_id)
 
-        answers_coro = AnswersCRUD(self.answer_session).get_list(
+        answers = await AnswersCRUD(self.answer_session).get_list(
             applet_id=applet_id, target_subject_ids=[filters.target_subject_id], created_date=filters.created_date
         )
-        activities_coro = ActivitiesCRUD(self.session).get_by_applet_id(applet_id, is_reviewable=False)
-        answers, activities = await asyncio.gather(answers_coro, activities_coro)
+        activities = await ActivitiesCRUD(self.session).get_by_applet_id(applet_id, is_reviewable=False)
 
         activity_map: dict[uuid.UUID, ReviewActivity] = dict()
         for activity in activities:
@@ -625,11 +830,10 @@ class AnswerService:
     ) -> list[ReviewFlow]:
         await self._validate_applet_activity_access(applet_id, target_subject_id)
 
-        submissions_coro = AnswersCRUD(self.answer_session).get_flow_submission_data(
+        submissions = await AnswersCRUD(self.answer_session).get_flow_submission_data(
             applet_id=applet_id, target_subject_ids=[target_subject_id], created_date=created_date
         )
-        flows_coro = FlowsCRUD(self.session).get_by_applet_id(applet_id)
-        submissions, flows = await asyncio.gather(submissions_coro, flows_coro)
+        flows = await FlowsCRUD(self.session).get_by_applet_id(applet_id)
 
         flow_map: dict[uuid.UUID, ReviewFlow] = dict()
         for flow in flows:
@@ -824,7 +1028,7 @@ class AnswerService:
         await self._validate_applet_activity_access(applet_id, answer_schema.target_subject_id)
         if activity_id:
             pk = self._generate_history_id(answer_schema.version)
-            await ActivityHistoriesCRUD(self.session).get_by_id(pk(activity_id))
+            await self._get_activity_history(pk(activity_id))
 
     async def _validate_submission_access(self, applet_id: uuid.UUID, submission_id: uuid.UUID):
         answer_schema = await AnswersCRUD(self.answer_session).get_last_answer_in_flow(submission_id)
@@ -995,13 +1199,10 @@ class AnswerService:
     async def _get_full_assessment_info(self, applet_id: uuid.UUID, assessment_answer: AnswerItemSchema | None):
         assert self.user_id
         items_crud = ActivityItemHistoriesCRUD(self.session)
-        last = items_crud.get_applets_assessments(applet_id)
+        items_last = await items_crud.get_applets_assessments(applet_id)
+        items_current = None
         if assessment_answer:
-            current = items_crud.get_assessment_activity_items(assessment_answer.assessment_activity_id)
-            items_last, items_current = await asyncio.gather(last, current)
-        else:
-            items_last = await last
-            items_current = None
+            items_current = await items_crud.get_assessment_activity_items(assessment_answer.assessment_activity_id)
 
         if len(items_last) == 0:
             return AssessmentAnswer(items=items_last)
@@ -1070,7 +1271,7 @@ class AnswerService:
             return []
 
         activity_versions = [t[1] for t in reviewer_activity_version]
-        activity_items = await ActivityItemHistoriesCRUD(self.session).get_by_activity_id_versions(activity_versions)
+        activity_items = await self._get_activity_items_history(activity_versions)
 
         reviews = await AnswerItemsCRUD(self.answer_session).get_reviews_by_answer_id(answer_id)
         results = await self._prepare_answer_reviews(reviews, activity_items, current_role)
@@ -1090,7 +1291,7 @@ class AnswerService:
             return []
 
         activity_versions = [t[1] for t in reviewer_activity_version]
-        activity_items = await ActivityItemHistoriesCRUD(self.session).get_by_activity_id_versions(activity_versions)
+        activity_items = await self._get_activity_items_history(activity_versions)
 
         reviews = await AnswerItemsCRUD(self.answer_session).get_reviews_by_submit_id(submit_id)
         results = await self._prepare_answer_reviews(reviews, activity_items, current_role)
@@ -1144,15 +1345,33 @@ class AnswerService:
                 )
             )
 
+    async def _get_activity_history(self, id_version: str) -> ActivityHistory:
+        async def _load() -> ActivityHistory:
+            return ActivityHistory.model_validate(await ActivityHistoriesCRUD(self.session).get_by_id(id_version))
+
+        activity = await activity_history_cache.get_or_load(id_version, _load)
+        assert activity
+        return activity
+
+    async def _get_activity_items_history(self, activity_id_versions: list[str]) -> list[ActivityItemHistoryFull]:
+        async def _load(id_versions: list[str]) -> dict[str, list[ActivityItemHistoryFull]]:
+            schemas = await ActivityItemHistoriesCRUD(self.session).get_by_activity_id_versions(id_versions)
+            items: dict[str, list[ActivityItemHistoryFull]] = {id_version: [] for id_version in id_versions}
+            for schema in schemas:
+                items[schema.activity_id].append(ActivityItemHistoryFull.model_validate(schema))
+            return items
+
+        items = await activity_items_history_cache.get_many_or_load(activity_id_versions, _load)
+        return [item for activity_items in items.values() for item in activity_items]
+
     async def _validate_activity_for_assessment(self, activity_history_id: str):
-        schema = await ActivityHistoriesCRUD(self.session).get_by_id(activity_history_id)
+        schema = await self._get_activity_history(activity_history_id)
 
         if not schema.is_reviewable:
             raise ActivityIsNotAssessment()
 
-    async def _get_exported_data(
-        self, applet_id: uuid.UUID, query_params: QueryParams
-    ) -> tuple[list[RespondentAnswerData], int]:
+    async def _get_export_filters(self, applet_id: uuid.UUID, query_params: QueryParams) -> tuple[dict, bool]:
+        """Returns export filters restricted by the user's access and whether assessments are allowed"""
         assert self.user_id is not None
 
         access = await UserAppletAccessCRUD(self.session).get_by_roles(
@@ -1188,24 +1407,68 @@ class AnswerService:
             else:
                 filters["target_subject_ids"] = allowed_subjects
 
+        return filters, assessments_allowed
+
+    async def _get_exported_data(
+        self, applet_id: uuid.UUID, query_params: QueryParams
+    ) -> tuple[list[RespondentAnswerData], int, bool]:
+        filters, assessments_allowed = await self._get_export_filters(applet_id, query_params)
         repository = AnswersCRUD(self.answer_session)
-        answers, total = await repository.get_applet_answers(
+        page = query_params.page
+        total_mode = filters.pop("total", None)
+        if total_mode is None:
+            answers, total = await repository.get_applet_answers(
+                applet_id,
+                page=page,
+                limit=query_params.limit,
+                include_assessments=assessments_allowed,
+                **filters,
+            )
+            has_more = (page - 1) * page_limit(query_params.limit) + len(answers) < total
+            return answers, total, has_more
+
+        answers, has_more = await repository.get_applet_answers_page(
             applet_id,
-            page=query_params.page,
+            page=page,
             limit=query_params.limit,
             include_assessments=assessments_allowed,
             **filters,
         )
+        if page == 1 and not has_more:
+            return answers, len(answers), has_more
 
-        return answers, total
+        total = await self._get_exported_total(applet_id, total_mode, page, assessments_allowed, filters)
+        return answers, total, has_more
+
+    async def _get_exported_total(
+        self,
+        applet_id: uuid.UUID,
+        total_mode: AnswerExportTotal,
+        page: int,
+        include_assessments: bool,
+        filters: dict,
+    ) -> int:
+        """Returns the cached total, the exact total is counted on the first page only if requested"""
+        cache = AnswersCountCache()
+        count_filters = {key: value for key, value in filters.items() if key != "include_ehr"}
+        digest = cache.digest(include_assessments, count_filters)
+        if not (total_mode == AnswerExportTotal.EXACT and page == 1):
+            with suppress(CacheNotFound):
+                return (await cache.get(applet_id, digest)).instance.total
+
+        total = await AnswersCRUD(self.answer_session).count_applet_answers(
+            applet_id, include_assessments=include_assessments, **count_filters
+        )
+        await cache.set_total(applet_id, digest, total)
+        return total
 
     async def get_applet_submissions(
         self, applet_id: uuid.UUID, query_params: QueryParams
-    ) -> tuple[list[AppletSubmission], int]:
-        answers, total = await self._get_exported_data(applet_id, query_params)
+    ) -> tuple[list[AppletSubmission], int, bool]:
+        answers, total, has_more = await self._get_exported_data(applet_id, query_params)
 
         if not answers:
-            return [], total
+            return [], total, has_more
 
         respondent_ids: set[uuid.UUID] = set()
         subject_ids: set[uuid.UUID] = set()
@@ -1220,25 +1483,14 @@ class AnswerService:
             if answer.activity_history_id:
                 activity_hist_ids.add(answer.activity_history_id)
 
-        activities_coro = ActivityHistoriesCRUD(self.session).get_by_history_ids(list(activity_hist_ids))
-        subject_map_coro = SubjectsCrud(self.session).get_by_ids(list(subject_ids), include_deleted=True)
-        user_subject_coro = SubjectsCrud(self.session).get_by_user_ids(
-            applet_id, list(respondent_ids), include_deleted=True
-        )
-
-        coros_result = await asyncio.gather(
-            activities_coro,
-            user_subject_coro,
-            subject_map_coro,
-            return_exceptions=True,
+        activities, users_subjects, subjects = await ReadFanOut(self.session).gather(
+            lambda session: ActivityHistoriesCRUD(session).get_by_history_ids(list(activity_hist_ids)),
+            lambda session: SubjectsCrud(session).get_by_user_ids(
+                applet_id, list(respondent_ids), include_deleted=True
+            ),
+            lambda session: SubjectsCrud(session).get_by_ids(list(subject_ids), include_deleted=True),
         )
 
-        for res in coros_result:
-            if isinstance(res, BaseException):
-                raise res
-
-        activities, users_subjects, subjects = coros_result
-
         activities_map = {activity.id_version: activity for activity in activities}  # type: ignore
         subject_map = {subject.id: subject for subject in subjects}  # type: ignore
         users_subjects_map = {subject.user_id: subject for subject in users_subjects}  # type: ignore
@@ -1275,21 +1527,90 @@ class AnswerService:
                 )
             )
 
-        return submissions, total
+        return submissions, total, has_more
 
-    async def get_export_data(  # noqa: C901
+    async def get_export_data(
         self,
         applet_id: uuid.UUID,
         query_params: QueryParams,
         skip_activities: bool = False,
     ) -> AnswerExport:
-        answers, total = await self._get_exported_data(applet_id, query_params)
+        answers, total, has_more = await self._get_exported_data(applet_id, query_params)
         if not answers:
-            return AnswerExport()
+            return AnswerExport(total_answers=total, has_more=has_more)
 
         if query_params.filters.get("include_ehr") is True:
             answers = await self._fill_ehr_filenames(applet_id, answers)
 
+        activity_hist_ids = await self._fill_export_metadata(applet_id, answers)
+
+        activities_result = []
+        if not skip_activities:
+            activities, items = await ReadFanOut(self.session).gather(
+                lambda session: ActivityHistoriesCRUD(session).get_by_history_ids(list(activity_hist_ids)),
+                lambda session: AnswersCRUD(session).get_item_history_by_activity_history(list(activity_hist_ids)),
+            )
+
+            activity_map = {
+                activity.id_version: ActivityHistoryFull.model_validate(activity) for activity in activities
+            }
+            for item in items:
+                activity = activity_map.get(item.activity_id)
+                if activity:
+                    activity.items.append(item)
+            activities_result = list(activity_map.values())
+
+        return AnswerExport(
+            answers=answers,
+            activities=activities_result,
+            total_answers=total,
+            has_more=has_more,
+        )
+
+    async def stream_export_data(
+        self,
+        applet_id: uuid.UUID,
+        query_params: QueryParams,
+        after: AnswerExportCursor | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[tuple[RespondentAnswerData, AnswerExportCursor]]]:
+        """Streams export rows in batches with metadata resolved per batch.
+
+        Metadata already resolved for previous batches is reused, so memory
+        depends on the batch size and the number of subjects, not on the
+        number of exported rows.
+        """
+        filters, assessments_allowed = await self._get_export_filters(applet_id, query_params)
+        metadata: dict[str, dict] = dict(flows={}, respondents={}, subjects={})
+        batches = AnswersCRUD(self.answer_session).stream_applet_answers(
+            applet_id,
+            include_assessments=assessments_allowed,
+            after=after,
+            batch_size=batch_size,
+            **filters,
+        )
+        async for batch in batches:
+            answers = [answer for answer, _ in batch]
+            if query_params.filters.get("include_ehr") is True:
+                await self._fill_ehr_filenames(applet_id, answers)
+            await self._fill_export_metadata(applet_id, answers, metadata)
+            yield batch
+
+    async def _fill_export_metadata(  # noqa: C901
+        self,
+        applet_id: uuid.UUID,
+        answers: list[RespondentAnswerData],
+        metadata: dict[str, dict] | None = None,
+    ) -> set[str]:
+        """Fills respondent, subject and flow data of exported answers.
+
+        Returns activity history ids of the answers. `metadata` is used as a
+        cache of already resolved flows, respondents and subjects.
+        """
+        if metadata is None:
+            metadata = dict(flows={}, respondents={}, subjects={})
+        flow_map, user_map, subject_map = metadata["flows"], metadata["respondents"], metadata["subjects"]
+
         respondent_ids: set[uuid.UUID] = set()
         subject_ids: set[uuid.UUID] = set()
         applet_assessment_ids = set()
@@ -1312,22 +1633,18 @@ class AnswerService:
             if answer.activity_history_id:
                 activity_hist_ids.add(answer.activity_history_id)
 
-        flows_coro = FlowsHistoryCRUD(self.session).get_by_id_versions(list(flow_hist_ids))
-        user_map_coro = AppletAccessCRUD(self.session).get_respondent_export_data(applet_id, list(respondent_ids))
-        subject_map_coro = AppletAccessCRUD(self.session).get_subject_export_data(applet_id, list(subject_ids))
-
-        coros_result = await asyncio.gather(
-            flows_coro,
-            user_map_coro,
-            subject_map_coro,
-            return_exceptions=True,
+        flows, new_users, new_subjects = await ReadFanOut(self.session).gather(
+            lambda session: FlowsHistoryCRUD(session).get_by_id_versions(list(flow_hist_ids - flow_map.keys())),
+            lambda session: AppletAccessCRUD(session).get_respondent_export_data(
+                applet_id, list(respondent_ids - user_map.keys())
+            ),
+            lambda session: AppletAccessCRUD(session).get_subject_export_data(
+                applet_id, list(subject_ids - subject_map.keys())
+            ),
         )
-        for res in coros_result:
-            if isinstance(res, BaseException):
-                raise res
-
-        flows, user_map, subject_map = coros_result
-        flow_map = {flow.id_version: flow for flow in flows}  # type: ignore
+        flow_map.update({flow.id_version: flow for flow in flows})  # type: ignore
+        user_map.update(new_users)  # type: ignore
+        subject_map.update(new_subjects)  # type: ignore
 
         for answer in answers:
             respondent = user_map[answer.respondent_id]  # type: ignore
@@ -1370,28 +1687,7 @@ class AnswerService:
                 if flow := flow_map.get(flow_id):
                     answer.flow_name = flow.name
 
-        repo_local = AnswersCRUD(self.session)
-        activities_result = []
-        if not skip_activities:
-            activities, items = await asyncio.gather(
-                ActivityHistoriesCRUD(self.session).get_by_history_ids(list(activity_hist_ids)),
-                repo_local.get_item_history_by_activity_history(list(activity_hist_ids)),
-            )
-
-            activity_map = {
-                activity.id_version: ActivityHistoryFull.model_validate(activity) for activity in activities
-            }
-            for item in items:
-                activity = activity_map.get(item.activity_id)
-                if activity:
-                    activity.items.append(item)
-            activities_result = list(activity_map.values())
-
-        return AnswerExport(
-            answers=answers,
-            activities=activities_result,
-            total_answers=total,
-        )
+        return activity_hist_ids
 
     async def get_activity_identifiers(
         self, activity_id: uuid.UUID, filters: IdentifiersQueryParams
@@ -1674,62 +1970,52 @@ class AnswerService:
         return results
 
     async def _create_alerts(
-        self,
-        subject_id: uuid.UUID,
-        answer_id: uuid.UUID,
-        applet_id: uuid.UUID,
-        activity_id: uuid.UUID,
-        version: str,
-        raw_alerts: list[AnswerAlert],
-    ):
-        if len(raw_alerts) == 0:
-            return
-        cache = RedisCache()
-        persons = await UserAppletAccessCRUD(self.session).get_responsible_persons(applet_id, subject_id)
+        self, side_effects: list[AnswerSideEffects]
+    ) -> tuple[list[tuple[str, dict]], list[UserSchema]]:
+        """Creates alerts of the answers, returns the messages to publish and
+        the persons to send the alert mail.
+
+        Answers which already have alerts are skipped, so processing an event
+        again does not duplicate them. Responsible persons are loaded once per
+        applet and subject.
+        """
+        side_effects = [effects for effects in side_effects if effects.alerts]
+        if not side_effects:
+            return [], []
+        processed = await AlertCRUD(self.session).get_answer_ids([effects.answer_id for effects in side_effects])
+        persons_by_subject: dict[tuple[uuid.UUID, uuid.UUID], list[UserSchema]] = {}
+        recipients: dict[uuid.UUID, UserSchema] = {}
         alert_schemas = []
-
-        for person in persons:
-            for raw_alert in raw_alerts:
-                alert_schemas.append(
-                    AlertSchema(
-                        user_id=person.id,
-                        respondent_id=self.user_id,
-                        subject_id=subject_id,
-                        is_watched=False,
-                        applet_id=applet_id,
-                        version=version,
-                        activity_id=activity_id,
-                        activity_item_id=raw_alert.activity_item_id,
-                        alert_message=raw_alert.message,
-                        answer_id=answer_id,
-                        type=AlertTypes.ANSWER_ALERT.value,
+        for effects in side_effects:
+            if effects.answer_id in processed:
+                continue
+            key = (effects.applet_id, effects.target_subject_id)
+            if key not in persons_by_subject:
+                persons_by_subject[key] = await UserAppletAccessCRUD(self.session).get_responsible_persons(*key)
+            persons = persons_by_subject[key]
+            recipients.update((person.id, person) for person in persons)
+            for person in persons:
+                for raw_alert in effects.alerts:
+                    alert_schemas.append(
+                        AlertSchema(
+                            user_id=person.id,
+                            respondent_id=self.user_id,
+                            subject_id=effects.target_subject_id,
+                            is_watched=False,
+                            applet_id=effects.applet_id,
+                            version=effects.version,
+                            activity_id=effects.activity_id,
+                            activity_item_id=raw_alert.activity_item_id,
+                            alert_message=raw_alert.message,
+                            answer_id=effects.answer_id,
+                            type=AlertTypes.ANSWER_ALERT.value,
+                        )
                     )
-                )
+        if not alert_schemas:
+            return [], []
         alerts = await AlertCRUD(self.session).create_many(alert_schemas)
-
-        for alert in alerts:
-            channel_id = f"channel_{alert.user_id}"
-            try:
-                await cache.publish(
-                    channel_id,
-                    AlertMessage(
-                        id=alert.id,
-                        respondent_id=self.user_id,
-                        subject_id=subject_id,
-                        applet_id=applet_id,
-                        version=version,
-                        message=alert.alert_message,
-                        created_at=alert.created_at,
-                        activity_id=alert.activity_id,
-                        activity_item_id=alert.activity_item_id,
-                        answer_id=answer_id,
-                        type=alert.type,
-                    ).model_dump(),
-                )
-            except Exception as e:
-                sentry_sdk.capture_exception(e)
-                break
-        await self.send_alert_mail(persons)
+        messages = await AlertService(self.session, self.user_id).messages(alerts)
+        return messages, list(recipients.values())
 
     @staticmethod
     def _filter_activity_flows(result: AppletCompletedEntities) -> None:
@@ -1886,97 +2172,104 @@ class AnswerService:
 
     @staticmethod
     async def send_alert_mail(users: List[UserSchema]):
-        domain = os.environ.get("ADMIN_DOMAIN", "")
-        mail_service = MailingService()
-        schemas = parse_obj_as(List[User], users)
-        email_list = [schema.email_encrypted for schema in schemas]
-        return await mail_service.send(
-            MessageSchema(
-                recipients=email_list,
-                subject="Response alert",
-                body=mail_service.get_localized_html_template(
-                    template_name="response_alert", language="en", domain=domain
-                ),
-            )
-        )
+        """Queues the alert mail to every user separately.
 
-    @classmethod
-    def _is_public_key_match(cls, answer_id, stored_public_key, generated_public_key) -> bool:
-        if not stored_public_key:
-            logger.error(
-                f'Reencryption:  Answer item "{answer_id}": wrong public key, skip'  # noqa: E501
-            )
-        try:
-            stored_public_key = json.loads(stored_public_key)
-        except JSONDecodeError as e:
-            logger.error(
-                f'Reencryption:  Answer item "{answer_id}": wrong public key, skip'  # noqa: E501
-            )
-            logger.exception(str(e))
-            return False
+        A user gets the mail of the first alert right away, the alerts of the
+        following `alert_digest_window` are counted and sent in one digest
+        mail by `send_alert_mail_digests`. The mail does not describe the
+        alerts, it points to the alerts in the admin panel.
+        """
+        window = settings.mailing.alert_digest_window
+        cache = RedisCache()
+        recipients = []
+        for user in parse_obj_as(List[User], users):
+            try:
+                # `set` returns None when the key exists, False when there is no cache
+                if window and await cache.set(ALERT_MAIL_KEY.format(user_id=user.id), 1, ex=window, nx=True) is None:
+                    digest_key = ALERT_MAIL_DIGEST_KEY.format(user_id=user.id)
+                    await cache.incr(digest_key)
+                    await cache.expire(digest_key, ALERT_MAIL_DIGEST_TTL)
+                    await cache.sadd(ALERT_MAIL_DIGEST_USERS_KEY, str(user.id))
+                    continue
+            except Exception as e:
+                logger.warning(f"Failed to check the alert mail window of {user.id}: {e}")
+            recipients.append(user)
+        await AnswerService._enqueue_alert_mails([(user, "Response alert") for user in recipients])
 
-        if stored_public_key != generated_public_key:
-            logger.error(
-                f'Reencryption: Answer item "{answer_id}": public key doesn\'t match, skip'  # noqa: E501
-            )
-            return False
+    @staticmethod
+    async def send_alert_mail_digests(session) -> int:
+        """Queues the digest mails of users whose alert mail window ended,
+        returns the number of queued mails.
 
-        return True
+        A digest starts a new window, so a user gets at most one alert mail
+        per window. The user leaves the pending set before the counter is read
+        and cleared, an alert counted in between adds the user back.
+        """
+        window = settings.mailing.alert_digest_window
+        cache = RedisCache()
+        counts: dict[uuid.UUID, int] = {}
+        for user_id in await cache.smembers(ALERT_MAIL_DIGEST_USERS_KEY):
+            if await cache.get(ALERT_MAIL_KEY.format(user_id=user_id)) is not None:
+                continue
+            await cache.srem(ALERT_MAIL_DIGEST_USERS_KEY, user_id)
+            count = await cache.getdel(ALERT_MAIL_DIGEST_KEY.format(user_id=user_id))
+            if count:
+                counts[uuid.UUID(user_id)] = int(count)
+        if not counts:
+            return 0
+        users = parse_obj_as(List[User], await UsersCRUD(session).get_by_ids(list(counts)))
+        for user in users:
+            if window:
+                await cache.set(ALERT_MAIL_KEY.format(user_id=user.id), 1, ex=window)
+        await AnswerService._enqueue_alert_mails([(user, f"Response alerts ({counts[user.id]})") for user in users])
+        return len(users)
+
+    @staticmethod
+    async def _enqueue_alert_mails(recipients: list[tuple[User, str]]) -> None:
+        if not recipients:
+            return
+        domain = os.environ.get("ADMIN_DOMAIN", "")
+        mail_service = MailingService()
+        body = mail_service.get_localized_html_template(template_name="response_alert", language="en", domain=domain)
+        await mail_service.enqueue(
+            [
+                MessageSchema(recipients=[user.email_encrypted], subject=subject, body=body)
+                for user, subject in recipients
+            ]
+        )
 
     async def reencrypt_user_answers(
         self,
         applet_id: uuid.UUID,
         user_id: uuid.UUID,
-        page=1,
+        after_id: uuid.UUID | None = None,
         limit=1000,
         *,
-        old_public_key: list,
-        new_public_key: list,
-        decryptor: "AnswerEncryptor",
-        encryptor: "AnswerEncryptor",
-    ) -> int:
+        keys: ReencryptionKeys,
+    ) -> tuple[int, uuid.UUID | None]:
+        """Re-encrypts a page of the user answer items following `after_id`.
+
+        Returns the number of items read and the id of the last one, the next
+        page starts after it. The encryption runs in the crypto process pool.
+        """
         logger.debug(f'Reencryption: Start reencrypt_user_answers for "{applet_id}"')
         repository = AnswersCRUD(self.answer_session)
-        answers = await repository.get_applet_user_answer_items(applet_id, user_id, page, limit)
-        count = len(answers)
-        if not count:
-            return 0
-
-        data_to_update: list[AnswerItemDataEncrypted] = []
-        for answer in answers:
-            if not self._is_public_key_match(answer.id, answer.user_public_key, old_public_key):
-                continue
-
-            try:
-                encrypted_answer = encryptor.encrypt(decryptor.decrypt(answer.answer))
-                encrypted_events, encrypted_identifier = None, None
-                if answer.events:
-                    encrypted_events = encryptor.encrypt(decryptor.decrypt(answer.events))
-                if answer.identifier:
-                    if answer.migrated_data and answer.migrated_data.get("is_identifier_encrypted") is False:
-                        encrypted_identifier = encrypted_identifier
-                    else:
-                        encrypted_identifier = encryptor.encrypt(decryptor.decrypt(answer.identifier))
-
-                data_to_update.append(
-                    AnswerItemDataEncrypted(
-                        id=answer.id,
-                        answer=encrypted_answer,
-                        events=encrypted_events,
-                        identifier=encrypted_identifier,
-                    )
-                )
-            except EncryptionError as e:
-                logger.error(
-                    f'Reencryption: Skip answer item "{answer.id}": cannot decrypt answer'  # noqa: E501
-                )
-                logger.exception(str(e))
-                continue
-
+        answers = await repository.get_applet_user_answer_items(applet_id, user_id, after_id, limit)
+        if not answers:
+            return 0, None
+
+        encrypted = await crypto_executor.run(
+            reencrypt_answer_items,
+            [answer.model_dump() for answer in answers],
+            keys.old_public_key,
+            keys.decryptor,
+            keys.encryptor,
+        )
+        data_to_update = [AnswerItemDataEncrypted.model_validate(item) for item in encrypted]
         if data_to_update:
-            await repository.update_encrypted_fields(json.dumps(new_public_key), data_to_update)
+            await repository.update_encrypted_fields(json.dumps(keys.new_public_key), data_to_update)
 
-        return count
+        return len(answers), answers[-1].id
 
     async def fill_last_activity_workspace_respondent(
         self,
@@ -2018,8 +2311,9 @@ class AnswerService:
     async def delete_assessment(self, assessment_id: uuid.UUID):
         return await AnswerItemsCRUD(self.answer_session).delete_assessment(assessment_id)
 
-    async def delete_by_subject(self, subject_id: uuid.UUID):
+    async def delete_by_subject(self, applet_id: uuid.UUID, subject_id: uuid.UUID):
         await AnswersCRUD(self.answer_session).delete_by_subject(subject_id)
+        await AnswersCountCache().invalidate_on_commit(self.answer_session, applet_id)
 
     async def get_latest_answer_by_activity_id(
         self, applet_id: uuid.UUID, activity_id: uuid.UUID
@@ -2101,7 +2395,7 @@ class AnswerService:
         await AnswerNotesCRUD(self.session).delete_note_by_id(note_id)
 
     async def _prepare_answer_reviews(
-        self, reviews: list[AnswerItemSchema], activity_items: list[ActivityItemHistorySchema], role: Role | None
+        self, reviews: list[AnswerItemSchema], activity_items: list[ActivityItemHistoryFull], role: Role | None
     ) -> list[AnswerReview]:
         user_ids = [rev.respondent_id for rev in reviews]
         users = await UsersCRUD(self.session).get_by_ids(user_ids)
@@ -2180,15 +2474,9 @@ class AnswerService:
         return existing_subject_ids
 
     async def get_submissions_metadata_by_subject(self, subject_id: uuid.UUID) -> SubmissionsActivityMetadataBySubject:
-        submissions_target_coro = AnswersCRUD(self.answer_session).get_submissions_metadata_by_target_subject(
-            subject_id
-        )
-        submissions_respondent_coro = AnswersCRUD(self.answer_session).get_submissions_metadata_by_respondent_subject(
-            subject_id
-        )
-
-        submissions_target, submissions_respondent = await asyncio.gather(
-            submissions_target_coro, submissions_respondent_coro
+        submissions_target, submissions_respondent = await ReadFanOut(self.answer_session).gather(
+            lambda session: AnswersCRUD(session).get_submissions_metadata_by_target_subject(subject_id),
+            lambda session: AnswersCRUD(session).get_submissions_metadata_by_respondent_subject(subject_id),
         )
 
         existing_subject_ids = await self._filter_out_soft_deleted_subjects(submissions_target + submissions_respondent)
@@ -2571,33 +2859,6 @@ class ReportServerEncryption:
         )
 
 
-class AnswerEncryptor:
-    def __init__(self, key: list | bytes):
-        if isinstance(key, list):
-            key = bytes(key)
-        self.key: bytes = key
-
-    def encrypt(self, data: str, iv: bytes | None = None):
-        try:
-            ct, iv = encrypt_cbc(self.key, data.encode("utf-8"), iv)
-        except Exception as e:
-            raise EncryptionError("Cannot encrypt answer data") from e
-        return f"{iv.hex()}:{ct.hex()}"
-
-    def decrypt(self, encrypted_data: str) -> str:
-        """
-        @param encrypted_data: data in hex format "iv:text"
-        """
-        try:
-            iv_hex, text_hex = encrypted_data.split(":", 1)
-            data = bytes.fromhex(text_hex)
-            iv = bytes.fromhex(iv_hex)
-
-            return decrypt_cbc(self.key, data, iv).decode("utf-8")
-        except Exception as e:
-            raise EncryptionError("Cannot decrypt answer data") from e
-
-
 class AnswerTransferService:
     def __init__(
         self,
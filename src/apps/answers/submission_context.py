@@ -0,0 +1,208 @@
+import asyncio
+import datetime
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.activity_assignments.crud.assignments import ActivityAssigmentCRUD
+from apps.activity_assignments.domain.assignments import ActivityAssignmentCreate
+from apps.answers.crud.answers import AnswersCRUD
+from apps.answers.db.schemas import AnswerSchema
+from apps.answers.domain import AppletAnswerCreate
+from apps.applets.crud import AppletsCRUD
+from apps.applets.domain.applet import AppletSubmissionState
+from apps.subjects.crud import SubjectsCrud
+from apps.subjects.db.schemas import SubjectSchema
+from apps.subjects.domain import SubjectRelation
+from apps.workspaces.domain.constants import Role
+from infrastructure.database.mixins import HistoryAware
+
+__all__ = ["SubmissionContext"]
+
+
+class SubmissionContext:
+    """Everything needed to validate an answer submission, loaded up front.
+
+    The applet state, the subjects of the answer, relations between them and
+    the assignment are read from the main database with a few batched
+    queries, the answers of the submission are read from the answers
+    database concurrently. Validation then only looks at the loaded state.
+
+    Contexts of a batch share loaded rows, answers of the same submission
+    share the `existing_answers` list, so an answer accepted earlier in the
+    batch is seen by the following ones.
+    """
+
+    def __init__(
+        self,
+        applet: AppletSubmissionState | None,
+        respondent_subject: SubjectSchema | None,
+        subjects: dict[uuid.UUID, SubjectSchema],
+        relations: dict[tuple[uuid.UUID, uuid.UUID], SubjectRelation],
+        assignment_exists: bool,
+        existing_answers: list[AnswerSchema],
+    ):
+        self.applet = applet
+        self.respondent_subject = respondent_subject
+        self.assignment_exists = assignment_exists
+        self.existing_answers = existing_answers
+        self._subjects = subjects
+        self._relations = relations
+
+    @classmethod
+    async def load(
+        cls,
+        session: AsyncSession,
+        answer_session: AsyncSession,
+        user_id: uuid.UUID,
+        applet_answer: AppletAnswerCreate,
+    ) -> "SubmissionContext":
+        contexts = await cls.load_many(session, answer_session, user_id, [applet_answer])
+        return contexts[0]
+
+    @classmethod
+    async def load_many(
+        cls,
+        session: AsyncSession,
+        answer_session: AsyncSession,
+        user_id: uuid.UUID,
+        applet_answers: list[AppletAnswerCreate],
+    ) -> list["SubmissionContext"]:
+        answers_by_submit_id: dict[uuid.UUID, list[AnswerSchema]] = {
+            applet_answer.submit_id: [] for applet_answer in applet_answers
+        }
+
+        async def _load_answers() -> None:
+            answers = await AnswersCRUD(answer_session).get_by_submit_ids(list(answers_by_submit_id))
+            for answer in answers:
+                answers_by_submit_id[answer.submit_id].append(answer)
+
+        loader = _Loader(session, user_id)
+        if answer_session is session:
+            await _load_answers()
+            await loader.load(applet_answers)
+        else:
+            await asyncio.gather(_load_answers(), loader.load(applet_answers))
+
+        return [
+            cls(
+                applet=loader.applets.get((applet_answer.applet_id, applet_answer.version)),
+                respondent_subject=loader.respondent_subjects.get(applet_answer.applet_id),
+                subjects=loader.subjects,
+                relations=loader.relations,
+                assignment_exists=loader.assignment_exists(applet_answer),
+                existing_answers=answers_by_submit_id[applet_answer.submit_id],
+            )
+            for applet_answer in applet_answers
+        ]
+
+    @property
+    def roles(self) -> list[Role]:
+        return self.applet.roles if self.applet else []
+
+    def subject(self, subject_id: uuid.UUID | None) -> SubjectSchema | None:
+        """Returns the subject by id, the respondent subject when no id is given"""
+        if not subject_id:
+            return self.respondent_subject
+        return self._subjects.get(subject_id)
+
+    def get_relation(self, source_subject_id: uuid.UUID, target_subject_id: uuid.UUID) -> SubjectRelation | None:
+        return self._relations.get((source_subject_id, target_subject_id))
+
+    def has_answer_created_at(
+        self, applet_id: uuid.UUID, activity_id: uuid.UUID, created_at: datetime.datetime
+    ) -> bool:
+        return any(
+            answer.applet_id == applet_id
+            and answer.activity_history_id.startswith(str(activity_id))
+            and answer.created_at == created_at
+            for answer in self.existing_answers
+        )
+
+
+_AssignmentKey = tuple[uuid.UUID | None, uuid.UUID | None, uuid.UUID, uuid.UUID]
+
+
+class _Loader:
+    """Loads main database rows for the submission contexts of a batch"""
+
+    def __init__(self, session: AsyncSession, user_id: uuid.UUID):
+        self.session = session
+        self.user_id = user_id
+        self.applets: dict[tuple[uuid.UUID, str], AppletSubmissionState | None] = {}
+        self.respondent_subjects: dict[uuid.UUID, SubjectSchema] = {}
+        self.subjects: dict[uuid.UUID, SubjectSchema] = {}
+        self.relations: dict[tuple[uuid.UUID, uuid.UUID], SubjectRelation] = {}
+        self.assignments: dict[_AssignmentKey, bool] = {}
+
+    @staticmethod
+    def assignment_key(
+        applet_answer: AppletAnswerCreate, source: SubjectSchema, target: SubjectSchema
+    ) -> _AssignmentKey:
+        activity_id = applet_answer.activity_id if applet_answer.flow_id is None else None
+        return activity_id, applet_answer.flow_id, source.id, target.id
+
+    def subject(self, applet_id: uuid.UUID, subject_id: uuid.UUID | None) -> SubjectSchema | None:
+        if not subject_id:
+            return self.respondent_subjects.get(applet_id)
+        return self.subjects.get(subject_id)
+
+    def assignment_exists(self, applet_answer: AppletAnswerCreate) -> bool:
+        source = self.subject(applet_answer.applet_id, applet_answer.source_subject_id)
+        target = self.subject(applet_answer.applet_id, applet_answer.target_subject_id)
+        if not (source and target):
+            return False
+        return self.assignments.get(self.assignment_key(applet_answer, source, target), False)
+
+    async def load(self, applet_answers: list[AppletAnswerCreate]) -> None:
+        for applet_answer in applet_answers:
+            key = (applet_answer.applet_id, applet_answer.version)
+            if key not in self.applets:
+                applet_history_id = HistoryAware.generate_id_version(applet_answer.applet_id, applet_answer.version)
+                self.applets[key] = await AppletsCRUD(self.session).get_submission_state(
+                    applet_answer.applet_id, applet_history_id, self.user_id
+                )
+
+        subject_ids: dict[uuid.UUID, set[uuid.UUID]] = {}
+        for applet_answer in applet_answers:
+            subject_ids.setdefault(applet_answer.applet_id, set()).update(
+                subject_id
+                for subject_id in (
+                    applet_answer.input_subject_id,
+                    applet_answer.target_subject_id,
+                    applet_answer.source_subject_id,
+                )
+                if subject_id
+            )
+        for applet_id, ids in subject_ids.items():
+            subjects = await SubjectsCrud(self.session).get_user_subject_with_ids(self.user_id, applet_id, list(ids))
+            for subject in subjects:
+                self.subjects[subject.id] = subject
+                if subject.user_id == self.user_id and subject.applet_id == applet_id and subject.soft_exists():
+                    self.respondent_subjects[applet_id] = subject
+
+        assignments: dict[_AssignmentKey, ActivityAssignmentCreate] = {}
+        relation_subject_ids: set[uuid.UUID] = set()
+        for applet_answer in applet_answers:
+            respondent = self.respondent_subjects.get(applet_answer.applet_id)
+            source = self.subject(applet_answer.applet_id, applet_answer.source_subject_id)
+            target = self.subject(applet_answer.applet_id, applet_answer.target_subject_id)
+            if not (respondent and source and target):
+                continue
+            relation_subject_ids.update((respondent.id, source.id, target.id))
+            key = self.assignment_key(applet_answer, source, target)
+            assignments[key] = ActivityAssignmentCreate(
+                activity_id=key[0],
+                activity_flow_id=key[1],
+                respondent_subject_id=source.id,
+                target_subject_id=target.id,
+            )
+
+        if relation_subject_ids:
+            relations = await SubjectsCrud(self.session).get_relations_between(list(relation_subject_ids))
+            self.relations = {
+                (relation.source_subject_id, relation.target_subject_id): relation for relation in relations
+            }
+
+        for key, assignment in assignments.items():
+            self.assignments[key] = bool(await ActivityAssigmentCRUD(self.session).exist(assignment))
@@ -66,3 +66,64 @@ async def create_report(
     except Exception as e:
         traceback.print_exception(e)
         sentry_sdk.capture_exception(e)
+
+
+@broker.task()
+async def process_answer_events(applet_id: uuid.UUID | None = None):
+    """Processes outbox events of the answers database of the applet"""
+    from apps.answers import outbox
+
+    try:
+        await outbox.process_answer_events(applet_id)
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
+
+
+@broker.task(schedule=[{"cron": "* * * * *"}])
+async def sweep_answer_events():
+    """Processes outbox events left behind by failed kicks and workers"""
+    from apps.answers import outbox
+
+    try:
+        await outbox.sweep_answer_events()
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
+
+
+@broker.task(schedule=[{"cron": "* * * * *"}])
+async def send_alert_mail_digests():
+    """Queues the digest mails of the alerts whose mail window ended"""
+    from apps.answers.service import AnswerService
+
+    session_maker = session_manager.get_session()
+    try:
+        async with session_maker() as session:
+            await AnswerService.send_alert_mail_digests(session)
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
+
+
+@broker.task()
+async def export_answers(job_id: uuid.UUID, user_id: uuid.UUID):
+    from apps.answers.export_job import run_export_job
+
+    try:
+        await run_export_job(job_id, user_id)
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
+
+
+@broker.task(schedule=[{"cron": "*/5 * * * *"}])
+async def sweep_export_jobs():
+    """Resumes failed answers exports and exports which lost their worker"""
+    from apps.answers.export_job import sweep_export_jobs
+
+    try:
+        await sweep_export_jobs()
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
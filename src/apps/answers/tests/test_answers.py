@@ -1,6 +1,9 @@
+import csv
 import datetime
+import gzip
 import http
 import io
+import json
 import re
 import uuid
 import zipfile
@@ -24,12 +27,16 @@ from apps.answers.domain import (
     AnswerEHR,
     AnswerNote,
     AppletAnswerCreate,
+    AppletAnswersBatchCreate,
     AssessmentAnswerCreate,
     ClientMeta,
     EHRIngestionStatus,
     ItemAnswerCreate,
 )
+from apps.answers.export_job import run_export_job, sweep_export_jobs
+from apps.answers.outbox import AnswerEventsProcessor
 from apps.answers.service import AnswerService
+from apps.answers.tasks import export_answers
 from apps.applets.db.schemas import AppletSchema
 from apps.applets.domain.applet_create_update import AppletUpdate
 from apps.applets.domain.applet_full import AppletFull
@@ -37,6 +44,8 @@ from apps.applets.errors import InvalidVersionError
 from apps.applets.service import AppletService
 from apps.integrations.oneup_health.service.domain import EHRData
 from apps.integrations.oneup_health.service.ehr_storage import EHRStorage
+from apps.job.constants import JobStatus
+from apps.job.service import JobService
 from apps.mailing.services import TestMail
 from apps.schedule.domain.schedule import PublicEvent
 from apps.schedule.service import ScheduleService
@@ -54,6 +63,8 @@ from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
 from apps.workspaces.db.schemas import UserAppletAccessSchema
 from apps.workspaces.domain.constants import Role
 from apps.workspaces.service.user_applet_access import UserAppletAccessService
+from config import settings
+from infrastructure.storage.storage_client import StorageClient
 from infrastructure.utility.redis_client import RedisCacheTest
 
 
@@ -961,9 +972,13 @@ class TestAnswerActivityItems(BaseTest):
     applets_answers_completions_url = "/answers/applet/completions"
     applet_submissions_list_url = "/answers/applet/{applet_id}/submissions"
     applet_answers_export_url = "/answers/applet/{applet_id}/data"
+    applet_answers_export_stream_url = "/answers/applet/{applet_id}/data/stream"
+    applet_answers_export_jobs_url = "/answers/applet/{applet_id}/data/jobs"
+    applet_answers_export_job_url = "/answers/applet/{applet_id}/data/jobs/{job_id}"
     applet_answers_completions_url = "/answers/applet/{applet_id}/completions"
     applets_answers_completions_url = "/answers/applet/completions"
     applet_submit_dates_url = "/answers/applet/{applet_id}/dates"
+    answers_batch_url = "/answers/applet/{applet_id}/batch"
 
     activity_answer_url = "/answers/applet/{applet_id}/activities/{activity_id}/answers/{answer_id}"
     flow_submission_url = f"{flow_submissions_url}/{{submit_id}}"
@@ -996,26 +1011,78 @@ class TestAnswerActivityItems(BaseTest):
     async def test_answer_activity_items_create_alert_for_respondent(
         self,
         mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
         tom: User,
         answer_with_alert_create: AppletAnswerCreate,
         tom_applet_subject: Subject,
         redis: RedisCacheTest,
         mailbox: TestMail,
         client: TestClient,
+        session: AsyncSession,
     ) -> None:
         client.login(tom)
         response = await client.post(self.answer_url, data=answer_with_alert_create)
         assert response.status_code == http.HTTPStatus.CREATED, response.json()
 
+        # Side effects are run by a worker
+        mock_kiq_answer_events.assert_awaited_once_with(answer_with_alert_create.applet_id)
+        assert len(mailbox.mails) == 0
+        assert await AnswerEventsProcessor(session, session).process_pending() == 1
+
         mock_kiq_report.assert_awaited_once()
 
         published_values = await redis.get(f"channel_{tom.id}")
         published_values = published_values or []
         assert len(published_values) == 1
-        assert len(redis._storage) == 1
+        # Alerts are published with the data the websocket sends
+        published = json.loads(published_values[0])
+        assert published["applet_id"] == str(answer_with_alert_create.applet_id)
+        assert published["applet_name"]
+        assert published["workspace"]
+        # The channel and the alert mail window key
+        assert set(redis._storage) == {f"channel_{tom.id}", f"alert_mail:{tom.id}"}
         assert len(mailbox.mails) == 1
         assert mailbox.mails[0].subject == "Response alert"
 
+    async def test_answer_activity_items_create_alert__mails_are_digested(
+        self,
+        mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
+        tom: User,
+        answer_with_alert_create: AppletAnswerCreate,
+        tom_applet_subject: Subject,
+        redis: RedisCacheTest,
+        mailbox: TestMail,
+        client: TestClient,
+        session: AsyncSession,
+    ) -> None:
+        client.login(tom)
+        for _ in range(2):
+            data = answer_with_alert_create.model_copy(deep=True)
+            data.submit_id = uuid.uuid4()
+            response = await client.post(self.answer_url, data=data)
+            assert response.status_code == http.HTTPStatus.CREATED, response.json()
+            await AnswerEventsProcessor(session, session).process_pending()
+
+        published_values = await redis.get(f"channel_{tom.id}")
+        assert len(published_values) == 2
+        # The second alert falls in the digest window of the first mail
+        assert len(mailbox.mails) == 1
+        assert await redis.get(f"alert_mail_digest:{tom.id}") == "1"
+        assert await redis.smembers("alert_mail_digest_users") == {str(tom.id)}
+
+        # Digests wait for the end of the window
+        assert await AnswerService.send_alert_mail_digests(session) == 0
+        await redis.delete(f"alert_mail:{tom.id}")
+        assert await AnswerService.send_alert_mail_digests(session) == 1
+
+        assert len(mailbox.mails) == 2
+        assert mailbox.mails[0].subject == "Response alerts (1)"
+        assert await redis.get(f"alert_mail_digest:{tom.id}") is None
+        assert await redis.smembers("alert_mail_digest_users") == set()
+        # The digest starts a new window
+        assert await redis.get(f"alert_mail:{tom.id}") is not None
+
     async def test_answer_activity_answer_dates_for_respondent(
         self,
         client: TestClient,
@@ -1187,6 +1254,61 @@ class TestAnswerActivityItems(BaseTest):
         response = await client.post(self.answer_url, data=data)
         assert response.status_code == http.HTTPStatus.CREATED
 
+    async def test_create_answers_batch(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_create: AppletAnswerCreate,
+        session: AsyncSession,
+    ):
+        client.login(tom)
+        duplicate = answer_create.model_copy(deep=True)
+        other = answer_create.model_copy(deep=True)
+        other.submit_id = uuid.uuid4()
+        data = AppletAnswersBatchCreate(answers=[answer_create, duplicate, other])
+
+        response = await client.post(self.answers_batch_url.format(applet_id=answer_create.applet_id), data=data)
+
+        assert response.status_code == http.HTTPStatus.OK
+        results = response.json()["result"]
+        assert response.json()["count"] == 3
+        assert results[0]["answerId"] and results[0]["error"] is None
+        assert results[1]["answerId"] is None and results[1]["error"] == "Submit id duplicate error"
+        assert results[2]["answerId"] and results[2]["error"] is None
+        answers = await AnswersCRUD(session).get_by_ids([results[0]["answerId"], results[2]["answerId"]])
+        assert {answer.submit_id for answer in answers} == {answer_create.submit_id, other.submit_id}
+
+    async def test_create_answers_batch__flow_submissions(
+        self,
+        client: TestClient,
+        tom: User,
+        applet_with_flow: AppletFull,
+        applet_with_flow_answer_create: list[AppletAnswerCreate],
+        session: AsyncSession,
+    ):
+        client.login(tom)
+        data = AppletAnswersBatchCreate(answers=applet_with_flow_answer_create)
+
+        response = await client.post(self.answers_batch_url.format(applet_id=applet_with_flow.id), data=data)
+
+        assert response.status_code == http.HTTPStatus.OK
+        results = response.json()["result"]
+        assert len(results) == len(applet_with_flow_answer_create)
+        assert all(result["answerId"] and result["error"] is None for result in results)
+        flow_answers = await AnswersCRUD(session).get_by_submit_id(applet_with_flow_answer_create[1].submit_id)
+        assert flow_answers
+        assert [answer.is_flow_completed for answer in flow_answers] == [False, False, True]
+
+    async def test_create_answers_batch__answer_of_other_applet(
+        self, client: TestClient, tom: User, answer_create: AppletAnswerCreate
+    ):
+        client.login(tom)
+        data = AppletAnswersBatchCreate(answers=[answer_create])
+
+        response = await client.post(self.answers_batch_url.format(applet_id=uuid.uuid4()), data=data)
+
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
     async def test_create_activity_answer_flow_answer__submit_duplicate(
         self,
         client: TestClient,
@@ -1338,12 +1460,14 @@ class TestAnswerActivityItems(BaseTest):
     @pytest.mark.asyncio
     async def test_answer_activity_with_ehr_ingestion(
         self,
+        mock_kiq_answer_events: AsyncMock,
         client: TestClient,
         tom: User,
         answer_create_applet_one: AppletAnswerCreate,
         applet_one: AppletFull,
         applet_one_lucy_subject: Subject,
         applet_one_user_subject: Subject,
+        session: AsyncSession,
     ):
         client.login(tom)
         data = answer_create_applet_one.model_copy(deep=True)
@@ -1352,7 +1476,9 @@ class TestAnswerActivityItems(BaseTest):
         with patch("apps.answers.service.AnswerService.trigger_ehr_ingestion") as trigger_ehr_ingestion_mock:
             response = await client.post(self.answer_url, data=data)
             assert response.status_code == http.HTTPStatus.CREATED
+            trigger_ehr_ingestion_mock.assert_not_called()
 
+            await AnswerEventsProcessor(session, session).process_pending()
             trigger_ehr_ingestion_mock.assert_called()
 
     @pytest.mark.usefixtures("mock_report_server_response", "answer")
@@ -2321,6 +2447,218 @@ class TestAnswerActivityItems(BaseTest):
             answer_for_review["respondentSecretId"],
         )
 
+    async def test_answers_export_stream__ndjson_resume_by_cursor(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        url = self.applet_answers_export_stream_url.format(applet_id=str(applet_id))
+        response = await client.get(url)
+
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        # One answer, one answer with ts offset, one assessment
+        assert len(rows) == 3
+        assert all(row["cursor"] for row in rows)
+        export_response = await client.get(self.applet_answers_export_url.format(applet_id=str(applet_id)))
+        assert {row["id"] for row in rows} == {row["id"] for row in export_response.json()["result"]["answers"]}
+
+        response = await client.get(url, query={"cursor": rows[0]["cursor"]})
+        assert response.status_code == http.HTTPStatus.OK
+        resumed = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["cursor"] for row in resumed] == [row["cursor"] for row in rows[1:]]
+
+    async def test_answers_export_stream__csv(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        response = await client.get(
+            self.applet_answers_export_stream_url.format(applet_id=str(applet_id)),
+            query={"format": "csv"},
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 3
+        assert {"id", "submitId", "respondentSecretId", "cursor"} <= set(rows[0].keys())
+
+    async def test_answers_export_stream__invalid_cursor(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        response = await client.get(
+            self.applet_answers_export_stream_url.format(applet_id=str(applet_id)),
+            query={"cursor": "not-a-cursor"},
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    async def test_answers_export__total_without_count_per_page(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        url = self.applet_answers_export_url.format(applet_id=str(answer_reviewable_activity_with_ts_offset.applet_id))
+
+        response = await client.get(url, query={"total": "exact", "limit": 2})
+        assert response.status_code == http.HTTPStatus.OK
+        data = response.json()
+        assert len(data["result"]["answers"]) == 2
+        assert data["count"] == 3
+        assert data["hasMore"] is True
+
+        response = await client.get(url, query={"total": "estimate", "limit": 2, "page": 2})
+        assert response.status_code == http.HTTPStatus.OK
+        data = response.json()
+        assert len(data["result"]["answers"]) == 1
+        assert data["count"] == 3
+        assert data["hasMore"] is False
+
+    async def test_answers_export_job__create_and_retrieve(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        response = await client.post(self.applet_answers_export_jobs_url.format(applet_id=str(applet_id)))
+
+        assert response.status_code == http.HTTPStatus.ACCEPTED
+        job = response.json()["result"]
+        assert job["id"]
+        assert job["parts"] == []
+
+        response = await client.get(
+            self.applet_answers_export_job_url.format(applet_id=str(applet_id), job_id=job["id"])
+        )
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.json()["result"]["id"] == job["id"]
+
+        response = await client.get(
+            self.applet_answers_export_job_url.format(applet_id=str(uuid.uuid4()), job_id=job["id"])
+        )
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    @pytest.mark.usefixtures("mock_get_session")
+    async def test_answers_export_job__run(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        response = await client.post(self.applet_answers_export_jobs_url.format(applet_id=str(applet_id)))
+        job_id = response.json()["result"]["id"]
+        uploads: dict[str, bytes] = {}
+
+        async def _upload(key, body):
+            uploads[key] = body.read()
+
+        storage = AsyncMock(spec=StorageClient)
+        storage.upload.side_effect = _upload
+        storage.generate_presigned_url.side_effect = lambda key: f"https://storage/{key}"
+        with (
+            patch("apps.answers.export_job.create_answer_client", return_value=storage),
+            patch.object(settings.task_answers_export, "part_rows", 1),
+        ):
+            await run_export_job(uuid.UUID(job_id), tom.id)
+            response = await client.get(
+                self.applet_answers_export_job_url.format(applet_id=str(applet_id), job_id=job_id)
+            )
+
+        assert response.status_code == http.HTTPStatus.OK
+        job = response.json()["result"]
+        assert job["status"] == JobStatus.success
+        assert job["error"] is None
+        assert job["rows"] > 0
+        # A part per row with the part size of one row
+        assert len(uploads) == len(job["parts"]) == job["rows"]
+        assert [part["url"] for part in job["parts"]] == [f"https://storage/{key}" for key in sorted(uploads)]
+        for key, body in uploads.items():
+            assert key.startswith(f"answers_export/{applet_id}/{job_id}/part-")
+            rows = [json.loads(line) for line in gzip.decompress(body).splitlines()]
+            assert len(rows) == 1
+            assert rows[0]["appletId"] == str(applet_id)
+            assert rows[0]["cursor"]
+
+    @pytest.mark.usefixtures("mock_get_session")
+    async def test_answers_export_job__runs_once(
+        self,
+        client: TestClient,
+        tom: User,
+        session: AsyncSession,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        response = await client.post(self.applet_answers_export_jobs_url.format(applet_id=str(applet_id)))
+        job_id = uuid.UUID(response.json()["result"]["id"])
+        storage = AsyncMock(spec=StorageClient)
+
+        with patch("apps.answers.export_job.create_answer_client", return_value=storage):
+            await run_export_job(job_id, tom.id)
+            uploads = storage.upload.await_count
+            assert uploads > 0
+            # A redelivered task does not run the finished job again
+            await run_export_job(job_id, tom.id)
+            assert storage.upload.await_count == uploads
+
+            # A job run by another worker is not run twice
+            await JobService(session, tom.id).change_status(job_id, JobStatus.in_progress)
+            await run_export_job(job_id, tom.id)
+            assert storage.upload.await_count == uploads
+
+    @pytest.mark.usefixtures("mock_get_session")
+    async def test_answers_export_job__failed_runs_are_retried(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        response = await client.post(self.applet_answers_export_jobs_url.format(applet_id=str(applet_id)))
+        job_id = response.json()["result"]["id"]
+        url = self.applet_answers_export_job_url.format(applet_id=str(applet_id), job_id=job_id)
+        storage = AsyncMock(spec=StorageClient)
+        storage.upload.side_effect = ConnectionError("storage.internal:9000 refused")
+
+        with (
+            patch("apps.answers.export_job.create_answer_client", return_value=storage),
+            patch.object(export_answers, "kiq", new_callable=AsyncMock) as kiq,
+        ):
+            for attempt in range(1, settings.task_answers_export.max_attempts + 1):
+                with pytest.raises(ConnectionError):
+                    await run_export_job(uuid.UUID(job_id), tom.id)
+                job = (await client.get(url)).json()["result"]
+                if attempt < settings.task_answers_export.max_attempts:
+                    assert job["status"] == JobStatus.retry
+                    assert await sweep_export_jobs() == 1
+                    kiq.assert_awaited_with(uuid.UUID(job_id), tom.id)
+                    job = (await client.get(url)).json()["result"]
+                    assert job["status"] == JobStatus.pending
+
+        assert job["status"] == JobStatus.error
+        # The exception is logged, the client gets the error code only
+        assert job["error"] == "export_failed"
+        assert kiq.await_count == settings.task_answers_export.max_attempts - 1
+
     async def test_get_applet_answers_without_assessment(
         self, client: TestClient, tom: User, applet: AppletFull, answer_shell_account_target
     ):
@@ -4618,7 +4956,8 @@ class TestAnswerActivityItems(BaseTest):
             with zipfile.ZipFile(io.BytesIO(response_body), "r") as zip_file:
                 file_list = zip_file.namelist()
                 assert len(file_list) == 2
-                assert file_list == file_names
+                # Archives are written in download completion order
+                assert sorted(file_list) == sorted(file_names)
 
     @pytest.mark.asyncio
     async def test_applet_ehr_data_endpoint_filtering_by_flow(
@@ -4673,7 +5012,8 @@ class TestAnswerActivityItems(BaseTest):
             with zipfile.ZipFile(io.BytesIO(response_body), "r") as zip_file:
                 file_list = zip_file.namelist()
                 assert len(file_list) == 1
-                assert file_list == file_names
+                # Archives are written in download completion order
+                assert sorted(file_list) == sorted(file_names)
                 assert str(tom_answer_activity_flow.submit_id) in file_names[0]
 
     @pytest.mark.parametrize(
@@ -4743,15 +5083,17 @@ class TestAnswerActivityItems(BaseTest):
             response_body = response.read()
             with zipfile.ZipFile(io.BytesIO(response_body), "r") as zip_file:
                 file_list = zip_file.namelist()
+                # Archives are written in download completion order
+                file_names = sorted(file_names)
                 if role == Role.REVIEWER:
                     assert len(file_list) == 1
-                    assert file_list == file_names
+                    assert sorted(file_list) == file_names
                     assert str(tom_answer_on_reviewable_applet.submit_id) in file_names[0]
                 else:
                     assert len(file_list) == 2
-                    assert file_list == file_names
-                    assert str(tom_answer_on_reviewable_applet.submit_id) in file_names[0]
-                    assert str(lucy_answer_on_reviewable_applet.submit_id) in file_names[1]
+                    assert sorted(file_list) == file_names
+                    assert any(str(tom_answer_on_reviewable_applet.submit_id) in name for name in file_names)
+                    assert any(str(lucy_answer_on_reviewable_applet.submit_id) in name for name in file_names)
 
     @pytest.mark.asyncio
     async def test_applet_ehr_data_endpoint_without_ehr(self, client, session, tom, tom_answer):
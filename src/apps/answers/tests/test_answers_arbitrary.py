@@ -14,6 +14,7 @@ from apps.answers.crud import AnswerItemsCRUD
 from apps.answers.crud.answers import AnswersCRUD
 from apps.answers.db.schemas import AnswerItemSchema, AnswerNoteSchema, AnswerSchema
 from apps.answers.domain import AnswerNote, AppletAnswerCreate, AssessmentAnswerCreate
+from apps.answers.outbox import AnswerEventsProcessor
 from apps.answers.service import AnswerService
 from apps.applets.domain.applet_full import AppletFull
 from apps.applets.errors import InvalidVersionError
@@ -141,24 +142,31 @@ class TestAnswerActivityItems(BaseTest):
     async def test_answer_activity_items_create_for_respondent(
         self,
         mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
         arbitrary_client: TestClient,
         tom: User,
         redis: RedisCacheTest,
         answer_with_alert_create: AppletAnswerCreate,
         mailbox: TestMail,
         session: AsyncSession,
+        arbitrary_session: AsyncSession,
     ):
         arbitrary_client.login(tom)
         response = await arbitrary_client.post(self.answer_url, data=answer_with_alert_create)
         assert response.status_code == http.HTTPStatus.CREATED, response.json()
 
+        mock_kiq_answer_events.assert_awaited_once()
+        # The event is written to the arbitrary database with the answer
+        assert await AnswerEventsProcessor(session, arbitrary_session).process_pending() == 1
+
         mock_kiq_report.assert_awaited_once()
 
         published_values = await redis.get(f"channel_{tom.id}")
         published_values = published_values or []
         assert len(published_values) == 1
         # 2 because alert for lucy and for tom
-        assert len(redis._storage) == 1
+        # The channel and the alert mail window key
+        assert set(redis._storage) == {f"channel_{tom.id}", f"alert_mail:{tom.id}"}
         assert len(mailbox.mails) == 1
         assert mailbox.mails[0].subject == "Response alert"
 
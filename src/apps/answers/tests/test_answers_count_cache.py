@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.answers.cache import AnswersCountCache
+from infrastructure.cache import CacheNotFound
+from infrastructure.utility.redis_client import RedisCacheTest
+
+
+async def test_answers_count_cache__set_and_get():
+    cache = AnswersCountCache()
+    applet_id = uuid.uuid4()
+    digest = cache.digest(True, {"respondent_ids": [uuid.uuid4()]})
+
+    await cache.set_total(applet_id, digest, 42)
+
+    assert (await cache.get(applet_id, digest)).instance.total == 42
+
+
+async def test_answers_count_cache__invalidate_drops_applet_totals():
+    cache = AnswersCountCache()
+    applet_id, other_applet_id = uuid.uuid4(), uuid.uuid4()
+    digest = cache.digest(True, {})
+    await cache.set_total(applet_id, digest, 1)
+    await cache.set_total(other_applet_id, digest, 2)
+
+    await cache.invalidate(applet_id)
+
+    with pytest.raises(CacheNotFound):
+        await cache.get(applet_id, digest)
+    assert (await cache.get(other_applet_id, digest)).instance.total == 2
+
+
+async def test_answers_count_cache__invalidate_on_commit_drops_totals_counted_before_commit():
+    cache = AnswersCountCache()
+    session = AsyncSession()
+    applet_id = uuid.uuid4()
+    digest = cache.digest(True, {})
+
+    await cache.invalidate_on_commit(session, applet_id)
+    # A concurrent request counts the answers before the commit
+    await cache.set_total(applet_id, digest, 1)
+    session.sync_session.dispatch.after_commit(session.sync_session)
+    await asyncio.sleep(0)
+
+    with pytest.raises(CacheNotFound):
+        await cache.get(applet_id, digest)
+
+
+async def test_answers_count_cache__revision_expires():
+    cache = AnswersCountCache()
+    applet_id = uuid.uuid4()
+
+    await cache.invalidate(applet_id)
+
+    _, expiry = RedisCacheTest._storage[cache._revision_key(applet_id)]
+    assert expiry is not None
+
+
+async def test_answers_count_cache__set_total_does_not_raise_redis_errors(mocker: MockerFixture):
+    cache = AnswersCountCache()
+    mocker.patch.object(cache.redis_client, "set", side_effect=ConnectionError("redis is down"))
+
+    await cache.set_total(uuid.uuid4(), cache.digest(True, {}), 1)
+
+
+def test_answers_count_cache__digest_depends_on_filters():
+    respondent_id = uuid.uuid4()
+    digest = AnswersCountCache.digest(True, {"respondent_ids": [respondent_id]})
+
+    assert digest == AnswersCountCache.digest(True, {"respondent_ids": [respondent_id]})
+    assert digest != AnswersCountCache.digest(False, {"respondent_ids": [respondent_id]})
+    assert digest != AnswersCountCache.digest(True, {})
+
+
+async def test_answers_count_cache__failed_invalidation_is_logged(mocker: MockerFixture):
+    cache = AnswersCountCache()
+    mocker.patch.object(cache.redis_client, "incr", return_value=0)
+    warning = mocker.patch("apps.answers.cache.logger.warning")
+
+    await cache.invalidate(uuid.uuid4())
+
+    warning.assert_called_once()
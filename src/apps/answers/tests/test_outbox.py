@@ -0,0 +1,90 @@
+import datetime
+from unittest.mock import AsyncMock
+
+from pytest_mock import MockerFixture
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.answers.crud.answer_events import AnswerEventsCRUD
+from apps.answers.db.schemas import AnswerEventSchema, AnswerSchema
+from apps.answers.outbox import AnswerEventsProcessor
+from config import settings
+
+
+async def test_answer_events_claim__leased_events_are_skipped(session: AsyncSession, answer: AnswerSchema):
+    crud = AnswerEventsCRUD(session)
+
+    events = await crud.claim(limit=10, lease=60, max_attempts=5)
+
+    assert [event.answer_id for event in events] == [answer.id]
+    assert events[0].attempts == 1
+    assert events[0].locked_until
+    assert await crud.claim(limit=10, lease=60, max_attempts=5) == []
+
+
+async def test_answer_events_claim__expired_lease_is_claimed_again(session: AsyncSession, answer: AnswerSchema):
+    crud = AnswerEventsCRUD(session)
+    await crud.claim(limit=10, lease=-1, max_attempts=2)
+
+    events = await crud.claim(limit=10, lease=-1, max_attempts=2)
+
+    assert [event.attempts for event in events] == [2]
+    # Attempts are exhausted
+    assert await crud.claim(limit=10, lease=-1, max_attempts=2) == []
+
+
+async def test_answer_events_processor(session: AsyncSession, answer: AnswerSchema, mock_kiq_report: AsyncMock):
+    assert await AnswerEventsProcessor(session, session).process_pending() == 1
+
+    # Processed events are not claimed again
+    assert await AnswerEventsCRUD(session).claim(limit=10, lease=-1, max_attempts=5) == []
+
+
+async def test_answer_events_processor__retries_failed_steps_only(
+    session: AsyncSession, answer: AnswerSchema, mocker: MockerFixture
+):
+    query = select(AnswerEventSchema).where(AnswerEventSchema.answer_id == answer.id)
+    event = (await session.execute(query)).scalar_one()
+    event.payload = dict(event.payload, allowed_ehr_ingest=True)
+    await session.flush()
+    report = mocker.patch("apps.answers.service.AnswerService.create_report_from_answer")
+    ehr = mocker.patch("apps.answers.service.AnswerService.trigger_ehr_ingestion", side_effect=ConnectionError())
+    # The failed event is claimed again right away
+    mocker.patch.object(settings.task_answer_events, "lease", -1)
+    processor = AnswerEventsProcessor(session, session)
+
+    # EHR ingestion fails after the report is queued
+    assert await processor.process_pending() == 0
+    report.assert_awaited_once()
+    ehr.assert_awaited_once()
+    assert (await session.execute(query)).scalar_one().report_done
+
+    ehr.side_effect = None
+    assert await processor.process_pending() == 1
+    # The report is not queued again
+    report.assert_awaited_once()
+    assert ehr.await_count == 2
+
+
+async def test_answer_events_delete_finished__removes_exhausted_events(session: AsyncSession, answer: AnswerSchema):
+    crud = AnswerEventsCRUD(session)
+    (event,) = await crud.claim(limit=10, lease=-1, max_attempts=2)
+    before = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) + datetime.timedelta(minutes=1)
+
+    # Attempts are left, the event is kept
+    assert await crud.delete_finished(before, max_attempts=2) == []
+    await crud.claim(limit=10, lease=-1, max_attempts=2)
+
+    assert await crud.delete_finished(before, max_attempts=2) == [event.id]
+    assert await crud.claim(limit=10, lease=-1, max_attempts=5) == []
+
+
+async def test_answer_events_delete_finished__removes_processed_events(
+    session: AsyncSession, answer: AnswerSchema, mock_kiq_report: AsyncMock
+):
+    await AnswerEventsProcessor(session, session).process_pending()
+    before = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) + datetime.timedelta(minutes=1)
+
+    # Only ids of failed events are returned
+    assert await AnswerEventsCRUD(session).delete_finished(before, max_attempts=5) == []
+    assert await AnswerEventsCRUD(session).count(answer_id=answer.id) == 0
@@ -0,0 +1,47 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.answers.db.schemas import AnswerSchema
+from apps.answers.domain import AppletAnswerCreate
+from apps.answers.submission_context import SubmissionContext
+from apps.applets.domain.applet_full import AppletFull
+from apps.subjects.db.schemas import SubjectSchema
+from apps.users import User
+from apps.workspaces.domain.constants import Role
+
+
+async def test_submission_context_load(
+    session: AsyncSession,
+    tom: User,
+    applet: AppletFull,
+    tom_applet_subject: SubjectSchema,
+    answer: AnswerSchema,
+    answer_create: AppletAnswerCreate,
+):
+    context = await SubmissionContext.load(session, session, tom.id, answer_create)
+
+    assert context.applet
+    assert context.applet.version_exists
+    assert Role.RESPONDENT in context.roles
+    assert context.respondent_subject
+    assert context.respondent_subject.id == tom_applet_subject.id
+    assert context.subject(None) == context.respondent_subject
+    assert [existing.id for existing in context.existing_answers] == [answer.id]
+    assert not context.assignment_exists
+
+
+async def test_submission_context_load__unknown_version_and_subject(
+    session: AsyncSession, tom: User, applet: AppletFull, answer_create: AppletAnswerCreate
+):
+    data = answer_create.model_copy(deep=True)
+    data.version = "0.0.0"
+    data.submit_id = uuid.uuid4()
+    data.target_subject_id = uuid.uuid4()
+
+    context = await SubmissionContext.load(session, session, tom.id, data)
+
+    assert context.applet
+    assert not context.applet.version_exists
+    assert context.subject(data.target_subject_id) is None
+    assert context.existing_answers == []
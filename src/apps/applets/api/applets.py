@@ -1,4 +1,3 @@
-import asyncio
 import uuid
 from copy import deepcopy
 
@@ -44,7 +43,7 @@ from apps.subjects.services import SubjectsService
 from apps.users.domain import User
 from apps.workspaces.domain.constants import Role
 from apps.workspaces.service.check_access import CheckAccessService
-from infrastructure.database import atomic
+from infrastructure.database import ReadFanOut, atomic
 from infrastructure.database.deps import get_session
 from infrastructure.http import get_language
 from infrastructure.logger import logger
@@ -96,11 +95,12 @@ async def applet_retrieve(
         service = AppletService(session, user.id)
         await service.exist_by_id(applet_id)
         await CheckAccessService(session, user.id).check_applet_detail_access(applet_id)
-        applet_future = service.get_single_language_by_id(applet_id, language)
-        subject_future = SubjectsService(session, user.id).get_by_user_and_applet(user.id, applet_id)
-        has_assessment_future = AppletService(session, user.id).has_assessment(applet_id)
-        applet, subject, has_assessment = await asyncio.gather(applet_future, subject_future, has_assessment_future)
-        applet_owner = await UserAppletAccessCRUD(session).get_applet_owner(applet_id)
+        applet, subject, has_assessment, applet_owner = await ReadFanOut(session).gather(
+            lambda s: AppletService(s, user.id).get_single_language_by_id(applet_id, language),
+            lambda s: SubjectsService(s, user.id).get_by_user_and_applet(user.id, applet_id),
+            lambda s: AppletService(s, user.id).has_assessment(applet_id),
+            lambda s: UserAppletAccessCRUD(s).get_applet_owner(applet_id),
+        )
         applet.owner_id = applet_owner.owner_id
     return AppletRetrieveResponse(
         result=AppletSingleLanguageDetailPublic.model_validate(applet),
@@ -135,6 +135,7 @@ async def applet_create(
         )
         manager_role = Role.EDITOR if has_editor else None
         applet = await AppletService(session, owner_id).create(schema, user.id, manager_role)
+    await AppletHistoryService(session, applet.id, applet.version).warm_up()
     return Response(result=public_detail.Applet.model_validate(applet))
 
 
@@ -149,6 +150,7 @@ async def applet_update(
         await service.exist_by_id(applet_id)
         await CheckAccessService(session, user.id).check_applet_edit_access(applet_id)
         applet = await service.update(applet_id, schema)
+    await AppletHistoryService(session, applet.id, applet.version).warm_up()
     try:
         await service.send_notification_to_applet_respondents(
             applet_id,
@@ -192,6 +194,7 @@ async def applet_duplicate(
         applet = await service.duplicate(
             applet_for_duplicate, schema.display_name, schema.encryption, schema.include_report_server
         )
+    await AppletHistoryService(session, applet.id, applet.version).warm_up()
     return Response(result=public_detail.Applet.model_validate(applet))
 
 
@@ -67,6 +67,7 @@ from apps.schedule.domain.schedule import (
     ReminderSettingRequest,
 )
 from apps.schedule.service import ScheduleService
+from apps.shared.blind_index import update_search_tokens
 from apps.subjects.db.schemas import SubjectSchema
 from apps.subjects.domain import Subject, SubjectCreate
 from apps.subjects.services import SubjectsService
@@ -98,6 +99,7 @@ async def update_subject_details(
     db_result = await session.execute(query, execution_options={"synchronize_session": False})
     mappings = db_result.mappings().all()
     updated_subject = SubjectSchema(**mappings[0])
+    await update_search_tokens(session, [updated_subject])
 
     return Subject.model_validate(updated_subject)
 
@@ -4,6 +4,7 @@ import csv
 import datetime
 import io
 import os
+import re
 import tracemalloc
 import uuid
 from typing import BinaryIO, Optional, TypeVar, cast
@@ -24,6 +25,7 @@ from apps.job.errors import JobStatusError
 from apps.job.service import JobService
 from apps.schedule.db.schemas import EventSchema
 from apps.schedule.domain.constants import PeriodicityType
+from apps.schedule.occurrences import event_occurrences
 from apps.shared.domain import parse_obj_as
 from apps.shared.domain.base import PublicModel
 from apps.subjects.db.schemas import SubjectSchema
@@ -34,7 +36,7 @@ from config import get_settings, settings
 from infrastructure.commands.utils import coro
 from infrastructure.database import atomic, session_manager
 from infrastructure.storage.storage import get_operations_storage
-from infrastructure.storage.storage_client import ObjectNotFoundError, StorageClient
+from infrastructure.storage.storage_client import StorageClient
 
 app = typer.Typer()
 
@@ -45,6 +47,9 @@ PATH_PREFIX = settings.applet_ema.export_path_prefix
 PATH_FLOW_FILE_NAME = settings.applet_ema.export_flow_file_name
 PATH_USER_FLOW_SCHEDULE_FILE_NAME = settings.applet_ema.export_user_flow_schedule_file_name
 PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME = settings.applet_ema.export_user_activity_schedule_file_name
+PATH_SCHEDULE_PARTITIONS_DIR = "partitions"
+# A partition a day, the listing is given up after about 270 years of them
+PARTITIONS_MAX_KEYS = 100_000
 
 
 # Not ISO
@@ -157,6 +162,87 @@ async def save_csv(path: str, data: list[dict], cdn_client: StorageClient, colum
         await cdn_client.upload(path, f)
 
 
+async def save_schedule_partition(
+    cdn_client: StorageClient,
+    path_prefix: str,
+    unique_prefix: str,
+    filename: str,
+    scheduled_date: datetime.date,
+    data: list[dict],
+) -> None:
+    """
+    Uploads the rows of the day as a partition file, the previous days files
+    are not read nor written. A day without rows gets an empty partition, so
+    the partitions list all the exported days.
+    """
+    partition_key = cdn_client.generate_key(
+        path_prefix, f"{unique_prefix}/{PATH_SCHEDULE_PARTITIONS_DIR}", filename.format(date=scheduled_date)
+    )
+    print(f"Upload file to the {partition_key}")
+    await cdn_client.upload(partition_key, create_csv(data) or io.BytesIO())
+
+
+async def get_schedule_partitions(
+    cdn_client: StorageClient, path_prefix: str, unique_prefix: str, filename: str
+) -> dict[datetime.date, str] | None:
+    """
+    Partition keys by date, listed from the storage, None when they could not be listed.
+
+    Days exported before the partitions are in the appended file of the day
+    before the first partition, it is returned as the first partition.
+    """
+    partitions_prefix = cdn_client.generate_key(path_prefix, f"{unique_prefix}/{PATH_SCHEDULE_PARTITIONS_DIR}", "")
+    keys = await cdn_client.list_keys(partitions_prefix, PARTITIONS_MAX_KEYS)
+    if keys is None:
+        return None
+    before, _, after = filename.partition("{date}")
+    pattern = re.compile(re.escape(partitions_prefix + before) + r"(\d{4}-\d{2}-\d{2})" + re.escape(after))
+    partitions = {datetime.date.fromisoformat(match.group(1)): key for key in keys if (match := pattern.fullmatch(key))}
+    if partitions:
+        prev_date = min(partitions) - datetime.timedelta(days=1)
+        prev_key = cdn_client.generate_key(path_prefix, unique_prefix, filename.format(date=prev_date))
+        if (await cdn_client.check_existence_many([prev_key]))[prev_key]:
+            partitions[prev_date] = prev_key
+    return dict(sorted(partitions.items()))
+
+
+async def compact_schedule_partitions(
+    path_prefix: str, unique_prefix: str, filename: str, to_date: datetime.date | None = None
+) -> None:
+    """
+    Combines the partitions of the days up to the date into the file of the
+    date, with the same content the previous day by day appending produced.
+
+    The partitions are listed from the storage, concurrent exports of
+    different days do not share any file.
+    """
+    cdn_client = await get_operations_storage(get_settings())
+    partitions = await get_schedule_partitions(cdn_client, path_prefix, unique_prefix, filename)
+    if partitions is None:
+        print("[bold red]Error: partitions could not be listed[/bold red]")
+        exit(1)
+    partitions = {date: key for date, key in partitions.items() if to_date is None or date <= to_date}
+    if not partitions:
+        print("[bold red]Error: no partitions to compact[/bold red]")
+        exit(1)
+
+    last_date = max(partitions)
+    filename = filename.format(date=last_date)
+    key = cdn_client.generate_key(path_prefix, unique_prefix, filename)
+    path = settings.uploads_dir / filename
+    with open(path, "wb") as f:
+        for partition_key in partitions.values():
+            partition_file, _ = cdn_client.download(partition_key)
+            if f.tell():
+                # Header is written once
+                partition_file.readline()
+            f.write(partition_file.read())
+    with open(path, "rb") as f:
+        print(f"Upload {len(partitions)} partitions to the {key}")
+        await cdn_client.upload(key, f)
+    os.remove(path)
+
+
 async def _export_flows(applet_id: uuid.UUID, path_prefix: str):
     """
     select
@@ -228,6 +314,8 @@ async def export_flows(
 async def get_user_flow_events(
     session: AsyncSession, scheduled_date: datetime.date, applet_id: uuid.UUID
 ) -> list[FlowEventRawRow]:
+    """Rows of the events of the users occurring on the date"""
+    occurrences = event_occurrences(scheduled_date, scheduled_date).subquery()
     cte = (
         select(
             EventSchema.applet_id,
@@ -249,7 +337,12 @@ async def get_user_flow_events(
             EventSchema.end_time,
         )
         .select_from(EventSchema)
-        .where(EventSchema.is_deleted == false(), EventSchema.periodicity != PeriodicityType.ALWAYS)
+        .join(occurrences, occurrences.c.event_id == EventSchema.id)
+        .where(
+            EventSchema.applet_id == applet_id,
+            EventSchema.is_deleted == false(),
+            EventSchema.periodicity != PeriodicityType.ALWAYS,
+        )
     ).cte("user_flow_events")
 
     query = (
@@ -306,6 +399,11 @@ async def get_user_flow_events(
 
 
 def filter_events(raw_events_rows: list[TRawRow], schedule_date: datetime.date) -> list[TRawRow]:  # noqa: C901
+    """
+    Filters the rows of the events occurring on the date day by day.
+    The exports select the occurrences with `event_occurrences` instead, this
+    is the reference of the rules they follow.
+    """
     filtered: list[TRawRow] = []
     for row in raw_events_rows:
         # TODO: patch events with periodicity WEEKDAYS, WEEKLY, some events don't have start_date and end_date
@@ -417,12 +515,10 @@ async def export_flow_schedule(
 
     try:
         async with session_maker() as session:
-            raw_data = await get_user_flow_events(session, scheduled_date, applet_id)
-        print(f"Num raw rows is {len(raw_data)}")
-        filtered = filter_events(raw_data, scheduled_date)
-        print(f"Num filtered rows is {len(filtered)}")
+            rows = await get_user_flow_events(session, scheduled_date, applet_id)
+        print(f"Num rows is {len(rows)}")
         result = []
-        for row in filtered:
+        for row in rows:
             outrow = FlowEventOutputRow(
                 applet_id=row.applet_id,
                 date_prior_day=scheduled_date,
@@ -439,28 +535,14 @@ async def export_flow_schedule(
             result.append(outrow)
 
         cdn_client = await get_operations_storage(get_settings())
-        unique_prefix = f"{applet_id}/flow-schedule"
-
-        prev_filename = PATH_USER_FLOW_SCHEDULE_FILE_NAME.format(date=scheduled_date - datetime.timedelta(days=1))
-        prev_key = cdn_client.generate_key(path_prefix, unique_prefix, prev_filename)
-
-        filename = PATH_USER_FLOW_SCHEDULE_FILE_NAME.format(date=scheduled_date)
-        key = cdn_client.generate_key(path_prefix, unique_prefix, filename)
-
-        path = settings.uploads_dir / filename
-
-        with open(path, "wb") as f:
-            try:
-                cdn_client.download(prev_key, f)
-            except ObjectNotFoundError:
-                pass
-            f.seek(0, io.SEEK_END)
-            create_csv(result, append_to=f)
-        with open(path, "rb") as f:
-            print(f"Upload file to the {key}")
-            await cdn_client.upload(key, f)
-
-        os.remove(path)
+        await save_schedule_partition(
+            cdn_client,
+            path_prefix,
+            f"{applet_id}/flow-schedule",
+            PATH_USER_FLOW_SCHEDULE_FILE_NAME,
+            scheduled_date,
+            result,
+        )
 
         async with session_maker() as session:
             async with atomic(session):
@@ -481,6 +563,8 @@ async def export_flow_schedule(
 async def get_user_activity_events(
     session: AsyncSession, scheduled_date: datetime.date, applet_id: uuid.UUID
 ) -> list[ActivityEventRawRow]:
+    """Rows of the events of the users occurring on the date"""
+    occurrences = event_occurrences(scheduled_date, scheduled_date).subquery()
     cte = (
         select(
             EventSchema.applet_id,
@@ -502,7 +586,12 @@ async def get_user_activity_events(
             EventSchema.end_time,
         )
         .select_from(EventSchema)
-        .where(EventSchema.is_deleted == false(), EventSchema.periodicity != PeriodicityType.ALWAYS)
+        .join(occurrences, occurrences.c.event_id == EventSchema.id)
+        .where(
+            EventSchema.applet_id == applet_id,
+            EventSchema.is_deleted == false(),
+            EventSchema.periodicity != PeriodicityType.ALWAYS,
+        )
     ).cte("user_activity_events")
 
     query = (
@@ -601,12 +690,10 @@ async def export_activity_schedule(
     try:
         session_maker = session_manager.get_session()
         async with session_maker() as session:
-            raw_data = await get_user_activity_events(session, scheduled_date, applet_id)
-        print(f"Num raw rows is {len(raw_data)}")
-        filtered = filter_events(raw_data, scheduled_date)
-        print(f"Num filtered rows is {len(filtered)}")
+            rows = await get_user_activity_events(session, scheduled_date, applet_id)
+        print(f"Num rows is {len(rows)}")
         result = []
-        for row in filtered:
+        for row in rows:
             outrow = ActivityEventOutputRow(
                 applet_id=row.applet_id,
                 date_prior_day=scheduled_date,
@@ -623,28 +710,14 @@ async def export_activity_schedule(
             result.append(outrow)
 
         cdn_client = await get_operations_storage(get_settings())
-        unique_prefix = f"{applet_id}/activity-schedule"
-
-        prev_filename = PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME.format(date=scheduled_date - datetime.timedelta(days=1))
-        prev_key = cdn_client.generate_key(path_prefix, unique_prefix, prev_filename)
-
-        filename = PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME.format(date=scheduled_date)
-        key = cdn_client.generate_key(path_prefix, unique_prefix, filename)
-
-        path = settings.uploads_dir / filename
-
-        with open(path, "wb") as f:
-            try:
-                cdn_client.download(prev_key, f)
-            except ObjectNotFoundError:
-                pass
-            f.seek(0, io.SEEK_END)
-            create_csv(result, append_to=f)
-        with open(path, "rb") as f:
-            print(f"Upload file to the {key}")
-            await cdn_client.upload(key, f)
-
-        os.remove(path)
+        await save_schedule_partition(
+            cdn_client,
+            path_prefix,
+            f"{applet_id}/activity-schedule",
+            PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME,
+            scheduled_date,
+            result,
+        )
         async with session_maker() as session:
             async with atomic(session):
                 await JobService(session, owner_id).change_status(job.id, JobStatus.success)
@@ -658,3 +731,47 @@ async def export_activity_schedule(
     tracemalloc.stop()
     print("Activity schedule export finished")
     print("Peak memory usage:", peak)
+
+
+@app.command(short_help="Combine daily user flow schedule partitions to csv")
+@coro
+async def compact_flow_schedule(
+    to_date: datetime.datetime = typer.Argument(None, help="last date, all partitions by default"),
+    applet_id: Optional[uuid.UUID] = typer.Option(None, "--applet_id", "-a"),
+    path_prefix: Optional[str] = typer.Option(PATH_PREFIX, "--path-prefix", "-p"),
+):
+    """
+    Create and upload to s3 csv file with the flow schedule of all days up to the date
+    """
+    assert path_prefix
+    applet_id = get_applet_id(applet_id)
+    print(f"Flow schedule compaction start {applet_id}")
+    await compact_schedule_partitions(
+        path_prefix,
+        f"{applet_id}/flow-schedule",
+        PATH_USER_FLOW_SCHEDULE_FILE_NAME,
+        to_date.date() if to_date else None,
+    )
+    print("Flow schedule compaction finished")
+
+
+@app.command(short_help="Combine daily user activity schedule partitions to csv")
+@coro
+async def compact_activity_schedule(
+    to_date: datetime.datetime = typer.Argument(None, help="last date, all partitions by default"),
+    applet_id: Optional[uuid.UUID] = typer.Option(None, "--applet_id", "-a"),
+    path_prefix: Optional[str] = typer.Option(PATH_PREFIX, "--path-prefix", "-p"),
+):
+    """
+    Create and upload to s3 csv file with the activity schedule of all days up to the date
+    """
+    assert path_prefix
+    applet_id = get_applet_id(applet_id)
+    print(f"Activity schedule compaction start {applet_id}")
+    await compact_schedule_partitions(
+        path_prefix,
+        f"{applet_id}/activity-schedule",
+        PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME,
+        to_date.date() if to_date else None,
+    )
+    print("Activity schedule compaction finished")
@@ -11,9 +11,9 @@ from sqlalchemy.sql.functions import count, func
 
 from apps.activities.db.schemas import ActivitySchema
 from apps.applets import errors
-from apps.applets.db.schemas import AppletSchema
+from apps.applets.db.schemas import AppletHistorySchema, AppletSchema
 from apps.applets.domain import Role
-from apps.applets.domain.applet import AppletDataRetention
+from apps.applets.domain.applet import AppletDataRetention, AppletSubmissionState
 from apps.applets.domain.applet_create_update import AppletReportConfiguration
 from apps.applets.errors import AppletNotFoundError
 from apps.folders.db.schemas import FolderAppletSchema, FolderSchema
@@ -125,6 +125,31 @@ class AppletsCRUD(BaseCRUD[AppletSchema]):
 
         return db_result.scalars().first() is not None
 
+    async def get_submission_state(
+        self, applet_id: uuid.UUID, applet_history_id: str, user_id: uuid.UUID
+    ) -> AppletSubmissionState | None:
+        """Public link, version existence and roles of the user in one query"""
+        version_query: Query = select(AppletHistorySchema.id_version)
+        version_query = version_query.where(AppletHistorySchema.id_version == applet_history_id)
+
+        roles_query: Query = select(func.array_agg(UserAppletAccessSchema.role))
+        roles_query = roles_query.where(UserAppletAccessSchema.applet_id == applet_id)
+        roles_query = roles_query.where(UserAppletAccessSchema.user_id == user_id)
+        roles_query = roles_query.where(UserAppletAccessSchema.soft_exists())
+
+        query: Query = select(
+            AppletSchema.link.isnot(None).label("is_public"),
+            version_query.exists().label("version_exists"),
+            roles_query.scalar_subquery().label("roles"),
+        )
+        query = query.where(AppletSchema.id == applet_id)
+
+        db_result = await self._execute(query)
+        row = db_result.one_or_none()
+        if not row:
+            return None
+        return AppletSubmissionState(is_public=row.is_public, version_exists=row.version_exists, roles=row.roles or [])
+
     async def get_applets_by_roles(
         self,
         user_id: uuid.UUID,
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Query
 from apps.applets.db.schemas import AppletHistorySchema
 from apps.applets.domain.applet_create_update import AppletReportConfiguration
 from apps.applets.errors import AppletVersionNotFoundError
+from apps.applets.history_cache import invalidate_applet_version
 from apps.users.db.schemas import UserSchema
 from infrastructure.database.crud import BaseCRUD
 
@@ -56,6 +57,7 @@ class AppletHistoriesCRUD(BaseCRUD[AppletHistorySchema]):
             display_name=display_name,
         )
         await self._execute(query)
+        await invalidate_applet_version(self.session, id_version)
 
     async def get_versions_by_applet_id(self, applet_id: uuid.UUID) -> list[str]:
         query: Query = select(AppletHistorySchema.version)
@@ -77,3 +79,4 @@ class AppletHistoriesCRUD(BaseCRUD[AppletHistorySchema]):
         query = query.values(**schema.model_dump(by_alias=False))
 
         await self._execute(query)
+        await invalidate_applet_version(self.session, AppletHistorySchema.generate_id_version(applet_id, version))
@@ -24,7 +24,7 @@ from apps.activity_flows.domain.flow_full import PublicFlowFull
 from apps.applets.domain.base import AppletBaseInfo, AppletFetchBase, Encryption
 from apps.shared.domain import InternalModel, PublicModel, _BaseModel
 from apps.themes.domain import PublicTheme, PublicThemeMobile, Theme
-from apps.workspaces.domain.constants import DataRetention
+from apps.workspaces.domain.constants import DataRetention, Role
 
 
 class Applet(AppletFetchBase, InternalModel):
@@ -132,6 +132,14 @@ class AppletDataRetention(InternalModel):
         return self
 
 
+class AppletSubmissionState(InternalModel):
+    """State of the applet an answer is submitted to, for a particular user"""
+
+    is_public: bool
+    version_exists: bool
+    roles: list[Role] = Field(default_factory=list)
+
+
 class AppletMeta(PublicModel):
     has_assessment: bool = False
 
@@ -0,0 +1,65 @@
+"""Caches of applet version history.
+
+History rows are written once per applet version and are read on every
+answer submission, report check, export and alert. All caches are keyed
+by `id_version`.
+
+The only in-place updates of history rows are the display name and the
+report configuration of the current version, the CRUD methods doing them
+drop the cached values, once more after the update is committed.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.activities.domain import ActivityHistory
+from apps.activities.domain.activity_full import ActivityItemHistoryFull
+from apps.activity_flows.domain.flow_full import FlowHistoryWithActivityFull
+from apps.applets.domain.applet_full import AppletHistoryFull
+from config import settings
+from infrastructure.cache import ImmutableCache
+from infrastructure.database.core import after_commit
+
+__all__ = [
+    "activity_history_cache",
+    "activity_items_history_cache",
+    "applet_full_key",
+    "applet_history_cache",
+    "flow_history_cache",
+    "invalidate_activity_version",
+    "invalidate_applet_version",
+]
+
+
+def _cache(name: str, type_) -> ImmutableCache:
+    return ImmutableCache(
+        name,
+        type_,
+        ttl=settings.service.history_cache_ttl,
+        local_ttl=settings.service.history_cache_local_ttl,
+        maxsize=settings.service.history_cache_size,
+    )
+
+
+applet_history_cache: ImmutableCache[AppletHistoryFull] = _cache("AppletHistoryFull", AppletHistoryFull)
+activity_history_cache: ImmutableCache[ActivityHistory] = _cache("ActivityHistory", ActivityHistory)
+activity_items_history_cache: ImmutableCache[list[ActivityItemHistoryFull]] = _cache(
+    "ActivityItemHistory", list[ActivityItemHistoryFull]
+)
+# Flows with their items only, activities are not included
+flow_history_cache: ImmutableCache[FlowHistoryWithActivityFull] = _cache("FlowHistory", FlowHistoryWithActivityFull)
+
+
+def applet_full_key(id_version: str, non_performance: bool) -> str:
+    return f"{id_version}:{int(non_performance)}"
+
+
+async def invalidate_applet_version(session: AsyncSession, id_version: str) -> None:
+    keys = applet_full_key(id_version, False), applet_full_key(id_version, True)
+    await applet_history_cache.delete(*keys)
+    after_commit(session, lambda: applet_history_cache.delete(*keys))
+
+
+async def invalidate_activity_version(session: AsyncSession, id_version: str, applet_id_version: str) -> None:
+    await activity_history_cache.delete(id_version)
+    after_commit(session, lambda: activity_history_cache.delete(id_version))
+    await invalidate_applet_version(session, applet_id_version)
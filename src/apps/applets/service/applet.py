@@ -37,6 +37,7 @@ from apps.applets.errors import (
     AppletsFolderAccessDenied,
 )
 from apps.applets.service.applet_history_service import AppletHistoryService
+from apps.applets.tasks import send_applet_notification
 from apps.folders.crud import FolderAppletCRUD, FolderCRUD
 from apps.integrations.crud.integrations import IntegrationsCRUD
 from apps.schedule.service import ScheduleService
@@ -61,7 +62,7 @@ __all__ = [
 ]
 
 from apps.shared.query_params import QueryParams
-from infrastructure.utility.notification_client import FCMNotification, FirebaseMessage, FirebaseNotificationType
+from infrastructure.utility.notification_client import FirebaseMessage, FirebaseNotificationType
 
 
 class AppletService:
@@ -812,21 +813,18 @@ class AppletService:
         device_ids: list | None = None,
         respondent_ids: list | None = None,
     ):
-        if device_ids is None:
-            device_ids = []
-        respondents_device_ids = await AppletsCRUD(self.session).get_respondents_device_ids(applet_id, respondent_ids)
-        respondents_device_ids += device_ids
-        await FCMNotification().notify(
-            respondents_device_ids,
-            FirebaseMessage(
-                title=title,
-                body=body,
-                data=dict(
-                    type=type_,
-                    applet_id=applet_id,
-                ),
+        """Queues a push to the respondent devices, sent by a worker"""
+        message = FirebaseMessage(
+            title=title,
+            body=body,
+            data=dict(
+                type=type_,
+                applet_id=applet_id,
             ),
         )
+        await send_applet_notification.kiq(
+            applet_id, message.model_dump(mode="json"), device_ids=device_ids, respondent_ids=respondent_ids
+        )
 
     async def get_info_by_id(self, applet_id: uuid.UUID, language: str) -> AppletActivitiesBaseInfo:
         schema = await AppletsCRUD(self.session).get_by_id(applet_id)
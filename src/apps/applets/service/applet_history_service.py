@@ -7,8 +7,10 @@ from apps.applets.db.schemas import AppletHistorySchema
 from apps.applets.domain import AppletHistory, AppletHistoryChange
 from apps.applets.domain.applet_full import AppletFull, AppletHistoryFull
 from apps.applets.errors import NotValidAppletHistory
+from apps.applets.history_cache import applet_full_key, applet_history_cache
 from apps.applets.service.applet_change import AppletChangeService
 from apps.shared.version import INITIAL_VERSION
+from infrastructure.logger import logger
 
 __all__ = ["AppletHistoryService"]
 
@@ -81,6 +83,22 @@ class AppletHistoryService:
         return prev_version
 
     async def get_full(self, non_performance=False) -> AppletHistoryFull:
+        applet = await applet_history_cache.get_or_load(
+            applet_full_key(self._id_version, non_performance), lambda: self._load_full(non_performance)
+        )
+        assert applet
+        return applet
+
+    async def warm_up(self) -> None:
+        """Puts the just published version into the history cache."""
+        if not applet_history_cache.enabled:
+            return
+        try:
+            await self.get_full()
+        except Exception:
+            logger.exception(f"Failed to warm up the history cache of {self._id_version}")
+
+    async def _load_full(self, non_performance: bool) -> AppletHistoryFull:
         schema = await AppletHistoriesCRUD(self.session).get_by_id_version(self._id_version)
         applet = AppletHistoryFull.model_validate(schema)
         applet.activities = await ActivityHistoryService(self.session, self._applet_id, self._version).get_full(
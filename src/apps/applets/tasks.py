@@ -0,0 +1,54 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.crud import AppletsCRUD
+from apps.users.cruds.user_device import UserDevicesCRUD
+from broker import broker
+from infrastructure.database import atomic, session_manager
+from infrastructure.logger import logger
+from infrastructure.utility.notification_client import FCMNotification, FirebaseMessage, NotificationResult
+
+
+async def notify_applet_respondents(
+    session: AsyncSession,
+    applet_id: uuid.UUID,
+    message: FirebaseMessage,
+    *,
+    device_ids: list[str] | None = None,
+    respondent_ids: list[uuid.UUID] | None = None,
+) -> NotificationResult:
+    """Pushes the message to the respondent devices, removes dead tokens.
+
+    Tokens FCM reported as unregistered or invalid are deleted, so the
+    following pushes do not send to them again.
+    """
+    devices = await AppletsCRUD(session).get_respondents_device_ids(applet_id, respondent_ids)
+    devices += device_ids or []
+    result = await FCMNotification().notify(devices, message)
+    if result.invalid_devices:
+        async with atomic(session):
+            await UserDevicesCRUD(session).delete_by_device_ids(result.invalid_devices)
+    logger.info(
+        f"Applet {applet_id} push: {result.success_count} sent, {result.failure_count} failed, "
+        f"{len(result.invalid_devices)} dead tokens removed"
+    )
+    return result
+
+
+@broker.task()
+async def send_applet_notification(
+    applet_id: uuid.UUID,
+    message: dict,
+    device_ids: list[str] | None = None,
+    respondent_ids: list[uuid.UUID] | None = None,
+) -> None:
+    session_maker = session_manager.get_session()
+    async with session_maker() as session:
+        await notify_applet_respondents(
+            session,
+            applet_id,
+            FirebaseMessage.model_validate(message),
+            device_ids=device_ids,
+            respondent_ids=respondent_ids,
+        )
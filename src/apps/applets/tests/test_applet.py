@@ -39,6 +39,7 @@ from apps.workspaces.service.user_applet_access import UserAppletAccessService
 from infrastructure.utility.notification_client import FCMNotificationTest
 
 
+@pytest.mark.usefixtures("mock_kiq_applet_notification")
 class TestApplet:
     login_url = "/auth/login"
     applet_list_url = "applets"
@@ -0,0 +1,119 @@
+import uuid
+from unittest.mock import ANY
+
+import pytest
+from firebase_admin import exceptions, messaging
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.domain.applet_full import AppletFull
+from apps.applets.service import AppletService
+from apps.applets.tasks import notify_applet_respondents
+from apps.users.cruds.user_device import UserDevicesCRUD
+from config import settings
+from infrastructure.utility.notification_client import (
+    FCMNotification,
+    FCMNotificationTest,
+    FirebaseMessage,
+    FirebaseNotificationType,
+)
+
+
+@pytest.fixture
+def message() -> FirebaseMessage:
+    return FirebaseMessage(
+        title="Applet is updated.",
+        body="",
+        data=dict(type=FirebaseNotificationType.APPLET_UPDATE, applet_id=uuid.uuid4()),
+    )
+
+
+@pytest.fixture
+def fcm() -> FCMNotification:
+    client = object.__new__(FCMNotification)
+    client._initialized = True
+    return client
+
+
+def _batch_response(tokens: list[str], failed: dict[str, Exception]) -> messaging.BatchResponse:
+    responses = [messaging.SendResponse({"name": token}, failed.get(token)) for token in tokens]
+    return messaging.BatchResponse(responses)
+
+
+async def test_notify__tokens_sent_in_chunks(fcm: FCMNotification, message: FirebaseMessage, mocker: MockerFixture):
+    mocker.patch.object(settings.fcm, "multicast_size", 2)
+    failed = {
+        "unregistered": messaging.UnregisteredError("Requested entity was not found."),
+        "malformed": exceptions.InvalidArgumentError("The registration token is not a valid FCM registration token"),
+        "unavailable": exceptions.UnavailableError("Service unavailable"),
+    }
+
+    async def send(multicast: messaging.MulticastMessage, app=None) -> messaging.BatchResponse:
+        return _batch_response(multicast.tokens, failed)
+
+    send_mock = mocker.patch.object(messaging, "send_each_for_multicast_async", side_effect=send)
+
+    result = await fcm.notify(["ok-1", "unregistered", "ok-1", "malformed", "unavailable"], message)
+
+    assert [call.args[0].tokens for call in send_mock.call_args_list] == [
+        ["ok-1", "unregistered"],
+        ["malformed", "unavailable"],
+    ]
+    assert result.success_count == 1
+    assert result.failure_count == 3
+    assert result.invalid_devices == ["unregistered", "malformed"]
+
+
+async def test_notify__failed_chunk_does_not_fail_others(
+    fcm: FCMNotification, message: FirebaseMessage, mocker: MockerFixture
+):
+    mocker.patch.object(settings.fcm, "multicast_size", 1)
+
+    async def send(multicast: messaging.MulticastMessage, app=None) -> messaging.BatchResponse:
+        if multicast.tokens == ["broken"]:
+            raise messaging.QuotaExceededError("Quota exceeded")
+        return _batch_response(multicast.tokens, {})
+
+    mocker.patch.object(messaging, "send_each_for_multicast_async", side_effect=send)
+
+    result = await fcm.notify(["broken", "ok"], message)
+
+    assert result.success_count == 1
+    assert result.failure_count == 1
+    assert result.invalid_devices == []
+
+
+async def test_notify_applet_respondents__dead_tokens_removed(
+    session: AsyncSession,
+    applet_one: AppletFull,
+    device_tom: str,
+    fcm_client: FCMNotificationTest,
+    message: FirebaseMessage,
+    mocker: MockerFixture,
+):
+    mocker.patch.object(FCMNotificationTest, "invalid_devices", {device_tom})
+
+    result = await notify_applet_respondents(session, applet_one.id, message)
+
+    assert result.invalid_devices == [device_tom]
+    assert device_tom not in fcm_client.notifications
+    assert await UserDevicesCRUD(session).get_by_device_id(device_tom) is None
+
+
+async def test_send_notification_to_applet_respondents__queued(
+    session: AsyncSession,
+    applet_one: AppletFull,
+    device_tom: str,
+    fcm_client: FCMNotificationTest,
+    mocker: MockerFixture,
+):
+    kiq = mocker.patch("apps.applets.tasks.send_applet_notification.kiq")
+
+    await AppletService(session, uuid.uuid4()).send_notification_to_applet_respondents(
+        applet_one.id, "Applet is updated.", "", FirebaseNotificationType.APPLET_UPDATE
+    )
+
+    kiq.assert_awaited_once_with(applet_one.id, ANY, device_ids=None, respondent_ids=None)
+    assert kiq.await_args.args[1]["title"] == "Applet is updated."
+    # The push is sent by the worker
+    assert device_tom not in fcm_client.notifications
@@ -0,0 +1,94 @@
+import datetime
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from apps.applets.commands.applet_ema import (
+    compact_schedule_partitions,
+    create_csv,
+    get_schedule_partitions,
+    save_schedule_partition,
+)
+from infrastructure.storage.storage_client import ObjectNotFoundError, StorageClient
+
+DATE = datetime.date(2024, 3, 4)
+
+
+@pytest.fixture
+def cdn_client() -> MagicMock:
+    """Storage with the uploaded files"""
+    files: dict[str, bytes] = {}
+    client = MagicMock(spec=StorageClient)
+    client.generate_key.side_effect = lambda scope, unique, filename: f"{scope}/{unique}/{filename}"
+
+    async def _upload(key, f):
+        files[key] = f.read()
+
+    def _download(key, f=None):
+        if key not in files:
+            raise ObjectNotFoundError()
+        return io.BytesIO(files[key]), "text/csv"
+
+    client.upload = AsyncMock(side_effect=_upload)
+    client.download.side_effect = _download
+    client.check_existence_many = AsyncMock(side_effect=lambda keys, prefix=None: {key: key in files for key in keys})
+    client.list_keys = AsyncMock(side_effect=lambda prefix, max_keys: {key for key in files if key.startswith(prefix)})
+    client.files = files
+    return client
+
+
+async def test_save_schedule_partition__uploads_day_only(cdn_client: MagicMock):
+    for day in range(3):
+        date = DATE + datetime.timedelta(days=day)
+        await save_schedule_partition(cdn_client, "export", "applet", "{date}.csv", date, [{"day": day}])
+
+    assert sorted(cdn_client.files) == [
+        "export/applet/partitions/2024-03-04.csv",
+        "export/applet/partitions/2024-03-05.csv",
+        "export/applet/partitions/2024-03-06.csv",
+    ]
+    assert cdn_client.files["export/applet/partitions/2024-03-06.csv"] == b"day\r\n2\r\n"
+    assert cdn_client.upload.await_count == 3
+
+
+async def test_get_schedule_partitions__appended_file_before_first_partition(cdn_client: MagicMock):
+    prev_file = create_csv([{"day": 0}])
+    assert prev_file
+    cdn_client.files["export/applet/2024-03-03.csv"] = prev_file.read()
+    cdn_client.files["export/applet/partitions/other-2024-03-05.csv"] = b""
+    await save_schedule_partition(cdn_client, "export", "applet", "{date}.csv", DATE, [])
+
+    partitions = await get_schedule_partitions(cdn_client, "export", "applet", "{date}.csv")
+
+    assert partitions == {
+        DATE - datetime.timedelta(days=1): "export/applet/2024-03-03.csv",
+        DATE: "export/applet/partitions/2024-03-04.csv",
+    }
+    assert cdn_client.files["export/applet/partitions/2024-03-04.csv"] == b""
+
+
+async def test_compact_schedule_partitions(cdn_client: MagicMock, mocker: MockerFixture):
+    mocker.patch("apps.applets.commands.applet_ema.get_operations_storage", return_value=cdn_client)
+    prev_file = create_csv([{"day": 0}])
+    assert prev_file
+    cdn_client.files["export/applet/2024-03-03.csv"] = prev_file.read()
+    # Days are exported out of order, e.g. by concurrent runs
+    for day in (2, 0, 1):
+        date = DATE + datetime.timedelta(days=day)
+        await save_schedule_partition(cdn_client, "export", "applet", "{date}.csv", date, [{"day": day + 1}] * day)
+
+    await compact_schedule_partitions("export", "applet", "{date}.csv", to_date=DATE + datetime.timedelta(days=1))
+
+    assert cdn_client.files["export/applet/2024-03-05.csv"] == b"day\r\n0\r\n2\r\n"
+
+
+async def test_compact_schedule_partitions__listing_failed(cdn_client: MagicMock, mocker: MockerFixture):
+    mocker.patch("apps.applets.commands.applet_ema.get_operations_storage", return_value=cdn_client)
+    await save_schedule_partition(cdn_client, "export", "applet", "{date}.csv", DATE, [{"day": 0}])
+    cdn_client.list_keys.side_effect = None
+    cdn_client.list_keys.return_value = None
+
+    with pytest.raises(SystemExit):
+        await compact_schedule_partitions("export", "applet", "{date}.csv")
@@ -2,6 +2,7 @@ import uuid
 from typing import cast
 
 import pytest
+from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.applets.crud.applets import AppletsCRUD
@@ -10,6 +11,8 @@ from apps.applets.db.schemas import AppletHistorySchema, AppletSchema
 from apps.applets.domain.applet_create_update import AppletReportConfiguration
 from apps.applets.domain.base import AppletBase, AppletReportConfigurationBase
 from apps.applets.errors import AppletVersionNotFoundError
+from apps.applets.history_cache import applet_history_cache, invalidate_applet_version
+from apps.applets.service.applet_history_service import AppletHistoryService
 from apps.shared.version import INITIAL_VERSION
 from apps.users.domain import User
 
@@ -138,6 +141,24 @@ async def test_update_display_name(applet_history: AppletHistorySchema, session:
     assert updated.display_name == new_display_name
 
 
+async def test_update_display_name__cached_applet_is_dropped(
+    applet_history: AppletHistorySchema, session: AsyncSession, mocker: MockerFixture
+):
+    mocker.patch.object(applet_history_cache, "ttl", 60)
+    await invalidate_applet_version(session, applet_history.id_version)
+    service = AppletHistoryService(session, applet_history.id, applet_history.version)
+    load = mocker.spy(service, "_load_full")
+    for _ in range(2):
+        assert (await service.get_full()).display_name == applet_history.display_name
+    # The second read is a cache hit
+    load.assert_called_once()
+
+    await AppletHistoriesCRUD(session).update_display_name(applet_history.id_version, "new")
+
+    assert (await service.get_full()).display_name == "new"
+    assert load.call_count == 2
+
+
 async def test_get_versions_by_applet_id(applet_history: AppletHistorySchema, session: AsyncSession):
     crud = AppletHistoriesCRUD(session)
     result = await crud.get_versions_by_applet_id(applet_history.id)
@@ -0,0 +1,81 @@
+import datetime
+
+from apps.authentication.domain.token import InternalToken, TokenRevocation
+from config import settings
+from infrastructure.cache import BaseCacheService, CacheNotFound, LRUCache
+from infrastructure.cache.domain import CacheEntry
+from infrastructure.logger import logger
+
+__all__ = ["RevokedTokensCache"]
+
+# NOTE: A revoked token can not become valid again, so revoked verdicts are safe
+#       to keep in-process until the token expires.
+_revoked_tokens = LRUCache[bool](maxsize=settings.authentication.cache.local_size)
+
+
+class RevokedTokensCache(BaseCacheService[TokenRevocation]):
+    """Revocation verdicts of tokens by `jti`.
+
+    A revoked verdict is kept for the remaining lifetime of the token. A
+    "not revoked" verdict is kept for at most `token_ttl` seconds and is
+    written only when there is no verdict for the token yet, so it never
+    overrides a concurrent revocation.
+
+    The example of a key:
+        RevokedTokensCache:<jti>
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.default_ttl = settings.authentication.cache.token_ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_ttl > 0
+
+    @staticmethod
+    def _lifetime(token: InternalToken) -> int:
+        return token.payload.exp - int(datetime.datetime.now(datetime.UTC).timestamp())
+
+    async def get(self, jti: str) -> CacheEntry[TokenRevocation]:
+        cache_record: dict = await self._get(jti)
+        return CacheEntry[TokenRevocation](**cache_record)
+
+    async def is_revoked(self, token: InternalToken) -> bool | None:
+        """Returns the cached verdict, None when the token is not cached."""
+        if not self.enabled:
+            return None
+        jti = token.payload.jti
+        if _revoked_tokens.get(jti, False):
+            return True
+        try:
+            revoked = (await self.get(jti)).instance.revoked
+        except CacheNotFound:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read the token verdict: {e}")
+            return None
+        if revoked:
+            _revoked_tokens.set(jti, True, ttl=self._lifetime(token))
+        return revoked
+
+    async def set_revoked(self, token: InternalToken) -> None:
+        if not self.enabled or (lifetime := self._lifetime(token)) < 1:
+            return
+        _revoked_tokens.set(token.payload.jti, True, ttl=lifetime)
+        try:
+            await self.set(token.payload.jti, TokenRevocation(revoked=True), ttl=lifetime)
+        except Exception as e:
+            # The blacklist is the source of truth, other processes may keep
+            # a "not revoked" verdict for at most `token_ttl` seconds
+            logger.warning(f"Failed to cache the token revocation: {e}")
+
+    async def set_not_revoked(self, token: InternalToken) -> None:
+        if not self.enabled or (lifetime := self._lifetime(token)) < 1:
+            return
+        try:
+            await self.set(
+                token.payload.jti, TokenRevocation(revoked=False), ttl=min(lifetime, self.default_ttl), nx=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache the token verdict: {e}")
@@ -11,7 +11,6 @@ from apps.authentication.domain.login import UserLoginRequest
 from apps.authentication.domain.token import InternalToken, JWTClaim, TokenPayload, TokenPurpose
 from apps.authentication.errors import AuthenticationError
 from apps.authentication.services import AuthenticationService
-from apps.users.cruds.user import UsersCRUD
 from apps.users.domain import User
 from config import settings
 from infrastructure.database import atomic
@@ -54,7 +53,7 @@ async def get_current_user_for_ws(websocket: WebSocket, session=Depends(get_sess
         if revoked:
             raise AuthenticationError
 
-        user = await UsersCRUD(session).get_by_id(id_=token_data.sub)
+        user = await AuthenticationService(session).get_current_user(token_data.sub)
 
     return user
 
@@ -89,14 +88,17 @@ async def get_current_user(
     token: InternalToken = Depends(get_current_token()),
     session=Depends(get_session),
 ) -> User:
+    # NOTE: Both the revocation check and the user are served from caches,
+    #       so a request of an active user usually does not touch the database.
+    auth_service = AuthenticationService(session)
     async with atomic(session):
         # Check if the token is in the blacklist
-        revoked = await AuthenticationService(session).is_revoked(token)
+        revoked = await auth_service.is_revoked(token)
         if revoked:
             raise AuthenticationError
 
-        user = await UsersCRUD(session).get_by_id(id_=token.payload.sub)
-        await AuthenticationService(session).update_last_seen_at(user)
+        user = await auth_service.get_current_user(token.payload.sub)
+        await auth_service.update_last_seen_at(user)
 
     return user
 
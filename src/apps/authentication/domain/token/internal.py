@@ -39,6 +39,12 @@ class InternalToken(InternalModel):
     raw_token: str | None = None
 
 
+class TokenRevocation(InternalModel):
+    """The cached revocation verdict of a token."""
+
+    revoked: bool
+
+
 class MFATokenPayload(InternalModel):
     """Payload for MFA tokens."""
 
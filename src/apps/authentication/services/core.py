@@ -1,5 +1,6 @@
 import datetime
 
+from apps.authentication.cache import RevokedTokensCache
 from apps.authentication.crud import TokenBlacklistCRUD
 from apps.authentication.domain.token import InternalToken, TokenPurpose
 
@@ -11,7 +12,15 @@ class TokensService:
         self.session = session
 
     async def is_revoked(self, token: InternalToken) -> bool:
-        return await TokenBlacklistCRUD(self.session).exists(token)
+        cache = RevokedTokensCache()
+        if (revoked := await cache.is_revoked(token)) is not None:
+            return revoked
+        revoked = await TokenBlacklistCRUD(self.session).exists(token)
+        if revoked:
+            await cache.set_revoked(token)
+        else:
+            await cache.set_not_revoked(token)
+        return revoked
 
     async def revoke(self, token: InternalToken, type_: TokenPurpose) -> None:
         now = datetime.datetime.now(datetime.UTC)
@@ -20,3 +29,4 @@ class TokensService:
             revoked = await self.is_revoked(token)
             if not revoked:
                 await TokenBlacklistCRUD(self.session).create(token, type_)
+                await RevokedTokensCache().set_revoked(token)
@@ -14,6 +14,7 @@ from apps.authentication.errors import (
 )
 from apps.authentication.services.core import TokensService
 from apps.shared.bcrypt import get_password_hash, verify
+from apps.users.cache import UserCache
 from apps.users.cruds.user import UsersCRUD
 from apps.users.domain import User
 from apps.users.password_validation import PasswordValidator
@@ -263,9 +264,19 @@ class AuthenticationService:
     async def is_revoked(self, token: InternalToken):
         return await TokensService(self.session).is_revoked(token)
 
+    async def get_current_user(self, user_id: uuid.UUID) -> User:
+        """Get the user of an authenticated request, from the cache when it is there."""
+        cache = UserCache()
+        if user := await cache.get_user(user_id):
+            return user
+        user = await UsersCRUD(self.session).get_by_id(id_=user_id)
+        await cache.set_user(user)
+        return user
+
     async def update_last_seen_at(self, user: User):
         """Update last seen at, but only every 15 minutes."""
 
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         if user.last_seen_at is None or now - user.last_seen_at > timedelta(minutes=15):
             await UsersCRUD(self.session).update_last_seen_by_id(user.id)
+            await UserCache().set_user(user.model_copy(update={"last_seen_at": now}))
@@ -8,6 +8,7 @@ import pytest
 from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.authentication.crud import TokenBlacklistCRUD
 from apps.authentication.domain.login import UserLoginRequest
 from apps.authentication.domain.token import RefreshAccessTokenRequest, TokenPayload
 from apps.authentication.errors import AuthenticationError, InvalidCredentials, InvalidRefreshToken
@@ -18,6 +19,7 @@ from apps.shared.test import BaseTest
 from apps.shared.test.client import TestClient
 from apps.users.cruds.user import UsersCRUD
 from apps.users.domain import User, UserCreate, UserCreateRequest
+from apps.users.router import router as user_router
 from config import settings
 
 TEST_PASSWORD = "Test12345!"
@@ -52,6 +54,26 @@ class TestAuthentication(BaseTest):
         response = await client.post(url=self.delete_token_url)
         assert response.status_code == http.HTTPStatus.OK
 
+    async def test_delete_access_token__cached_verdict_is_replaced(
+        self, client: TestClient, user: User, mocker: MockerFixture
+    ):
+        mocker.patch.object(settings.authentication.cache, "token_ttl", 60)
+        exists = mocker.spy(TokenBlacklistCRUD, "exists")
+        user_retrieve_url = user_router.url_path_for("user_retrieve")
+        client.login(user)
+        for _ in range(2):
+            response = await client.get(user_retrieve_url)
+            assert response.status_code == http.HTTPStatus.OK
+        # The second request uses the cached "not revoked" verdict
+        assert exists.call_count == 1
+
+        response = await client.post(url=self.delete_token_url)
+        assert response.status_code == http.HTTPStatus.OK
+
+        response = await client.get(user_retrieve_url)
+        assert response.status_code == http.HTTPStatus.UNAUTHORIZED
+        assert exists.call_count == 1
+
     async def test_refresh_access_token(self, client: TestClient, user: User):
         refresh_access_token_request = RefreshAccessTokenRequest(
             refresh_token=AuthenticationService.create_refresh_token(
@@ -0,0 +1,117 @@
+import datetime
+import uuid
+
+import pytest
+
+from apps.authentication.cache import RevokedTokensCache
+from apps.authentication.domain.token import InternalToken, TokenPayload
+from apps.users.cache import UserCache
+from apps.users.domain import User
+from config import settings
+from infrastructure.cache import CacheNotFound
+
+
+@pytest.fixture
+def auth_cache_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.authentication.cache, "user_ttl", 60)
+    monkeypatch.setattr(settings.authentication.cache, "token_ttl", 60)
+
+
+def _token(lifetime: int = 300) -> InternalToken:
+    exp = int(datetime.datetime.now(datetime.UTC).timestamp()) + lifetime
+    return InternalToken(payload=TokenPayload(sub=uuid.uuid4(), exp=exp, jti=str(uuid.uuid4())))
+
+
+@pytest.mark.usefixtures("auth_cache_enabled")
+async def test_revoked_tokens_cache__verdicts():
+    cache = RevokedTokensCache()
+    token = _token()
+    assert await cache.is_revoked(token) is None
+
+    await cache.set_not_revoked(token)
+    assert await cache.is_revoked(token) is False
+
+    await cache.set_revoked(token)
+    assert await cache.is_revoked(token) is True
+
+    # A late "not revoked" verdict does not override the revocation
+    await cache.set_not_revoked(token)
+    assert await cache.is_revoked(token) is True
+
+
+@pytest.mark.usefixtures("auth_cache_enabled")
+async def test_revoked_tokens_cache__expired_token_is_not_cached():
+    cache = RevokedTokensCache()
+    token = _token(lifetime=-1)
+    await cache.set_revoked(token)
+    assert await cache.is_revoked(token) is None
+
+
+async def test_revoked_tokens_cache__disabled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings.authentication.cache, "token_ttl", 0)
+    cache = RevokedTokensCache()
+    token = _token()
+    await cache.set_revoked(token)
+    assert await cache.is_revoked(token) is None
+
+
+@pytest.mark.usefixtures("auth_cache_enabled")
+async def test_revoked_tokens_cache__redis_errors_are_not_raised(monkeypatch: pytest.MonkeyPatch):
+    cache = RevokedTokensCache()
+    token = _token()
+
+    async def _fail(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(cache, "set", _fail)
+    monkeypatch.setattr(cache, "get", _fail)
+    assert await cache.is_revoked(token) is None
+    await cache.set_revoked(token)
+    # The revocation is still known to the process
+    assert await cache.is_revoked(token) is True
+
+
+@pytest.mark.usefixtures("auth_cache_enabled")
+async def test_user_cache__set_get_invalidate():
+    cache = UserCache()
+    user = User(
+        id=uuid.uuid4(),
+        email="hashed",
+        first_name="John",
+        last_name="Doe",
+        is_super_admin=False,
+        hashed_password="hash",
+        mfa_secret="secret",
+        pending_mfa_secret="pending",
+    )
+    assert await cache.get_user(user.id) is None
+
+    await cache.set_user(user)
+    cached = await cache.get_user(user.id)
+    assert cached == user.model_copy(update=dict(hashed_password="", mfa_secret=None, pending_mfa_secret=None))
+    assert cached is not user
+
+    await cache.invalidate(user.id)
+    assert await cache.get_user(user.id) is None
+
+
+@pytest.mark.usefixtures("auth_cache_enabled")
+async def test_user_cache__invalidate_redis_errors_are_not_raised(monkeypatch: pytest.MonkeyPatch):
+    cache = UserCache()
+    user = User(
+        id=uuid.uuid4(), email="hashed", first_name="John", last_name="Doe", is_super_admin=False, hashed_password=""
+    )
+    await cache.set_user(user)
+
+    async def _fail(*args, **kwargs):
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(cache, "_delete", _fail)
+    await cache.invalidate(user.id)
+
+    async def _not_found(*args, **kwargs):
+        raise CacheNotFound()
+
+    # The in-process record is dropped still
+    monkeypatch.setattr(cache, "_get", _not_found)
+    assert await cache.get_user(user.id) is None
@@ -1,9 +1,9 @@
 import asyncio
 import datetime
+import http
 import mimetypes
 import os
 import uuid
-from functools import partial
 from typing import cast
 from urllib.parse import quote
 
@@ -11,9 +11,10 @@ import aiofiles
 import pytz
 from botocore.exceptions import ClientError
 from ddtrace import tracer
-from fastapi import Body, Depends, File, Query, UploadFile
+from fastapi import Body, Depends, File, Header, Query, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import Receive, Scope, Send
 from taskiq import TaskiqResult, TaskiqResultTimeoutError
 
 from apps.authentication.deps import get_current_user
@@ -31,11 +32,10 @@ from apps.file.domain import (
     WebmTargetExtenstion,
 )
 from apps.file.enums import FileScopeEnum
-from apps.file.errors import FileNotFoundError, SomethingWentWrongError
+from apps.file.errors import FileNotFoundError, RangeNotSatisfiableError, SomethingWentWrongError
 from apps.file.services import LogFileService
 from apps.file.tasks import convert_audio_file, convert_image
 from apps.shared.domain.response import Response, ResponseMulti
-from apps.shared.exception import NotFoundError
 from apps.users.domain import User
 from apps.users.services.user import UserService
 from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
@@ -52,7 +52,13 @@ from infrastructure.storage.storage import (
     get_operations_storage,
     select_answer_storage,
 )
-from infrastructure.storage.storage_client import ObjectNotFoundError, StorageClient
+from infrastructure.storage.storage_client import (
+    InvalidRangeError,
+    ObjectNotFoundError,
+    StorageClient,
+    StorageObject,
+    parse_range_header,
+)
 
 
 # TODO: delete later, it is not used anymore
@@ -177,19 +183,47 @@ def _get_keys_and_bucket_for_image(
     return target_key, upload_key, bucket
 
 
-async def download(
-    request: FileDownloadRequest = Body(...),
-    user: User = Depends(get_current_user),
-    cdn_client: StorageClient = Depends(get_media_storage),
-) -> StreamingResponse:
+class StorageObjectResponse(StreamingResponse):
+    """Streams an object body, the body is closed also when the client disconnects before its end"""
+
+    def __init__(self, storage_object: StorageObject, **kwargs):
+        super().__init__(storage_object.body, media_type=storage_object.media_type, **kwargs)
+        self.storage_object = storage_object
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.storage_object.body.aclose()
+
+
+async def _stream_object(cdn_client: StorageClient, key: str, range_header: str | None) -> StreamingResponse:
+    """Streams an object by chunks, a single byte range is answered with 206 Partial Content"""
     try:
-        file, media_type = cdn_client.download(request.key)
+        storage_object = await cdn_client.open_stream(key, parse_range_header(range_header))
     except ClientError:
         raise SomethingWentWrongError
     except ObjectNotFoundError:
         raise FileNotFoundError
+    except InvalidRangeError as e:
+        headers = {"Content-Range": f"bytes */{e.size}"} if e.size is not None else None
+        raise RangeNotSatisfiableError(headers=headers)
+
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(storage_object.size)}
+    status_code = http.HTTPStatus.OK
+    if storage_object.content_range:
+        headers["Content-Range"] = storage_object.content_range
+        status_code = http.HTTPStatus.PARTIAL_CONTENT
+    return StorageObjectResponse(storage_object, status_code=status_code, headers=headers)
 
-    return StreamingResponse(file, media_type=media_type)
+
+async def download(
+    request: FileDownloadRequest = Body(...),
+    user: User = Depends(get_current_user),
+    cdn_client: StorageClient = Depends(get_media_storage),
+    range_header: str | None = Header(None, alias="Range"),
+) -> StreamingResponse:
+    return await _stream_object(cdn_client, request.key, range_header)
 
 
 @tracer.wrap("storage.warn.upload")
@@ -254,18 +288,13 @@ async def answer_download(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
     app_settings=Depends(get_settings),
+    range_header: str | None = Header(None, alias="Range"),
 ) -> StreamingResponse:
     cdn_client = await select_answer_storage(applet_id=applet_id, session=session, app_settings=app_settings)
     if request.key.startswith(LogFileService.LOG_KEY):
         LogFileService.raise_for_access(user.email)
 
-    try:
-        file, media_type = cdn_client.download(request.key)
-    except ClientError:
-        raise SomethingWentWrongError
-    except ObjectNotFoundError:
-        raise FileNotFoundError
-    return StreamingResponse(file, media_type=media_type)
+    return await _stream_object(cdn_client, request.key, range_header)
 
 
 async def check_file_uploaded(
@@ -285,30 +314,20 @@ async def check_file_uploaded(
         raise AnswerViewAccessDenied()
 
     cdn_client = await select_answer_storage(applet_id=applet_id, session=session, app_settings=app_settings)
-    results: list[FileExistenceResponse] = []
-
-    for file_id in schema.files:
-        cleaned_file_id = file_id.strip()
-
-        unique = f"{user.id}/{applet_id}"
-        orig_key = cdn_client.generate_key(FileScopeEnum.ANSWER, unique, cleaned_file_id)
+    unique = f"{user.id}/{applet_id}"
+    keys = [cdn_client.generate_key(FileScopeEnum.ANSWER, unique, file_id.strip()) for file_id in schema.files]
+    existence = await cdn_client.check_existence_many(
+        keys, prefix=cdn_client.generate_key(FileScopeEnum.ANSWER, unique, "")
+    )
 
-        file_existence_factory = partial(
-            FileExistenceResponse,
+    results = [
+        FileExistenceResponse(
             file_id=file_id,
+            uploaded=existence[key],
+            url=cdn_client.generate_private_url(key) if existence[key] else None,
         )
-
-        try:
-            await cdn_client.check_existence(orig_key)
-            results.append(
-                file_existence_factory(
-                    uploaded=True,
-                    url=cdn_client.generate_private_url(orig_key),
-                )
-            )
-        except NotFoundError:
-            results.append(file_existence_factory(uploaded=False))
-
+        for file_id, key in zip(schema.files, keys)
+    ]
     return ResponseMulti[FileExistenceResponse](result=results, count=len(results))
 
 
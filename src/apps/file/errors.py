@@ -9,6 +9,12 @@ class FileNotFoundError(NotFoundError):
     message = _("File not found.")
 
 
+class RangeNotSatisfiableError(BaseError):
+    message = _("Requested range is not satisfiable.")
+    status_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    type = ExceptionTypes.BAD_REQUEST
+
+
 class SomethingWentWrongError(BaseError):
     message = _("Something went wrong. Try later.")
     status_code = status.HTTP_400_BAD_REQUEST
@@ -7,11 +7,13 @@ from botocore.exceptions import ClientError, EndpointConnectionError
 from pytest import LogCaptureFixture
 from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
 
 from apps.applets.domain.applet_full import AppletFull
+from apps.file.api.file import StorageObjectResponse
 from apps.file.domain import WebmTargetExtenstion
 from apps.file.enums import FileScopeEnum
-from apps.file.errors import FileNotFoundError, SomethingWentWrongError
+from apps.file.errors import FileNotFoundError, RangeNotSatisfiableError, SomethingWentWrongError
 from apps.file.services import LogFileService
 from apps.shared.exception import AccessDeniedError, NotFoundError
 from apps.shared.test import BaseTest
@@ -24,10 +26,46 @@ from apps.workspaces.service.workspace import WorkspaceService
 from config import settings
 from config.cdn import CDNSettings
 from infrastructure.storage.storage_arbitrary import ArbitraryS3StorageClient
-from infrastructure.storage.storage_client import StorageClient
+from infrastructure.storage.storage_client import StorageClient, StorageObject
 from infrastructure.storage.storage_config import StorageConfig
 
 
+async def _iter_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _storage_object(*chunks: bytes, total_size: int | None = None, content_range: str | None = None) -> StorageObject:
+    size = sum(map(len, chunks))
+    return StorageObject(
+        body=_iter_chunks(*chunks),
+        media_type="text/plain",
+        size=size,
+        total_size=total_size or size,
+        content_range=content_range,
+    )
+
+
+async def test_storage_object_response__body_closed_on_disconnect():
+    closed = []
+
+    async def body():
+        try:
+            yield b"a"
+            yield b"b"
+        finally:
+            closed.append(True)
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            raise OSError
+
+    response = StorageObjectResponse(StorageObject(body=body(), media_type="text/plain", size=2, total_size=2))
+    with pytest.raises(ClientDisconnect):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, None, send)
+    assert closed == [True]
+
+
 @pytest.fixture
 async def tom_workspace_arbitrary_aws(tom: User, arbitrary_db_url: str, session: AsyncSession) -> WorkspaceArbitrary:
     srv = WorkspaceService(session, tom.id)
@@ -158,15 +196,15 @@ class TestAnswerActivityItems(BaseTest):
     ):
         client.login(tom)
         mock = mocker.patch(
-            "infrastructure.storage.storage_arbitrary.ArbitraryS3StorageClient.download",
-            return_value=(iter(("a", "b")), "txt"),
+            "infrastructure.storage.storage_arbitrary.ArbitraryS3StorageClient.open_stream",
+            return_value=_storage_object(b"a", b"b"),
         )
         response = await client.post(
             self.answer_download_url.format(applet_id=applet_one.id),
             data={"key": "key"},
         )
         assert http.HTTPStatus.OK == response.status_code
-        mock.assert_called_once()
+        mock.assert_awaited_once()
 
     @pytest.mark.usefixtures("tom_workspace_arbitrary_gcp")
     async def test_arbitrary_upload_to_s3_gcp(
@@ -189,15 +227,15 @@ class TestAnswerActivityItems(BaseTest):
     ):
         client.login(tom)
         mock = mocker.patch(
-            "infrastructure.storage.storage_arbitrary.ArbitraryGCPStorageClient.download",
-            return_value=(iter(("a", "b")), "txt"),
+            "infrastructure.storage.storage_arbitrary.ArbitraryGCPStorageClient.open_stream",
+            return_value=_storage_object(b"a", b"b"),
         )
         response = await client.post(
             self.answer_download_url.format(applet_id=applet_one.id),
             data={"key": "key"},
         )
         assert http.HTTPStatus.OK == response.status_code
-        mock.assert_called_once()
+        mock.assert_awaited_once()
 
     @pytest.mark.usefixtures("tom_workspace_arbitrary_azure")
     async def test_arbitrary_upload_to_blob_azure(
@@ -408,7 +446,7 @@ class TestAnswerActivityItems(BaseTest):
         client.login(tom)
         data = {"key": "key"}
         mocker.patch(
-            "infrastructure.storage.storage_client.StorageClient.download",
+            "infrastructure.storage.storage_client.StorageClient.open_stream",
             side_effect=FileNotFoundError,
         )
         resp = await client.post(self.answer_download_url.format(applet_id=applet_one.id), data=data)
@@ -465,7 +503,7 @@ class TestAnswerActivityItems(BaseTest):
         client.login(tom)
         data = {"key": "key"}
         mocker.patch(
-            "infrastructure.storage.storage_client.StorageClient.download",
+            "infrastructure.storage.storage_client.StorageClient.open_stream",
             side_effect=FileNotFoundError,
         )
         resp = await client.post(self.download_url, data=data)
@@ -478,12 +516,38 @@ class TestAnswerActivityItems(BaseTest):
         client.login(tom)
         data = {"key": "key"}
         mocker.patch(
-            "infrastructure.storage.storage_client.StorageClient.download",
-            return_value=(iter(("a", "b")), "txt"),
+            "infrastructure.storage.storage_client.StorageClient.open_stream",
+            return_value=_storage_object(b"a", b"b"),
         )
         resp = await client.post(self.download_url, data=data)
         assert resp.status_code == http.HTTPStatus.OK
         assert resp.content == b"ab"
+        assert resp.headers["Accept-Ranges"] == "bytes"
+
+    async def test_general_file_download__range(self, client: TestClient, tom: User, mocker: MockerFixture):
+        client.login(tom)
+        mock = mocker.patch(
+            "infrastructure.storage.storage_client.StorageClient.open_stream",
+            return_value=_storage_object(b"b", total_size=2, content_range="bytes 1-1/2"),
+        )
+        resp = await client.post(self.download_url, data={"key": "key"}, headers={"Range": "bytes=1-"})
+        assert resp.status_code == http.HTTPStatus.PARTIAL_CONTENT
+        assert resp.content == b"b"
+        assert resp.headers["Content-Range"] == "bytes 1-1/2"
+        mock.assert_awaited_once_with("key", (1, None))
+
+    async def test_general_file_download__range_not_satisfiable(
+        self, client: TestClient, tom: User, mocker: MockerFixture
+    ):
+        client.login(tom)
+        mocker.patch(
+            "botocore.client.BaseClient._make_api_call",
+            side_effect=ClientError({"Error": {"Code": "InvalidRange", "ActualObjectSize": "2"}}, "GetObject"),
+        )
+        resp = await client.post(self.download_url, data={"key": "key"}, headers={"Range": "bytes=10-"})
+        assert resp.status_code == http.HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        assert resp.headers["Content-Range"] == "bytes */2"
+        assert resp.json()["result"][0]["message"] == RangeNotSatisfiableError.message
 
     # NOTE: We must keep old answer upload process until all Mindlogger users have last App version.
     async def test_answer_upload__not_valid_user_role(
@@ -532,6 +596,47 @@ class TestAnswerActivityItems(BaseTest):
         assert result[0]["url"] is None
         assert resp.json()["count"] == 1
 
+    async def test_check_answer_file_uploaded__many_files(
+        self, client: TestClient, applet_one: AppletFull, tom: User, mocker: MockerFixture
+    ):
+        client.login(tom)
+        missing = "missing.txt"
+
+        def _check_existence(key: str):
+            if key.endswith(missing):
+                raise NotFoundError()
+
+        mocker.patch(
+            "infrastructure.storage.storage_client.StorageClient._check_existence", side_effect=_check_existence
+        )
+        resp = await client.post(
+            self.existance_url.format(applet_id=applet_one.id),
+            data={"files": [self.file_id, missing]},
+        )
+        assert resp.status_code == http.HTTPStatus.OK
+        result = resp.json()["result"]
+        assert [item["fileId"] for item in result] == [self.file_id, missing]
+        assert [item["uploaded"] for item in result] == [True, False]
+        assert result[0]["url"].endswith(f"{tom.id}/{applet_one.id}/{self.file_id}")
+        assert result[1]["url"] is None
+
+    async def test_check_answer_file_uploaded__prefix_is_listed(
+        self, client: TestClient, applet_one: AppletFull, tom: User, mocker: MockerFixture
+    ):
+        client.login(tom)
+        files = [f"file-{i}.txt" for i in range(StorageClient.EXISTENCE_LIST_PAGE_COST)]
+        prefix = StorageClient.generate_key(FileScopeEnum.ANSWER, f"{tom.id}/{applet_one.id}", "")
+        list_keys = mocker.patch(
+            "infrastructure.storage.storage_client.StorageClient._list_keys", return_value={prefix + files[0]}
+        )
+        check_existence = mocker.patch("infrastructure.storage.storage_client.StorageClient._check_existence")
+        resp = await client.post(self.existance_url.format(applet_id=applet_one.id), data={"files": files})
+        assert resp.status_code == http.HTTPStatus.OK
+        result = resp.json()["result"]
+        assert [item["uploaded"] for item in result] == [True] + [False] * (len(files) - 1)
+        list_keys.assert_called_once_with(prefix, StorageClient.EXISTENCE_LIST_PAGE_SIZE)
+        check_existence.assert_not_called()
+
     async def test_presign_answer_url(self, client: TestClient, applet_one: AppletFull, tom: User):
         client.login(tom)
         key = self.file_id
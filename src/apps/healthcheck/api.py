@@ -4,12 +4,17 @@ from fastapi import Body, Depends, Query
 from fastapi.responses import Response
 from starlette import status
 
-from apps.authentication.deps import get_optional_current_user
+from apps.authentication.deps import get_current_user, get_optional_current_user
 from apps.healthcheck.domain import EmergencyMessage, EmergencyMessageType
 from apps.shared.domain import Response as ResponseModel
+from apps.shared.exception import AccessDeniedError
 from apps.users import User
 from apps.users.domain import AppInfo
 from config import settings
+from infrastructure.cache import immutable_caches
+from infrastructure.database import engine_registry
+from infrastructure.storage.executor import storage_executor
+from infrastructure.storage.storage import storage_clients
 
 
 def readiness():
@@ -20,6 +25,36 @@ def liveness():
     return Response("Liveness - OK!")
 
 
+def _check_super_admin(user: User) -> None:
+    """Process metrics are available to super admins only."""
+    if not user.is_super_admin:
+        raise AccessDeniedError()
+
+
+def db_pool_metrics(user: User = Depends(get_current_user)) -> dict[str, dict]:
+    """Connection pool usage of every database engine created by this process.
+
+    Engines are named "default" and "arbitrary:<hash of the URI>".
+    """
+    _check_super_admin(user)
+    return engine_registry.metrics()
+
+
+def storage_metrics(user: User = Depends(get_current_user)) -> dict[str, dict]:
+    """Usage of the storage I/O executor and of the storage client cache of this process.
+
+    Only counters are returned, the configs of the cached clients are not.
+    """
+    _check_super_admin(user)
+    return dict(executor=storage_executor.metrics(), clients=storage_clients.stats())
+
+
+def cache_metrics(user: User = Depends(get_current_user)) -> dict[str, dict]:
+    """Hits and misses of the in-process/Redis caches of immutable data of this process."""
+    _check_super_admin(user)
+    return {name: cache.stats() for name, cache in immutable_caches.items()}
+
+
 statuses = {code for var, code in vars(status).items() if var.startswith("HTTP_")}
 exclude = {301, 302}
 supported_statuses = statuses - exclude
@@ -1,12 +1,23 @@
 from fastapi import status
 from fastapi.routing import APIRouter
 
-from apps.healthcheck.api import emergency_message, liveness, readiness, statuscode
+from apps.healthcheck.api import (
+    cache_metrics,
+    db_pool_metrics,
+    emergency_message,
+    liveness,
+    readiness,
+    statuscode,
+    storage_metrics,
+)
 
 router = APIRouter(tags=["Health check"])
 
 router.get("/readiness", status_code=status.HTTP_200_OK)(readiness)
 router.get("/liveness", status_code=status.HTTP_200_OK)(liveness)
+router.get("/db-pool", status_code=status.HTTP_200_OK)(db_pool_metrics)
+router.get("/storage", status_code=status.HTTP_200_OK)(storage_metrics)
+router.get("/caches", status_code=status.HTTP_200_OK)(cache_metrics)
 router.get("/statuscode")(statuscode)
 router.post("/statuscode")(statuscode)
 router.post("/emergency-message")(emergency_message)
@@ -27,6 +27,38 @@ class TestHealthcheck(BaseTest):
         assert response.status_code == 200
         assert response.content == b"Liveness - OK!"
 
+    @pytest.mark.parametrize("url", ("db-pool", "storage", "caches"))
+    async def test_metrics__super_admin_only(self, client, tom: User, url: str):
+        response = await client.get(url)
+        assert response.status_code == 401
+        client.login(tom)
+        response = await client.get(url)
+        assert response.status_code == 403
+
+    async def test_db_pool_metrics(self, client, superadmin: User):
+        client.login(superadmin)
+        response = await client.get("db-pool")
+        assert response.status_code == 200
+        for name, metrics in response.json().items():
+            assert name == "default" or name.startswith("arbitrary:")
+            assert {"size", "checked_out", "overflow", "wait_time_avg"} <= set(metrics.keys())
+
+    async def test_storage_metrics(self, client, superadmin: User):
+        client.login(superadmin)
+        response = await client.get("storage")
+        assert response.status_code == 200
+        data = response.json()
+        assert {"max_workers", "active", "queued", "queue_time_avg"} <= set(data["executor"].keys())
+        assert {"size", "maxsize", "hits", "misses"} <= set(data["clients"].keys())
+
+    async def test_cache_metrics(self, client, superadmin: User):
+        client.login(superadmin)
+        response = await client.get("caches")
+        assert response.status_code == 200
+        data = response.json()
+        assert "AppletHistoryFull" in data
+        assert {"size", "local_hits", "redis_hits", "misses"} <= set(data["AppletHistoryFull"].keys())
+
     async def test_emergency_message__unauthorized(self, client, emergency_message_payload):
         response = await client.post("emergency-message", data=emergency_message_payload)
         assert response.status_code == 200
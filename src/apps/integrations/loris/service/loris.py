@@ -14,7 +14,8 @@ from apps.activities.crud.activity_history import ActivityHistoriesCRUD
 from apps.activities.crud.activity_item_history import ActivityItemHistoriesCRUD
 from apps.alerts.crud.alert import AlertCRUD
 from apps.alerts.db.schemas import AlertSchema
-from apps.alerts.domain import AlertMessage, AlertTypes
+from apps.alerts.domain import AlertTypes
+from apps.alerts.service import AlertService
 from apps.answers.crud.answers import AnswersCRUD
 from apps.answers.errors import ReportServerError
 from apps.answers.service import ReportServerService
@@ -47,8 +48,6 @@ __all__ = [
     "LorisIntegrationService",
 ]
 
-from infrastructure.utility.redis_client import RedisCache
-
 
 class LorisIntegrationService:
     def __init__(self, applet_id: uuid.UUID, session, user: User, answer_session=None) -> None:
@@ -849,7 +848,6 @@ class LorisIntegrationService:
     async def _create_integration_alerts(self, applet_id: uuid.UUID, message: str):
         latest_versions = await AppletHistoriesCRUD(self.session).get_versions_by_applet_id(self.applet_id)
         version = next(iter(latest_versions[::-1]), None)
-        cache = RedisCache()
         user_applet_access = UserAppletAccessCRUD(self.session)
         persons = await user_applet_access.get_responsible_persons(applet_id=applet_id, subject_id=None)
         alert_schemas = []
@@ -870,28 +868,10 @@ class LorisIntegrationService:
         async with atomic(alert_crud.session):
             alerts = await alert_crud.create_many(alert_schemas)
 
-        for alert in alerts:
-            channel_id = f"channel_{alert.user_id}"
-
-            try:
-                await cache.publish(
-                    channel_id,
-                    AlertMessage(
-                        id=alert.id,
-                        respondent_id=self.user.id,
-                        applet_id=applet_id,
-                        version=version,
-                        message=alert.alert_message,
-                        created_at=alert.created_at,
-                        activity_id=alert.activity_id,
-                        activity_item_id=alert.activity_item_id,
-                        type=alert.type,
-                    ).model_dump(),
-                )
-
-            except Exception as e:
-                sentry_sdk.capture_exception(e)
-                break
+        try:
+            await AlertService(self.session, self.user.id).publish(alerts)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
 
     async def create_loris_integration(self, hostname, username, project, password) -> LorisIntegration:
         integration_schema = await IntegrationsCRUD(self.session).create(
@@ -1,16 +1,18 @@
+import asyncio
 import io
 import json
 import os
 import uuid
 import zipfile
 from io import BytesIO
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO
 
 from slugify import slugify
 
 from apps.file.enums import FileScopeEnum
 from apps.integrations.oneup_health.service.domain import EHRData
 from config import Settings
+from infrastructure.storage.executor import storage_executor
 from infrastructure.storage.storage import select_answer_storage
 from infrastructure.storage.storage_client import StorageClient
 
@@ -119,6 +121,39 @@ class EHRStorage:
 
         return filename
 
+    def _download_ehr_zip_content(self, storage_path: str, data: EHRData) -> tuple[str, bytes]:
+        file_buffer = io.BytesIO()
+        try:
+            filename = self.download_ehr_zip(storage_path=storage_path, data=data, file_buffer=file_buffer)
+            return filename, file_buffer.getvalue()
+        finally:
+            file_buffer.close()
+
+    async def iter_ehr_zips(
+        self, items: list[tuple[str, EHRData]], concurrency: int
+    ) -> AsyncIterator[tuple[str, bytes]]:
+        """Downloads EHR archives in the storage executor and yields them in completion order.
+
+        At most `concurrency` archives are downloaded or held at once.
+        """
+        pending: set[asyncio.Task] = set()
+        items_iter = iter(items)
+        try:
+            while True:
+                for storage_path, data in items_iter:
+                    coro = storage_executor.run(self._download_ehr_zip_content, storage_path, data)
+                    pending.add(asyncio.create_task(coro))
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
 
 async def create_ehr_storage(session, applet_id: uuid.UUID, app_settings: Settings) -> EHRStorage:
     cdn_client = await select_answer_storage(applet_id=applet_id, session=session, app_settings=app_settings)
@@ -19,6 +19,7 @@ from apps.invitations.domain import (
     InvitationDetailReviewer,
     InvitationRespondent,
 )
+from apps.shared.blind_index import update_search_tokens
 from apps.shared.filtering import FilterField, Filtering
 from apps.shared.ordering import Ordering
 from apps.shared.paging import paging
@@ -55,6 +56,12 @@ class InvitationCRUD(BaseCRUD[InvitationSchema]):
         schema = await self._create(schema)
         return schema
 
+    async def _update_one(self, lookup: str, value: Any, schema: InvitationSchema) -> InvitationSchema:
+        instance = await super()._update_one(lookup, value, schema)
+        if InvitationSchema.writes_search_fields(dict(schema)):
+            await update_search_tokens(self.session, [instance])
+        return instance
+
     async def update(self, lookup: str, value: Any, schema: InvitationSchema) -> InvitationSchema:
         schema = await self._update_one(lookup, value, schema)
         return schema
@@ -1,14 +1,16 @@
-from sqlalchemy import Column, ForeignKey, String, Unicode, text
+from sqlalchemy import Column, ForeignKey, Index, String, Unicode, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy_utils import StringEncryptedType
 
+from apps.shared.blind_index import BlindIndexed
 from apps.shared.encryption import get_key
 from infrastructure.database import Base
 
 
-class InvitationSchema(Base):
+class InvitationSchema(BlindIndexed, Base):
     __tablename__ = "invitations"
+    __search_fields__ = {"first_name": "first_name", "last_name": "last_name", "nickname": "nickname", "email": "email"}
 
     email = Column(StringEncryptedType(Unicode, get_key))
     applet_id = Column(ForeignKey("applets.id", ondelete="RESTRICT"), nullable=False)
@@ -24,6 +26,8 @@ class InvitationSchema(Base):
     tag = Column(String())
     title = Column(StringEncryptedType(Unicode, get_key))
 
+    __table_args__ = (Index(None, "search_tokens", postgresql_using="gin"),)
+
     @hybrid_property
     def subject_id(self):
         return (self.meta or {}).get("subject_id", None)
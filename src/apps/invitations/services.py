@@ -1,4 +1,3 @@
-import asyncio
 import uuid
 from typing import cast
 
@@ -158,7 +157,7 @@ class InvitationsService:
                 key=invitation_internal.key,
             ),
         )
-        _ = asyncio.create_task(service.send(message))
+        await service.enqueue([message])
 
         return InvitationDetailForRespondent(
             id=invitation_internal.id,
@@ -235,7 +234,7 @@ class InvitationsService:
             ),
         )
 
-        await service.send(message)
+        await service.enqueue([message])
 
         return InvitationDetailForReviewer(
             id=invitation_internal.id,
@@ -310,7 +309,7 @@ class InvitationsService:
             ),
         )
 
-        await service.send(message)
+        await service.enqueue([message])
 
         return InvitationDetailForManagers(
             id=invitation_internal.id,
@@ -1,7 +1,9 @@
+import datetime
 import uuid
 
-from sqlalchemy import select, update
+from sqlalchemy import or_, select, update
 
+from apps.job.constants import JobStatus
 from apps.job.db.schemas import JobSchema
 from apps.job.domain import Job, JobCreate
 from infrastructure.database import BaseCRUD
@@ -26,6 +28,12 @@ class JobCRUD(BaseCRUD[JobSchema]):
             return None
         return Job.model_validate(schema)
 
+    async def get_by_id(self, id_: uuid.UUID) -> Job | None:
+        schema = await self._get("id", id_)
+        if not schema:
+            return None
+        return Job.model_validate(schema)
+
     async def create(self, model: JobCreate) -> Job:
         schema = await self._create(JobSchema(**model.model_dump(by_alias=False, exclude_unset=True)))
         return Job.model_validate(schema)
@@ -37,3 +45,40 @@ class JobCRUD(BaseCRUD[JobSchema]):
         job_schema = db_result.first()
 
         return Job.model_validate(job_schema)
+
+    async def get_to_resume(self, name_prefix: str, updated_before: datetime.datetime) -> list[Job]:
+        """Jobs of the name prefix waiting for a retry, or pending and in
+        progress without updates since the date"""
+        query = select(JobSchema).where(
+            JobSchema.name.startswith(name_prefix, autoescape=True),
+            or_(
+                JobSchema.status == JobStatus.retry,
+                JobSchema.status.in_([JobStatus.pending, JobStatus.in_progress])
+                & (JobSchema.updated_at < updated_before),
+            ),
+        )
+        results = await self._execute(query=query)
+        return [Job.model_validate(schema) for schema in results.scalars().all()]
+
+    async def claim(self, id_: uuid.UUID, user_id: uuid.UUID, updated_before: datetime.datetime) -> Job | None:
+        """Moves the job of the user to in progress if it waits for a run, or
+        is in progress without updates since the date. Returns None when the
+        job is done or another worker runs it."""
+        query = (
+            update(JobSchema)
+            .where(
+                JobSchema.id == id_,
+                JobSchema.creator_id == user_id,
+                or_(
+                    JobSchema.status.in_([JobStatus.pending, JobStatus.retry]),
+                    (JobSchema.status == JobStatus.in_progress) & (JobSchema.updated_at < updated_before),
+                ),
+            )
+            .values(status=JobStatus.in_progress)
+            .returning(JobSchema)
+        )
+        db_result = await self._execute(query)
+        job_schema = db_result.first()
+        if not job_schema:
+            return None
+        return Job.model_validate(job_schema)
@@ -1,7 +1,14 @@
+from gettext import gettext as _
+
 from apps.job.domain import Job
+from apps.shared.exception import NotFoundError
 
 
 class JobStatusError(Exception):
     def __init__(self, job: Job, *args, **kwargs):
         self.job = job
         super().__init__(*args, **kwargs)
+
+
+class JobNotFoundError(NotFoundError):
+    message = _("Job not found.")
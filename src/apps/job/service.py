@@ -4,7 +4,7 @@ from typing import Any
 from apps.job.constants import JobStatus
 from apps.job.crud import JobCRUD
 from apps.job.domain import Job, JobCreate
-from apps.job.errors import JobStatusError
+from apps.job.errors import JobNotFoundError, JobStatusError
 
 
 class JobService:
@@ -36,6 +36,12 @@ class JobService:
 
         return job
 
+    async def get_owned(self, id_: uuid.UUID) -> Job:
+        job = await JobCRUD(self.session).get_by_id(id_)
+        if not job or job.creator_id != self.user_id:
+            raise JobNotFoundError()
+        return job
+
     async def is_job_in_progress(self, job_name: str) -> bool:
         repository = JobCRUD(self.session)
         job = await repository.get_by_name(job_name, self.user_id)
@@ -49,3 +55,6 @@ class JobService:
         if details:
             data["details"] = details
         return await JobCRUD(self.session).update(id_, **data)
+
+    async def update_details(self, id_: uuid.UUID, details: dict) -> Job:
+        return await JobCRUD(self.session).update(id_, details=details)
@@ -0,0 +1 @@
+from apps.library.commands.documents import app as library_cli  # noqa: F401
@@ -0,0 +1,26 @@
+import typer
+from rich import print
+
+from apps.library.service import LibraryService
+from infrastructure.commands.utils import coro
+from infrastructure.database import atomic, session_manager
+
+app = typer.Typer()
+
+
+@app.command(short_help="Build documents of library items shared before they were stored")
+@coro
+async def build_documents(
+    batch_size: int = typer.Option(100, "--batch-size", "-b", help="Items built in one transaction."),
+) -> None:
+    session_maker = session_manager.get_session()
+    total = 0
+    while True:
+        async with session_maker() as session:
+            async with atomic(session):
+                built = await LibraryService(session).build_missing_documents(batch_size)
+        if not built:
+            break
+        total += built
+        print(f"{total} library items built")
+    print(f"[green]Finished, {total} library items built[/green]")
@@ -1,7 +1,11 @@
+import re
 import uuid
+from functools import reduce
 
-from sqlalchemy import Unicode, or_, select
+from sqlalchemy import false, func, select, text
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.functions import count
 
 from apps.applets.db.schemas import AppletHistorySchema
 from apps.library.db.schemas import CartSchema, LibrarySchema
@@ -11,6 +15,8 @@ from apps.shared.paging import paging
 from apps.shared.query_params import QueryParams
 from infrastructure.database.crud import BaseCRUD
 
+SEARCH_CONFIG = text("'simple'::regconfig")
+
 
 class LibraryCRUD(BaseCRUD[LibrarySchema]):
     schema_class = LibrarySchema
@@ -30,48 +36,58 @@ class LibraryCRUD(BaseCRUD[LibrarySchema]):
         schema = await self._get("applet_id_version", applet_id_version)
         return schema
 
+    @staticmethod
+    def search_vector(name: str, keywords: list[str], activity_names: list[str], search_keywords: list[str]):
+        """Text search vector of the library item, names weigh more than the rest of the text"""
+        parts = (
+            (name, "A"),
+            (" ".join(keywords), "B"),
+            (" ".join(activity_names), "C"),
+            (" ".join(search_keywords), "D"),
+        )
+        vectors = [
+            func.setweight(func.to_tsvector(SEARCH_CONFIG, value), text(f"'{weight}'")) for value, weight in parts
+        ]
+        return reduce(lambda left, right: left.op("||")(right), vectors)
+
+    @staticmethod
+    def _search_filter(search: str):
+        """Matches the items with words starting with every word of the search"""
+        words = re.findall(r"\w+", search.lower())
+        if not words:
+            return false(), None
+        ts_query = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{word}:*" for word in words))
+        return LibrarySchema.search_vector.op("@@")(ts_query), ts_query
+
     async def get_all_library_count(self, query_params: QueryParams) -> int:
-        query: Query = select(LibrarySchema.id)
+        query: Query = select(count(LibrarySchema.id))
         if query_params.search:
-            query = query.where(
-                or_(
-                    LibrarySchema.search_keywords.cast(Unicode()).ilike(f"%{query_params.search}%"),
-                    LibrarySchema.keywords.cast(Unicode()).ilike(f"%{query_params.search}%"),
-                )
-            )
+            search_filter, _ = self._search_filter(query_params.search)
+            query = query.where(search_filter)
         results = await self._execute(query)
-        return len(results.all())
+        return results.scalar()
 
-    async def get_all_library_items(
-        self,
-        query_params: QueryParams,
-    ) -> list[LibrarySchema]:
-        query: Query = select(
-            LibrarySchema.id,
-            LibrarySchema.keywords,
-            LibrarySchema.applet_id_version,
-            AppletHistorySchema.display_name,
-            AppletHistorySchema.description,
-            AppletHistorySchema.about,
-            AppletHistorySchema.image,
-            AppletHistorySchema.watermark,
-        )
-        query = query.join(
-            AppletHistorySchema,
-            LibrarySchema.applet_id_version == AppletHistorySchema.id_version,
-        )
+    async def get_all_library_items(self, query_params: QueryParams) -> list[Row]:
+        query: Query = select(LibrarySchema.id, LibrarySchema.document)
         if query_params.search:
-            query = query.where(
-                or_(
-                    LibrarySchema.search_keywords.cast(Unicode()).ilike(f"%{query_params.search}%"),
-                    LibrarySchema.keywords.cast(Unicode()).ilike(f"%{query_params.search}%"),
-                )
-            )
+            search_filter, ts_query = self._search_filter(query_params.search)
+            query = query.where(search_filter)
+            if ts_query is not None:
+                query = query.order_by(func.ts_rank(LibrarySchema.search_vector, ts_query).desc())
+        query = query.order_by(LibrarySchema.created_at, LibrarySchema.id)
         query = paging(query, query_params.page, query_params.limit)
 
         results = await self._execute(query)
         return results.all()  # noqa
 
+    async def get_without_document(self, limit: int) -> list[LibrarySchema]:
+        query: Query = select(LibrarySchema)
+        query = query.where(LibrarySchema.document.is_(None))
+        query = query.order_by(LibrarySchema.id)
+        query = query.limit(limit)
+        results = await self._execute(query)
+        return results.scalars().all()
+
     async def get_library_item_by_id(self, id_: uuid.UUID) -> LibraryItem:
         query: Query = select(
             LibrarySchema.id,
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, ForeignKey, String
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import Column, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 
 from infrastructure.database import Base
 
@@ -13,6 +13,11 @@ class LibrarySchema(Base):
     )
     keywords = Column(ARRAY(String), nullable=False, server_default="{}")
     search_keywords = Column(ARRAY(String), nullable=False, server_default="{}")
+    # The library item with activities and flows, built when the applet is shared
+    document = Column(JSONB(), nullable=True)
+    search_vector = Column(TSVECTOR(), nullable=True)
+
+    __table_args__ = (Index(None, "search_vector", postgresql_using="gin"),)
 
 
 class CartSchema(Base):
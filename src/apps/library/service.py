@@ -1,7 +1,7 @@
 import asyncio
 import json
 import uuid
-from typing import List
+from typing import Any, List
 
 from apps.activities.crud import ActivityHistoriesCRUD, ActivityItemHistoriesCRUD
 from apps.activities.db.schemas import ActivityItemHistorySchema
@@ -70,37 +70,74 @@ class LibraryService:
                 display_name=schema.name,
             )
 
-        search_keywords = await self._get_search_keywords(applet, applet_version)
-        search_keywords.append(schema.name)
         # save library_item
+        library_id = uuid.uuid4()
+        document = await self._build_document(library_id, applet_version, schema.name, schema.keywords)
         library_item = LibrarySchema(
-            applet_id_version=f"{schema.applet_id}_{applet.version}",
+            id=library_id,
+            applet_id_version=applet_version,
             keywords=schema.keywords,
-            search_keywords=search_keywords,
+            **document,
         )
         library_item = await LibraryCRUD(self.session).save(library_item)
 
         return AppletLibraryFull.model_validate(library_item)
 
-    async def _get_search_keywords(self, applet, applet_version):
-        search_keywords = []
-        search_keywords.extend(applet.description.values())
-
-        activities = await ActivityHistoriesCRUD(session=self.session).retrieve_by_applet_version(applet_version)
-
-        search_keywords.extend([activity.name for activity in activities])
+    async def _build_document(
+        self, library_id: uuid.UUID, applet_id_version: str, name: str, keywords: list[str]
+    ) -> dict[str, Any]:
+        """Builds the library item of the applet version with its search data.
+
+        Shared applet versions do not change, so the item is built once and
+        stored as a document, the list and the detail read it with no joins.
+        """
+        applet_history = await AppletHistoriesCRUD(self.session).retrieve_by_applet_version(applet_id_version)
+        library_item = LibraryItem(
+            id=library_id,
+            applet_id_version=applet_id_version,
+            display_name=name,
+            description=applet_history.description,
+            about=applet_history.about,
+            image=applet_history.image,
+            keywords=keywords,
+        )
+        library_item = await self._get_full_library_item(library_item)
 
-        activity_items = await ActivityItemHistoriesCRUD(self.session).get_by_activity_id_versions(
-            [activity.id_version for activity in activities]
+        search_keywords = self._get_search_keywords(library_item)
+        search_keywords.append(name)
+        activity_names = [activity.name for activity in library_item.activities or []]
+        return dict(
+            search_keywords=search_keywords,
+            document=library_item.model_dump(mode="json", exclude={"id"}),
+            search_vector=LibraryCRUD.search_vector(name, keywords, activity_names, search_keywords),
         )
 
-        for activity_item in activity_items:
-            search_keywords.extend(activity_item.question.values())
-            if activity_item.response_type in ["singleSelect", "multiSelect"]:
-                options = activity_item.response_values.get("options")
-                search_keywords.extend([option["text"] for option in options])
+    @staticmethod
+    def _get_search_keywords(library_item: LibraryItem) -> list[str]:
+        search_keywords = []
+        search_keywords.extend((library_item.description or {}).values())
+        for activity in library_item.activities or []:
+            search_keywords.append(activity.name)
+            for activity_item in activity.items or []:
+                search_keywords.extend((activity_item.question or {}).values())
+                if activity_item.response_type in ["singleSelect", "multiSelect"]:
+                    options = (activity_item.response_values or {}).get("options") or []
+                    search_keywords.extend([option["text"] for option in options])
         return search_keywords
 
+    async def build_missing_documents(self, limit: int) -> int:
+        """Builds documents of the items shared before they were stored"""
+        libraries = await LibraryCRUD(self.session).get_without_document(limit)
+        for library in libraries:
+            applet_history = await AppletHistoriesCRUD(self.session).retrieve_by_applet_version(
+                library.applet_id_version
+            )
+            document = await self._build_document(
+                library.id, library.applet_id_version, applet_history.display_name, library.keywords
+            )
+            await LibraryCRUD(self.session).update(LibrarySchema(**document), library.id)
+        return len(libraries)
+
     async def get_applets_count(self, query_param: QueryParams) -> int:
         count = await LibraryCRUD(self.session).get_all_library_count(query_param)
         return count
@@ -108,11 +145,8 @@ class LibraryService:
     async def get_all_applets(self, query_params: QueryParams) -> list[PublicLibraryItem]:
         """Get all applets for library."""
 
-        library_schemas = await LibraryCRUD(self.session).get_all_library_items(query_params)
-        library_items = parse_obj_as(list[LibraryItem], library_schemas)
-
-        for library_item in library_items:
-            library_item = await self._get_full_library_item(library_item)
+        rows = await LibraryCRUD(self.session).get_all_library_items(query_params)
+        library_items = [await self._get_library_item(row.id, row.document) for row in rows]
 
         return [
             PublicLibraryItem(
@@ -125,14 +159,23 @@ class LibraryService:
     async def get_applet_by_id(self, id_: uuid.UUID) -> PublicLibraryItem:
         """Get applet detail for library by id."""
 
-        library_item = await LibraryCRUD(self.session).get_library_item_by_id(id_)
+        library = await LibraryCRUD(self.session).get_by_id(id_)
+        if not library:
+            raise LibraryItemDoesNotExistError()
 
-        library_item = await self._get_full_library_item(library_item)
+        library_item = await self._get_library_item(library.id, library.document)
         return PublicLibraryItem(
             version=library_item.applet_id_version.split("_")[1],
             **library_item.model_dump(exclude={"applet_id_version"}),
         )
 
+    async def _get_library_item(self, id_: uuid.UUID, document: dict | None) -> LibraryItem:
+        if document is not None:
+            return LibraryItem.model_validate(dict(document, id=id_))
+        # Shared before the documents were stored, see `build_missing_documents`
+        library_item = await LibraryCRUD(self.session).get_library_item_by_id(id_)
+        return await self._get_full_library_item(library_item)
+
     async def _get_full_library_item(self, library_item: LibraryItem) -> LibraryItem:
         activities = await ActivityHistoriesCRUD(session=self.session).retrieve_by_applet_version(
             library_item.applet_id_version
@@ -262,14 +305,12 @@ class LibraryService:
                 id_version=new_applet_version,
                 display_name=schema.name,
             )
-        search_keywords = await self._get_search_keywords(applet, new_applet_version)
-        search_keywords.append(schema.name)
-
         # save library_item
+        document = await self._build_document(library_id, new_applet_version, schema.name, schema.keywords)
         library_item = LibrarySchema(
             applet_id_version=new_applet_version,
             keywords=schema.keywords,
-            search_keywords=search_keywords,
+            **document,
         )
         library_item = await LibraryCRUD(self.session).update(library_item, library_id)
         return AppletLibraryFull.model_validate(library_item)
@@ -97,6 +97,32 @@ class TestLibrary(BaseTest):
         result = response.json()["result"]
         assert len(result) == 1
 
+    async def test_library_search_by_name_and_activity_prefix(
+        self, client: TestClient, applet_one: AppletFull, tom: User
+    ):
+        client.login(tom)
+
+        data = dict(applet_id=applet_one.id, keywords=["depression"], name="PHQ2")
+        response = await client.post(self.library_url, data=data)
+        assert response.status_code == http.HTTPStatus.CREATED, response.json()
+        library_id = response.json()["result"]["id"]
+
+        activity_name = applet_one.activities[0].name
+        for search_term in ("phq", "DEPRESS", activity_name[:3]):
+            response = await client.get(self.library_url_search.format(search_term=search_term))
+            assert response.status_code == http.HTTPStatus.OK, response.json()
+            data = response.json()
+            assert data["count"] == 1
+            assert [item["id"] for item in data["result"]] == [library_id]
+
+        response = await client.get(self.library_url_search.format(search_term="unknown"))
+        assert response.json()["count"] == 0
+
+        # The item is stored once, its activity keys do not change between reads
+        first = await client.get(self.library_detail_url.format(library_id=library_id))
+        second = await client.get(self.library_detail_url.format(library_id=library_id))
+        assert first.json()["result"]["activities"][0]["key"] == second.json()["result"]["activities"][0]["key"]
+
     async def test_library_get_detail(self, client: TestClient, applet_one: AppletFull, tom: User):
         client.login(tom)
 
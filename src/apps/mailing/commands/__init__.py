@@ -0,0 +1 @@
+from apps.mailing.commands.benchmark import app as mailing_cli  # noqa: F401
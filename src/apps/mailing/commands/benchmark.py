@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import typer
+from fastapi_mail import ConnectionConfig, FastMail
+from rich import print
+from rich.table import Table
+
+from apps.mailing.domain import MessageSchema
+from apps.mailing.pool import SMTPPool
+from apps.mailing.services import MailingService
+from apps.mailing.sink import LocalSMTPSink
+from infrastructure.commands.utils import coro
+
+app = typer.Typer()
+
+
+async def _send_concurrently(send, messages: list[MessageSchema], concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _send(message: MessageSchema) -> None:
+        async with semaphore:
+            await send(message)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_send(message) for message in messages))
+    return time.perf_counter() - started
+
+
+@app.command(short_help="Compare per message SMTP sessions with the pooled sender")
+@coro
+async def benchmark(
+    count: int = typer.Option(500, "--count", "-n", help="Messages to send"),
+    concurrency: int = typer.Option(20, "--concurrency", "-c", help="Parallel senders, the size of the pool"),
+    latency: float = typer.Option(0.002, "--latency", "-l", help="Delay of every server reply, seconds"),
+):
+    """
+    Send messages to a local SMTP sink, once opening a session per message
+    like `FastMail` does and once over the pooled connections.
+    Templates are rendered for every message.
+    """
+    service = MailingService()
+
+    def _message(i: int) -> MessageSchema:
+        body = service.get_localized_html_template(template_name="response_alert", language="en", domain="example")
+        return MessageSchema(recipients=[f"user{i}@example.com"], subject="Response alert", body=body)
+
+    table = Table("Sender", "Messages", "SMTP sessions", "Seconds", "Messages/s")
+    async with LocalSMTPSink(delay=latency) as sink:
+        config = ConnectionConfig(
+            MAIL_USERNAME="benchmark",
+            MAIL_PASSWORD="benchmark",
+            MAIL_SERVER=sink.host,
+            MAIL_PORT=sink.port,
+            MAIL_STARTTLS=False,
+            MAIL_SSL_TLS=False,
+            MAIL_FROM="no-reply@example.com",
+        )
+
+        async def _per_message(message: MessageSchema) -> None:
+            await FastMail(config).send_message(message)
+
+        pool = SMTPPool(config, size=concurrency, idle_timeout=60)
+
+        async def _pooled(message: MessageSchema) -> None:
+            await pool.send([await service._build(message)])
+
+        for name, send in (("session per message", _per_message), (f"pool of {concurrency}", _pooled)):
+            sink.connections = 0
+            sink.messages.clear()
+            elapsed = await _send_concurrently(send, [_message(i) for i in range(count)], concurrency)
+            assert len(sink.messages) == count
+            table.add_row(name, str(count), str(sink.connections), f"{elapsed:.2f}", f"{count / elapsed:.0f}")
+        await pool.close()
+
+    print(table)
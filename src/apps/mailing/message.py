@@ -0,0 +1,70 @@
+import time
+from email.encoders import encode_base64
+from email.message import Message
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.utils import formatdate, make_msgid
+
+from fastapi_mail.schemas import MessageType, MultipartSubtypeEnum
+
+from apps.mailing.domain import MessageSchema
+
+__all__ = ["build_message"]
+
+
+def _join(addresses: list) -> str:
+    return ", ".join(str(address) for address in addresses)
+
+
+async def _attach_files(mime: MIMEMultipart, message: MessageSchema) -> None:
+    """Attaches the (file, meta) pairs the schema validator makes of the attachments"""
+    for file, meta in message.attachments:
+        meta = meta or {}
+        if "mime_type" in meta and "mime_subtype" in meta:
+            part = MIMEBase(_maintype=meta["mime_type"], _subtype=meta["mime_subtype"])
+        else:
+            part = MIMEBase(_maintype="application", _subtype="octet-stream")
+        await file.seek(0)
+        part.set_payload(await file.read())
+        encode_base64(part)
+        await file.close()
+        for name, value in meta.get("headers", {}).items():
+            part.add_header(name, value)
+        if not part.get("Content-Disposition"):
+            part.add_header("Content-Disposition", "attachment", filename=("UTF8", "", file.filename))
+        mime.attach(part)
+
+
+async def build_message(message: MessageSchema, sender: str) -> Message:
+    """MIME message of the schema, the same fastapi_mail sends"""
+    mime = MIMEMultipart(message.multipart_subtype.value)
+    mime.set_charset(message.charset)
+    if body := message.template_body or message.body:
+        mime.attach(MIMEText(body, _subtype=message.subtype.value, _charset=message.charset))
+    if message.alternative_body is not None and message.multipart_subtype == MultipartSubtypeEnum.alternative:
+        subtype = "html" if message.subtype == MessageType.plain else "plain"
+        mime.attach(MIMEText(message.alternative_body, _subtype=subtype, _charset=message.charset))
+        related = MIMEMultipart(MultipartSubtypeEnum.related.value)
+        related.set_charset(message.charset)
+        related.attach(mime)
+        mime = related
+
+    headers = dict(message.headers or {})
+    mime["Date"] = formatdate(time.time(), localtime=True)
+    mime["Message-ID"] = headers.pop("message-id", None) or make_msgid()
+    mime["To"] = _join(message.recipients)
+    mime["From"] = sender
+    if message.subject:
+        mime["Subject"] = message.subject
+    if message.cc:
+        mime["Cc"] = _join(message.cc)
+    if message.bcc:
+        mime["Bcc"] = _join(message.bcc)
+    if message.reply_to:
+        mime["Reply-To"] = _join(message.reply_to)
+    if message.attachments:
+        await _attach_files(mime, message)
+    for name, value in headers.items():
+        mime.add_header(name, value)
+    return mime
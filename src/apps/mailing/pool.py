@@ -0,0 +1,124 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import AsyncIterator
+
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+from fastapi_mail.errors import ConnectionErrors
+
+__all__ = ["SMTPPool"]
+
+
+class SMTPPool:
+    """Bounded pool of persistent SMTP connections.
+
+    - at most `size` connections are open, senders wait for a free one;
+    - a connection is reused by the following sends instead of opening a
+      new SMTP/TLS session and logging in for every message;
+    - connections idle for `idle_timeout` seconds are closed on the next
+      checkout, a connection which failed while sending is closed;
+    - a send on a reused connection dropped by the server is retried once
+      on a new connection.
+
+    NOTE: The pool is bound to the event loop it is used in.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int, idle_timeout: int):
+        self.config = config
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._in_use = 0
+        self._created = 0
+        self._reused = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            local_hostname=self.config.LOCAL_HOSTNAME,
+            cert_bundle=self.config.CERT_BUNDLE,
+        )
+        try:
+            await smtp.connect()
+            if self.config.USE_CREDENTIALS:
+                await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value())
+        except Exception as error:
+            smtp.close()
+            raise ConnectionErrors(
+                f"Exception raised {error}, check your credentials or email service configuration"
+            ) from error
+        self._created += 1
+        return smtp
+
+    @staticmethod
+    async def _close(smtp: aiosmtplib.SMTP) -> None:
+        if not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def _checkout(self) -> tuple[aiosmtplib.SMTP, bool]:
+        """Returns an open connection and whether it was reused"""
+        deadline = time.monotonic() - self.idle_timeout
+        while self._idle:
+            smtp, released_at = self._idle.pop()
+            if released_at > deadline and smtp.is_connected:
+                self._reused += 1
+                return smtp, True
+            await self._close(smtp)
+        return await self._connect(), False
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[tuple[aiosmtplib.SMTP, bool]]:
+        async with self._semaphore:
+            smtp, reused = await self._checkout()
+            self._in_use += 1
+            try:
+                yield smtp, reused
+            except BaseException:
+                # The state of the SMTP session is unknown after an error
+                smtp.close()
+                raise
+            finally:
+                self._in_use -= 1
+            self._idle.append((smtp, time.monotonic()))
+
+    async def send(self, messages: list[Message]) -> None:
+        """Sends the messages over one pooled connection"""
+        sent = 0
+        reused = False
+        try:
+            async with self._connection() as (smtp, reused):
+                for message in messages:
+                    await smtp.send_message(message)
+                    sent += 1
+        except aiosmtplib.SMTPServerDisconnected:
+            if not reused:
+                raise
+            async with self._connection() as (smtp, _):
+                for message in messages[sent:]:
+                    await smtp.send_message(message)
+
+    async def close(self) -> None:
+        while self._idle:
+            smtp, _ = self._idle.pop()
+            await self._close(smtp)
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "created": self._created,
+            "reused": self._reused,
+        }
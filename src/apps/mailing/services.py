@@ -1,10 +1,17 @@
-from typing import cast
+import asyncio
+from email.message import Message
+from email.utils import formataddr
 
-from fastapi_mail import ConnectionConfig, FastMail
-from jinja2 import Environment, PackageLoader, TemplateNotFound, select_autoescape
+import sentry_sdk
+from fastapi_mail import ConnectionConfig
+from jinja2 import Environment, PackageLoader, Template, TemplateNotFound, select_autoescape
 
 from apps.mailing.domain import MessageSchema
+from apps.mailing.message import build_message
+from apps.mailing.pool import SMTPPool
+from broker import broker
 from config import settings
+from infrastructure.logger import logger
 
 
 class TestMail:
@@ -26,7 +33,12 @@ class TestMail:
 
 
 class MailingService:
-    """A singleton realization of a Mailing service."""
+    """A singleton realization of a Mailing service.
+
+    Mails are sent over a process wide pool of SMTP connections, `enqueue`
+    hands them to a worker instead. Compiled templates are cached per
+    template name and language.
+    """
 
     _initialized = False
 
@@ -50,39 +62,108 @@ class MailingService:
             MAIL_FROM=settings.mailing.mail.from_email,
             MAIL_FROM_NAME=settings.mailing.mail.from_name,
         )
+        self.pool = SMTPPool(
+            self._connection, size=settings.mailing.pool_size, idle_timeout=settings.mailing.pool_idle_timeout
+        )
+        # Templates are packaged with the code, they are not checked for changes
         self.env = Environment(
             loader=PackageLoader("apps.mailing", "static/templates"),
             autoescape=select_autoescape(["html", "xml"]),
+            auto_reload=False,
+            cache_size=-1,
         )
 
         self.env_text = Environment(
             loader=PackageLoader("apps.mailing", "static/templates/subjects"),
             autoescape=False,
+            auto_reload=False,
+            cache_size=-1,
         )
+        self._localized: dict[tuple[str, str, str], tuple[Template, str]] = {}
 
         self._initialized = True
 
     async def send(self, message: MessageSchema) -> None:
-        mailing_class = FastMail
+        await self.send_many([message])
+
+    async def send_many(self, messages: list[MessageSchema]) -> None:
+        """Sends the messages over one pooled SMTP connection"""
+        if not messages:
+            return
         if settings.env == "testing":
-            mailing_class = cast(type[FastMail], TestMail)
-        fm = mailing_class(self._connection)
-        await fm.send_message(message)
+            sink = TestMail(self._connection)
+            for message in messages:
+                await sink.send_message(message)
+            return
+        await self.pool.send([await self._build(message) for message in messages])
+
+    async def enqueue(self, messages: list[MessageSchema]) -> None:
+        """Queues the messages to be sent by a worker, retried on failures.
+
+        Attachments are not serializable, messages with attachments are sent
+        right away.
+        """
+        queued = [message for message in messages if not message.attachments]
+        await self.send_many([message for message in messages if message.attachments])
+        if not queued:
+            return
+        await send_mails.kiq([message.model_dump(mode="json") for message in queued])
+
+    async def _build(self, message: MessageSchema) -> Message:
+        sender = message.from_email or self._connection.MAIL_FROM
+        if from_name := message.from_name or self._connection.MAIL_FROM_NAME:
+            sender = formataddr((from_name, sender))
+        return await build_message(message, sender)
+
+    def _get_localized(self, env: Environment, template_name: str, language: str, ext: str) -> tuple[Template, str]:
+        """Returns the template of the language, the english one if there is no translation"""
+        key = (ext, template_name, language)
+        if key not in self._localized:
+            try:
+                self._localized[key] = (env.get_template(f"{template_name}_{language}.{ext}"), language)
+            except TemplateNotFound:
+                if language == "en":
+                    raise
+                self._localized[key] = self._get_localized(env, template_name, "en", ext)
+        return self._localized[key]
 
     def get_localized_text_template(self, template_name: str, language: str, **kwargs) -> str:
         # Use the language exactly as given; only fallback is 'en'
-        try:
-            return self.env_text.get_template(f"{template_name}_{language}.txt").render(**kwargs).strip()
-        except TemplateNotFound:
-            if language != "en":
-                return self.env_text.get_template(f"{template_name}_en.txt").render(**kwargs).strip()
-            raise
+        template, _ = self._get_localized(self.env_text, template_name, language, "txt")
+        return template.render(**kwargs).strip()
 
     def get_localized_html_template(self, template_name: str, language: str, **kwargs) -> str:
-        kwargs["language"] = language
+        template, kwargs["language"] = self._get_localized(self.env, template_name, language, "html")
+        return template.render(**kwargs)
+
+
+async def _send_with_retries(service: MailingService, message: MessageSchema) -> None:
+    """Sends the mail, retries failed sends with exponential backoff"""
+    for attempt in range(1, settings.mailing.max_attempts + 1):
         try:
-            return self.env.get_template(f"{template_name}_{language}.html").render(**kwargs)
-        except TemplateNotFound:
-            if language != "en":
-                return self.get_localized_html_template(template_name, "en", **kwargs)
-            raise
+            await service.send(message)
+            return
+        except Exception as e:
+            if attempt == settings.mailing.max_attempts:
+                logger.error(
+                    f"Mail {message.subject!r} to {len(message.recipients)} recipient(s) dropped "
+                    f"after {attempt} attempts: {type(e).__name__}: {e}"
+                )
+                sentry_sdk.capture_exception(e)
+                return
+            delay = settings.mailing.retry_backoff * 2 ** (attempt - 1)
+            logger.warning(f"Sending mail failed, attempt {attempt}, retry in {delay}s: {type(e).__name__}: {e}")
+            await asyncio.sleep(delay)
+
+
+@broker.task()
+async def send_mails(messages: list[dict]) -> None:
+    """Sends queued mails one by one over pooled connections.
+
+    Every mail is retried on its own, so a retry does not send already
+    delivered mails again. A mail which failed all `max_attempts` is logged
+    and reported, the following mails are still sent.
+    """
+    service = MailingService()
+    for message in messages:
+        await _send_with_retries(service, MessageSchema.model_validate(message))
@@ -0,0 +1,68 @@
+import asyncio
+from email import message_from_bytes
+from email.message import Message
+
+__all__ = ["LocalSMTPSink"]
+
+
+class LocalSMTPSink:
+    """Local stand-in for an SMTP server, keeps received messages in memory.
+
+    Speaks just enough SMTP for `aiosmtplib` without TLS and authentication
+    (any credentials are accepted). Used by tests and the mailing benchmark.
+
+        async with LocalSMTPSink() as sink:
+            ... send to sink.host:sink.port ...
+            assert len(sink.messages) == 1
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0):
+        self.host = host
+        self.port = port
+        # Emulates the latency of a remote server for every reply
+        self.delay = delay
+        self.messages: list[Message] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> "LocalSMTPSink":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        assert self._server
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await self._reply(writer, "220 localhost ESMTP sink")
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip().upper()
+                if command.startswith("EHLO"):
+                    await self._reply(writer, "250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME")
+                elif command.startswith("AUTH"):
+                    await self._reply(writer, "235 Authentication successful")
+                elif command == "DATA":
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    data = b""
+                    while (chunk := await reader.readline()) not in (b".\r\n", b""):
+                        data += chunk[1:] if chunk.startswith(b"..") else chunk
+                    self.messages.append(message_from_bytes(data))
+                    await self._reply(writer, "250 OK")
+                elif command == "QUIT":
+                    await self._reply(writer, "221 Bye")
+                    break
+                else:
+                    # HELO, MAIL, RCPT, RSET, NOOP
+                    await self._reply(writer, "250 OK")
+        finally:
+            writer.close()
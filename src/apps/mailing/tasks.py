@@ -0,0 +1,4 @@
+# The task is defined next to the service which queues it, it is imported here for the worker discovery
+from apps.mailing.services import send_mails
+
+__all__ = ["send_mails"]
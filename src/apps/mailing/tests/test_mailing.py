@@ -0,0 +1,139 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi_mail import ConnectionConfig
+from pytest_mock import MockerFixture
+
+from apps.mailing.domain import MessageSchema
+from apps.mailing.message import build_message
+from apps.mailing.pool import SMTPPool
+from apps.mailing.services import MailingService
+from apps.mailing.sink import LocalSMTPSink
+from apps.mailing.tasks import send_mails
+from config import settings
+
+
+def _config(sink: LocalSMTPSink) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="user",
+        MAIL_PASSWORD="password",
+        MAIL_SERVER=sink.host,
+        MAIL_PORT=sink.port,
+        MAIL_STARTTLS=False,
+        MAIL_SSL_TLS=False,
+        MAIL_FROM="no-reply@example.com",
+    )
+
+
+async def _messages(count: int) -> list:
+    service = MailingService()
+    return [
+        await service._build(MessageSchema(recipients=[f"user{i}@example.com"], subject=f"Subject {i}", body="Body"))
+        for i in range(count)
+    ]
+
+
+async def test_smtp_pool__connections_are_reused():
+    async with LocalSMTPSink() as sink:
+        pool = SMTPPool(_config(sink), size=2, idle_timeout=60)
+
+        await asyncio.gather(*(pool.send([message]) for message in await _messages(10)))
+        await pool.close()
+
+    assert len(sink.messages) == 10
+    assert sink.connections == 2
+    assert pool.metrics()["reused"] == 8
+    assert sorted(message["Subject"] for message in sink.messages) == sorted(f"Subject {i}" for i in range(10))
+
+
+async def test_smtp_pool__idle_connections_are_closed():
+    async with LocalSMTPSink() as sink:
+        pool = SMTPPool(_config(sink), size=1, idle_timeout=-1)
+
+        for message in await _messages(2):
+            await pool.send([message])
+        await pool.close()
+
+    assert sink.connections == 2
+
+
+async def test_smtp_pool__dropped_connection_is_replaced():
+    messages = await _messages(2)
+    async with LocalSMTPSink() as sink:
+        pool = SMTPPool(_config(sink), size=1, idle_timeout=60)
+        await pool.send(messages[:1])
+        # The server closed the idle connection
+        smtp, _ = pool._idle[0]
+        smtp.close()
+        await pool.send(messages[1:])
+        await pool.close()
+
+    assert len(sink.messages) == 2
+    assert sink.connections == 2
+
+
+@pytest.mark.parametrize("language,expected", (("en", "en"), ("fr", "fr"), ("xx", "en")))
+def test_localized_html_template__fallback_is_cached(language: str, expected: str):
+    service = MailingService()
+
+    body = service.get_localized_html_template("reset_password", language, email="user@example.com", link="link")
+
+    template, resolved = service._localized[("html", "reset_password", language)]
+    assert resolved == expected
+    assert template.name == f"reset_password_{expected}.html"
+    assert body == template.render(email="user@example.com", link="link", language=expected)
+
+
+async def test_build_message__headers_and_body():
+    message = await build_message(
+        MessageSchema(
+            recipients=["user@example.com"],
+            cc=["cc@example.com"],
+            subject="Subject",
+            body="<p>Body</p>",
+            headers={"message-id": "<id@example.com>", "X-Tag": "tag"},
+        ),
+        "Sender <no-reply@example.com>",
+    )
+    assert message["To"] == "user <user@example.com>"
+    assert message["Cc"] == "cc <cc@example.com>"
+    assert message["From"] == "Sender <no-reply@example.com>"
+    assert message["Subject"] == "Subject"
+    assert message.get_all("Message-ID") == ["<id@example.com>"]
+    assert message["X-Tag"] == "tag"
+    (part,) = message.get_payload()
+    assert part.get_content_type() == "text/html"
+
+
+async def test_send_mails__failed_mail_does_not_stop_the_others(mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings.mailing, "max_attempts", 2)
+    monkeypatch.setattr(settings.mailing, "retry_backoff", 0)
+    sent = []
+
+    async def _send(message: MessageSchema):
+        if message.subject == "Fails":
+            raise ConnectionError()
+        sent.append(message.subject)
+
+    send = mocker.patch.object(MailingService, "send", AsyncMock(side_effect=_send))
+    messages = [
+        MessageSchema(recipients=["user@example.com"], subject=subject, body="Body").model_dump(mode="json")
+        for subject in ("First", "Fails", "Last")
+    ]
+
+    await send_mails(messages)
+
+    assert sent == ["First", "Last"]
+    assert send.await_count == 4
+
+
+async def test_enqueue__mails_are_queued(mock_kiq_mails: AsyncMock, mocker: MockerFixture):
+    send_many = mocker.patch.object(MailingService, "send_many", AsyncMock())
+    message = MessageSchema(recipients=["user@example.com"], subject="Subject", body="Body")
+
+    await MailingService().enqueue([message])
+
+    mock_kiq_mails.assert_awaited_once_with([message.model_dump(mode="json")])
+    # Only mails with attachments are sent right away
+    send_many.assert_awaited_once_with([])
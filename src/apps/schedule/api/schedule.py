@@ -1,9 +1,11 @@
+import http
 import uuid
 from copy import deepcopy
 from datetime import date, timedelta
 from typing import Annotated
 
-from fastapi import Body, Depends, Header
+from fastapi import Body, Depends, Header, Query
+from fastapi import Response as FastAPIResponse
 from firebase_admin.exceptions import FirebaseError
 
 # TODO: don't use answers error for schedule
@@ -13,7 +15,13 @@ from apps.applets.db.schemas import AppletSchema
 from apps.applets.service import AppletService
 from apps.authentication.deps import get_current_user
 from apps.schedule.domain.schedule.filters import EventQueryParams, ScheduleEventsExportParams
-from apps.schedule.domain.schedule.public import PublicEvent, PublicEventByUser, PublicEventCount
+from apps.schedule.domain.schedule.internal import ScheduleVersion
+from apps.schedule.domain.schedule.public import (
+    PublicEvent,
+    PublicEventByUser,
+    PublicEventCount,
+    PublicEventsByUserResponse,
+)
 from apps.schedule.domain.schedule.requests import EventRequest, EventUpdateRequest
 from apps.schedule.service.schedule import ScheduleService
 from apps.schedule.service.schedule_history import ScheduleHistoryService
@@ -25,7 +33,7 @@ from apps.workspaces.domain.constants import Role
 from apps.workspaces.service.check_access import CheckAccessService
 from infrastructure.database import atomic
 from infrastructure.database.deps import get_session
-from infrastructure.http import get_local_tz
+from infrastructure.http import get_if_none_match, get_local_tz
 from infrastructure.logger import logger
 from infrastructure.utility.notification_client import FirebaseNotificationType
 
@@ -260,29 +268,76 @@ async def schedule_delete_by_user(
         logger.exception(e)
 
 
+SCHEDULE_VERSION_HEADER = "X-Schedule-Version"
+
+
+def _set_schedule_version_headers(response: FastAPIResponse, version: ScheduleVersion) -> None:
+    response.headers["ETag"] = f'"{version.etag}"'
+    response.headers[SCHEDULE_VERSION_HEADER] = version.token
+
+
+def _not_modified(version: ScheduleVersion) -> FastAPIResponse:
+    response = FastAPIResponse(status_code=http.HTTPStatus.NOT_MODIFIED)
+    _set_schedule_version_headers(response, version)
+    return response
+
+
 async def schedule_get_all_by_user(
+    response: FastAPIResponse,
     user: User = Depends(get_current_user),
     session=Depends(get_session),
-) -> ResponseMulti[PublicEventByUser]:
-    """Get all schedules for a user."""
+    if_none_match: set[str] = Depends(get_if_none_match),
+    since_version: str | None = Query(None, alias="sinceVersion"),
+) -> PublicEventsByUserResponse | FastAPIResponse:
+    """Get all schedules for a user.
+
+    The `ETag` header is the version of the schedule, the request with it in
+    `If-None-Match` gets 304 if the schedule has not changed. With the
+    `X-Schedule-Version` header value of a previous response in `sinceVersion`
+    only the events changed since then are returned, with the ids of the
+    removed ones.
+    """
     async with atomic(session):
-        public_events_by_user = await ScheduleService(session, admin_user_id=user.id).get_events_by_user(
-            user_id=user.id
+        service = ScheduleService(session, admin_user_id=user.id)
+        applet_ids = await service.get_user_applet_ids(user.id)
+        version = await service.get_schedule_version(user.id, applet_ids)
+        if version.etag in if_none_match:
+            return _not_modified(version)
+
+        since_xid = version.changed_since(since_version)
+        changed_event_ids = None
+        if since_xid is not None:
+            changed_event_ids = await service.get_changed_event_ids(user.id, applet_ids, since_xid)
+        public_events_by_user = await service.get_events_by_user(
+            user_id=user.id, applet_ids=applet_ids, only_event_ids=changed_event_ids
         )
-        count = await ScheduleService(session, admin_user_id=user.id).count_events_by_user(user_id=user.id)
-    return ResponseMulti(result=public_events_by_user, count=count)
+        count = await service.count_events_by_user(user_id=user.id, applet_ids=applet_ids)
+        deleted_event_ids = None
+        if since_xid is not None and changed_event_ids is not None:
+            deleted_event_ids = await service.get_removed_event_ids(
+                user.id, applet_ids, since_xid, changed_event_ids, public_events_by_user
+            )
+    _set_schedule_version_headers(response, version)
+    return PublicEventsByUserResponse(result=public_events_by_user, count=count, deleted_event_ids=deleted_event_ids)
 
 
 async def schedule_get_all_by_respondent_user(
+    response: FastAPIResponse,
     user: User = Depends(get_current_user),
     session=Depends(get_session),
     time_zone: str | None = Depends(get_local_tz()),
+    if_none_match: set[str] = Depends(get_if_none_match),
+    since_version: str | None = Query(None, alias="sinceVersion"),
     device_id: Annotated[str | None, Header()] = None,
     os_name: Annotated[str | None, Header()] = None,
     os_version: Annotated[str | None, Header()] = None,
     app_version: Annotated[str | None, Header()] = None,
-) -> ResponseMulti[PublicEventByUser]:
-    """Get all the respondent's schedules for the next 2 weeks."""
+) -> PublicEventsByUserResponse | FastAPIResponse:
+    """Get all the respondent's schedules for the next 2 weeks.
+
+    Supports `If-None-Match` and `sinceVersion` like `/users/me/events`,
+    the device event versions are recorded only for the returned events.
+    """
     max_date_from_event_delta_days = 15
     min_date_to_event_delta_days = 2
     today: date = date.today()
@@ -304,7 +359,16 @@ async def schedule_get_all_by_respondent_user(
         )
         applet_ids: list[uuid.UUID] = [applet.id for applet in applets]
 
-        public_events_by_user = await ScheduleService(session, admin_user_id=user.id).get_upcoming_events_by_user(
+        service = ScheduleService(session, admin_user_id=user.id)
+        version = await service.get_schedule_version(user.id, applet_ids, min_end_date, max_start_date)
+        if version.etag in if_none_match:
+            return _not_modified(version)
+
+        since_xid = version.changed_since(since_version)
+        changed_event_ids = None
+        if since_xid is not None:
+            changed_event_ids = await service.get_changed_event_ids(user.id, applet_ids, since_xid)
+        public_events_by_user = await service.get_upcoming_events_by_user(
             user_id=user.id,
             applet_ids=applet_ids,
             min_end_date=min_end_date,
@@ -314,8 +378,17 @@ async def schedule_get_all_by_respondent_user(
             os_name=os_name,
             os_version=os_version,
             app_version=app_version,
+            only_event_ids=changed_event_ids,
         )
-    return ResponseMulti(result=public_events_by_user, count=len(public_events_by_user))
+        deleted_event_ids = None
+        if since_xid is not None and changed_event_ids is not None:
+            deleted_event_ids = await service.get_removed_event_ids(
+                user.id, applet_ids, since_xid, changed_event_ids, public_events_by_user
+            )
+    _set_schedule_version_headers(response, version)
+    return PublicEventsByUserResponse(
+        result=public_events_by_user, count=len(public_events_by_user), deleted_event_ids=deleted_event_ids
+    )
 
 
 async def schedule_get_by_user(
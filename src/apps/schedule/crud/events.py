@@ -1,7 +1,8 @@
 import uuid
-from datetime import date
+from datetime import date, datetime
+from typing import Collection
 
-from sqlalchemy import Integer, update
+from sqlalchemy import Integer, literal_column, union, union_all, update
 from sqlalchemy.exc import IntegrityError, MultipleResultsFound, NoResultFound
 from sqlalchemy.orm import Query
 from sqlalchemy.sql import and_, delete, func, or_, select
@@ -10,6 +11,7 @@ from sqlalchemy.sql.expression import case, cast
 from apps.activities.db.schemas import ActivitySchema
 from apps.activity_flows.db.schemas import ActivityFlowSchema
 from apps.schedule.db.schemas import (
+    DeletedEventSchema,
     EventSchema,
 )
 from apps.schedule.domain.constants import EventType, PeriodicityType
@@ -28,7 +30,7 @@ from apps.workspaces.db.schemas import UserAppletAccessSchema
 from apps.workspaces.domain.constants import Role
 from infrastructure.database import BaseCRUD
 
-__all__ = ["EventCRUD"]
+__all__ = ["EventCRUD", "DeletedEventCRUD"]
 
 
 class EventCRUD(BaseCRUD[EventSchema]):
@@ -46,6 +48,17 @@ class EventCRUD(BaseCRUD[EventSchema]):
         event: Event = Event.model_validate(instance)
         return event
 
+    async def insert_many(self, events: list[EventCreate]) -> list[Event]:
+        """Return the created events in the order of the given ones."""
+        schemas = [EventSchema(id=uuid.uuid4(), **event.model_dump()) for event in events]
+        try:
+            instances = await self._insert_many(schemas, returning=True)
+        except IntegrityError as e:
+            raise EventError(message=str(e))
+
+        instances_map = {instance.id: instance for instance in instances}
+        return [Event.model_validate(instances_map[schema.id]) for schema in schemas]
+
     async def get_by_id(self, pk: uuid.UUID) -> Event:
         """Return event instance."""
         query: Query = select(self.schema_class)
@@ -171,6 +184,7 @@ class EventCRUD(BaseCRUD[EventSchema]):
         user_id: uuid.UUID,
         min_end_date: date | None = None,
         max_start_date: date | None = None,
+        only_event_ids: Collection[uuid.UUID] | None = None,
     ) -> tuple[dict[uuid.UUID, list[EventFull]], set[uuid.UUID]]:
         """Get events by applet_ids and user_id
         Return {applet_id: [EventFull]}"""
@@ -181,6 +195,8 @@ class EventCRUD(BaseCRUD[EventSchema]):
             EventSchema.is_deleted.is_(False),
             EventSchema.user_id == user_id,
         )
+        if only_event_ids is not None:
+            query = query.where(EventSchema.id.in_(only_event_ids))
         if min_end_date and max_start_date:
             query = query.where(
                 or_(
@@ -238,7 +254,83 @@ class EventCRUD(BaseCRUD[EventSchema]):
         """Delete event by event ids."""
         query: Query = delete(EventSchema)
         query = query.where(EventSchema.id.in_(ids))
-        await self._execute(query)
+        query = query.returning(
+            EventSchema.id,
+            EventSchema.applet_id,
+            EventSchema.user_id,
+            func.coalesce(EventSchema.activity_flow_id, EventSchema.activity_id).label("entity_id"),
+        )
+        db_result = await self._execute(query)
+        await DeletedEventCRUD(self.session).insert_many(
+            [
+                DeletedEventSchema(
+                    event_id=row.id,
+                    applet_id=row.applet_id,
+                    user_id=row.user_id,
+                    entity_id=row.entity_id,
+                )
+                for row in db_result
+            ]
+        )
+
+    async def get_changed_event_ids(
+        self, applet_ids: list[uuid.UUID], user_id: uuid.UUID, since_xid: int
+    ) -> list[uuid.UUID]:
+        """Get events of the user schedule changed since the transaction.
+        The general events of the activities and flows which individual
+        events of the user changed are returned too, as they can be hidden
+        or shown by the individual ones."""
+        individual_entity_ids = union(
+            select(func.coalesce(EventSchema.activity_flow_id, EventSchema.activity_id)).where(
+                EventSchema.applet_id.in_(applet_ids),
+                EventSchema.user_id == user_id,
+                EventSchema.change_xid >= since_xid,
+            ),
+            select(DeletedEventSchema.entity_id).where(
+                DeletedEventSchema.applet_id.in_(applet_ids),
+                DeletedEventSchema.user_id == user_id,
+                DeletedEventSchema.change_xid >= since_xid,
+            ),
+        )
+
+        query: Query = select(EventSchema.id)
+        query = query.where(
+            EventSchema.applet_id.in_(applet_ids),
+            or_(EventSchema.user_id == user_id, EventSchema.user_id.is_(None)),
+            or_(
+                EventSchema.change_xid >= since_xid,
+                and_(
+                    EventSchema.user_id.is_(None),
+                    func.coalesce(EventSchema.activity_flow_id, EventSchema.activity_id).in_(individual_entity_ids),
+                ),
+            ),
+        )
+        db_result = await self._execute(query)
+        return db_result.scalars().all()
+
+    async def get_schedule_state(self, applet_ids: list[uuid.UUID], user_id: uuid.UUID) -> tuple[int, int, int, int]:
+        """Get the count, sum and max of the change transactions of the user
+        schedule events, deleted ones included, which change with any event
+        change, and the oldest transaction not visible yet."""
+        changes = union_all(
+            select(EventSchema.change_xid).where(
+                EventSchema.applet_id.in_(applet_ids),
+                or_(EventSchema.user_id == user_id, EventSchema.user_id.is_(None)),
+            ),
+            select(DeletedEventSchema.change_xid).where(
+                DeletedEventSchema.applet_id.in_(applet_ids),
+                or_(DeletedEventSchema.user_id == user_id, DeletedEventSchema.user_id.is_(None)),
+            ),
+        ).subquery()
+        query: Query = select(
+            func.count(),
+            func.coalesce(func.sum(changes.c.change_xid), 0),
+            func.coalesce(func.max(changes.c.change_xid), 0),
+            literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint"),
+        ).select_from(changes)
+        db_result = await self._execute(query)
+        count, total, last, xmin = db_result.one()
+        return count, int(total), last, xmin
 
     async def get_all_by_applet_and_activity(
         self,
@@ -262,6 +354,29 @@ class EventCRUD(BaseCRUD[EventSchema]):
         result = await self._execute(query)
         return result.scalars().all()
 
+    async def get_all_by_applet_and_activities_or_flows(
+        self,
+        applet_id: uuid.UUID,
+        activity_ids: list[uuid.UUID],
+        flow_ids: list[uuid.UUID],
+        respondent_ids: list[uuid.UUID | None],
+    ) -> list[EventSchema]:
+        """Get events of any of the activities or flows and any of the respondents, None for general events"""
+        user_ids = [respondent_id for respondent_id in respondent_ids if respondent_id]
+        query: Query = select(EventSchema)
+        query = query.where(
+            EventSchema.applet_id == applet_id,
+            EventSchema.is_deleted.is_(False),
+            or_(EventSchema.activity_id.in_(activity_ids), EventSchema.activity_flow_id.in_(flow_ids)),
+        )
+        if None in respondent_ids:
+            query = query.where(or_(EventSchema.user_id.in_(user_ids), EventSchema.user_id.is_(None)))
+        else:
+            query = query.where(EventSchema.user_id.in_(user_ids))
+
+        result = await self._execute(query)
+        return result.scalars().all()
+
     async def validate_existing_always_available(
         self,
         applet_id: uuid.UUID,
@@ -375,6 +490,7 @@ class EventCRUD(BaseCRUD[EventSchema]):
         user_id: uuid.UUID,
         min_end_date: date | None = None,
         max_start_date: date | None = None,
+        only_event_ids: Collection[uuid.UUID] | None = None,
     ) -> tuple[dict[uuid.UUID, list[EventFull]], set[uuid.UUID]]:
         """Get general events by applet_id and user_id"""
 
@@ -403,6 +519,8 @@ class EventCRUD(BaseCRUD[EventSchema]):
             ),
             EventSchema.user_id.is_(None),
         )
+        if only_event_ids is not None:
+            query = query.where(EventSchema.id.in_(only_event_ids))
         if min_end_date and max_start_date:
             query = query.where(
                 or_(
@@ -660,3 +778,29 @@ class EventCRUD(BaseCRUD[EventSchema]):
         flow_events = result.scalars().all()
 
         return [Event.model_validate(flow_event) for flow_event in flow_events]
+
+
+class DeletedEventCRUD(BaseCRUD[DeletedEventSchema]):
+    schema_class = DeletedEventSchema
+
+    async def insert_many(self, deleted_events: list[DeletedEventSchema]) -> None:
+        await self._insert_many(deleted_events)
+
+    async def get_deleted_event_ids(
+        self, applet_ids: list[uuid.UUID], user_id: uuid.UUID, since_xid: int
+    ) -> list[uuid.UUID]:
+        """Get events of the user schedule deleted since the transaction."""
+        query: Query = select(DeletedEventSchema.event_id).distinct()
+        query = query.where(
+            DeletedEventSchema.applet_id.in_(applet_ids),
+            or_(DeletedEventSchema.user_id == user_id, DeletedEventSchema.user_id.is_(None)),
+            DeletedEventSchema.change_xid >= since_xid,
+        )
+        db_result = await self._execute(query)
+        return db_result.scalars().all()
+
+    async def delete_created_before(self, before: datetime) -> int:
+        """Removes deleted events older than the date, returns the number of removed ones."""
+        query = delete(DeletedEventSchema).where(DeletedEventSchema.created_at < before)
+        db_result = await self._execute(query)
+        return db_result.rowcount
@@ -4,7 +4,12 @@ from sqlalchemy.orm import Query
 from sqlalchemy.sql import delete, select, update
 
 from apps.schedule.db.schemas import NotificationSchema, ReminderSchema
-from apps.schedule.domain.schedule.internal import NotificationSetting, ReminderSetting, ReminderSettingCreate
+from apps.schedule.domain.schedule.internal import (
+    NotificationSetting,
+    NotificationSettingCreate,
+    ReminderSetting,
+    ReminderSettingCreate,
+)
 from infrastructure.database import BaseCRUD
 
 __all__ = [
@@ -23,6 +28,12 @@ class NotificationCRUD(BaseCRUD[NotificationSchema]):
         result = await self._create_many(notifications)
         return [NotificationSetting.model_validate(notification) for notification in result]
 
+    async def insert_many(self, notifications: list[NotificationSettingCreate]) -> list[NotificationSetting]:
+        """Create notifications with multi-row inserts."""
+        schemas = [NotificationSchema(id=uuid.uuid4(), **notification.model_dump()) for notification in notifications]
+        await self._insert_many(schemas)
+        return [NotificationSetting.model_validate(schema) for schema in schemas]
+
     async def get_all_by_event_id(self, event_id: uuid.UUID) -> list[NotificationSetting]:
         """Return all notifications by event id."""
 
@@ -66,6 +77,12 @@ class ReminderCRUD(BaseCRUD[ReminderSchema]):
         db_reminder = await self._create(ReminderSchema(**reminder.model_dump()))
         return ReminderSetting.model_validate(db_reminder)
 
+    async def insert_many(self, reminders: list[ReminderSettingCreate]) -> list[ReminderSetting]:
+        """Create reminders with multi-row inserts."""
+        schemas = [ReminderSchema(id=uuid.uuid4(), **reminder.model_dump()) for reminder in reminders]
+        await self._insert_many(schemas)
+        return [ReminderSetting.model_validate(schema) for schema in schemas]
+
     async def get_by_event_id(self, event_id: uuid.UUID) -> ReminderSchema:
         """Return all reminders by event id."""
 
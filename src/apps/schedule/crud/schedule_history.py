@@ -42,9 +42,18 @@ class ScheduleHistoryCRUD(BaseCRUD[EventHistorySchema]):
     async def get_by_id(self, id_version: str) -> EventHistorySchema | None:
         return await self._get("id_version", id_version)
 
+    async def get_by_ids(self, id_versions: list[str]) -> list[EventHistorySchema]:
+        query: Query = select(EventHistorySchema)
+        query = query.where(EventHistorySchema.id_version.in_(id_versions))
+        result = await self._execute(query)
+        return result.scalars().all()
+
     async def add(self, event: EventHistorySchema) -> EventHistorySchema:
         return await self._create(event)
 
+    async def insert_many(self, events: list[EventHistorySchema]) -> None:
+        await self._insert_many(events)
+
     async def mark_as_deleted(self, events: list[tuple[uuid.UUID, str]]):
         id_versions = [f"{event[0]}_{event[1]}" for event in events]
 
@@ -152,6 +161,8 @@ class ScheduleHistoryCRUD(BaseCRUD[EventHistorySchema]):
 
 
 class AppletEventsCRUD(BaseCRUD[AppletEventsSchema]):
+    schema_class = AppletEventsSchema
+
     async def find_by_applet_id_version(self, applet_id_version: str) -> list[AppletEventsSchema]:
         query = select(AppletEventsSchema)
         query = query.where(
@@ -169,6 +180,9 @@ class AppletEventsCRUD(BaseCRUD[AppletEventsSchema]):
     async def add_many(self, applet_events: list[AppletEventsSchema]) -> list[AppletEventsSchema]:
         return await self._create_many(applet_events)
 
+    async def insert_many(self, applet_events: list[AppletEventsSchema]) -> None:
+        await self._insert_many(applet_events)
+
     async def mark_as_deleted(self, events: list[tuple[uuid.UUID, str]]):
         id_versions = [f"{event[0]}_{event[1]}" for event in events]
 
@@ -178,12 +192,17 @@ class AppletEventsCRUD(BaseCRUD[AppletEventsSchema]):
 
 
 class NotificationHistoryCRUD(BaseCRUD[NotificationHistorySchema]):
+    schema_class = NotificationHistorySchema
+
     async def add(self, notification: NotificationHistorySchema) -> NotificationHistorySchema:
         return await self._create(notification)
 
     async def add_many(self, notifications: list[NotificationHistorySchema]) -> list[NotificationHistorySchema]:
         return await self._create_many(notifications)
 
+    async def insert_many(self, notifications: list[NotificationHistorySchema]) -> None:
+        await self._insert_many(notifications)
+
     async def mark_as_deleted(self, events: list[tuple[uuid.UUID, str]]):
         id_versions = [f"{event[0]}_{event[1]}" for event in events]
 
@@ -197,9 +216,14 @@ class NotificationHistoryCRUD(BaseCRUD[NotificationHistorySchema]):
 
 
 class ReminderHistoryCRUD(BaseCRUD[ReminderHistorySchema]):
+    schema_class = ReminderHistorySchema
+
     async def add(self, reminder: ReminderHistorySchema) -> ReminderHistorySchema:
         return await self._create(reminder)
 
+    async def insert_many(self, reminders: list[ReminderHistorySchema]) -> None:
+        await self._insert_many(reminders)
+
     async def mark_as_deleted(self, events: list[tuple[uuid.UUID, str]]):
         id_versions = [f"{event[0]}_{event[1]}" for event in events]
 
@@ -8,7 +8,7 @@ from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Query
 from sqlalchemy.sql import func
-from sqlalchemy.sql.expression import and_, select
+from sqlalchemy.sql.expression import and_, select, tuple_
 
 from apps.applets.db.schemas import AppletHistorySchema
 from apps.schedule.db.schemas import AppletEventsSchema, EventHistorySchema, UserDeviceEventsHistorySchema
@@ -44,6 +44,25 @@ class UserDeviceEventsHistoryCRUD(BaseCRUD[UserDeviceEventsHistorySchema]):
         result = await self._execute(query)
         return result.scalars().first()
 
+    async def get_recorded_event_versions(
+        self,
+        device_id: str,
+        user_id: uuid.UUID,
+        event_versions: list[tuple[uuid.UUID, str]],
+    ) -> set[tuple[uuid.UUID, str]]:
+        """Returns which of the event versions were recorded for the device"""
+        query: Query = select(UserDeviceEventsHistorySchema.event_id, UserDeviceEventsHistorySchema.event_version)
+        query = query.where(UserDeviceEventsHistorySchema.device_id == device_id)
+        query = query.where(UserDeviceEventsHistorySchema.user_id == user_id)
+        query = query.where(
+            tuple_(UserDeviceEventsHistorySchema.event_id, UserDeviceEventsHistorySchema.event_version).in_(
+                event_versions
+            )
+        )
+
+        result = await self._execute(query)
+        return {(event_id, event_version) for event_id, event_version in result.all()}
+
     async def record_event_versions(
         self,
         user_id: uuid.UUID,
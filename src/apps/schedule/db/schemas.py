@@ -1,6 +1,20 @@
 import datetime
 
-from sqlalchemy import Boolean, Column, Date, ForeignKey, Integer, Interval, String, Text, Time, UniqueConstraint, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    Interval,
+    String,
+    Text,
+    Time,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ENUM, UUID
 
 from infrastructure.database.base import Base
@@ -31,11 +45,44 @@ class _BaseEventSchema:
     activity_flow_id = Column(UUID(as_uuid=True), nullable=True)
 
 
+# Id of the transaction writing a row, used to find the events changed since a schedule version
+CURRENT_XACT_ID = "pg_current_xact_id()::text::bigint"
+
+
 class EventSchema(_BaseEventSchema, Base):
     __tablename__ = "events"
 
     applet_id = Column(ForeignKey("applets.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(ForeignKey("users.id", ondelete="RESTRICT"), nullable=True)
+    change_xid = Column(
+        BigInteger,
+        nullable=False,
+        default=text(CURRENT_XACT_ID),
+        onupdate=text(CURRENT_XACT_ID),
+        server_default=text(CURRENT_XACT_ID),
+    )
+
+    __table_args__ = (Index(None, "applet_id", "change_xid"),)
+
+
+class DeletedEventSchema(Base):
+    """Deleted events, so the schedule delta sync can tell the clients to remove them"""
+
+    __tablename__ = "deleted_events"
+
+    event_id = Column(UUID(as_uuid=True), nullable=False)
+    applet_id = Column(ForeignKey("applets.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    # Activity or flow of the event
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    change_xid = Column(
+        BigInteger,
+        nullable=False,
+        default=text(CURRENT_XACT_ID),
+        server_default=text(CURRENT_XACT_ID),
+    )
+
+    __table_args__ = (Index(None, "applet_id", "change_xid"),)
 
 
 class EventHistorySchema(_BaseEventSchema, HistoryAware, Base):
@@ -17,6 +17,7 @@ from apps.schedule.domain.schedule.public import (
 )
 from apps.schedule.errors import SelectedDateRequiredError
 from apps.shared.domain import InternalModel
+from config import settings
 
 __all__ = [
     "Event",
@@ -28,6 +29,7 @@ __all__ = [
     "NotificationSetting",
     "ReminderSettingCreate",
     "ReminderSetting",
+    "ScheduleVersion",
 ]
 
 
@@ -199,3 +201,43 @@ class ScheduleEvent(EventFull):
             notificationSettings=notification_settings,
             version=self.version,
         )
+
+
+class ScheduleVersion(InternalModel):
+    """Version of the schedule of a user.
+
+    `etag` changes with any event of the user schedule. `scope` identifies
+    the applets and the dates of the schedule, and `xmin` is the oldest
+    transaction not visible when the version was read, the events written
+    by it and later ones are not in the version. The `token` returned to the
+    client lets it ask for the events changed since the version.
+
+    Deleted events are kept for `schedule_deleted_events_retention_days`,
+    a token issued before that (less a day for the transactions running
+    when it was issued) can not tell the removed events anymore.
+    """
+
+    etag: str
+    scope: str
+    xmin: int
+    # Unix time the version was read at
+    issued_at: int
+
+    @property
+    def token(self) -> str:
+        return f"{self.xmin}.{self.issued_at}.{self.scope}"
+
+    def changed_since(self, token: str | None) -> int | None:
+        """Transaction id to get the changes since the token version from,
+        None if the token is of another scope or too old, then the full
+        schedule is needed."""
+        if not token:
+            return None
+        xmin, _, rest = token.partition(".")
+        issued_at, _, scope = rest.partition(".")
+        if scope != self.scope or not xmin.isdigit() or not issued_at.isdigit():
+            return None
+        max_age = (settings.service.schedule_deleted_events_retention_days - 1) * 86400
+        if self.issued_at - int(issued_at) > max_age:
+            return None
+        return int(xmin)
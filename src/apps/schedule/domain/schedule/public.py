@@ -7,7 +7,7 @@ from pydantic import NonNegativeInt, field_validator
 from apps.schedule.domain.constants import AvailabilityType, NotificationTriggerType, PeriodicityType
 from apps.schedule.domain.schedule import BaseEvent, BaseNotificationSetting, BasePeriodicity, BaseReminderSetting
 from apps.schedule.errors import HourRangeError, MinuteRangeError
-from apps.shared.domain import PublicModel
+from apps.shared.domain import PublicModel, ResponseMulti
 
 __all__ = [
     "PublicPeriodicity",
@@ -16,6 +16,7 @@ __all__ = [
     "FlowEventCount",
     "PublicEventCount",
     "PublicEventByUser",
+    "PublicEventsByUserResponse",
     "HourMinute",
     "TimerDto",
     "EventAvailabilityDto",
@@ -134,6 +135,12 @@ class PublicEventByUser(PublicModel):
     events: list[ScheduleEventDto] | None = None
 
 
+class PublicEventsByUserResponse(ResponseMulti[PublicEventByUser]):
+    # Set for the changes since a schedule version: the events to remove,
+    # `result` has the created and updated events only
+    deleted_event_ids: list[uuid.UUID] | None = None
+
+
 class ExportEventHistoryDto(PublicModel):
     applet_id: uuid.UUID
     applet_version: str
@@ -1,6 +1,13 @@
 from gettext import gettext as _
 
-from apps.shared.exception import AccessDeniedError, FieldError, InternalServerError, NotFoundError, ValidationError
+from apps.shared.exception import (
+    AccessDeniedError,
+    FieldError,
+    InternalServerError,
+    MultipleErrors,
+    NotFoundError,
+    ValidationError,
+)
 
 
 class EventNotFoundError(NotFoundError):
@@ -98,3 +105,15 @@ class TimerRequiredError(FieldError):
 class FromTimeToTimeRequiredError(FieldError):
     zero_path = None
     message = _("from_time and to_time are required for this trigger type.")
+
+
+class EventRespondentAccessError(FieldError):
+    message = _("Respondent does not have access to applet.")
+
+
+class EventActivityOrFlowNotFoundError(FieldError):
+    message = _("Activity/Flow not found.")
+
+
+class InvalidEventsError(MultipleErrors):
+    message = _("Some events are invalid, no event is saved.")
@@ -0,0 +1,125 @@
+"""Occurrences of scheduled events in a date range.
+
+The dates an event happens on are computed by Postgres: the dates between
+the event bounds and the requested range are generated with
+`generate_series` and filtered with the periodicity rules, so a query
+returns the occurrences of any number of events at once.
+
+The rules are the ones of the mobile app calendar:
+ - ONCE happens on the selected date, DAILY on every date between the start
+   and end dates, WEEKDAYS on the working days between them, WEEKLY on the
+   weekday of the start date, MONTHLY on the month day of the start date and
+   on the last day of every month, ALWAYS on every date;
+ - a cross-day event (the start time is after the end time) also happens on
+   the day following every occurrence, the end date is extended to it when
+   the last occurrence falls on the end date;
+ - missing start or end dates do not bound the occurrences, WEEKLY and
+   MONTHLY events without start date have none.
+"""
+
+import datetime
+
+from sqlalchemy import Date, Integer, and_, case, cast, extract, func, literal, literal_column, or_, select, text, true
+from sqlalchemy.sql import ColumnElement, FromClause, Select
+
+from apps.schedule.db.schemas import EventSchema
+from apps.schedule.domain.constants import PeriodicityType
+
+__all__ = ["event_occurrences"]
+
+FRIDAY_ISODOW = 5
+# Rendered inline, as a bound parameter Postgres cannot tell `date + $1` operators apart
+ONE = literal_column("1", Integer)
+
+
+def _isodow(value) -> ColumnElement:
+    return extract("isodow", value)
+
+
+def _is_last_day_of_month(value) -> ColumnElement:
+    return extract("day", value + ONE) == 1
+
+
+def event_occurrences(start_date: datetime.date, end_date: datetime.date, events: FromClause | None = None) -> Select:
+    """Query of (`event_id`, `date`) rows of the occurrences of the events
+    between the dates, both included.
+
+    `events` is the events table by default, any selectable with its `id`,
+    `periodicity`, `start_date`, `end_date`, `selected_date`, `start_time`
+    and `end_time` columns can be given. Filter it, or join the query to
+    the events with their filters, to get the occurrences of some events.
+    """
+    if events is None:
+        events = EventSchema.__table__
+    e = events.c
+    is_crossday = and_(e.start_time.is_not(None), e.end_time.is_not(None), e.start_time > e.end_time)
+
+    def _extend_if(condition) -> ColumnElement:
+        return cast(and_(is_crossday, condition), Integer)
+
+    first_date = case((e.periodicity == PeriodicityType.ONCE, e.selected_date), else_=e.start_date)
+    last_date = case(
+        (e.periodicity == PeriodicityType.ONCE, e.selected_date + _extend_if(true())),
+        (e.periodicity == PeriodicityType.DAILY, e.end_date + _extend_if(true())),
+        (e.periodicity == PeriodicityType.WEEKDAYS, e.end_date + _extend_if(_isodow(e.end_date) == FRIDAY_ISODOW)),
+        (
+            e.periodicity == PeriodicityType.WEEKLY,
+            e.end_date + _extend_if(_isodow(e.start_date) == _isodow(e.end_date)),
+        ),
+        (
+            e.periodicity == PeriodicityType.MONTHLY,
+            e.end_date
+            + _extend_if(
+                or_(
+                    and_(_is_last_day_of_month(e.start_date), _is_last_day_of_month(e.end_date)),
+                    extract("day", e.start_date) == extract("day", e.end_date),
+                )
+            ),
+        ),
+        else_=e.end_date,
+    )
+
+    # Postgres greatest/least ignore nulls, missing bounds do not limit the series
+    series = (
+        func.generate_series(
+            func.greatest(first_date, literal(start_date, Date)),
+            func.least(last_date, literal(end_date, Date)),
+            text("interval '1 day'"),
+        )
+        .table_valued("value")
+        .lateral("occurrence_dates")
+    )
+    date = cast(series.c.value, Date)
+
+    following_monthday = case(
+        (_is_last_day_of_month(e.start_date), ONE),
+        else_=cast(extract("day", e.start_date), Integer) + ONE,
+    )
+    occurs = case(
+        (e.periodicity == PeriodicityType.ONCE, e.selected_date.is_not(None)),
+        (
+            e.periodicity == PeriodicityType.WEEKDAYS,
+            _isodow(date) <= FRIDAY_ISODOW + cast(is_crossday, Integer),
+        ),
+        (
+            e.periodicity == PeriodicityType.WEEKLY,
+            or_(
+                _isodow(date) == _isodow(e.start_date),
+                and_(is_crossday, _isodow(date) == _isodow(e.start_date) % 7 + ONE),
+            ),
+        ),
+        (
+            e.periodicity == PeriodicityType.MONTHLY,
+            and_(
+                e.start_date.is_not(None),
+                or_(
+                    extract("day", date) == extract("day", e.start_date),
+                    and_(is_crossday, extract("day", date) == following_monthday),
+                    _is_last_day_of_month(date),
+                ),
+            ),
+        ),
+        else_=true(),
+    )
+
+    return select(e.id.label("event_id"), date.label("date")).select_from(events).join(series, true()).where(occurs)
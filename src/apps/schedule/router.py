@@ -26,6 +26,7 @@ from apps.schedule.domain.schedule.public import (
     PublicEvent,
     PublicEventByUser,
     PublicEventCount,
+    PublicEventsByUserResponse,
 )
 from apps.shared.domain.response import (
     AUTHENTICATION_ERROR_RESPONSES,
@@ -211,10 +212,11 @@ user_router = APIRouter(prefix="/users", tags=["Users"])
 # Get schedule by user
 user_router.get(
     "/me/events",
-    response_model=ResponseMulti[PublicEventByUser],
+    response_model=PublicEventsByUserResponse,
     status_code=status.HTTP_200_OK,
     responses={
-        status.HTTP_200_OK: {"model": ResponseMulti[PublicEventByUser]},
+        status.HTTP_200_OK: {"model": PublicEventsByUserResponse},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Schedule is not modified"},
         **AUTHENTICATION_ERROR_RESPONSES,
         **DEFAULT_OPENAPI_RESPONSE,
         **NO_CONTENT_ERROR_RESPONSES,
@@ -235,10 +237,11 @@ user_router.get(
 
 user_router.get(
     "/me/respondent/current_events",
-    response_model=ResponseMulti[PublicEventByUser],
+    response_model=PublicEventsByUserResponse,
     status_code=status.HTTP_200_OK,
     responses={
-        status.HTTP_200_OK: {"model": ResponseMulti[PublicEventByUser]},
+        status.HTTP_200_OK: {"model": PublicEventsByUserResponse},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Schedule is not modified"},
         **AUTHENTICATION_ERROR_RESPONSES,
         **DEFAULT_OPENAPI_RESPONSE,
         **NO_CONTENT_ERROR_RESPONSES,
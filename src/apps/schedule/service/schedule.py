@@ -1,12 +1,15 @@
 import asyncio
+import hashlib
+import time
 import uuid
 from datetime import date
+from typing import Any, Collection
 
 from apps.activities.crud import ActivitiesCRUD
 from apps.activity_flows.crud import FlowsCRUD
 from apps.applets.crud import AppletsCRUD, UserAppletAccessCRUD
 from apps.applets.errors import AppletNotFoundError
-from apps.schedule.crud.events import EventCRUD
+from apps.schedule.crud.events import DeletedEventCRUD, EventCRUD
 from apps.schedule.crud.notification import NotificationCRUD, ReminderCRUD
 from apps.schedule.crud.schedule_history import NotificationHistoryCRUD, ReminderHistoryCRUD
 from apps.schedule.crud.user_device_events_history import UserDeviceEventsHistoryCRUD
@@ -19,9 +22,11 @@ from apps.schedule.domain.schedule.internal import (
     EventFull,
     EventUpdate,
     NotificationSetting,
+    NotificationSettingCreate,
     ReminderSetting,
     ReminderSettingCreate,
     ScheduleEvent,
+    ScheduleVersion,
 )
 from apps.schedule.domain.schedule.public import (
     PublicEvent,
@@ -36,10 +41,14 @@ from apps.schedule.domain.schedule.requests import EventRequest, EventUpdateRequ
 from apps.schedule.errors import (
     AccessDeniedToApplet,
     ActivityOrFlowNotFoundError,
+    EventActivityOrFlowNotFoundError,
     EventAlwaysAvailableExistsError,
+    EventRespondentAccessError,
+    InvalidEventsError,
     ScheduleNotFoundError,
 )
 from apps.schedule.service.schedule_history import ScheduleHistoryService
+from apps.shared.exception import BaseError
 from apps.shared.query_params import QueryParams
 from apps.users.cruds.user import UsersCRUD
 from apps.users.errors import UserNotFound
@@ -47,6 +56,9 @@ from apps.workspaces.domain.constants import Role
 
 __all__ = ["ScheduleService"]
 
+# Activity id, flow id and respondent id of an event
+_Target = tuple[uuid.UUID | None, uuid.UUID | None, uuid.UUID | None]
+
 
 class ScheduleService:
     def __init__(self, session, admin_user_id: uuid.UUID | None = None):
@@ -292,25 +304,11 @@ class ScheduleService:
             [(event.id, event.version) for event in event_schemas]
         )
 
-        # Create default events for activities and flows
-        processed_activities_and_flows: dict[uuid.UUID, bool] = {}
-        for event in event_schemas:
-            if event.activity_id and event.activity_id not in processed_activities_and_flows:
-                await self._create_default_event(
-                    applet_id=applet_id,
-                    activity_id=event.activity_id,
-                    is_activity=True,
-                    respondent_id=event.user_id,
-                )
-                processed_activities_and_flows[event.activity_id] = True
-            if event.activity_flow_id and event.activity_flow_id not in processed_activities_and_flows:
-                await self._create_default_event(
-                    applet_id=applet_id,
-                    activity_id=event.activity_flow_id,
-                    is_activity=False,
-                    respondent_id=event.user_id,
-                )
-                processed_activities_and_flows[event.activity_flow_id] = True
+        # Create default events for activities and flows, the events are general ones
+        activity_ids = {event.activity_id for event in event_schemas if event.activity_id}
+        flow_ids = {event.activity_flow_id for event in event_schemas if event.activity_flow_id}
+        await self.create_default_schedules(applet_id=applet_id, activity_ids=list(activity_ids), is_activity=True)
+        await self.create_default_schedules(applet_id=applet_id, activity_ids=list(flow_ids), is_activity=False)
 
     async def delete_schedule_by_id(self, schedule_id: uuid.UUID) -> uuid.UUID | None:
         crud = EventCRUD(self.session)
@@ -324,9 +322,9 @@ class ScheduleService:
         if event.activity_id:
             count_events = await crud.count_by_activity(activity_id=event.activity_id, respondent_id=event.user_id)
             if count_events == 0:
-                await self._create_default_event(
+                await self.create_default_schedules(
                     applet_id=event.applet_id,
-                    activity_id=event.activity_id,
+                    activity_ids=[event.activity_id],
                     is_activity=True,
                     respondent_id=event.user_id,
                 )
@@ -334,9 +332,9 @@ class ScheduleService:
         elif event.activity_flow_id:
             count_events = await crud.count_by_flow(flow_id=event.activity_flow_id, respondent_id=event.user_id)
             if count_events == 0:
-                await self._create_default_event(
+                await self.create_default_schedules(
                     applet_id=event.applet_id,
-                    activity_id=event.activity_flow_id,
+                    activity_ids=[event.activity_flow_id],
                     is_activity=False,
                     respondent_id=event.user_id,
                 )
@@ -494,6 +492,179 @@ class ScheduleService:
         if not activity_or_flow:
             raise ActivityOrFlowNotFoundError()
 
+    async def _validate_schedules(self, applet_id: uuid.UUID, schedules: list[EventRequest]) -> None:
+        """Validate schedules before saving them, like `_validate_schedule` does for one."""
+        await self._validate_applet(applet_id=applet_id)
+
+        respondent_ids = list({schedule.respondent_id for schedule in schedules if schedule.respondent_id})
+        applet_respondent_ids = set()
+        if respondent_ids:
+            applet_respondent_ids = set(
+                await UserAppletAccessCRUD(self.session).get_respondent_user_ids(applet_id, respondent_ids)
+            )
+        activity_ids = set(await ActivitiesCRUD(self.session).get_ids_by_applet_id(applet_id))
+        flow_ids = set(await FlowsCRUD(self.session).get_ids_by_applet_id(applet_id))
+
+        errors: list[BaseError] = []
+        for index, schedule in enumerate(schedules):
+            if schedule.respondent_id and schedule.respondent_id not in applet_respondent_ids:
+                errors.append(EventRespondentAccessError(path=[index, "respondentId"]))
+            if schedule.activity_id and schedule.activity_id not in activity_ids:
+                errors.append(EventActivityOrFlowNotFoundError(path=[index, "activityId"]))
+            if schedule.flow_id and schedule.flow_id not in flow_ids:
+                errors.append(EventActivityOrFlowNotFoundError(path=[index, "flowId"]))
+        if errors:
+            raise InvalidEventsError(errors=errors)
+
+    async def _create_schedules(
+        self,
+        applet_id: uuid.UUID,
+        schedules: list[EventRequest],
+        replace_always_available: bool = True,
+    ) -> list[PublicEvent]:
+        """Create validated schedules in bulk.
+
+        The result is the same as of `create_schedule` called for every
+        schedule in order: an "always available" event replaces all events
+        of its activity or flow and respondent, other events replace the
+        "always available" one. Existing "always available" events raise
+        an error unless `replace_always_available` is set.
+        """
+        # Whether all existing events of the target are replaced or only the "always available" one
+        replace_all: dict[_Target, bool] = {}
+        # Schedules which are not replaced by the following ones, an "always available" one can be the first only
+        kept: dict[_Target, list[int]] = {}
+        for index, schedule in enumerate(schedules):
+            target = (schedule.activity_id, schedule.flow_id, schedule.respondent_id)
+            target_kept = kept.setdefault(target, [])
+            is_always_available = schedule.periodicity.type == PeriodicityType.ALWAYS
+            replace_all[target] = replace_all.get(target, False) or is_always_available
+            if is_always_available:
+                target_kept.clear()
+            elif target_kept and schedules[target_kept[0]].periodicity.type == PeriodicityType.ALWAYS:
+                target_kept.pop(0)
+            target_kept.append(index)
+
+        existing_events = await EventCRUD(self.session).get_all_by_applet_and_activities_or_flows(
+            applet_id=applet_id,
+            activity_ids=[target[0] for target in replace_all if target[0]],
+            flow_ids=[target[1] for target in replace_all if target[1]],
+            respondent_ids=list({target[2] for target in replace_all}),
+        )
+        replaced_events = []
+        for existing_event in existing_events:
+            target = (existing_event.activity_id, existing_event.activity_flow_id, existing_event.user_id)
+            if target not in replace_all:
+                continue
+            is_always_available = existing_event.periodicity == PeriodicityType.ALWAYS
+            if is_always_available and not replace_always_available and replace_all[target]:
+                raise EventAlwaysAvailableExistsError()
+            if is_always_available or replace_all[target]:
+                replaced_events.append(existing_event)
+
+        if replaced_events:
+            await self._delete_by_ids(event_ids=[event.id for event in replaced_events])
+            await ScheduleHistoryService(self.session).mark_as_deleted(
+                [(event.id, event.version) for event in replaced_events]
+            )
+
+        schedules = [schedules[index] for index in sorted(i for indexes in kept.values() for i in indexes)]
+        events = await EventCRUD(self.session).insert_many(
+            [
+                EventCreate(
+                    start_time=schedule.start_time,
+                    end_time=schedule.end_time,
+                    access_before_schedule=schedule.access_before_schedule,
+                    one_time_completion=schedule.one_time_completion,
+                    timer=schedule.timer,
+                    timer_type=schedule.timer_type,
+                    applet_id=applet_id,
+                    periodicity=schedule.periodicity.type,
+                    start_date=schedule.periodicity.start_date,
+                    end_date=schedule.periodicity.end_date,
+                    selected_date=schedule.periodicity.selected_date,
+                    user_id=schedule.respondent_id,
+                    activity_id=schedule.activity_id,
+                    activity_flow_id=schedule.flow_id,
+                    event_type=EventType.ACTIVITY if schedule.activity_id else EventType.FLOW,
+                )
+                for schedule in schedules
+            ]
+        )
+
+        notifications_create: list[NotificationSettingCreate] = []
+        reminders_create: list[ReminderSettingCreate] = []
+        for event, schedule in zip(events, schedules):
+            if not schedule.notification:
+                continue
+            notifications_create.extend(
+                NotificationSettingCreate(
+                    event_id=event.id,
+                    from_time=notification.from_time,
+                    to_time=notification.to_time,
+                    at_time=notification.at_time,
+                    trigger_type=notification.trigger_type,
+                    order=notification.order,
+                )
+                for notification in schedule.notification.notifications or []
+            )
+            if schedule.notification.reminder:
+                reminders_create.append(
+                    ReminderSettingCreate(
+                        event_id=event.id,
+                        activity_incomplete=schedule.notification.reminder.activity_incomplete,
+                        reminder_time=schedule.notification.reminder.reminder_time,
+                    )
+                )
+
+        notifications_map: dict[uuid.UUID, list[NotificationSetting]] = dict()
+        for notification in await NotificationCRUD(self.session).insert_many(notifications_create):
+            notifications_map.setdefault(notification.event_id, list()).append(notification)
+        reminders_map = {
+            reminder.event_id: reminder for reminder in await ReminderCRUD(self.session).insert_many(reminders_create)
+        }
+
+        schedule_events = [
+            ScheduleEvent(
+                **event.model_dump(exclude={"applet_id", "activity_flow_id"}),
+                flow_id=event.activity_flow_id,
+                notifications=notifications_map.get(event.id),
+                reminder=reminders_map.get(event.id),
+            )
+            for event in events
+        ]
+        await ScheduleHistoryService(self.session).add_histories(
+            applet_id=applet_id, events=schedule_events, updated_by=self.admin_user_id
+        )
+
+        return [
+            PublicEvent(
+                **event.model_dump(exclude={"periodicity"}),
+                periodicity=PublicPeriodicity(
+                    type=event.periodicity,
+                    start_date=event.start_date,
+                    end_date=event.end_date,
+                    selected_date=event.selected_date,
+                ),
+                respondent_id=event.user_id,
+                flow_id=event.activity_flow_id,
+                notification=PublicNotification(
+                    notifications=[
+                        PublicNotificationSetting(**notification.model_dump())
+                        for notification in notifications_map[event.id]
+                    ]
+                    if event.id in notifications_map
+                    else None,
+                    reminder=PublicReminderSetting(**reminders_map[event.id].model_dump())
+                    if event.id in reminders_map
+                    else None,
+                )
+                if schedule.notification
+                else None,
+            )
+            for event, schedule in zip(events, schedules)
+        ]
+
     async def count_schedules(self, applet_id: uuid.UUID) -> PublicEventCount:
         # Check if applet exists
         await self._validate_applet(applet_id=applet_id)
@@ -551,25 +722,6 @@ class ScheduleService:
             respondent_id=user_id,
         )
 
-    async def _create_default_event(
-        self,
-        applet_id: uuid.UUID,
-        activity_id: uuid.UUID,
-        is_activity: bool,
-        respondent_id: uuid.UUID | None = None,
-    ) -> None:
-        """Create default schedules for applet."""
-        default_event = DefaultEvent()
-        if is_activity:
-            default_event.activity_id = activity_id
-        else:
-            default_event.flow_id = activity_id
-
-        default_event.respondent_id = respondent_id
-
-        # Create default event
-        await self.create_schedule(applet_id=applet_id, schedule=EventRequest(**default_event.model_dump()))
-
     async def _delete_by_activity_or_flow(
         self,
         applet_id: uuid.UUID,
@@ -637,31 +789,81 @@ class ScheduleService:
         respondent_id: uuid.UUID | None = None,
     ) -> None:
         """Create default schedules for applet."""
+        if not activity_ids:
+            return
+        schedules = []
         for activity_id in activity_ids:
-            await self._create_default_event(
-                applet_id=applet_id,
-                activity_id=activity_id,
-                is_activity=is_activity,
-                respondent_id=respondent_id,
-            )
-
-    async def get_events_by_user(self, user_id: uuid.UUID) -> list[PublicEventByUser]:
-        """Get all events for user in applets that user is respondent."""
+            default_event = DefaultEvent(respondent_id=respondent_id)
+            if is_activity:
+                default_event.activity_id = activity_id
+            else:
+                default_event.flow_id = activity_id
+            schedules.append(EventRequest(**default_event.model_dump()))
+
+        await self._validate_schedules(applet_id=applet_id, schedules=schedules)
+        await self._create_schedules(applet_id=applet_id, schedules=schedules, replace_always_available=False)
+
+    async def get_user_applet_ids(self, user_id: uuid.UUID) -> list[uuid.UUID]:
+        """Get ids of the applets the user has any role in."""
         applets = await AppletsCRUD(self.session).get_applets_by_roles(
             user_id=user_id,
             roles=Role.as_list(),
             query_params=QueryParams(),
         )
-
-        applet_ids = [applet.id for applet in applets]
+        return [applet.id for applet in applets]
+
+    async def get_schedule_version(
+        self, user_id: uuid.UUID, applet_ids: list[uuid.UUID], *scope: Any
+    ) -> ScheduleVersion:
+        """Get version of the user schedule in the applets.
+        The scope values (e.g. the dates window) are the parameters of the
+        schedule other than the events, a change of them changes the version."""
+        scope_key = ",".join(sorted(map(str, applet_ids)) + [str(value) for value in scope])
+        scope_hash = hashlib.sha256(scope_key.encode()).hexdigest()[:16]
+        count, total, last, xmin = await EventCRUD(self.session).get_schedule_state(applet_ids, user_id)
+        etag = hashlib.sha256(f"{scope_hash}:{count}:{total}:{last}".encode()).hexdigest()[:32]
+        return ScheduleVersion(etag=etag, scope=scope_hash, xmin=xmin, issued_at=int(time.time()))
+
+    async def get_changed_event_ids(
+        self, user_id: uuid.UUID, applet_ids: list[uuid.UUID], since_xid: int
+    ) -> set[uuid.UUID]:
+        """Get ids of the events of the user schedule changed since the transaction."""
+        return set(await EventCRUD(self.session).get_changed_event_ids(applet_ids, user_id, since_xid))
+
+    async def get_removed_event_ids(
+        self,
+        user_id: uuid.UUID,
+        applet_ids: list[uuid.UUID],
+        since_xid: int,
+        changed_event_ids: set[uuid.UUID],
+        events: list[PublicEventByUser],
+    ) -> list[uuid.UUID]:
+        """Get ids of the events removed from the user schedule since the
+        transaction: deleted ones and changed ones not in the schedule any
+        more, e.g. hidden by an individual event or out of the dates window."""
+        deleted_event_ids = await DeletedEventCRUD(self.session).get_deleted_event_ids(applet_ids, user_id, since_xid)
+        returned_event_ids = {event.id for applet_events in events for event in applet_events.events or []}
+        return sorted((changed_event_ids | set(deleted_event_ids)) - returned_event_ids)
+
+    async def get_events_by_user(
+        self,
+        user_id: uuid.UUID,
+        applet_ids: list[uuid.UUID] | None = None,
+        only_event_ids: Collection[uuid.UUID] | None = None,
+    ) -> list[PublicEventByUser]:
+        """Get all events for user in applets that user is respondent."""
+        if applet_ids is None:
+            applet_ids = await self.get_user_applet_ids(user_id)
 
         user_events_map, user_event_ids = await EventCRUD(self.session).get_all_by_applets_and_user(
             applet_ids=applet_ids,
             user_id=user_id,
+            only_event_ids=only_event_ids,
         )
         general_events_map, general_event_ids = await EventCRUD(self.session).get_general_events_by_applets_and_user(
             applet_ids=applet_ids,
             user_id=user_id,
+            only_event_ids=only_event_ids,
         )
         full_events_map: dict[uuid.UUID, list[EventFull]] = self._sum_applets_events_map(
             user_events_map, general_events_map
@@ -701,19 +903,23 @@ class ScheduleService:
         os_name: str | None = None,
         os_version: str | None = None,
         app_version: str | None = None,
+        only_event_ids: Collection[uuid.UUID] | None = None,
     ) -> list[PublicEventByUser]:
-        """Get all events for user in applets that user is respondent."""
+        """Get all events for user in applets that user is respondent.
+        The device event versions are recorded for the returned events only."""
         user_events_map, user_event_ids = await EventCRUD(self.session).get_all_by_applets_and_user(
             applet_ids=applet_ids,
             user_id=user_id,
             min_end_date=min_end_date,
             max_start_date=max_start_date,
+            only_event_ids=only_event_ids,
         )
         general_events_map, general_event_ids = await EventCRUD(self.session).get_general_events_by_applets_and_user(
             applet_ids=applet_ids,
             user_id=user_id,
             min_end_date=min_end_date,
             max_start_date=max_start_date,
+            only_event_ids=only_event_ids,
         )
         full_events_map: dict[uuid.UUID, list[EventFull]] = self._sum_applets_events_map(
             user_events_map, general_events_map
@@ -808,14 +1014,10 @@ class ScheduleService:
 
         return events
 
-    async def count_events_by_user(self, user_id: uuid.UUID) -> int:
+    async def count_events_by_user(self, user_id: uuid.UUID, applet_ids: list[uuid.UUID] | None = None) -> int:
         """Count all events for user in applets that user is respondent."""
-        applets = await AppletsCRUD(self.session).get_applets_by_roles(
-            user_id=user_id,
-            roles=Role.as_list(),
-            query_params=QueryParams(),
-        )
-        applet_ids = [applet.id for applet in applets]
+        if applet_ids is None:
+            applet_ids = await self.get_user_applet_ids(user_id)
         count = 0
 
         for applet_id in applet_ids:
@@ -911,23 +1113,14 @@ class ScheduleService:
         )
 
     async def import_schedule(self, event_requests: list[EventRequest], applet_id: uuid.UUID) -> list[PublicEvent]:
-        """Import schedule."""
-        events = []
-        for event_request in event_requests:
-            if event_request.periodicity.type == PeriodicityType.ALWAYS:
-                # delete alwaysAvailable events of this activity or flow,
-                # if new event type is AA
-                await self._delete_by_activity_or_flow(
-                    applet_id=applet_id,
-                    activity_id=event_request.activity_id,
-                    flow_id=event_request.flow_id,
-                    respondent_id=event_request.respondent_id,
-                    only_always_available=True,
-                )
-            event = await self.create_schedule(applet_id=applet_id, schedule=event_request)
-            events.append(event)
-
-        return events
+        """Import schedule.
+
+        All events are validated before saving, the errors of every event
+        are reported at once. Events replaced by the following ones of the
+        same schedule are not saved and not returned.
+        """
+        await self._validate_schedules(applet_id=applet_id, schedules=event_requests)
+        return await self._create_schedules(applet_id=applet_id, schedules=event_requests)
 
     async def create_schedule_individual(self, applet_id: uuid.UUID, respondent_id: uuid.UUID) -> list[PublicEvent]:
         """Create individual schedule for a user for the first time"""
@@ -30,65 +30,80 @@ class ScheduleHistoryService:
         return await ScheduleHistoryCRUD(self.session).get_by_id(id_version)
 
     async def add_history(self, applet_id: uuid.UUID, event: ScheduleEvent, updated_by: uuid.UUID | None) -> None:
+        await self.add_histories(applet_id, [event], updated_by)
+
+    async def add_histories(
+        self, applet_id: uuid.UUID, events: list[ScheduleEvent], updated_by: uuid.UUID | None
+    ) -> None:
+        """Add the event versions and link them to the applet version with multi-row inserts"""
+        if not events:
+            return
+
         applet = await AppletsCRUD(self.session).get_by_id(applet_id)
 
         # Refresh the applet so we don't get the old version number, in case the version has changed
         await self.session.refresh(applet)
 
-        event_history = await ScheduleHistoryCRUD(self.session).add(
-            EventHistorySchema(
-                start_time=event.start_time,
-                end_time=event.end_time,
-                access_before_schedule=event.access_before_schedule,
-                one_time_completion=event.one_time_completion,
-                timer=event.timer,
-                timer_type=event.timer_type,
-                version=event.version,
-                periodicity=event.periodicity,
-                start_date=event.start_date,
-                end_date=event.end_date,
-                selected_date=event.selected_date,
-                id_version=f"{event.id}_{event.version}",
-                id=event.id,
-                event_type=EventType.ACTIVITY if event.activity_id else EventType.FLOW,
-                activity_id=event.activity_id,
-                activity_flow_id=event.flow_id,
-                user_id=event.user_id,
-                updated_by=updated_by,
-            )
-        )
-
-        await AppletEventsCRUD(self.session).add(
-            AppletEventsSchema(applet_id=f"{applet_id}_{applet.version}", event_id=event_history.id_version)
-        )
-
-        if event.notifications:
-            await NotificationHistoryCRUD(self.session).add_many(
-                [
-                    NotificationHistorySchema(
-                        from_time=notification.from_time,
-                        to_time=notification.to_time,
-                        at_time=notification.at_time,
-                        trigger_type=notification.trigger_type,
-                        order=notification.order,
-                        id_version=f"{notification.id}_{event.version}",
-                        id=notification.id,
-                        event_id=event_history.id_version,
-                    )
-                    for notification in event.notifications
-                ]
+        event_histories: list[EventHistorySchema] = []
+        notification_histories: list[NotificationHistorySchema] = []
+        reminder_histories: list[ReminderHistorySchema] = []
+        for event in events:
+            id_version = f"{event.id}_{event.version}"
+            event_histories.append(
+                EventHistorySchema(
+                    start_time=event.start_time,
+                    end_time=event.end_time,
+                    access_before_schedule=event.access_before_schedule,
+                    one_time_completion=event.one_time_completion,
+                    timer=event.timer,
+                    timer_type=event.timer_type,
+                    version=event.version,
+                    periodicity=event.periodicity,
+                    start_date=event.start_date,
+                    end_date=event.end_date,
+                    selected_date=event.selected_date,
+                    id_version=id_version,
+                    id=event.id,
+                    event_type=EventType.ACTIVITY if event.activity_id else EventType.FLOW,
+                    activity_id=event.activity_id,
+                    activity_flow_id=event.flow_id,
+                    user_id=event.user_id,
+                    updated_by=updated_by,
+                )
             )
-
-        if event.reminder:
-            await ReminderHistoryCRUD(self.session).add(
-                ReminderHistorySchema(
-                    activity_incomplete=event.reminder.activity_incomplete,
-                    reminder_time=event.reminder.reminder_time,
-                    id_version=f"{event.reminder.id}_{event.version}",
-                    id=event.reminder.id,
-                    event_id=event_history.id_version,
+            notification_histories.extend(
+                NotificationHistorySchema(
+                    from_time=notification.from_time,
+                    to_time=notification.to_time,
+                    at_time=notification.at_time,
+                    trigger_type=notification.trigger_type,
+                    order=notification.order,
+                    id_version=f"{notification.id}_{event.version}",
+                    id=notification.id,
+                    event_id=id_version,
                 )
+                for notification in event.notifications or []
             )
+            if event.reminder:
+                reminder_histories.append(
+                    ReminderHistorySchema(
+                        activity_incomplete=event.reminder.activity_incomplete,
+                        reminder_time=event.reminder.reminder_time,
+                        id_version=f"{event.reminder.id}_{event.version}",
+                        id=event.reminder.id,
+                        event_id=id_version,
+                    )
+                )
+
+        await ScheduleHistoryCRUD(self.session).insert_many(event_histories)
+        await AppletEventsCRUD(self.session).insert_many(
+            [
+                AppletEventsSchema(applet_id=f"{applet_id}_{applet.version}", event_id=event_history.id_version)
+                for event_history in event_histories
+            ]
+        )
+        await NotificationHistoryCRUD(self.session).insert_many(notification_histories)
+        await ReminderHistoryCRUD(self.session).insert_many(reminder_histories)
 
     async def mark_as_deleted(self, events: list[tuple[uuid.UUID, str]]) -> None:
         if len(events) == 0:
@@ -0,0 +1,26 @@
+import datetime
+import traceback
+
+import sentry_sdk
+
+from apps.schedule.crud.events import DeletedEventCRUD
+from broker import broker
+from config import settings
+from infrastructure.database import atomic, session_manager
+from infrastructure.logger import logger
+
+
+@broker.task(schedule=[{"cron": "15 3 * * *"}])
+async def prune_deleted_events():
+    """Removes deleted events kept for the schedule delta sync after the retention period"""
+    retention = datetime.timedelta(days=settings.service.schedule_deleted_events_retention_days)
+    before = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) - retention
+    try:
+        session_maker = session_manager.get_session()
+        async with session_maker() as session:
+            async with atomic(session):
+                removed = await DeletedEventCRUD(session).delete_created_before(before)
+        logger.info(f"Removed {removed} deleted events created before {before}")
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
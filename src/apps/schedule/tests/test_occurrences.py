@@ -0,0 +1,110 @@
+import datetime
+import random
+import uuid
+
+import pytest
+from sqlalchemy import Date, String, Time, cast, column, select, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import FromClause
+
+from apps.applets.commands.applet_ema import RawRow, filter_events
+from apps.schedule.domain.constants import PeriodicityType
+from apps.schedule.occurrences import event_occurrences
+from apps.shared.version import INITIAL_VERSION
+
+RANGE_START = datetime.date(2024, 1, 20)
+RANGE_END = datetime.date(2024, 4, 10)
+PERIODICITIES = (
+    PeriodicityType.ONCE,
+    PeriodicityType.DAILY,
+    PeriodicityType.WEEKDAYS,
+    PeriodicityType.WEEKLY,
+    PeriodicityType.MONTHLY,
+)
+DATE_COLUMNS = ("start_date", "end_date", "selected_date")
+TIME_COLUMNS = ("start_time", "end_time")
+
+
+def _events(data: list[tuple]) -> FromClause:
+    """Events table of (id, periodicity, start_date, end_date, selected_date, start_time, end_time) rows"""
+    rows = values(
+        *(column(name, String) for name in ("id", "periodicity", *DATE_COLUMNS, *TIME_COLUMNS)),
+        name="rows",
+    ).data([tuple(None if value is None else str(value) for value in row) for row in data])
+    # Parameters of VALUES are text, the engine needs typed columns
+    return select(
+        cast(rows.c.id, UUID(as_uuid=True)).label("id"),
+        rows.c.periodicity,
+        *(cast(rows.c[name], Date).label(name) for name in DATE_COLUMNS),
+        *(cast(rows.c[name], Time).label(name) for name in TIME_COLUMNS),
+    ).subquery("events")
+
+
+def _random_row(rnd: random.Random) -> RawRow:
+    start_date = RANGE_START + datetime.timedelta(days=rnd.randint(-40, 80))
+    end_date = start_date + datetime.timedelta(days=rnd.randint(0, 70))
+    # Month ends and cross-day times are the edge cases of the rules
+    if rnd.random() < 0.2:
+        start_date = datetime.date(2024, rnd.randint(1, 3), 1) - datetime.timedelta(days=1)
+        end_date = datetime.date(2024, rnd.randint(4, 5), 1) - datetime.timedelta(days=1)
+    start_time = datetime.time(rnd.randint(0, 23), 0)
+    end_time = datetime.time(rnd.randint(0, 23), 0)
+    return RawRow(
+        applet_id=uuid.uuid4(),
+        date=RANGE_START,
+        user_id=uuid.uuid4(),
+        secret_user_id=uuid.uuid4(),
+        applet_version=INITIAL_VERSION,
+        schedule_start_time=start_time,
+        schedule_end_time=end_time,
+        event_id=uuid.uuid4(),
+        event_type=rnd.choice(PERIODICITIES),
+        start_date=start_date,
+        end_date=end_date,
+        selected_date=start_date,
+    )
+
+
+def _loop_occurrences(rows: list[RawRow]) -> set[tuple[uuid.UUID, datetime.date]]:
+    occurrences = set()
+    date = RANGE_START
+    while date <= RANGE_END:
+        # filter_events changes the rows
+        for row in filter_events([row.model_copy() for row in rows], date):
+            occurrences.add((row.event_id, date))
+        date += datetime.timedelta(days=1)
+    return occurrences
+
+
+@pytest.mark.parametrize("seed", range(5))
+async def test_event_occurrences__same_as_day_by_day_filter(session: AsyncSession, seed: int):
+    rnd = random.Random(seed)
+    rows = [_random_row(rnd) for _ in range(200)]
+    events = _events(
+        [
+            (
+                row.event_id,
+                row.event_type,
+                row.start_date,
+                row.end_date,
+                row.selected_date,
+                row.schedule_start_time,
+                row.schedule_end_time,
+            )
+            for row in rows
+        ]
+    )
+
+    db_result = await session.execute(event_occurrences(RANGE_START, RANGE_END, events))
+
+    assert {(row.event_id, row.date) for row in db_result} == _loop_occurrences(rows)
+
+
+async def test_event_occurrences__no_bounds(session: AsyncSession):
+    event_id = uuid.uuid4()
+    events = _events([(event_id, PeriodicityType.ALWAYS, None, None, None, None, None)])
+
+    db_result = await session.execute(event_occurrences(RANGE_START, RANGE_END, events))
+
+    assert len(db_result.all()) == (RANGE_END - RANGE_START).days + 1
@@ -16,7 +16,7 @@ from apps.applets.domain.applet_full import AppletFull
 from apps.applets.domain.applet_link import CreateAccessLink
 from apps.applets.errors import AppletNotFoundError
 from apps.applets.service.applet import AppletService
-from apps.schedule.crud.events import EventCRUD
+from apps.schedule.crud.events import DeletedEventCRUD, EventCRUD
 from apps.schedule.crud.user_device_events_history import UserDeviceEventsHistoryCRUD
 from apps.schedule.domain import constants
 from apps.schedule.domain.constants import EventType
@@ -33,7 +33,9 @@ from apps.schedule.domain.schedule import (
 from apps.schedule.errors import (
     AccessDeniedToApplet,
     ActivityOrFlowNotFoundError,
+    EventActivityOrFlowNotFoundError,
     EventAlwaysAvailableExistsError,
+    EventRespondentAccessError,
     StartEndTimeEqualError,
 )
 from apps.schedule.service.schedule import ScheduleService
@@ -242,7 +244,9 @@ async def daily_event_lucy_with_notification_and_reminder(
     return schedule
 
 
-@pytest.mark.usefixtures("applet", "applet_lucy_respondent", "device_lucy", "device_user")
+@pytest.mark.usefixtures(
+    "applet", "applet_lucy_respondent", "device_lucy", "device_user", "mock_kiq_applet_notification"
+)
 class TestSchedule:
     login_url = "/auth/login"
     applet_detail_url = "applets/{applet_id}"
@@ -713,6 +717,66 @@ class TestSchedule:
 
         assert len(device_records) == 0
 
+    async def test_schedule_get_all_by_respondent_user__not_modified(
+        self,
+        client: TestClient,
+        minimal_applet: AppletFull,
+        user: User,
+        session: AsyncSession,
+        minimal_applet_default_event: PublicEvent,
+    ):
+        client.login(user)
+        response = await client.get(url=self.respondent_schedules_user_two_weeks_url)
+        assert response.status_code == http.HTTPStatus.OK
+        etag = response.headers["ETag"]
+
+        response = await client.get(
+            url=self.respondent_schedules_user_two_weeks_url,
+            headers={"If-None-Match": etag, "Device-Id": "device-id"},
+        )
+
+        assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        device_records = await UserDeviceEventsHistoryCRUD(session).get_all()
+        assert len(device_records) == 0
+
+    async def test_schedules_get_user_all__changes_since_version(
+        self, client: TestClient, applet: AppletFull, daily_event: PublicEvent, user: User
+    ):
+        client.login(user)
+        response = await client.get(self.schedule_user_url)
+        assert response.status_code == http.HTTPStatus.OK
+        etag = response.headers["ETag"]
+        version = response.headers["X-Schedule-Version"]
+        assert response.json()["deletedEventIds"] is None
+
+        response = await client.delete(self.schedule_detail_url.format(applet_id=applet.id, event_id=daily_event.id))
+        assert response.status_code == http.HTTPStatus.NO_CONTENT
+
+        response = await client.get(self.schedule_user_url, headers={"If-None-Match": etag})
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.headers["ETag"] != etag
+
+        response = await client.get(self.schedule_user_url, query={"sinceVersion": version})
+        assert response.status_code == http.HTTPStatus.OK
+        assert str(daily_event.id) in response.json()["deletedEventIds"]
+        returned_ids = {event["id"] for applet_events in response.json()["result"] for event in applet_events["events"]}
+        assert str(daily_event.id) not in returned_ids
+
+    async def test_deleted_events__removed_after_retention(
+        self, client: TestClient, session: AsyncSession, applet: AppletFull, daily_event: PublicEvent, user: User
+    ):
+        client.login(user)
+        response = await client.delete(self.schedule_detail_url.format(applet_id=applet.id, event_id=daily_event.id))
+        assert response.status_code == http.HTTPStatus.NO_CONTENT
+        crud = DeletedEventCRUD(session)
+        assert daily_event.id in await crud.get_deleted_event_ids([applet.id], user.id, 0)
+
+        before = datetime.datetime.now(datetime.UTC).replace(tzinfo=None) + datetime.timedelta(minutes=1)
+        assert await crud.delete_created_before(before) >= 1
+
+        assert await crud.get_deleted_event_ids([applet.id], user.id, 0) == []
+
     async def test_schedule_get_all_by_respondent_user__store_device_properties_existing_record(
         self,
         client: TestClient,
@@ -1362,6 +1426,62 @@ class TestSchedule:
         assert len(events) == 1
         assert events[0]["id"] != str(activity_event.id)
 
+    async def test_import_schedule__always_available_replaces_events_of_the_same_import(
+        self,
+        client: TestClient,
+        applet: AppletFull,
+        event_daily_data: EventRequest,
+        user: User,
+    ):
+        client.login(user)
+        daily = event_daily_data.model_dump()
+        always_available = event_daily_data.model_dump()
+        always_available["one_time_completion"] = False
+        always_available["periodicity"]["type"] = constants.PeriodicityType.ALWAYS
+        always_available["start_time"] = str(datetime.time(0, 0))
+        always_available["end_time"] = str(datetime.time(23, 59))
+
+        response = await client.post(
+            self.schedule_import_url.format(applet_id=applet.id), data=[daily, always_available, daily, daily]
+        )
+
+        assert response.status_code == http.HTTPStatus.CREATED
+        events = response.json()["result"]
+        assert len(events) == 2
+        assert all(event["periodicity"]["type"] == constants.PeriodicityType.DAILY for event in events)
+        response = await client.get(self.schedule_url.format(applet_id=applet.id))
+        activity_events = [i for i in response.json()["result"] if i["activityId"] == str(applet.activities[0].id)]
+        assert {event["id"] for event in activity_events} == {event["id"] for event in events}
+
+    async def test_import_schedule__invalid_events_reported_together(
+        self,
+        client: TestClient,
+        applet: AppletFull,
+        event_daily_data: EventRequest,
+        user: User,
+        tom: User,
+        uuid_zero: uuid.UUID,
+    ):
+        client.login(user)
+        valid = event_daily_data.model_dump()
+        not_respondent = event_daily_data.model_dump()
+        not_respondent["respondent_id"] = str(tom.id)
+        unknown_flow = event_daily_data.model_dump()
+        unknown_flow["activity_id"] = None
+        unknown_flow["flow_id"] = str(uuid_zero)
+
+        response = await client.post(
+            self.schedule_import_url.format(applet_id=applet.id), data=[valid, not_respondent, unknown_flow]
+        )
+
+        assert response.status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+        result = response.json()["result"]
+        assert [error["path"] for error in result] == [["body", 1, "respondentId"], ["body", 2, "flowId"]]
+        assert result[0]["message"] == EventRespondentAccessError.message
+        assert result[1]["message"] == EventActivityOrFlowNotFoundError.message
+        response = await client.get(self.schedule_url.format(applet_id=applet.id))
+        assert all(i["periodicity"]["type"] == constants.PeriodicityType.ALWAYS for i in response.json()["result"])
+
     @pytest.mark.usefixtures("daily_event_lucy_with_notification_and_reminder")
     async def test_user_get_events__event_with_reminder_and_notifications(
         self,
@@ -14,8 +14,10 @@ from apps.schedule.domain.schedule import (
     NotificationSettingRequest,
     PeriodicityRequest,
     ReminderSettingRequest,
+    ScheduleVersion,
 )
 from apps.shared.exception import FieldError
+from config import settings
 
 
 @pytest.fixture
@@ -577,3 +579,29 @@ def test_event_cross_day_with_reminder_notification__at_time_not_in_between_star
     data["notification"]["reminder"]["reminder_time"] = str(out_of_range_time)
     with pytest.raises(errors.UnavailableActivityOrFlowError):
         EventRequest(**data)
+
+
+@pytest.mark.parametrize(
+    "token,expected",
+    (
+        ("100.1000.scope", 100),
+        ("100.1000.other", None),
+        ("abc.1000.scope", None),
+        ("100.abc.scope", None),
+        # Tokens without the issue time
+        ("100.scope", None),
+        ("", None),
+        (None, None),
+    ),
+)
+def test_schedule_version_changed_since(token: str | None, expected: int | None):
+    version = ScheduleVersion(etag="etag", scope="scope", xmin=120, issued_at=2000)
+    assert version.token == "120.2000.scope"
+    assert version.changed_since(token) == expected
+
+
+def test_schedule_version_changed_since__token_older_than_deleted_events():
+    retention = settings.service.schedule_deleted_events_retention_days * 86400
+    version = ScheduleVersion(etag="etag", scope="scope", xmin=120, issued_at=retention + 1000)
+    assert version.changed_since(f"100.{86400 + 1000}.scope") == 100
+    assert version.changed_since("100.999.scope") is None
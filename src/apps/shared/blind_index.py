@@ -0,0 +1,182 @@
+"""Blind index for searching encrypted columns.
+
+Encrypted columns cannot be searched with SQL, so every row keeps the keyed
+hashes of the searchable parts of their values in the `search_tokens` array
+column. A search term is hashed the same way and the row matches when the
+column contains all the term tokens, which is answered with the GIN index.
+
+A value is normalized (case, accents and whitespace) and indexed with:
+ - the 1 and 2 character prefixes of its words, used by short terms;
+ - the trigrams of the whole value, used by terms of 3 characters and more,
+   which gives a substring search like `ilike '%term%'`.
+
+Tokens are bound to the logical field name, `first_name` tokens never
+match `last_name` ones. The hashes are keyed with the application secret
+key, the tokens do not reveal the values without it.
+
+NOTE: trigram matching can return a false positive when all trigrams of
+the term are present in the value, but not next to each other.
+"""
+
+import functools
+import hashlib
+import hmac
+import unicodedata
+from typing import Any, Callable, Collection, Iterable
+
+from sqlalchemy import Column, String, event, inspect, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import InstanceState, Mapper
+
+from config import settings
+
+__all__ = [
+    "BlindIndexed",
+    "BlindIndexField",
+    "index_tokens",
+    "normalize",
+    "search_tokens",
+    "update_search_tokens",
+]
+
+PREFIX_LENGTH = 2
+GRAM_LENGTH = 3
+TOKEN_SIZE = 8
+
+
+@functools.cache
+def _index_key() -> bytes:
+    return hmac.new(settings.secrets.key, b"blind-index", hashlib.sha256).digest()
+
+
+def _token(field: str, kind: str, value: str) -> str:
+    message = f"{field}\x00{kind}\x00{value}".encode("utf-8")
+    return hmac.new(_index_key(), message, hashlib.sha256).digest()[:TOKEN_SIZE].hex()
+
+
+def normalize(value: str) -> str:
+    """Lower case value without accents and with single spaces between words"""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def _grams(value: str) -> set[str]:
+    return {value[i : i + GRAM_LENGTH] for i in range(len(value) - GRAM_LENGTH + 1)}
+
+
+def index_tokens(field: str, value: str | None) -> set[str]:
+    """Tokens of the value to store in the index"""
+    if not value:
+        return set()
+    value = normalize(value)
+    tokens = {
+        _token(field, "p", word[:length])
+        for word in value.split(" ")
+        for length in range(1, min(len(word), PREFIX_LENGTH) + 1)
+    }
+    tokens.update(_token(field, "g", gram) for gram in _grams(value))
+    return tokens
+
+
+def search_tokens(field: str, term: str) -> list[str]:
+    """Tokens which all must be in the index of a value matching the term"""
+    term = normalize(term)
+    if not term:
+        return []
+    if len(term) < GRAM_LENGTH:
+        return [_token(field, "p", term)]
+    return sorted(_token(field, "g", gram) for gram in _grams(term))
+
+
+class BlindIndexed:
+    """Keeps the blind index of the encrypted columns of a schema.
+
+    `__search_fields__` maps the logical field names to the schema
+    attributes, the same logical name is used by every schema, so the
+    tokens of a user email and an invitation email are comparable.
+
+    The index is updated on ORM inserts and updates, writes done with
+    `update()` statements call `update_search_tokens` with the written rows.
+    """
+
+    __search_fields__: dict[str, str] = {}
+
+    search_tokens = Column(ARRAY(String()), nullable=True)
+
+    def blind_index_tokens(self) -> list[str]:
+        attributes = self.__search_fields__.values()
+        return self.tokens_of({attribute: getattr(self, attribute, None) for attribute in attributes})
+
+    @classmethod
+    def tokens_of(cls, values: dict[str, Any]) -> list[str]:
+        """Tokens of the search attribute values"""
+        tokens: set[str] = set()
+        for field, attribute in cls.__search_fields__.items():
+            tokens.update(index_tokens(field, values.get(attribute)))
+        return sorted(tokens)
+
+    @classmethod
+    def writes_search_fields(cls, attributes: Iterable[str]) -> bool:
+        return not set(cls.__search_fields__.values()).isdisjoint(attributes)
+
+
+@event.listens_for(BlindIndexed, "before_insert", propagate=True)
+def _set_search_tokens(mapper, connection, target: BlindIndexed) -> None:
+    target.search_tokens = target.blind_index_tokens()
+
+
+@event.listens_for(BlindIndexed, "before_update", propagate=True)
+def _update_search_tokens(mapper: Mapper, connection: Connection, target: BlindIndexed) -> None:
+    state: InstanceState = inspect(target)
+    attributes = target.__search_fields__.values()
+    if not any(state.attrs[attribute].history.has_changes() for attribute in attributes):
+        return
+    values = {attribute: getattr(target, attribute) for attribute in attributes if attribute not in state.unloaded}
+    if unloaded := [attribute for attribute in attributes if attribute in state.unloaded]:
+        # Attribute loading would need an awaiting session, the flush connection reads them
+        query = select(*(mapper.attrs[attribute].columns[0] for attribute in unloaded)).where(
+            *(column == value for column, value in zip(mapper.primary_key, mapper.primary_key_from_instance(target)))
+        )
+        values.update(connection.execute(query).one()._asdict())
+    target.search_tokens = target.tokens_of(values)
+
+
+async def update_search_tokens(session, schemas: Collection[BlindIndexed]) -> None:
+    """Updates the index of rows written with `update()` statements.
+
+    The schemas must have all search fields loaded, e.g. rows returned by
+    the update statement.
+    """
+    for schema in schemas:
+        schema_class: Any = type(schema)
+        tokens = schema.blind_index_tokens()
+        await session.execute(
+            update(schema_class).where(schema_class.id == schema.id).values(search_tokens=tokens),
+            execution_options={"synchronize_session": False},
+        )
+        schema.search_tokens = tokens
+
+
+class BlindIndexField:
+    """Search field of `Searching` which matches the blind index.
+
+    `tokens` is the `search_tokens` column (or an expression of it) and
+    `field` is the logical field name. `aggregate` wraps the clause for
+    searching in `having`, e.g. `func.bool_or`.
+    """
+
+    def __init__(self, tokens, field: str, aggregate: Callable | None = None):
+        self.tokens = tokens
+        self.field = field
+        self.aggregate = aggregate
+
+    def get_clause(self, term: str):
+        tokens = search_tokens(self.field, term)
+        if not tokens:
+            return true()
+        clause = self.tokens.contains(tokens)
+        if self.aggregate is not None:
+            clause = self.aggregate(clause)
+        return clause
@@ -0,0 +1,67 @@
+from typing import Optional
+
+import typer
+from rich import print
+from sqlalchemy import bindparam, select, update
+
+from apps.invitations.db import InvitationSchema
+from apps.shared.blind_index import BlindIndexed
+from apps.subjects.db.schemas import SubjectSchema
+from apps.users.db.schemas import UserSchema
+from infrastructure.commands.utils import coro
+from infrastructure.database import atomic, session_manager
+
+app = typer.Typer()
+
+SCHEMAS: dict[str, type[BlindIndexed]] = {
+    schema.__tablename__: schema  # type: ignore[attr-defined]
+    for schema in (UserSchema, SubjectSchema, InvitationSchema)
+}
+
+
+async def backfill_table(schema, batch_size: int, missing_only: bool) -> int:
+    """Writes the blind index of the table rows in batches ordered by id"""
+    session_maker = session_manager.get_session()
+    table = schema.__table__
+    columns = [getattr(schema, attribute) for attribute in schema.__search_fields__.values()]
+    query = update(table).where(table.c.id == bindparam("_id")).values(search_tokens=bindparam("_search_tokens"))
+    total = 0
+    last_id = None
+    while True:
+        async with session_maker() as session:
+            rows_query = select(schema.id, *columns).order_by(schema.id).limit(batch_size)
+            if last_id is not None:
+                rows_query = rows_query.where(schema.id > last_id)
+            if missing_only:
+                rows_query = rows_query.where(schema.search_tokens.is_(None))
+            rows = (await session.execute(rows_query)).all()
+            if not rows:
+                return total
+
+            values = [dict(_id=row.id, _search_tokens=schema(**row._asdict()).blind_index_tokens()) for row in rows]
+            async with atomic(session):
+                await session.execute(query, values)
+        total += len(rows)
+        last_id = rows[-1].id
+        print(f"{schema.__tablename__}: {total} rows indexed")
+
+
+@app.command(short_help="Fill the blind index of encrypted searchable columns")
+@coro
+async def backfill(
+    tables: Optional[list[str]] = typer.Argument(
+        None,
+        help=f"Tables to index, all of {', '.join(SCHEMAS)} if not provided.",
+    ),
+    batch_size: int = typer.Option(1000, "--batch-size", "-b", help="Rows updated in one transaction."),
+    missing_only: bool = typer.Option(
+        False, "--missing-only", "-m", help="Index only the rows without the index, e.g. after the migration."
+    ),
+) -> None:
+    for table_name in tables or list(SCHEMAS):
+        schema = SCHEMAS.get(table_name)
+        if schema is None:
+            print(f"[red][bold]{table_name}[/bold] table does not have the blind index. Skipped[/red]")
+            continue
+        total = await backfill_table(schema, batch_size, missing_only)
+        print(f"[green]{table_name}: finished, {total} rows indexed[/green]")
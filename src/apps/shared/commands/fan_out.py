@@ -0,0 +1,71 @@
+import asyncio
+import statistics
+import time
+
+import typer
+from rich import print
+from rich.table import Table
+from sqlalchemy import text
+
+from infrastructure.commands.utils import coro
+from infrastructure.database import ReadFanOut, atomic, session_manager
+
+app = typer.Typer()
+
+
+@app.command(short_help="Compare reads on the request session with the parallel read fan-out")
+@coro
+async def benchmark(
+    requests: int = typer.Option(200, "--requests", "-n", help="Requests to run"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Requests running at once"),
+    reads: int = typer.Option(4, "--reads", "-r", help="Independent reads of every request"),
+    latency: float = typer.Option(0.005, "--latency", "-l", help="Duration of every read, seconds"),
+    fan_out: int = typer.Option(3, "--fan-out", "-f", help="Reads of a request running at once"),
+):
+    """
+    Run requests of independent reads against the configured database,
+    once one after another on the request session and once with
+    `ReadFanOut`. Every read is a `pg_sleep` of the given latency, so the
+    gain does not depend on the data. Use a local Postgres, the pool size
+    must allow `concurrency * (fan_out + 1)` connections.
+    """
+    session_maker = session_manager.get_session()
+    query = text("SELECT pg_sleep(:latency)").bindparams(latency=latency)
+
+    async def _read(session) -> None:
+        await session.execute(query)
+
+    async def _request(concurrency_: int) -> float:
+        started = time.perf_counter()
+        async with session_maker() as session:
+            async with atomic(session):
+                await ReadFanOut(session, concurrency_).gather(*(_read for _ in range(reads)))
+        return time.perf_counter() - started
+
+    async def _run(concurrency_: int) -> tuple[list[float], float]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _limited() -> float:
+            async with semaphore:
+                return await _request(concurrency_)
+
+        started = time.perf_counter()
+        durations = await asyncio.gather(*(_limited() for _ in range(requests)))
+        return durations, time.perf_counter() - started
+
+    # Open the pool connections before measuring
+    await _run(fan_out)
+
+    table = Table("Reads", "Requests", "p50, ms", "p95, ms", "Seconds", "Requests/s")
+    for name, concurrency_ in (("request session", 1), (f"fan-out of {fan_out}", fan_out)):
+        durations, elapsed = await _run(concurrency_)
+        percentiles = statistics.quantiles(durations, n=20)
+        table.add_row(
+            name,
+            str(requests),
+            f"{statistics.median(durations) * 1000:.1f}",
+            f"{percentiles[18] * 1000:.1f}",
+            f"{elapsed:.2f}",
+            f"{requests / elapsed:.0f}",
+        )
+    print(table)
@@ -26,6 +26,8 @@ class BaseError(Exception):
     def __init__(self, *args, **kwargs):
         # Extract metadata if provided
         self.metadata = kwargs.pop("metadata", None)
+        # Extra response headers if provided
+        self.headers = kwargs.pop("headers", None)
         self.kwargs = kwargs
         self.updated_message = None
         if self.args and not self.message_is_template:
@@ -61,6 +63,18 @@ class FieldError(BaseError):
         super().__init__(**kwargs)
 
 
+class MultipleErrors(BaseError):
+    """Several errors reported at once, e.g. the invalid items of a bulk request"""
+
+    message = _("Invalid values.")
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    type = ExceptionTypes.INVALID_VALUE
+
+    def __init__(self, errors: list[BaseError], **kwargs):
+        self.errors = errors
+        super().__init__(**kwargs)
+
+
 class AccessDeniedError(BaseError):
     message = _("Access denied.")
     status_code = status.HTTP_403_FORBIDDEN
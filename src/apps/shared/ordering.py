@@ -10,7 +10,9 @@ from sqlalchemy.orm import InstrumentedAttribute
 
 OrderingDirection = Literal["+", "-"]
 
-# Record limit for ordering by encrypted fields to minimize performance impact
+# Record limit for ordering by encrypted fields to minimize performance impact.
+# The blind index cannot order values, but searches run with it before the count,
+# so ordering by encrypted fields is available for search results of any list.
 ENCRYPTED_ORDERING_LIMIT = 300
 
 
@@ -27,6 +27,27 @@ def paging(query: Query, page=1, limit=10) -> Query:
     return query
 
 
+def page_limit(limit: int | None) -> int:
+    """The page size the paging functions apply for the requested limit"""
+    if limit is None:
+        return settings.service.result_limit
+    return min(limit, settings.service.result_limit)
+
+
+def paging_lookahead(query: Query, page=1, limit=10) -> tuple[Query, int]:
+    """Pages the query with one extra row to tell whether there are more rows.
+
+    Returns the query and the effective page size.
+    """
+    limit = page_limit(limit)
+    if page is None:
+        page = 1
+
+    query = query.limit(limit + 1)
+    query = query.offset((page - 1) * limit)
+    return query, limit
+
+
 def paging_list(items: Optional[List], page=1, limit=10) -> list:
     if not items:
         return []
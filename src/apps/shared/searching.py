@@ -2,6 +2,8 @@ from functools import reduce
 
 from sqlalchemy import Unicode, or_
 
+from apps.shared.blind_index import BlindIndexField
+
 __all__ = ["Searching"]
 
 
@@ -16,16 +18,24 @@ class Searching:
         will generate where clause like below:
         select * from schema where first_name::text ilike '%To%'
 
+    Encrypted fields are searched with the blind index instead:
+        class SchemaSearch(Searching):
+            blind_index_fields = [BlindIndexField(Schema.search_tokens, "first_name")]
 
+        will generate where clause like below:
+        select * from schema where search_tokens @> array['<token>', ...]
     """
 
     search_fields: list = []
+    blind_index_fields: list[BlindIndexField] = []
 
     def get_clauses(self, search_term):
         clauses = []
-        if not search_term or not self.search_fields:
+        if not search_term or not (self.search_fields or self.blind_index_fields):
             return None
         for search_field in self.search_fields:
             clauses.append(search_field.cast(Unicode()).ilike(f"%{search_term}%"))
+        for blind_index_field in self.blind_index_fields:
+            clauses.append(blind_index_field.get_clause(search_term))
 
         return reduce(or_, clauses)
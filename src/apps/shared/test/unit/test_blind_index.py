@@ -0,0 +1,67 @@
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects import postgresql
+
+from apps.shared.blind_index import _update_search_tokens, index_tokens, normalize, search_tokens
+from apps.shared.searching import Searching
+from apps.subjects.db.schemas import SubjectSchema
+from apps.workspaces.crud.user_applet_access import _AppletUsersSearch
+
+
+def test_normalize():
+    assert normalize("  Zoë   O'Brien\t") == "zoe o'brien"
+
+
+@pytest.mark.parametrize("term", ("j", "jo", "sm", "ohn", "JOHN", "n sm", "Jöhn Smith", "smith"))
+def test_search_tokens__match(term: str):
+    assert set(search_tokens("first_name", term)) <= index_tokens("first_name", "John Smith")
+
+
+@pytest.mark.parametrize("term", ("h", "jon", "smyth", "john smith jr"))
+def test_search_tokens__no_match(term: str):
+    assert not set(search_tokens("first_name", term)) <= index_tokens("first_name", "John Smith")
+
+
+def test_search_tokens__bound_to_field():
+    assert index_tokens("first_name", "John").isdisjoint(index_tokens("last_name", "John"))
+
+
+def test_search_tokens__empty():
+    assert search_tokens("first_name", "   ") == []
+    assert index_tokens("first_name", None) == set()
+
+
+def test_subject_blind_index_tokens():
+    subject = SubjectSchema(first_name="John", last_name="Smith", nickname="Johnny")
+
+    assert set(subject.blind_index_tokens()) == (
+        index_tokens("first_name", "John") | index_tokens("last_name", "Smith") | index_tokens("nickname", "Johnny")
+    )
+
+
+def test_update_search_tokens__unloaded_attributes_are_read():
+    subject = SubjectSchema(id=uuid.uuid4(), first_name="Jane")
+    connection = MagicMock()
+    connection.execute.return_value.one.return_value._asdict.return_value = {
+        "last_name": "Smith",
+        "nickname": None,
+        "email": "jane@doe.com",
+    }
+
+    _update_search_tokens(inspect(SubjectSchema), connection, subject)
+
+    connection.execute.assert_called_once()
+    assert set(subject.search_tokens) == (
+        index_tokens("first_name", "Jane") | index_tokens("last_name", "Smith") | index_tokens("email", "jane@doe.com")
+    )
+
+
+def test_searching__blind_index_fields():
+    query = select(SubjectSchema.id).where(_AppletUsersSearch().get_clauses("john"))
+
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert sql.count("users.search_tokens @>") == 3
+    assert Searching().get_clauses("john") is None
@@ -0,0 +1,34 @@
+import io
+import zipfile
+
+import pytest
+
+from apps.shared.zip_stream import stream_zip
+
+
+async def _entries():
+    yield "first.zip", b"x" * 3000
+    yield "second.txt", b"second"
+
+
+@pytest.mark.parametrize("compression", (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED))
+async def test_stream_zip(compression: int):
+    chunks = [chunk async for chunk in stream_zip(_entries(), compression, chunk_size=1000)]
+
+    # The first entry is sent before the archive is complete
+    assert len(chunks) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == ["first.zip", "second.txt"]
+        assert zip_file.read("first.zip") == b"x" * 3000
+        assert zip_file.getinfo("second.txt").compress_type == compression
+
+
+async def test_stream_zip__empty():
+    async def _no_entries():
+        return
+        yield
+
+    data = b"".join([chunk async for chunk in stream_zip(_no_entries())])
+
+    assert zipfile.ZipFile(io.BytesIO(data)).namelist() == []
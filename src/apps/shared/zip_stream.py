@@ -0,0 +1,57 @@
+import io
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator
+
+__all__ = ["stream_zip"]
+
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable sink, the zip writer falls back to data descriptors for it.
+
+    Written bytes are kept only until they are drained to the response.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(
+    entries: AsyncIterator[tuple[str, bytes]],
+    compression: int = zipfile.ZIP_STORED,
+    chunk_size: int = ZIP_STREAM_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Writes a zip archive of `(filename, content)` entries as they arrive.
+
+    Nothing but the current entry is kept in memory, so the archive can be
+    sent as a streaming response of any size.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=compression, allowZip64=True) as zip_file:
+        async for filename, content in entries:
+            info = zipfile.ZipInfo(filename, date_time=datetime.now().timetuple()[:6])
+            info.compress_type = compression
+            with zip_file.open(info, "w", force_zip64=len(content) > zipfile.ZIP64_LIMIT) as entry:
+                for offset in range(0, len(content), chunk_size):
+                    entry.write(content[offset : offset + chunk_size])
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    if data := sink.drain():
+        yield data
@@ -204,7 +204,7 @@ async def delete_subject(
                     user_id=user.id,
                     session=session,
                     arbitrary_session=arbitrary_session,
-                ).delete_by_subject(subject_id)
+                ).delete_by_subject(subject.applet_id, subject_id)
         else:
             # Delete subject (soft)
             await SubjectsService(session, user.id).delete(subject.id)
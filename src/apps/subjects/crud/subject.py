@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 
 from asyncpg import UniqueViolationError
 from sqlalchemy import and_, delete, func, or_, select, update
@@ -8,6 +9,7 @@ from sqlalchemy.orm import Query
 
 from apps.invitations.constants import InvitationStatus
 from apps.invitations.db import InvitationSchema
+from apps.shared.blind_index import update_search_tokens
 from apps.subjects.db.schemas import SubjectRelationSchema, SubjectSchema
 from apps.subjects.domain import SubjectCreate, SubjectRelation
 from infrastructure.database.crud import BaseCRUD
@@ -24,6 +26,12 @@ class SubjectsCrud(BaseCRUD[SubjectSchema]):
     async def create_many(self, schema: list[SubjectSchema]) -> list[SubjectSchema]:
         return await self._create_many(schema)
 
+    async def _update_one(self, lookup: str, value: Any, schema: SubjectSchema) -> SubjectSchema:
+        instance = await super()._update_one(lookup, value, schema)
+        if SubjectSchema.writes_search_fields(dict(schema)):
+            await update_search_tokens(self.session, [instance])
+        return instance
+
     async def update(self, schema: SubjectSchema) -> SubjectSchema:
         return await self._update_one("id", schema.id, schema)
 
@@ -33,8 +41,11 @@ class SubjectsCrud(BaseCRUD[SubjectSchema]):
         )
         db_result = await self._execute(query)  # TODO test
         result = db_result.mappings().first()
+        instance = self.schema_class(**result)
+        if SubjectSchema.writes_search_fields(values):
+            await update_search_tokens(self.session, [instance])
 
-        return self.schema_class(**result)
+        return instance
 
     async def get_by_id(self, _id: uuid.UUID) -> SubjectSchema | None:
         return await self._get("id", _id)
@@ -129,6 +140,36 @@ class SubjectsCrud(BaseCRUD[SubjectSchema]):
             return None
         return SubjectRelation.model_validate(schema)
 
+    async def get_user_subject_with_ids(
+        self, user_id: uuid.UUID, applet_id: uuid.UUID, subject_ids: list[uuid.UUID]
+    ) -> list[SubjectSchema]:
+        """Returns the user subject of the applet and the subjects by ids in one query.
+
+        Subjects requested by ids are returned even when they are deleted.
+        """
+        query: Query = select(SubjectSchema)
+        query = query.where(
+            or_(
+                and_(
+                    SubjectSchema.user_id == user_id,
+                    SubjectSchema.applet_id == applet_id,
+                    SubjectSchema.soft_exists(),
+                ),
+                SubjectSchema.id.in_(subject_ids),
+            )
+        )
+        res = await self._execute(query)
+        return res.scalars().all()
+
+    async def get_relations_between(self, subject_ids: list[uuid.UUID]) -> list[SubjectRelation]:
+        query: Query = select(SubjectRelationSchema)
+        query = query.where(
+            SubjectRelationSchema.source_subject_id.in_(subject_ids),
+            SubjectRelationSchema.target_subject_id.in_(subject_ids),
+        )
+        result = await self._execute(query)
+        return [SubjectRelation.model_validate(schema) for schema in result.scalars().all()]
+
     async def exist(self, subject_id: uuid.UUID, applet_id: uuid.UUID) -> bool:
         query: Query = select(SubjectSchema.id)
         query = query.where(
@@ -163,6 +204,8 @@ class SubjectsCrud(BaseCRUD[SubjectSchema]):
 
     async def upsert(self, schema: SubjectCreate) -> SubjectSchema | None:
         values = {**schema.model_dump()}
+        # Core insert skips the ORM events which keep the blind index
+        values["search_tokens"] = SubjectSchema(**values).blind_index_tokens()
         stmt = insert(SubjectSchema).values(values)
         stmt = stmt.on_conflict_do_update(
             index_elements=[SubjectSchema.user_id, SubjectSchema.applet_id],
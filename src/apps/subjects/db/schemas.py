@@ -2,14 +2,16 @@ from sqlalchemy import Boolean, Column, ForeignKey, Index, String, Unicode
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy_utils import StringEncryptedType
 
+from apps.shared.blind_index import BlindIndexed
 from apps.shared.encryption import get_key
 from infrastructure.database.base import Base
 
 __all__ = ["SubjectSchema", "SubjectRelationSchema"]
 
 
-class SubjectSchema(Base):
+class SubjectSchema(BlindIndexed, Base):
     __tablename__ = "subjects"
+    __search_fields__ = {"first_name": "first_name", "last_name": "last_name", "nickname": "nickname", "email": "email"}
     is_deleted = Column(Boolean(), nullable=False, default=False)
     applet_id = Column(ForeignKey("applets.id", ondelete="RESTRICT"), nullable=False)
     creator_id = Column(ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
@@ -27,6 +29,7 @@ class SubjectSchema(Base):
     __table_args__ = (
         Index(None, "user_id", "applet_id", unique=True),
         Index("idx_subjects_meta", "meta", postgresql_using="gin"),
+        Index(None, "search_tokens", postgresql_using="gin"),
     )
 
 
@@ -16,6 +16,7 @@ from apps.transfer_ownership.errors import TransferEmailError
 from apps.users import UsersCRUD
 from apps.users.domain import User
 from apps.workspaces.db.schemas import UserAppletAccessSchema
+from apps.workspaces.cache import arbitrary_info_cache
 from config import settings
 
 
@@ -78,7 +79,7 @@ class TransferService:
             ),
         )
 
-        await service.send(message)
+        await service.enqueue([message])
 
     async def accept_transfer(self, applet_id: uuid.UUID, key: uuid.UUID):
         """Respond to a transfer of ownership of an applet."""
@@ -90,6 +91,10 @@ class TransferService:
 
         # delete previous owner's accesses
         previous_owner = await UserAppletAccessCRUD(self.session).get_applet_owner(applet_id=applet_id)
+
+        # the applet answers move to the arbitrary server of the new owner
+        arbitrary_info_cache.invalidate_on_commit(self.session, previous_owner.user_id)
+        arbitrary_info_cache.invalidate_on_commit(self.session, self._user.id)
         await UserAppletAccessCRUD(self.session).remove_access_by_user_and_applet_to_role(
             user_id=previous_owner.user_id,
             applet_ids=[
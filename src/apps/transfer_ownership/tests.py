@@ -186,6 +186,28 @@ class TestTransfer(BaseTest):
         assert tom_subject.id == prev_owner_subject.id
         assert tom_subject.tag is None
 
+    async def test_accept_transfer_invalidates_arbitrary_settings_of_both_owners(
+        self,
+        client: TestClient,
+        mocker: MockerFixture,
+        applet_one: AppletFull,
+        lucy: User,
+        tom: User,
+    ):
+        client.login(lucy)
+        mocker.patch("apps.transfer_ownership.crud.TransferCRUD.approve_by_key")
+        invalidate = mocker.patch("apps.workspaces.cache.arbitrary_info_cache.invalidate_on_commit")
+        response = await client.post(
+            self.response_url.format(
+                applet_id=applet_one.id,
+                key="6a3ab8e6-f2fa-49ae-b2db-197136677da7",
+            ),
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        invalidated_owners = {call.args[1] for call in invalidate.call_args_list}
+        assert invalidated_owners == {tom.id, lucy.id}
+
     async def test_accept_transfer_if_subject_already_exists(
         self,
         client: TestClient,
@@ -40,6 +40,8 @@ async def password_update(
         raise ReencryptionInProgressError()
 
     async with atomic(session):
+        # The authenticated user comes from the cache which has no password hash
+        user = await UsersCRUD(session).get_by_id(user.id)
         AuthenticationService.verify_password(
             schema.prev_password,
             user.hashed_password,
@@ -55,7 +57,9 @@ async def password_update(
 
     email = user.email_encrypted
     retries = settings.task_answer_encryption.max_retries
-    await reencrypt_answers.kiq(user.id, email, schema.prev_password, schema.password, retries=retries)
+    await reencrypt_answers.kiq(
+        user.id, email, schema.prev_password, schema.password, change_id=uuid.uuid4(), retries=retries
+    )
 
     return Response[PublicUser](result=public_user)
 
@@ -0,0 +1,88 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.users.domain import User
+from config import settings
+from infrastructure.cache import BaseCacheService, CacheNotFound, LRUCache
+from infrastructure.cache.domain import CacheEntry
+from infrastructure.database.core import after_commit
+from infrastructure.logger import logger
+
+__all__ = ["UserCache"]
+
+_local_users = LRUCache[User](
+    maxsize=settings.authentication.cache.local_size,
+    ttl=settings.authentication.cache.local_user_ttl,
+)
+# Secrets are never cached, they are read from the database when checked
+_SECRETS = dict(hashed_password="", mfa_secret=None, pending_mfa_secret=None)
+
+
+class UserCache(BaseCacheService[User]):
+    """Users of authenticated requests by id.
+
+    `UsersCRUD` invalidates a record on every update of the user, once
+    more after the update is committed. Records are also kept in-process
+    for `local_user_ttl` seconds, so other processes may see an updated
+    user that late.
+
+    Cached users have no password hash and MFA secrets: password and MFA
+    checks must read the user from the database.
+
+    The example of a key:
+        UserCache:<user id>
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.default_ttl = settings.authentication.cache.user_ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_ttl > 0
+
+    async def get(self, user_id: uuid.UUID) -> CacheEntry[User]:
+        cache_record: dict = await self._get(str(user_id))
+        return CacheEntry[User](**cache_record)
+
+    async def get_user(self, user_id: uuid.UUID) -> User | None:
+        if not self.enabled:
+            return None
+        if (user := _local_users.get(user_id, None)) is None:
+            try:
+                user = (await self.get(user_id)).instance
+            except CacheNotFound:
+                return None
+            _local_users.set(user_id, user)
+        return user.model_copy()
+
+    async def set_user(self, user: User) -> None:
+        if not self.enabled:
+            return
+        user = user.model_copy(update=_SECRETS)
+        _local_users.set(user.id, user)
+        try:
+            await self.set(str(user.id), user)
+        except Exception as e:
+            logger.warning(f"Failed to cache the user {user.id}: {e}")
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drops the cached user, a Redis failure does not fail the update,
+        the record expires after `user_ttl` seconds"""
+        _local_users.pop(user_id)
+        if not self.enabled:
+            return
+        try:
+            await self._delete(str(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate the cached user {user_id}: {e}")
+
+    async def invalidate_on_commit(self, session: AsyncSession, user_id: uuid.UUID) -> None:
+        """Invalidates now and once more after the session is committed.
+
+        The second invalidation drops records cached by concurrent requests
+        which still could read the old user before the commit.
+        """
+        await self.invalidate(user_id)
+        after_commit(session, lambda: self.invalidate(user_id))
@@ -6,7 +6,9 @@ from sqlalchemy import false, select, true, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query
 
+from apps.shared.blind_index import update_search_tokens
 from apps.shared.hashing import hash_sha224
+from apps.users.cache import UserCache
 from apps.users.db.schemas import UserSchema
 from apps.users.domain import User, UserChangePassword, UserUpdateRequest
 from apps.users.errors import UserAlreadyExistError, UserIsDeletedError, UserNotFound
@@ -16,6 +18,16 @@ from infrastructure.database.crud import BaseCRUD
 class UsersCRUD(BaseCRUD[UserSchema]):
     schema_class = UserSchema
 
+    async def _invalidate_cache(self, user_id: uuid.UUID) -> None:
+        """Every update of a user must drop the cached user of authenticated requests."""
+        await UserCache().invalidate_on_commit(self.session, user_id)
+
+    async def _update_one(self, lookup: str, value: Any, schema: UserSchema) -> UserSchema:
+        instance = await super()._update_one(lookup, value, schema)
+        if UserSchema.writes_search_fields(dict(schema)):
+            await update_search_tokens(self.session, [instance])
+        return instance
+
     async def _fetch(self, key: str, value: Any) -> User:
         if not (instance := await self._get(key, value)):
             raise UserNotFound
@@ -49,6 +61,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=user.id,
             schema=UserSchema(**update_schema.model_dump()),
         )
+        await self._invalidate_cache(user.id)
 
         # Create internal data model
         user = User.model_validate(instance)
@@ -61,6 +74,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=pk,
             schema=update_schema,
         )
+        await self._invalidate_cache(pk)
 
         return instance
 
@@ -70,6 +84,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=user.id,
             schema=UserSchema(email_encrypted=encrypted_email),
         )
+        await self._invalidate_cache(user.id)
         # Create internal data model
         user = User.model_validate(instance)
 
@@ -77,6 +92,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
 
     async def delete(self, user_id: uuid.UUID) -> UserSchema:
         instance = await self._update_one(lookup="id", value=user_id, schema=UserSchema(is_deleted=True))
+        await self._invalidate_cache(user_id)
         return instance
 
     async def change_password(self, user: User, update_schema: UserChangePassword) -> User:
@@ -85,6 +101,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=user.id,
             schema=UserSchema(hashed_password=update_schema.hashed_password),
         )
+        await self._invalidate_cache(user.id)
         return User.model_validate(instance)
 
     async def update_last_seen_by_id(self, id_: uuid.UUID) -> None:
@@ -138,6 +155,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=user_id,
             schema=UserSchema(mfa_enabled=enabled, mfa_secret=secret),
         )
+        await self._invalidate_cache(user_id)
         return User.model_validate(instance)
 
     async def update_pending_mfa(
@@ -159,6 +177,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=user_id,
             schema=UserSchema(pending_mfa_secret=encrypted_secret, pending_mfa_created_at=created_at),
         )
+        await self._invalidate_cache(user_id)
         return User.model_validate(instance)
 
     async def clear_pending_mfa(self, user_id: uuid.UUID) -> User:
@@ -178,6 +197,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             value=user_id,
             schema=UserSchema(pending_mfa_secret=None, pending_mfa_created_at=None),
         )
+        await self._invalidate_cache(user_id)
         return User.model_validate(instance)
 
     async def activate_mfa(self, user_id: uuid.UUID, encrypted_secret: str) -> User:
@@ -209,6 +229,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
         )
         await self._execute(query)
         await self.session.commit()  # Explicitly commit the transaction
+        await self._invalidate_cache(user_id)
 
         # Then fetch the updated record
         return await self.get_by_id(user_id)
@@ -223,6 +244,7 @@ class UsersCRUD(BaseCRUD[UserSchema]):
         """
         query = update(UserSchema).where(UserSchema.id == user_id).values(last_totp_time_step=time_step)
         await self._execute(query)
+        await self._invalidate_cache(user_id)
 
     async def disable_mfa(self, user_id: uuid.UUID, disabled_at: datetime.datetime) -> None:
         """
@@ -252,3 +274,4 @@ class UsersCRUD(BaseCRUD[UserSchema]):
             )
         )
         await self._execute(query)
+        await self._invalidate_cache(user_id)
@@ -1,15 +1,17 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, String, Text, Unicode, UniqueConstraint
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, String, Text, Unicode, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import StringEncryptedType
 
+from apps.shared.blind_index import BlindIndexed
 from apps.shared.encryption import get_key
 from infrastructure.database.base import Base
 
 
-class UserSchema(Base):
+class UserSchema(BlindIndexed, Base):
     __tablename__ = "users"
+    __search_fields__ = {"first_name": "first_name", "last_name": "last_name", "email": "email_encrypted"}
 
     email = Column(String(length=100), unique=True)
     email_encrypted = Column(StringEncryptedType(Unicode, get_key), default=None)
@@ -28,6 +30,8 @@ class UserSchema(Base):
     is_anonymous_respondent = Column(Boolean(), default=False, server_default="false")
     is_legacy_deleted_respondent = Column(Boolean(), default=False, server_default="false")
 
+    __table_args__ = (Index(None, "search_tokens", postgresql_using="gin"),)
+
     recovery_codes = relationship(
         "RecoveryCodeSchema",
         foreign_keys="RecoveryCodeSchema.user_id",
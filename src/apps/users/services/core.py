@@ -105,7 +105,7 @@ class PasswordRecoveryService:
                 url=url,
             ),
         )
-        await service.send(message)
+        await service.enqueue([message])
 
         public_user = PublicUser.from_user(user)
 
@@ -1,10 +1,14 @@
+import asyncio
 import json
+import uuid
 from json import JSONDecodeError
 
-from apps.answers.service import AnswerEncryptor, AnswerService
+from apps.answers.encryption import crypto_executor, derive_reencryption_keys
+from apps.answers.service import AnswerService
 from apps.job.constants import JobStatus
+from apps.job.domain import Job
 from apps.job.service import JobService
-from apps.shared.encryption import generate_dh_aes_key, generate_dh_public_key, generate_dh_user_private_key
+from apps.shared.encryption import generate_dh_user_private_key
 from apps.workspaces.service.workspace import WorkspaceService
 from broker import broker
 from config import settings
@@ -12,15 +16,71 @@ from infrastructure.database import atomic, session_manager
 from infrastructure.logger import logger
 
 
+class _ReencryptionProgress:
+    """Progress of the re-encryption job, stored in the job details.
+
+    The last re-encrypted answer item of each applet is the checkpoint the
+    applet continues from when the job is retried. Items are ordered by id,
+    so the items before the checkpoint are done. The progress belongs to one
+    password change, a job of another change starts over.
+    """
+
+    def __init__(self, user_id: uuid.UUID, job: Job, resume: bool, change_id: uuid.UUID):
+        details = job.details or {}
+        if not resume or details.get("change_id") != str(change_id):
+            details = {}
+        self.user_id = user_id
+        self.job_id = job.id
+        self.change_id = change_id
+        self.checkpoints: dict[str, str] = dict(details.get("checkpoints", {}))
+        self.done: set[str] = set(details.get("done", []))
+        self.processed: int = details.get("processed", 0)
+        self._lock = asyncio.Lock()
+
+    def after_id(self, applet_id: uuid.UUID) -> uuid.UUID | None:
+        checkpoint = self.checkpoints.get(str(applet_id))
+        return uuid.UUID(checkpoint) if checkpoint else None
+
+    def details(self) -> dict:
+        if not (self.checkpoints or self.done):
+            return {}
+        return dict(
+            change_id=str(self.change_id),
+            checkpoints=self.checkpoints,
+            done=sorted(self.done),
+            processed=self.processed,
+        )
+
+    async def save(self, applet_id: uuid.UUID, last_id: uuid.UUID | None, count: int) -> None:
+        """Records a re-encrypted page, `last_id` is None when the applet is done"""
+        async with self._lock:
+            self.processed += count
+            if last_id:
+                self.checkpoints[str(applet_id)] = str(last_id)
+            else:
+                self.checkpoints.pop(str(applet_id), None)
+                self.done.add(str(applet_id))
+            async with session_manager.get_session()() as session:
+                async with atomic(session):
+                    await JobService(session, self.user_id).update_details(self.job_id, self.details())
+
+
 @broker.task
 async def reencrypt_answers(
     user_id,
     email,
     old_password,
     new_password,
+    change_id: uuid.UUID | None = None,
     retries: int | None = None,
     retry_timeout: int = settings.task_answer_encryption.retry_timeout,
 ):
+    """Re-encrypts the user answers with the keys of the new password.
+
+    Applets are processed concurrently, answer items are read in keyset
+    pages and encrypted in the crypto process pool. A retried job continues
+    every applet from its checkpoint, if it is of the same `change_id`.
+    """
     job_name = "reencrypt_answers"
     logger.info(f"Reencryption {user_id}: reencrypt_answers start")
 
@@ -28,57 +88,53 @@ async def reencrypt_answers(
     new_private_key = generate_dh_user_private_key(user_id, email, new_password)
 
     batch_limit = settings.task_answer_encryption.batch_limit
-    success = True
+    semaphore = asyncio.Semaphore(settings.task_answer_encryption.concurrency)
 
     default_session_maker = session_manager.get_session()
     async with default_session_maker() as session:
         job_service = JobService(session, user_id)
         async with atomic(session):
             job = await job_service.get_or_create_owned(job_name, JobStatus.in_progress)
+            # A job which did not finish continues, a finished one starts over
+            resume = job.status in (JobStatus.in_progress, JobStatus.retry)
             if job.status != JobStatus.in_progress:
                 await job_service.change_status(job.id, JobStatus.in_progress)
 
         db_applets = await WorkspaceService(session, user_id).get_user_answer_db_info()
 
-    for db_applet_data in db_applets:
-        session_maker = default_session_maker
-        if arb_uri := db_applet_data.database_uri:
-            session_maker = session_manager.get_session(arb_uri)
-
-        for applet in db_applet_data.applets:
-            try:
-                prime = json.loads(applet.encryption.prime)
-                base = json.loads(applet.encryption.base)
-                applet_pub_key = json.loads(applet.encryption.public_key)
-            except JSONDecodeError as e:
-                logger.error(f"Reencryption {user_id}: Wrong applet {applet.applet_id} encryption format, skip")
-                logger.exception(str(e))
-                continue
+    # A task queued without the id of the password change does not resume
+    change_id = change_id or uuid.uuid4()
+    progress = _ReencryptionProgress(user_id, job, resume, change_id)
 
-            old_public_key = generate_dh_public_key(old_private_key, prime, base)
-            new_public_key = generate_dh_public_key(new_private_key, prime, base)
-            old_aes_key = generate_dh_aes_key(old_private_key, applet_pub_key, prime)
-            new_aes_key = generate_dh_aes_key(new_private_key, applet_pub_key, prime)
+    async def _reencrypt_applet(session_maker, applet) -> bool:
+        if str(applet.applet_id) in progress.done:
+            return True
+        try:
+            prime = json.loads(applet.encryption.prime)
+            base = json.loads(applet.encryption.base)
+            applet_pub_key = json.loads(applet.encryption.public_key)
+        except JSONDecodeError as e:
+            logger.error(f"Reencryption {user_id}: Wrong applet {applet.applet_id} encryption format, skip")
+            logger.exception(str(e))
+            return True
 
-            page = 1
+        async with semaphore:
             try:
+                keys = await crypto_executor.run(
+                    derive_reencryption_keys, old_private_key, new_private_key, prime, base, applet_pub_key
+                )
+                after_id = progress.after_id(applet.applet_id)
                 while True:
                     async with session_maker() as session:
                         async with atomic(session):
-                            service = AnswerService(session)
-                            count = await service.reencrypt_user_answers(
-                                applet.applet_id,
-                                user_id,
-                                page=page,
-                                limit=batch_limit,
-                                old_public_key=old_public_key,
-                                new_public_key=new_public_key,
-                                encryptor=AnswerEncryptor(bytes(new_aes_key)),
-                                decryptor=AnswerEncryptor(bytes(old_aes_key)),
+                            count, last_id = await AnswerService(session).reencrypt_user_answers(
+                                applet.applet_id, user_id, after_id, limit=batch_limit, keys=keys
                             )
-                            if count < batch_limit:
-                                break
-                            page += 1
+                    done = count < batch_limit
+                    await progress.save(applet.applet_id, None if done else last_id, count)
+                    if done:
+                        return True
+                    after_id = last_id
 
             except Exception as e:
                 msg = f"Reencryption {user_id}: cannot process applet {applet.applet_id}, skip"
@@ -86,10 +142,17 @@ async def reencrypt_answers(
                 logger.exception(str(e))
                 async with default_session_maker() as session:
                     async with atomic(session):
-                        details = dict(errors=[msg, str(e)])
+                        details = dict(errors=[msg, str(e)], **progress.details())
                         await JobService(session, user_id).change_status(job.id, JobStatus.error, details)
-                success = False
-                continue
+                return False
+
+    applet_jobs = []
+    for db_applet_data in db_applets:
+        session_maker = default_session_maker
+        if arb_uri := db_applet_data.database_uri:
+            session_maker = session_manager.get_session(arb_uri)
+        applet_jobs.extend(_reencrypt_applet(session_maker, applet) for applet in db_applet_data.applets)
+    success = all(await asyncio.gather(*applet_jobs))
 
     # Update job status, schedule retry
     async with default_session_maker() as session:
@@ -110,6 +173,7 @@ async def reencrypt_answers(
                             email,
                             old_password,
                             new_password,
+                            change_id=change_id,
                             retries=retries,
                             retry_timeout=retry_timeout,
                         )
@@ -65,7 +65,9 @@ class TestPassword:
         )
 
         assert internal_response.status_code == status.HTTP_200_OK
+        # Every password change gets its own id, the re-encryption of another change is not resumed
         mock_reencrypt_kiq.assert_awaited_once()
+        assert isinstance(mock_reencrypt_kiq.await_args.kwargs["change_id"], uuid.UUID)
 
     async def test_password_recovery(self, client: TestClient, user_create: UserCreate, mailbox: TestMail):
         # Password recovery
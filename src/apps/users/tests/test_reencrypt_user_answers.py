@@ -13,7 +13,8 @@ from apps.answers.crud.answer_items import AnswerItemsCRUD
 from apps.answers.crud.answers import AnswersCRUD
 from apps.answers.db.schemas import AnswerSchema
 from apps.answers.domain import AppletAnswerCreate, ClientMeta, ItemAnswerCreate
-from apps.answers.service import AnswerEncryptor, AnswerService
+from apps.answers.encryption import AnswerEncryptor
+from apps.answers.service import AnswerService
 from apps.applets.domain.applet_create_update import AppletCreate, AppletUpdate
 from apps.applets.domain.applet_full import AppletFull
 from apps.applets.service.applet import AppletService
@@ -364,3 +365,65 @@ async def test_reencrypt_answers_arbitrary(
         0
     ].answer
     assert answer_before != answer_after
+
+
+async def test_reencrypt_answers_retry_resumes_from_checkpoint(
+    session: AsyncSession,
+    user: User,
+    user_create: UserCreate,
+    mocker: MockerFixture,
+    job_model: Job,
+    applet: AppletFull,
+    answer: AnswerSchema,
+):
+    answer_id = answer.id
+    act_id_version = f"{applet.activities[0].id}_{applet.version}"
+    answer_before = (await AnswerItemsCRUD(session).get_by_answer_and_activity(answer_id, [act_id_version]))[0].answer
+    change_id = uuid.uuid4()
+    # The retried job already re-encrypted the items up to the checkpoint
+    job_model.status = JobStatus.retry
+    job_model.details = dict(
+        change_id=str(change_id),
+        checkpoints={str(applet.id): str(uuid.UUID(int=2**128 - 1))},
+        done=[],
+        processed=1,
+    )
+    mocker.patch("apps.job.service.JobService.get_or_create_owned", return_value=job_model)
+    mocker.patch("apps.job.crud.JobCRUD.update")
+    spy = mocker.spy(JobService, "update_details")
+    task = await reencrypt_answers.kiq(
+        user.id, user.email_encrypted, user_create.password, "new-pass", change_id=change_id, retries=0
+    )
+    await task.wait_result()
+    spy.assert_awaited_once_with(
+        ANY, job_model.id, dict(change_id=str(change_id), checkpoints={}, done=[str(applet.id)], processed=1)
+    )
+    answer_after = (await AnswerItemsCRUD(session).get_by_answer_and_activity(answer_id, [act_id_version]))[0].answer
+    assert answer_before == answer_after
+
+
+async def test_reencrypt_answers_retry_of_another_password_change_starts_over(
+    session: AsyncSession,
+    user: User,
+    user_create: UserCreate,
+    mocker: MockerFixture,
+    job_model: Job,
+    applet: AppletFull,
+    answer: AnswerSchema,
+):
+    answer_id = answer.id
+    act_id_version = f"{applet.activities[0].id}_{applet.version}"
+    answer_before = (await AnswerItemsCRUD(session).get_by_answer_and_activity(answer_id, [act_id_version]))[0].answer
+    # The unfinished job was started by an earlier password change
+    job_model.status = JobStatus.retry
+    job_model.details = dict(change_id=str(uuid.uuid4()), checkpoints={}, done=[str(applet.id)], processed=1)
+    mocker.patch("apps.job.service.JobService.get_or_create_owned", return_value=job_model)
+    mocker.patch("apps.job.crud.JobCRUD.update")
+    spy = mocker.spy(JobService, "change_status")
+    task = await reencrypt_answers.kiq(
+        user.id, user.email_encrypted, user_create.password, "new-pass", change_id=uuid.uuid4(), retries=0
+    )
+    await task.wait_result()
+    spy.assert_awaited_with(ANY, job_model.id, JobStatus.success)
+    answer_after = (await AnswerItemsCRUD(session).get_by_answer_and_activity(answer_id, [act_id_version]))[0].answer
+    assert answer_before != answer_after
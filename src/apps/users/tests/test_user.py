@@ -1,6 +1,7 @@
 from typing import cast
 
 import pytest
+from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
@@ -8,10 +9,12 @@ from apps.authentication.router import router as auth_router
 from apps.shared.domain import to_camelcase
 from apps.shared.test.client import TestClient
 from apps.users import UsersCRUD
+from apps.users.cache import UserCache
 from apps.users.domain import AppInfoOS, User, UserCreate, UserCreateRequest, UserDeviceCreate
 from apps.users.errors import PasswordHasSpacesError, UserIsDeletedError
 from apps.users.router import router as user_router
 from apps.users.tests.factories import UserUpdateRequestFactory
+from config import settings
 
 
 @pytest.fixture
@@ -65,6 +68,25 @@ class TestUser:
         response = await client.put(self.user_update_url, data=self.user_update_request.model_dump())
         assert response.status_code == status.HTTP_200_OK
 
+    async def test_user_retrieve__cached_until_update(self, client: TestClient, user: User, mocker: MockerFixture):
+        mocker.patch.object(settings.authentication.cache, "user_ttl", 60)
+        await UserCache().invalidate(user.id)
+        get_by_id = mocker.spy(UsersCRUD, "get_by_id")
+        client.login(user)
+        for _ in range(2):
+            response = await client.get(self.user_retrieve_url)
+            assert response.status_code == status.HTTP_200_OK
+        # The second request reads the user from the cache
+        assert get_by_id.call_count == 1
+
+        response = await client.put(self.user_update_url, data=self.user_update_request.model_dump())
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(self.user_retrieve_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["result"]["firstName"] == self.user_update_request.first_name
+        assert get_by_id.call_count == 2
+
     async def test_user_delete(self, session: AsyncSession, client: TestClient, user: User):
         client.login(user)
         response = await client.delete(
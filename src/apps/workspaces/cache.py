@@ -0,0 +1,57 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.workspaces.domain.workspace import WorkspaceArbitrary
+from config import settings
+from infrastructure.cache.lru import LRUCache
+from infrastructure.database.core import after_commit
+
+__all__ = ["ArbitraryInfoCache", "arbitrary_info_cache"]
+
+
+class ArbitraryInfoCache:
+    """Resolved `WorkspaceArbitrary` (or its absence) by applet id and by owner id.
+
+    NOTE: The cache is per process. The local process is invalidated
+          explicitly when settings are changed, other processes pick up
+          changes after `arbitrary_info_cache_ttl` seconds.
+    """
+
+    def __init__(self, *, ttl: int, maxsize: int):
+        self.by_applet: LRUCache[WorkspaceArbitrary | None] = LRUCache(maxsize, ttl)
+        self.by_owner: LRUCache[WorkspaceArbitrary | None] = LRUCache(maxsize, ttl)
+
+    def invalidate(self, owner_id: uuid.UUID | None = None) -> None:
+        """Drops cached arbitrary settings.
+
+        Applet entries are not linked to their owner (an applet without
+        arbitrary settings is cached as None), so all of them are dropped.
+        """
+        self.by_applet.clear()
+        if owner_id is None:
+            self.by_owner.clear()
+        else:
+            self.by_owner.pop(owner_id)
+
+    def invalidate_on_commit(self, session: AsyncSession, owner_id: uuid.UUID) -> None:
+        """Invalidates now and once more after the session is committed.
+
+        The second invalidation drops entries cached by concurrent requests
+        which still could read the old settings before the commit.
+        """
+        self.invalidate(owner_id)
+
+        async def _invalidate() -> None:
+            self.invalidate(owner_id)
+
+        after_commit(session, _invalidate)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return dict(by_applet=self.by_applet.stats(), by_owner=self.by_owner.stats())
+
+
+arbitrary_info_cache = ArbitraryInfoCache(
+    ttl=settings.database.arbitrary_info_cache_ttl,
+    maxsize=settings.database.arbitrary_info_cache_size,
+)
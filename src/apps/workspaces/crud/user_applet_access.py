@@ -29,6 +29,7 @@ from apps.applets.db.schemas import AppletSchema
 from apps.invitations.constants import InvitationStatus
 from apps.invitations.db import InvitationSchema
 from apps.schedule.db.schemas import EventSchema
+from apps.shared.blind_index import BlindIndexField
 from apps.shared.domain import parse_obj_as
 from apps.shared.encryption import get_key
 from apps.shared.filtering import FilterField, Filtering
@@ -84,9 +85,11 @@ class _WorkspaceRespondentOrdering(Ordering):
 
 class _WorkspaceRespondentSearch(Searching):
     search_fields = [
-        func.array_agg(SubjectSchema.nickname),
         func.array_agg(SubjectSchema.secret_user_id),
     ]
+    blind_index_fields = [
+        BlindIndexField(SubjectSchema.search_tokens, "nickname", aggregate=func.bool_or),
+    ]
 
 
 class _AppletRespondentSearch(Searching):
@@ -96,10 +99,18 @@ class _AppletRespondentSearch(Searching):
 
 
 class _AppletUsersSearch(Searching):
-    search_fields = [
-        UserSchema.first_name,
-        UserSchema.last_name,
-        UserSchema.email,
+    blind_index_fields = [
+        BlindIndexField(UserSchema.search_tokens, "first_name"),
+        BlindIndexField(UserSchema.search_tokens, "last_name"),
+        BlindIndexField(UserSchema.search_tokens, "email"),
+    ]
+
+
+class _AppletInvitationSearch(Searching):
+    blind_index_fields = [
+        BlindIndexField(InvitationSchema.search_tokens, "first_name"),
+        BlindIndexField(InvitationSchema.search_tokens, "last_name"),
+        BlindIndexField(InvitationSchema.search_tokens, "email"),
     ]
 
 
@@ -328,6 +339,16 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         result = await self._execute(query)
         return result.scalars().first()
 
+    async def get_respondent_user_ids(self, applet_id: uuid.UUID, user_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+        """Return the given users which are respondents of the applet"""
+        query: Query = select(UserAppletAccessSchema.user_id)
+        query = query.where(UserAppletAccessSchema.soft_exists())
+        query = query.where(UserAppletAccessSchema.applet_id == applet_id)
+        query = query.where(UserAppletAccessSchema.user_id.in_(user_ids))
+        query = query.where(UserAppletAccessSchema.role == Role.RESPONDENT)
+        result = await self._execute(query)
+        return result.scalars().all()
+
     async def get_user_roles_to_applet(self, user_id: uuid.UUID, applet_id: uuid.UUID) -> list[str]:
         from_query: Query = select(UserAppletAccessSchema)
         from_query = from_query.where(UserAppletAccessSchema.soft_exists())
@@ -791,6 +812,9 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
                 *_AppletInvitationFilter().get_clauses(**query_params.filters)
             )
             accepted_users_query = accepted_users_query.where(*_AppletUsersFilter().get_clauses(**query_params.filters))
+        if query_params.search:
+            invited_users_query = invited_users_query.where(_AppletInvitationSearch().get_clauses(query_params.search))
+            accepted_users_query = accepted_users_query.where(_AppletUsersSearch().get_clauses(query_params.search))
 
         invited_users = invited_users_query.cte("invited_users")
         accepted_users = accepted_users_query.cte("accepted_users")
@@ -858,34 +882,6 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         data = parse_obj_as(list[WorkspaceManager], data)
         ordering_fields = ordering.get_ordering_fields(total)
 
-        # TODO: Fix via class Searching
-        #  using database fields - StringEncryptedType
-        if query_params.search:
-            data_search = []
-            total_search = 0
-            for manager in data:
-                if manager.first_name:
-                    first_name_lower = manager.first_name.lower()
-                else:
-                    first_name_lower = ""
-                if manager.last_name:
-                    last_name_lower = manager.last_name.lower()
-                else:
-                    last_name_lower = ""
-                if manager.email_encrypted:
-                    email_encrypted_lower = manager.email_encrypted.lower()
-                else:
-                    email_encrypted_lower = ""
-
-                if (
-                    query_params.search.lower() in first_name_lower
-                    or query_params.search.lower() in last_name_lower
-                    or query_params.search.lower() in email_encrypted_lower
-                ):
-                    data_search.append(manager)
-                    total_search += 1
-            return data_search, total_search, ordering_fields
-
         return data, total, ordering_fields
 
     async def get_all_by_user_id_and_roles(self, user_id_: uuid.UUID, roles: list[Role]) -> list[UserAppletAccess]:
@@ -0,0 +1,87 @@
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from apps.workspaces.cache import ArbitraryInfoCache, arbitrary_info_cache
+from apps.workspaces.domain.workspace import WorkspaceArbitrary
+from apps.workspaces.service.workspace import WorkspaceService
+from config import settings
+from infrastructure.cache.lru import MISSING
+from infrastructure.database.core import EngineRegistry, SessionManager, engine_registry, session_manager
+from infrastructure.logger import logger
+
+__all__ = ["ArbitraryEngineRegistry", "arbitrary_registry"]
+
+
+class ArbitraryEngineRegistry:
+    """Resolves and connects to arbitrary (bring-your-own) answer databases.
+
+    - the resolved `WorkspaceArbitrary` (or its absence) is kept in the
+      `ArbitraryInfoCache`, so the workspace lookup and the
+      `database_uri` decryption are not repeated on every request;
+    - one pooled engine is shared per distinct database URI, the pool
+      size per tenant is capped by the `database.arbitrary_*` settings;
+    - engines which had no checkouts for `arbitrary_idle_timeout` seconds
+      are disposed to release the tenant's connections.
+    """
+
+    def __init__(
+        self,
+        engines: EngineRegistry,
+        sessions: SessionManager,
+        cache: ArbitraryInfoCache,
+        *,
+        idle_timeout: int,
+    ):
+        self.engines = engines
+        self.sessions = sessions
+        self.cache = cache
+        self.idle_timeout = idle_timeout
+        self._last_used: dict[str, float] = {}
+        self._last_eviction = time.monotonic()
+
+    async def get_by_applet_id(self, session: AsyncSession, applet_id: uuid.UUID) -> WorkspaceArbitrary | None:
+        info = self.cache.by_applet.get(applet_id)
+        if info is MISSING:
+            info = await WorkspaceService(session, uuid.uuid4()).get_arbitrary_info_if_use_arbitrary(applet_id)
+            self.cache.by_applet.set(applet_id, info)
+        return info
+
+    async def get_by_owner_id(self, session: AsyncSession, owner_id: uuid.UUID) -> WorkspaceArbitrary | None:
+        info = self.cache.by_owner.get(owner_id)
+        if info is MISSING:
+            service = WorkspaceService(session, uuid.uuid4())
+            info = await service.get_arbitrary_info_by_owner_id_if_use_arbitrary(owner_id)
+            self.cache.by_owner.set(owner_id, info)
+        return info
+
+    async def get_session_maker(self, uri: str) -> sessionmaker:
+        now = time.monotonic()
+        self._last_used[uri] = now
+        if self.idle_timeout and now - self._last_eviction > self.idle_timeout:
+            self._last_eviction = now
+            await self.evict_idle()
+        return self.sessions.get_session(uri)
+
+    async def evict_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_timeout
+        for uri, last_used in list(self._last_used.items()):
+            if last_used > deadline:
+                continue
+            engine = self.engines.peek(uri)
+            if engine is not None and engine.pool.checkedout():  # type: ignore[attr-defined]
+                continue
+            self._last_used.pop(uri, None)
+            if engine is not None:
+                logger.info(f"Dispose idle arbitrary engine {engine.url.render_as_string(hide_password=True)}")
+                await self.engines.dispose(uri)
+
+
+arbitrary_registry = ArbitraryEngineRegistry(
+    engine_registry,
+    session_manager,
+    arbitrary_info_cache,
+    idle_timeout=settings.database.arbitrary_idle_timeout,
+)
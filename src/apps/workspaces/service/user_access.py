@@ -2,6 +2,7 @@ import uuid
 from gettext import gettext as _
 
 import config
+from apps.answers.cache import AnswersCountCache
 from apps.answers.crud.answers import AnswersCRUD
 from apps.applets.crud import UserAppletAccessCRUD
 from apps.invitations.domain import ReviewerMeta
@@ -123,6 +124,7 @@ class UserAccessService:
                     applet_id,
                     schema.user_id,
                 )
+                await AnswersCountCache().invalidate_on_commit(self.session, applet_id)
 
     async def _validate_ownership(self, applet_ids: list[uuid.UUID], roles: list[Role]):
         accesses = await UserAppletAccessCRUD(self.session).get_user_applet_accesses_by_roles(
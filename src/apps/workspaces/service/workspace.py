@@ -6,6 +6,7 @@ from pydantic import ValidationError
 from apps.applets.crud import AppletsCRUD
 from apps.shared.query_params import QueryParams
 from apps.users import User, UsersCRUD
+from apps.workspaces.cache import arbitrary_info_cache
 from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
 from apps.workspaces.crud.workspaces import UserWorkspaceCRUD
 from apps.workspaces.db.schemas import UserWorkspaceSchema
@@ -306,6 +307,7 @@ class WorkspaceService:
         for k, v in data.model_dump(by_alias=False).items():
             setattr(schema, k, v)
         await repository.update_by_user_id(schema.user_id, schema)
+        arbitrary_info_cache.invalidate_on_commit(self.session, schema.user_id)
 
     async def get_arbitrary_list(self) -> list[WorkspaceArbitrary]:
         schemas = await UserWorkspaceCRUD(self.session).get_arbitrary_list()
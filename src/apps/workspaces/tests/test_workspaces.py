@@ -490,7 +490,8 @@ class TestWorkspaces(BaseTest):
         secret_user_id_1 = tom_result["secretIds"][0]
         search_params = {
             access_id_0: [secret_user_id_0[19:]],
-            access_id_1: [secret_user_id_1],
+            # Nicknames are encrypted and searched with the blind index
+            access_id_1: [secret_user_id_1, "isaak", "TOM IS"],
         }
         for access_id, params in search_params.items():
             for val in params:
@@ -2,7 +2,7 @@ from typing import Any, Coroutine, Union
 
 import structlog
 import taskiq_fastapi
-from taskiq import AsyncBroker, InMemoryBroker, TaskiqMessage, TaskiqMiddleware
+from taskiq import AsyncBroker, InMemoryBroker, TaskiqEvents, TaskiqMessage, TaskiqMiddleware, TaskiqState
 from taskiq.formatters.json_formatter import JSONFormatter
 from taskiq_aio_pika import AioPikaBroker
 from taskiq_redis import RedisAsyncResultBackend
@@ -35,4 +35,38 @@ if settings.env == "testing" or settings.env == "local":
 middlewares = [StructlogMiddleware()]
 broker.add_middlewares(*middlewares)
 
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def dispose_database_engines(state: TaskiqState) -> None:
+    from infrastructure.database import engine_registry
+
+    logger.info("Database engines shutdown", pools=engine_registry.metrics())
+    await engine_registry.dispose_all()
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def close_smtp_pool(state: TaskiqState) -> None:
+    from apps.mailing.services import MailingService
+
+    service = MailingService()
+    logger.info("SMTP pool shutdown", pool=service.pool.metrics())
+    await service.pool.close()
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def shutdown_crypto_executor(state: TaskiqState) -> None:
+    from apps.answers.encryption import crypto_executor
+
+    logger.info("Crypto executor shutdown")
+    crypto_executor.shutdown()
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def shutdown_storage_executor(state: TaskiqState) -> None:
+    from infrastructure.storage.executor import storage_executor
+
+    logger.info("Storage executor shutdown", executor=storage_executor.metrics())
+    storage_executor.shutdown()
+
+
 taskiq_fastapi.init(broker, "main:app")
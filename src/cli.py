@@ -15,7 +15,9 @@ from apps.applets.commands import (  # noqa: E402
     applet_cli,  # noqa: E402
     applet_ema_cli,  # noqa: E402
 )  # noqa: E402
-from apps.shared.commands import encryption_cli, patch  # noqa: E402
+from apps.library.commands import library_cli  # noqa: E402
+from apps.mailing.commands import mailing_cli  # noqa: E402
+from apps.shared.commands import blind_index_cli, encryption_cli, fan_out_cli, patch  # noqa: E402
 from apps.shared.commands.storage import app as storage_cli  # noqa: E402
 from apps.users.commands.token import app as token_cli  # noqa: E402
 from apps.users.commands.manage import app as user_cli  # noqa: E402
@@ -32,9 +34,13 @@ cli.add_typer(user_cli, name="users")
 cli.add_typer(mfa_cli, name="mfa")
 cli.add_typer(patch, name="patch")
 cli.add_typer(encryption_cli, name="encryption")
+cli.add_typer(blind_index_cli, name="blind-index")
 cli.add_typer(applet_ema_cli, name="applet-ema")
 cli.add_typer(applet_cli, name="applet")
 cli.add_typer(storage_cli, name="storage")
+cli.add_typer(mailing_cli, name="mailing")
+cli.add_typer(library_cli, name="library")
+cli.add_typer(fan_out_cli, name="fan-out")
 
 if __name__ == "__main__":
     # with app context?
@@ -26,7 +26,7 @@ from config.secret import SecretSettings
 from config.sentry import SentrySettings
 from config.service import JsonLdConverterSettings, ServiceSettings
 from config.superuser import SuperAdmin
-from config.task import AnswerEncryption, AudioFileConvert, ImageConvert
+from config.task import AnswerEncryption, AnswerEvents, AnswersExport, AudioFileConvert, ImageConvert
 
 
 # NOTE: Settings powered by pydantic
@@ -94,6 +94,8 @@ class Settings(BaseSettings):
     task_answer_encryption: AnswerEncryption = AnswerEncryption()
     task_audio_file_convert: AudioFileConvert = AudioFileConvert()
     task_image_convert: ImageConvert = ImageConvert()
+    task_answers_export: AnswersExport = AnswersExport()
+    task_answer_events: AnswerEvents = AnswerEvents()
 
     applet_ema: AppletEMASettings = AppletEMASettings()
 
@@ -3,3 +3,10 @@ from pydantic import BaseModel
 
 class AlertsSettings(BaseModel):
     ws_fetching_periodicity_sec: int = 5
+    # Alerts a websocket may lag behind before it is closed
+    ws_queue_size: int = 100
+    # Idle seconds before the Redis subscription of the websocket hub is pinged
+    ws_heartbeat_interval: int = 30
+    # Seconds the websocket hub keeps applet, workspace and subject data of alerts
+    metadata_cache_ttl: int = 60
+    metadata_cache_size: int = 1024
@@ -52,6 +52,18 @@ class MFATokenSettings(BaseModel):
         return v
 
 
+class AuthCacheSettings(BaseModel):
+    """Caches of get_current_user, set in seconds, 0 disables a cache."""
+
+    # Users of authenticated requests in Redis
+    user_ttl: int = 60
+    # In-process copies of cached users, they may be stale for this time on other processes
+    local_user_ttl: int = 5
+    local_size: int = 10000
+    # Upper bound for a cached "not revoked" token verdict, revoked ones are kept until token expiration
+    token_ttl: int = 60
+
+
 class AuthenticationSettings(BaseModel):
     access_token: AccessTokenSettings
     refresh_token: RefreshTokenSettings
@@ -59,3 +71,4 @@ class AuthenticationSettings(BaseModel):
     token_type: str = "Bearer"
     password_recover: PasswordRecoverSettings = PasswordRecoverSettings()
     mfa_token: MFATokenSettings
+    cache: AuthCacheSettings = AuthCacheSettings()
@@ -45,6 +45,10 @@ class CDNSettings(BaseModel):
     storage_address: str | None = None
 
     max_concurrent_tasks: int = 10
+    # Threads shared by all blocking object storage calls of a process
+    executor_max_workers: int = 32
+    # Storage clients kept per process, a client is reused for the same storage config
+    client_cache_size: int = 128
 
     @model_validator(mode="after")
     def validate_settings(self) -> Self:
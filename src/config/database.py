@@ -10,6 +10,22 @@ class DatabaseSettings(BaseModel):
     pool_size: int = 5
     pool_overflow_size: int = 10
     pool_timeout: int = 30
+    # Seconds after which a pooled connection is recycled, -1 disables recycling
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # Pooled connections a request may use at once for its independent reads, 1 runs them on the request session
+    fan_out_concurrency: int = 3
+    # Pool connections the readers leave to other requests, fewer spare connections run the reads sequentially
+    fan_out_pool_reserve: int = 1
+
+    # Arbitrary (bring-your-own) answer databases, the pool is per database
+    arbitrary_pool_size: int = 2
+    arbitrary_pool_overflow_size: int = 3
+    # Seconds without a checkout after which an arbitrary database pool is disposed
+    arbitrary_idle_timeout: int = 600
+    # Cache of the resolved arbitrary server settings by applet/owner, 0 disables the cache
+    arbitrary_info_cache_ttl: int = 60
+    arbitrary_info_cache_size: int = 10000
 
     @property
     def url(self) -> str:
@@ -17,6 +17,16 @@ class MailingSettings(BaseModel):
 
     mail: MailSettings = MailSettings()
 
+    # Persistent SMTP connections of a process
+    pool_size: int = 4
+    pool_idle_timeout: int = 60  # sec
+    # Attempts of a queued mail, the delay doubles after every failed attempt
+    max_attempts: int = 5
+    retry_backoff: int = 2  # sec
+    # The first alert mail of a recipient is sent right away, the alerts of the following
+    # window are sent in one digest mail, 0 sends every alert mail
+    alert_digest_window: int = 60  # sec
+
     # Currently these settings are not used
     use_credentials: bool = False
     validate_certs: bool = False
@@ -18,6 +18,9 @@ class FirebaseCloudMessagingSettings(BaseModel):
     client_x509_cert_url: str | None = None
     universe_domain: str | None = None
     ttl: int = 7 * 24 * 60 * 60
+    # FCM accepts up to 500 tokens in a multicast message
+    multicast_size: int = 500
+    concurrency: int = 10
 
     @property
     def certificate(self) -> dict:
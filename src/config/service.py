@@ -32,6 +32,15 @@ class ServiceSettings(BaseModel):
     port: int = 8000
     urls: ServiceUrlsSettings = ServiceUrlsSettings()
     result_limit: Annotated[int, Field(gt=0)] = 10000
+    # Seconds to keep cached totals of the answers export/submissions lists
+    answers_count_cache_ttl: int = 300
+    # Applet/activity/flow version history cache: seconds in Redis (0 disables the cache),
+    # seconds and number of entries kept in-process
+    history_cache_ttl: int = 86400
+    history_cache_local_ttl: int = 60
+    history_cache_size: int = 1024
+    # Days deleted events are kept for the schedule delta sync, older sync versions get the full schedule
+    schedule_deleted_events_retention_days: Annotated[int, Field(ge=2)] = 30
 
 
 class JsonLdConverterSettings(BaseModel):
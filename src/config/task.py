@@ -5,6 +5,10 @@ class AnswerEncryption(BaseModel):
     batch_limit: int = 1000
     max_retries: int = 5
     retry_timeout: int = 12 * 60 * 60
+    # Applets re-encrypted at once
+    concurrency: int = 4
+    # Processes doing the encryption, 0 runs it in threads
+    crypto_workers: int = 2
 
 
 class AudioFileConvert(BaseModel):
@@ -17,3 +21,29 @@ class ImageConvert(BaseModel):
     command: str = "convert -strip -interlace JPEG -sampling-factor 4:2:0 -quality 85 -colorspace RGB {fin} {fout}"
     subprocess_timeout: int = 20  # sec
     task_wait_timeout: int = 10  # sec
+
+
+class AnswersExport(BaseModel):
+    batch_size: int = 1000
+    # Rows per compressed part file uploaded to the answer bucket
+    part_rows: int = 100000
+    # Runs of a background export, a failed or interrupted run is resumed by the scheduled sweep
+    max_attempts: int = 3
+    # A job without progress for this period lost its worker and is resumed
+    stale_timeout: int = 30 * 60  # sec
+    # A running job bumps its progress at least this often, keep it well below `stale_timeout`
+    heartbeat_interval: int = 60  # sec
+    # EHR archives downloaded at once while the EHR export is streamed
+    ehr_download_concurrency: int = 4
+    # Compress EHR archives again in the export, they are zip files already
+    ehr_deflate: bool = False
+
+
+class AnswerEvents(BaseModel):
+    # Outbox events claimed and processed at once by a worker
+    batch_size: int = 100
+    # Claimed events are retried by another worker after the lease expires
+    lease: int = 5 * 60  # sec
+    max_attempts: int = 5
+    # Processed events and events which failed all attempts are removed by the scheduled sweep after this period
+    retention_days: int = 7
@@ -1,2 +1,4 @@
 from infrastructure.cache.errors import *  # noqa: F401, F403
+from infrastructure.cache.immutable import *  # noqa: F401, F403
+from infrastructure.cache.lru import *  # noqa: F401, F403
 from infrastructure.cache.services import *  # noqa: F401, F403
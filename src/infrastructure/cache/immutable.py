@@ -0,0 +1,143 @@
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from pydantic import TypeAdapter
+
+from infrastructure.cache.lru import LRUCache
+from infrastructure.logger import logger
+from infrastructure.utility.redis_client import RedisCache
+
+__all__ = ["ImmutableCache", "immutable_caches"]
+
+_Value = TypeVar("_Value")
+
+# All immutable caches of the process by name, for metrics
+immutable_caches: dict[str, "ImmutableCache"] = {}
+
+
+class ImmutableCache(Generic[_Value]):
+    """Two-level cache of values which do not change once written.
+
+    Values are stored as JSON, in-process in an LRU with a size cap and in
+    Redis, so a value loaded by one process is reused by the others. There
+    is no invalidation on the read path, `delete` is only needed for rare
+    in-place corrections of the source rows.
+
+        [In 1]: cache = ImmutableCache("AppletHistory", AppletHistory, ttl=86400, local_ttl=60, maxsize=1024)
+        [In 2]: await cache.get_or_load(id_version, load)
+
+    NOTE: `ttl=0` disables the cache.
+    """
+
+    def __init__(self, name: str, type_: Any, *, ttl: int, local_ttl: int, maxsize: int):
+        self.name = name
+        self.ttl = ttl
+        self._adapter: TypeAdapter[_Value] = TypeAdapter(type_)
+        self._local = LRUCache[bytes](maxsize=maxsize, ttl=local_ttl)
+        self.redis_client = RedisCache()
+        self.redis_hits = 0
+        self.misses = 0
+        immutable_caches[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _build_key(self, key: str) -> str:
+        return f"{self.__class__.__name__}:{self.name}:{key}"
+
+    async def get(self, key: str) -> _Value | None:
+        if not self.enabled:
+            return None
+        payload = self._local.get(key, None)
+        if payload is None:
+            if not (payload := await self.redis_client.get(self._build_key(key))):
+                self.misses += 1
+                return None
+            self.redis_hits += 1
+            self._local.set(key, payload)
+        return self._adapter.validate_json(payload)
+
+    async def set(self, key: str, value: _Value) -> None:
+        if not self.enabled:
+            return
+        payload = self._adapter.dump_json(value)
+        self._local.set(key, payload)
+        try:
+            await self.redis_client.set(self._build_key(key), payload, ex=self.ttl)
+        except Exception as e:
+            # The value is loaded already, it is cached by the next read
+            logger.warning(f"Failed to cache {self.name} {key}: {e}")
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[_Value | None]]) -> _Value | None:
+        if (value := await self.get(key)) is not None:
+            return value
+        value = await load()
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+    async def get_many_or_load(
+        self, keys: list[str], load: Callable[[list[str]], Awaitable[dict[str, _Value]]]
+    ) -> dict[str, _Value]:
+        """Returns cached values and loads all missed ones with a single `load` call.
+
+        Values missing in-process are read from Redis in one round trip.
+        """
+        values: dict[str, _Value] = {}
+        missed = list(dict.fromkeys(keys))
+        if self.enabled:
+            missed = await self._get_many(missed, values)
+        if missed:
+            loaded = await load(missed)
+            for key, value in loaded.items():
+                await self.set(key, value)
+            values.update(loaded)
+        return values
+
+    async def _get_many(self, keys: list[str], values: dict[str, _Value]) -> list[str]:
+        """Puts cached values of the keys to `values`, returns the missed keys"""
+        remote = []
+        for key in keys:
+            if (payload := self._local.get(key, None)) is not None:
+                values[key] = self._adapter.validate_json(payload)
+            else:
+                remote.append(key)
+        if not remote:
+            return []
+        try:
+            payloads = await self.redis_client.mget([self._build_key(key) for key in remote])
+        except Exception as e:
+            logger.warning(f"Failed to read cached {self.name} values: {e}")
+            payloads = []
+        payloads = payloads or [None] * len(remote)
+        missed = []
+        for key, payload in zip(remote, payloads):
+            if not payload:
+                self.misses += 1
+                missed.append(key)
+                continue
+            self.redis_hits += 1
+            self._local.set(key, payload)
+            values[key] = self._adapter.validate_json(payload)
+        return missed
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._local.pop(key)
+            if not self.enabled:
+                continue
+            try:
+                await self.redis_client.delete(self._build_key(key))
+            except Exception as e:
+                # The source rows are updated already, the value expires after `ttl`
+                logger.warning(f"Failed to drop cached {self.name} {key}: {e}")
+
+    def stats(self) -> dict[str, int]:
+        local = self._local.stats()
+        return dict(
+            size=local["size"],
+            maxsize=local["maxsize"],
+            local_hits=local["hits"],
+            redis_hits=self.redis_hits,
+            misses=self.misses,
+        )
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+__all__ = ["LRUCache", "MISSING"]
+
+_Value = TypeVar("_Value")
+
+# NOTE: Cached values are allowed to be None, so a dedicated marker is used for misses
+MISSING: Any = object()
+
+
+class LRUCache(Generic[_Value]):
+    """In-process LRU cache with an optional per-entry TTL.
+
+    The cache is not shared between processes, so it fits for data which
+    is either immutable or may be stale for at most `ttl` seconds.
+
+        [In 1]: cache = LRUCache[str](maxsize=2, ttl=60)
+        [In 2]: cache.set("key", "value")
+        [In 3]: cache.get("key")
+        [Out 3]: "value"
+
+    NOTE: `ttl=None` keeps entries until they are evicted by the size limit,
+          `ttl=0` or `maxsize=0` disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[_Value, float | None]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl != 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not MISSING
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return MISSING
+        return value
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        value = self._lookup(key)
+        if value is MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: _Value, ttl: float | None = None) -> None:
+        if not self.enabled:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        self._data.pop(key, None)
+        return default if value is MISSING else value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return dict(size=len(self._data), maxsize=self.maxsize, hits=self.hits, misses=self.misses)
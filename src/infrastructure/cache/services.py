@@ -83,6 +83,7 @@ class BaseCacheService(ABC, Generic[_InputObject]):
         key: str,
         instance: _InputObject,
         ttl: int | None = None,
+        nx: bool = False,
     ) -> CacheEntry[_InputObject]:
         enhanced_cache_entry: CacheEntry[_InputObject] = CacheEntry(
             instance=instance,
@@ -93,6 +94,7 @@ class BaseCacheService(ABC, Generic[_InputObject]):
             key=self._build_key(key=key),
             value=enhanced_cache_entry.model_dump_json(),
             ex=(ttl or self.default_ttl),
+            nx=nx,
         )
 
         # Return another rich data model after saving into the cache
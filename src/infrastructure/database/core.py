@@ -1,39 +1,179 @@
+import asyncio
+import hashlib
 import json
+import sys
+import time
+from typing import Awaitable, Callable
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool.impl import NullPool
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import queue as sqla_queue
 
 from config import settings
+from infrastructure.logger import logger
 
-__all__ = ["session_manager", "atomic", "build_engine"]
+__all__ = ["session_manager", "engine_registry", "atomic", "build_engine", "after_commit"]
 
+# Tasks scheduled after commits, referenced until they are done
+_after_commit_tasks: set[asyncio.Task] = set()
+# Session info key of the functions to run after the commit
+AFTER_COMMIT_HOOKS = "after_commit_hooks"
 
-def build_engine(uri: str) -> AsyncEngine:
+
+class _TimedQueue(sqla_queue.AsyncAdaptedQueue):
+    """Queue of the checked in connections which keeps track of the blocking waits."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def get(self, block=True, timeout=None):
+        if not block:
+            return super().get(block, timeout)
+        started_at = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.wait_count += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Bounded queue pool which keeps track of the time spent waiting for a connection.
+
+    Only checkouts which block on the exhausted pool are timed, opening a new
+    connection (also when the pool grows into the overflow) is not a wait.
+    """
+
+    _queue_class = _TimedQueue
+
+    def spare(self) -> int:
+        """Connections which can be checked out without waiting."""
+        if self._max_overflow < 0:
+            return sys.maxsize
+        return self.size() + self._max_overflow - self.checkedout()
+
+    def metrics(self) -> dict:
+        queue: _TimedQueue = self._pool
+        return dict(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            wait_count=queue.wait_count,
+            wait_time_total=round(queue.wait_time_total, 6),
+            wait_time_avg=round(queue.wait_time_total / queue.wait_count, 6) if queue.wait_count else 0.0,
+            wait_time_max=round(queue.wait_time_max, 6),
+        )
+
+
+def build_engine(uri: str, pool_size: int | None = None, max_overflow: int | None = None) -> AsyncEngine:
     return create_async_engine(
         uri,
         future=True,
-        pool_pre_ping=True,
+        pool_pre_ping=settings.database.pool_pre_ping,
         echo=False,
-        poolclass=NullPool,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size if pool_size is not None else settings.database.pool_size,
+        max_overflow=max_overflow if max_overflow is not None else settings.database.pool_overflow_size,
+        pool_timeout=settings.database.pool_timeout,
+        pool_recycle=settings.database.pool_recycle,
         json_serializer=lambda x: json.dumps(x),
         json_deserializer=lambda x: json.loads(x),
     )
 
 
-class SessionManager:
+class EngineRegistry:
+    """Process-wide registry of pooled engines keyed by database URI.
+
+    Engines are created lazily on the first request for a URI and reused
+    until `dispose_all` is called on the application/worker shutdown.
+    Any URI other than the main database is an arbitrary (tenant) database
+    and gets a smaller pool, so a single tenant can not exhaust connections.
+    """
+
+    def __init__(self):
+        self._engines: dict[str, AsyncEngine] = {}
+
+    def get(self, uri: str) -> AsyncEngine:
+        engine = self._engines.get(uri)
+        if engine is None:
+            if uri == settings.database.url:
+                engine = build_engine(uri)
+            else:
+                engine = build_engine(
+                    uri,
+                    pool_size=settings.database.arbitrary_pool_size,
+                    max_overflow=settings.database.arbitrary_pool_overflow_size,
+                )
+            self._engines[uri] = engine
+        return engine
+
+    def peek(self, uri: str) -> AsyncEngine | None:
+        """Returns an already created engine without creating a new one."""
+        return self._engines.get(uri)
+
+    async def dispose(self, uri: str) -> None:
+        engine = self._engines.pop(uri, None)
+        if engine is not None:
+            await engine.dispose()
+
+    async def dispose_all(self) -> None:
+        engines, self._engines = self._engines, {}
+        for engine in engines.values():
+            try:
+                await engine.dispose()
+            except Exception as e:
+                logger.error(f"Can not dispose engine {engine.url!r}: {e}")
+
     @staticmethod
-    def get_session(uri: str = settings.database.url) -> sessionmaker:
-        return sessionmaker(
-            build_engine(uri),
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=False,
-            autocommit=False,
-        )
+    def _label(uri: str) -> str:
+        """Name of an engine in the metrics which does not disclose the database address."""
+        if uri == settings.database.url:
+            return "default"
+        return f"arbitrary:{hashlib.sha256(uri.encode()).hexdigest()[:12]}"
+
+    def metrics(self) -> dict[str, dict]:
+        result: dict[str, dict] = {}
+        for uri, engine in self._engines.items():
+            pool = engine.pool
+            name = self._label(uri)
+            if isinstance(pool, InstrumentedQueuePool):
+                result[name] = pool.metrics()
+            else:
+                result[name] = dict(status=pool.status())
+        return result
+
+
+engine_registry = EngineRegistry()
+
+
+class SessionManager:
+    def __init__(self, registry: EngineRegistry):
+        self.registry = registry
+        self._session_makers: dict[str, sessionmaker] = {}
+
+    def get_session(self, uri: str = settings.database.url) -> sessionmaker:
+        session_maker = self._session_makers.get(uri)
+        if session_maker is None or session_maker.kw["bind"] is not self.registry.get(uri):
+            session_maker = sessionmaker(
+                self.registry.get(uri),
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+                autocommit=False,
+            )
+            self._session_makers[uri] = session_maker
+        return session_maker
 
 
-session_manager = SessionManager()
+session_manager = SessionManager(engine_registry)
 
 
 class atomic:
@@ -51,3 +191,37 @@ class atomic:
         else:
             await self.session.rollback()
             raise
+
+
+async def _run_after_commit_hook(func: Callable[[], Awaitable]) -> None:
+    try:
+        await func()
+    except Exception as e:
+        logger.warning(f"Failed to run the after commit hook: {e}")
+
+
+def _run_after_commit_hooks(sync_session: Session) -> None:
+    for func in sync_session.info.pop(AFTER_COMMIT_HOOKS, []):
+        task = asyncio.get_running_loop().create_task(_run_after_commit_hook(func))
+        _after_commit_tasks.add(task)
+        task.add_done_callback(_after_commit_tasks.discard)
+
+
+def _drop_after_commit_hooks(sync_session: Session, previous_transaction: SessionTransaction) -> None:
+    # Hooks of a rolled back transaction must not run on the next commit
+    if previous_transaction.parent is None:
+        sync_session.info.pop(AFTER_COMMIT_HOOKS, None)
+
+
+def after_commit(session: AsyncSession, func: Callable[[], Awaitable]) -> None:
+    """Runs `func` once the session transaction is committed, e.g. to drop
+    cached values which concurrent requests could read before the commit.
+
+    `func` runs as a separate task, its errors are logged. It is dropped
+    when the transaction is rolled back.
+    """
+    sync_session = session.sync_session
+    if not event.contains(sync_session, "after_commit", _run_after_commit_hooks):
+        event.listen(sync_session, "after_commit", _run_after_commit_hooks)
+        event.listen(sync_session, "after_soft_rollback", _drop_after_commit_hooks)
+    sync_session.info.setdefault(AFTER_COMMIT_HOOKS, []).append(func)
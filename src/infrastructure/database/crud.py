@@ -3,7 +3,7 @@ import typing
 from copy import deepcopy
 from typing import Any, Generic, Type, TypeVar
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.engine import Result
 from sqlalchemy.exc import MultipleResultsFound, NoResultFound
 from sqlalchemy.orm import Query
@@ -14,6 +14,9 @@ ConcreteSchema = TypeVar("ConcreteSchema", bound=Base)
 
 __all__ = ["BaseCRUD"]
 
+# Bind parameters limit of a PostgreSQL statement
+MAX_QUERY_PARAMETERS = 32767
+
 
 class BaseCRUD(Generic[ConcreteSchema]):
     schema_class: Type[ConcreteSchema]
@@ -91,6 +94,28 @@ class BaseCRUD(Generic[ConcreteSchema]):
         await self.session.flush()
         return deepcopy(schemas)
 
+    async def _insert_many(self, schemas: list[ConcreteSchema], returning: bool = False) -> list[ConcreteSchema]:
+        """
+        Creates the records with multi-row INSERT statements, without the
+        session unit of work, so the schemas are not added to the session.
+        All schemas must have the same attributes set.
+        The created records are returned only if requested, in no particular order.
+        """
+        created: list[ConcreteSchema] = []
+        if not schemas:
+            return created
+
+        values = [dict(schema) for schema in schemas]
+        batch_size = max(1, MAX_QUERY_PARAMETERS // len(self.schema_class.__table__.columns))
+        for start in range(0, len(values), batch_size):
+            query = insert(self.schema_class).values(values[start : start + batch_size])
+            if returning:
+                query = query.returning(self.schema_class)
+            db_result = await self._execute(query)
+            if returning:
+                created.extend(self.schema_class(**row_dict) for row_dict in db_result.mappings().all())
+        return created
+
     async def _all(self) -> list[ConcreteSchema]:
         query = select(self.schema_class)
         results = await self._execute(query=query)
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from config import settings
+from infrastructure.database.core import InstrumentedQueuePool
+
+__all__ = ["ReadFanOut"]
+
+Reader = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class ReadFanOut:
+    """Runs independent read-only queries of a request concurrently.
+
+    A session runs one query at a time, `asyncio.gather` over coroutines
+    sharing it gives no concurrency. Here every reader gets its own session
+    on a connection borrowed from the pool of the request session engine,
+    at most `concurrency` of them at once.
+
+    The request keeps its own connection while the readers run, so they
+    only borrow connections the pool has spare right away, leaving
+    `fan_out_pool_reserve` of them to other requests. Without spare
+    connections the readers run one by one on the request session instead
+    of waiting for connections held by requests waiting the same way.
+
+    The readers import the snapshot exported by the request transaction, so
+    they see the same data as each other and as the request session. Writes
+    not committed by the request session are not visible to them.
+
+    A session bound to a connection instead of an engine (e.g. in tests) has
+    no pool to borrow from, the readers then run one by one on it.
+
+    Example:
+        applet, subject = await ReadFanOut(session).gather(
+            lambda s: AppletsCRUD(s).get_by_id(applet_id),
+            lambda s: SubjectsCrud(s).get_by_id(subject_id),
+        )
+    """
+
+    def __init__(self, session: AsyncSession, concurrency: int | None = None):
+        self.session = session
+        self.concurrency = concurrency or settings.database.fan_out_concurrency
+
+    @property
+    def parallel(self) -> bool:
+        return isinstance(self.session.bind, AsyncEngine) and self.concurrency > 1
+
+    def _workers(self, readers: int) -> int:
+        """Readers which can run at once on spare pool connections."""
+        workers = min(self.concurrency, readers)
+        pool = self.session.bind.pool
+        if isinstance(pool, InstrumentedQueuePool):
+            workers = min(workers, pool.spare() - settings.database.fan_out_pool_reserve)
+        return workers
+
+    async def gather(self, *readers: Reader) -> list[Any]:
+        """Returns the results of the readers in their order"""
+        if not self.parallel or len(readers) < 2:
+            return [await reader(self.session) for reader in readers]
+
+        # The snapshot export checks out the request connection first
+        snapshot_id = (await self.session.execute(text("SELECT pg_export_snapshot()"))).scalar_one()
+        if (workers := self._workers(len(readers))) < 2:
+            return [await reader(self.session) for reader in readers]
+
+        semaphore = asyncio.Semaphore(workers)
+        tasks = [asyncio.ensure_future(self._run(reader, snapshot_id, semaphore)) for reader in readers]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _run(self, reader: Reader, snapshot_id: str, semaphore: asyncio.Semaphore) -> Any:
+        async with semaphore:
+            async with AsyncSession(self.session.bind, expire_on_commit=False, autoflush=False) as session:
+                await session.connection(
+                    execution_options=dict(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+                )
+                # Must be the first statement of the transaction
+                await session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+                return await reader(session)
@@ -0,0 +1,44 @@
+"""Add search_tokens blind index to users, subjects and invitations
+
+Revision ID: cb08ece8a763
+Revises: 3f6b2c9d1e47
+Create Date: 2026-10-17 11:05:23.184902
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "cb08ece8a763"
+down_revision = "3f6b2c9d1e47"
+branch_labels = None
+depends_on = None
+
+TABLES = ("users", "subjects", "invitations")
+
+
+def upgrade() -> None:
+    # Tokens are filled with `blind-index backfill` command
+    for table in TABLES:
+        op.add_column(table, sa.Column("search_tokens", postgresql.ARRAY(sa.String()), nullable=True))
+    # The tables are written all the time, the indexes are built without blocking writes
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                op.f(f"ix_{table}_search_tokens"),
+                table,
+                ["search_tokens"],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(op.f(f"ix_{table}_search_tokens"), table_name=table, postgresql_concurrently=True)
+    for table in TABLES:
+        op.drop_column(table, "search_tokens")
@@ -0,0 +1,47 @@
+"""Add library document and search_vector
+
+Revision ID: c952818dfa4f
+Revises: cb08ece8a763
+Create Date: 2026-10-17 12:40:12.551307
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c952818dfa4f"
+down_revision = "cb08ece8a763"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("library", sa.Column("document", postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column("library", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    # Search vectors of the shared applets, documents are built by `library build-documents` command
+    op.execute(
+        """
+        UPDATE library
+        SET search_vector =
+            setweight(to_tsvector('simple', coalesce(ah.display_name, '')), 'A')
+            || setweight(to_tsvector('simple', array_to_string(library.keywords, ' ')), 'B')
+            || setweight(to_tsvector('simple', array_to_string(library.search_keywords, ' ')), 'D')
+        FROM applet_histories ah
+        WHERE ah.id_version = library.applet_id_version
+        """
+    )
+    op.create_index(
+        op.f("ix_library_search_vector"),
+        "library",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_library_search_vector"), table_name="library")
+    op.drop_column("library", "search_vector")
+    op.drop_column("library", "document")
@@ -0,0 +1,105 @@
+"""Add events change_xid and deleted_events
+
+Revision ID: 5d1e0b7a9c23
+Revises: c952818dfa4f
+Create Date: 2026-10-17 14:10:41.207815
+
+"""
+
+import uuid
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5d1e0b7a9c23"
+down_revision = "c952818dfa4f"
+branch_labels = None
+depends_on = None
+
+CURRENT_XACT_ID = sa.text("pg_current_xact_id()::text::bigint")
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _backfill_change_xid() -> None:
+    """Sets `change_xid` of the existing events in batches of committed
+    transactions, so rows are not locked for the whole table update."""
+    connection = op.get_bind()
+    last_id = uuid.UUID(int=0)
+    while True:
+        batch_end = connection.execute(
+            sa.text("SELECT id FROM events WHERE id > :last_id ORDER BY id OFFSET :offset LIMIT 1"),
+            dict(last_id=last_id, offset=BACKFILL_BATCH_SIZE - 1),
+        ).scalar()
+        params = dict(last_id=last_id)
+        upper_bound = ""
+        if batch_end is not None:
+            params["batch_end"] = batch_end
+            upper_bound = "AND id <= :batch_end"
+        connection.execute(
+            sa.text(
+                f"UPDATE events SET change_xid = {CURRENT_XACT_ID.text} "
+                f"WHERE id > :last_id {upper_bound} AND change_xid IS NULL"
+            ),
+            params,
+        )
+        if batch_end is None:
+            return
+        last_id = batch_end
+
+
+def upgrade() -> None:
+    # A volatile default would rewrite the table under an exclusive lock, the
+    # column is added empty, new events get the default right away
+    op.add_column("events", sa.Column("change_xid", sa.BigInteger(), nullable=True))
+    op.alter_column("events", "change_xid", server_default=CURRENT_XACT_ID)
+    with op.get_context().autocommit_block():
+        _backfill_change_xid()
+        # The validated check lets SET NOT NULL skip the table scan under the exclusive lock
+        op.execute(
+            "ALTER TABLE events ADD CONSTRAINT ck_events_change_xid_not_null "
+            "CHECK (change_xid IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE events VALIDATE CONSTRAINT ck_events_change_xid_not_null")
+        op.alter_column("events", "change_xid", nullable=False)
+        op.drop_constraint("ck_events_change_xid_not_null", "events", type_="check")
+        op.create_index(
+            op.f("ix_events_applet_id"),
+            "events",
+            ["applet_id", "change_xid"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+    op.create_table(
+        "deleted_events",
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=True),
+        sa.Column("migrated_date", sa.DateTime(), nullable=True),
+        sa.Column("migrated_updated", sa.DateTime(), nullable=True),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("applet_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("change_xid", sa.BigInteger(), server_default=CURRENT_XACT_ID, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["applet_id"],
+            ["applets.id"],
+            name=op.f("fk_deleted_events_applet_id_applets"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_deleted_events")),
+    )
+    op.create_index(
+        op.f("ix_deleted_events_applet_id"), "deleted_events", ["applet_id", "change_xid"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_deleted_events_applet_id"), table_name="deleted_events")
+    op.drop_table("deleted_events")
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f("ix_events_applet_id"), table_name="events", postgresql_concurrently=True)
+    op.drop_column("events", "change_xid")
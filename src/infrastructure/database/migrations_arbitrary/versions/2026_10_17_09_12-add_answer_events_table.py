@@ -0,0 +1,50 @@
+"""Add answer_events table
+
+Revision ID: 3f6b2c9d1e47
+Revises: 4e194e2a1dab
+Create Date: 2026-10-17 09:12:41.503219
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3f6b2c9d1e47"
+down_revision = "4e194e2a1dab"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "answer_events",
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("timezone('utc', now())"), nullable=True),
+        sa.Column("migrated_date", sa.DateTime(), nullable=True),
+        sa.Column("migrated_updated", sa.DateTime(), nullable=True),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("applet_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("answer_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("respondent_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_answer_events")),
+    )
+    op.create_index(
+        "ix_answer_events_pending",
+        "answer_events",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_answer_events_pending", table_name="answer_events")
+    op.drop_table("answer_events")
@@ -0,0 +1,32 @@
+"""Add answer_events report_done and ehr_done
+
+Revision ID: a7c4e2f19b35
+Revises: 3f6b2c9d1e47
+Create Date: 2026-10-17 16:30:12.845120
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7c4e2f19b35"
+down_revision = "3f6b2c9d1e47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "answer_events",
+        sa.Column("report_done", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+    )
+    op.add_column(
+        "answer_events",
+        sa.Column("ehr_done", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("answer_events", "ehr_done")
+    op.drop_column("answer_events", "report_done")
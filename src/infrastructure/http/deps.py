@@ -47,3 +47,9 @@ def get_tz_utc_offset(required: bool = False):
         return None
 
     return _get_tz_utc_offset
+
+
+def get_if_none_match(request: Request) -> set[str]:
+    """Entity tags of the If-None-Match HTTP header without the quotes and the weak prefix."""
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/").strip('"') for tag in header.split(",") if tag.strip()}
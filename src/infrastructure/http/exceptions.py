@@ -6,7 +6,7 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from apps.shared.domain import ErrorResponse, ErrorResponseMulti
-from apps.shared.exception import BaseError
+from apps.shared.exception import BaseError, MultipleErrors
 from infrastructure.logger import logger
 
 
@@ -15,13 +15,15 @@ def custom_base_errors_handler(_: Request, error: BaseError) -> JSONResponse:
 
     logger.error(error.error, exc_info=error)
 
+    errors = error.errors if isinstance(error, MultipleErrors) else [error]
     response = ErrorResponseMulti(
         result=[
             ErrorResponse(
-                message=error.error,
-                type=error.type,
-                path=getattr(error, "path", []),
+                message=err.error,
+                type=err.type,
+                path=getattr(err, "path", []),
             )
+            for err in errors
         ]
     )
 
@@ -38,6 +40,7 @@ def custom_base_errors_handler(_: Request, error: BaseError) -> JSONResponse:
     return JSONResponse(
         response_dict,
         status_code=error.status_code,
+        headers=getattr(error, "headers", None),
     )
 
 
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 
 from broker import broker
+from infrastructure.database import engine_registry
 from infrastructure.logger import logger
+from infrastructure.storage.executor import storage_executor
 
 
 async def startup_taskiq() -> None:
@@ -16,6 +18,31 @@ async def shutdown_taskiq() -> None:
         await broker.shutdown()
 
 
+async def shutdown_database() -> None:
+    logger.info("Database engines shutdown", pools=engine_registry.metrics())
+    await engine_registry.dispose_all()
+
+
+async def shutdown_mailing() -> None:
+    from apps.mailing.services import MailingService
+
+    service = MailingService()
+    logger.info("SMTP pool shutdown", pool=service.pool.metrics())
+    await service.pool.close()
+
+
+async def shutdown_alert_hub() -> None:
+    from apps.alerts.hub import alert_hub
+
+    logger.info("Alert hub shutdown", hub=alert_hub.metrics())
+    await alert_hub.close()
+
+
+def shutdown_storage() -> None:
+    logger.info("Storage executor shutdown", executor=storage_executor.metrics())
+    storage_executor.shutdown()
+
+
 def startup(app: FastAPI):
     async def _startup():
         await startup_taskiq()
@@ -26,5 +53,9 @@ def startup(app: FastAPI):
 def shutdown(app: FastAPI):
     async def _shutdown():
         await shutdown_taskiq()
+        await shutdown_database()
+        await shutdown_mailing()
+        await shutdown_alert_hub()
+        shutdown_storage()
 
     return _shutdown
@@ -0,0 +1,90 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from config import settings
+
+__all__ = ["StorageExecutor", "storage_executor"]
+
+_Result = TypeVar("_Result")
+
+
+class StorageExecutor:
+    """Bounded thread pool shared by all blocking object storage calls.
+
+    The pool is created lazily and recreated after `shutdown`, so it can
+    be shut down on the application/worker shutdown. Calls above
+    `max_workers` wait in the executor queue, the queue depth and the
+    time spent in it are reported by `metrics`.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="storage")
+            return self._executor
+
+    def _call(self, queued_at: float, func: Callable[..., _Result]) -> _Result:
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.queue_time_total += waited
+            self.queue_time_max = max(self.queue_time_max, waited)
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, func: Callable[..., _Result], *args, **kwargs) -> _Result:
+        executor = self._get_executor()
+        with self._lock:
+            self.queued += 1
+        try:
+            future = executor.submit(self._call, time.perf_counter(), functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._dequeue()
+            raise
+        # A call cancelled while it waits in the queue never reaches `_call`
+        future.add_done_callback(lambda done: self._dequeue() if done.cancelled() else None)
+        return await asyncio.wrap_future(future)
+
+    def _dequeue(self) -> None:
+        with self._lock:
+            self.queued -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            started = self.completed + self.active
+            return dict(
+                max_workers=self.max_workers,
+                active=self.active,
+                queued=self.queued,
+                completed=self.completed,
+                queue_time_avg=round(self.queue_time_total / started, 6) if started else 0.0,
+                queue_time_max=round(self.queue_time_max, 6),
+            )
+
+
+storage_executor = StorageExecutor(settings.cdn.executor_max_workers)
@@ -1,4 +1,5 @@
 import uuid
+from typing import Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,6 +7,7 @@ from apps.workspaces.constants import StorageType
 from apps.workspaces.domain.workspace import WorkspaceArbitrary
 from apps.workspaces.service import workspace
 from config import AppSettings, settings
+from infrastructure.cache.lru import MISSING, LRUCache
 from infrastructure.storage.storage_arbitrary import (
     ArbitraryAzureStorageClient,
     ArbitraryGCPStorageClient,
@@ -14,6 +16,18 @@ from infrastructure.storage.storage_arbitrary import (
 from infrastructure.storage.storage_client import StorageClient
 from infrastructure.storage.storage_config import StorageConfig
 
+# NOTE: Clients are thread safe and keep connection pools, so one client is
+#       shared per storage config instead of being built for every request.
+storage_clients: LRUCache[StorageClient] = LRUCache(settings.cdn.client_cache_size)
+
+
+def _get_or_create_client(key: tuple, factory: Callable[[], StorageClient]) -> StorageClient:
+    client = storage_clients.get(key)
+    if client is MISSING:
+        client = factory()
+        storage_clients.set(key, client)
+    return client
+
 
 async def select_answer_storage(
     *,
@@ -43,8 +57,12 @@ def create_answer_client(app_settings: AppSettings, info: WorkspaceArbitrary | N
     # No arbitrary server, create a client based on local configuration
     if not info:
         config_cdn = StorageConfig.generate_answer_settings(app_settings.cdn)
+        max_concurrent_tasks = app_settings.cdn.max_concurrent_tasks
 
-        return StorageClient(config_cdn, env=settings.env, max_concurrent_tasks=app_settings.cdn.max_concurrent_tasks)
+        return _get_or_create_client(
+            (StorageClient, config_cdn.model_dump_json(), settings.env, max_concurrent_tasks),
+            lambda: StorageClient(config_cdn, env=settings.env, max_concurrent_tasks=max_concurrent_tasks),
+        )
 
     # Create an arbitrary server client
     bucket_type = info.storage_type.lower()
@@ -56,38 +74,55 @@ def create_answer_client(app_settings: AppSettings, info: WorkspaceArbitrary | N
         access_key=info.storage_access_key,
         secret_key=info.storage_secret_key,
     )
+    key = (bucket_type, arbitrary_cdn_config.model_dump_json(), settings.env)
 
     match bucket_type:
         case StorageType.AZURE:
-            return ArbitraryAzureStorageClient(
-                sec_key=info.storage_secret_key,
-                bucket=str(info.storage_bucket),
-                max_concurrent_tasks=settings.cdn.max_concurrent_tasks,
+            sec_key, bucket = info.storage_secret_key, str(info.storage_bucket)
+            return _get_or_create_client(
+                key,
+                lambda: ArbitraryAzureStorageClient(
+                    sec_key=sec_key,
+                    bucket=bucket,
+                    max_concurrent_tasks=settings.cdn.max_concurrent_tasks,
+                ),
             )
         case StorageType.GCP:
-            return ArbitraryGCPStorageClient(
-                arbitrary_cdn_config,
-                endpoint_url=settings.cdn.gcp_endpoint_url,
-                env=settings.env,
-                max_concurrent_tasks=settings.cdn.max_concurrent_tasks,
+            return _get_or_create_client(
+                key,
+                lambda: ArbitraryGCPStorageClient(
+                    arbitrary_cdn_config,
+                    endpoint_url=settings.cdn.gcp_endpoint_url,
+                    env=settings.env,
+                    max_concurrent_tasks=settings.cdn.max_concurrent_tasks,
+                ),
             )
         case _:
             # default is aws (logic from legacy app)
-            return ArbitraryS3StorageClient(
-                arbitrary_cdn_config, env=settings.env, max_concurrent_tasks=settings.cdn.max_concurrent_tasks
+            return _get_or_create_client(
+                key,
+                lambda: ArbitraryS3StorageClient(
+                    arbitrary_cdn_config, env=settings.env, max_concurrent_tasks=settings.cdn.max_concurrent_tasks
+                ),
             )
 
 
 async def get_media_storage(app_settings: AppSettings) -> StorageClient:
     config = StorageConfig.generate_media_settings(app_settings.cdn)
 
-    return StorageClient(config, env=app_settings.env)
+    return _get_or_create_client(
+        (StorageClient, config.model_dump_json(), app_settings.env),
+        lambda: StorageClient(config, env=app_settings.env),
+    )
 
 
 async def get_operations_storage(app_settings: AppSettings) -> StorageClient:
     config = StorageConfig.generate_operations_settings(app_settings.cdn)
 
-    return StorageClient(config, env=app_settings.env)
+    return _get_or_create_client(
+        (StorageClient, config.model_dump_json(), app_settings.env),
+        lambda: StorageClient(config, env=app_settings.env),
+    )
 
 
 async def get_log_storage(app_settings: AppSettings) -> StorageClient:
@@ -100,4 +135,7 @@ async def get_log_storage(app_settings: AppSettings) -> StorageClient:
     #     ttl_signed_urls=settings.cdn.ttl_signed_urls,
     # )
     config = StorageConfig.generate_logs_settings(app_settings.cdn)
-    return StorageClient(config, env=app_settings.env)
+    return _get_or_create_client(
+        (StorageClient, config.model_dump_json(), app_settings.env),
+        lambda: StorageClient(config, env=app_settings.env),
+    )
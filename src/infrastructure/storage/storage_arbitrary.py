@@ -3,10 +3,20 @@ from datetime import datetime, timedelta, timezone
 from typing import BinaryIO
 
 import boto3
-from azure.storage.blob import BlobSasPermissions, BlobServiceClient, generate_blob_sas
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.storage.blob import BlobClient, BlobSasPermissions, BlobServiceClient, generate_blob_sas
 from botocore.config import Config
 
-from infrastructure.storage.storage_client import StorageClient
+from infrastructure.logger import logger
+from infrastructure.storage.storage_client import (
+    ByteRange,
+    InvalidRangeError,
+    ObjectNotFoundError,
+    StorageClient,
+    StorageObject,
+    iter_blocking_stream,
+    media_type_by_key,
+)
 from infrastructure.storage.storage_config import StorageConfig
 
 
@@ -80,6 +90,71 @@ class ArbitraryAzureStorageClient(StorageClient):
         blob_client = self.client.get_blob_client(self.default_container_name, blob=key)
         return blob_client.exists()
 
+    async def _exists(self, key: str) -> bool:
+        return bool(await self.check_existence(key))
+
+    def _list_keys(self, prefix: str, max_keys: int) -> set[str] | None:
+        container_client = self.client.get_container_client(self.default_container_name)
+        keys: set[str] = set()
+        try:
+            for name in container_client.list_blob_names(name_starts_with=prefix):
+                keys.add(name)
+                if len(keys) > max_keys:
+                    return None
+        except HttpResponseError as e:
+            logger.warning(f"Error when trying to list {prefix} in {self.config.bucket}: {e}")
+            return None
+        return keys
+
+    def _open_stream(self, key: str, byte_range: ByteRange | None, chunk_size: int) -> StorageObject:
+        # The service client downloads up to 32MB in the first request, the
+        # blob client gets the stream chunk size for every request instead
+        blob_client = BlobClient.from_connection_string(
+            self.sec_key,
+            self.default_container_name,
+            key,
+            max_single_get_size=chunk_size,
+            max_chunk_get_size=chunk_size,
+        )
+        offset, length = None, None
+        try:
+            if byte_range:
+                start, end = byte_range
+                if start is None:
+                    # Suffix range, Azure accepts only an offset from the beginning
+                    blob_size = blob_client.get_blob_properties().size
+                    start, end = max(blob_size - (end or 0), 0), None
+                offset = start
+                length = end - start + 1 if end is not None else None
+            downloader = blob_client.download_blob(offset=offset, length=length)
+        except ResourceNotFoundError:
+            logger.warning(f"Trying to download not existing file {key}")
+            raise ObjectNotFoundError()
+        except HttpResponseError as e:
+            if e.status_code == 416:
+                raise InvalidRangeError(self._invalid_range_blob_size(blob_client))
+            logger.error(f"Error when trying to download file {key}: {e}")
+            raise
+
+        total_size = downloader.properties.size
+        size = downloader.size
+        content_range = f"bytes {offset}-{offset + size - 1}/{total_size}" if offset is not None else None
+        chunks = downloader.chunks()
+        return StorageObject(
+            body=iter_blocking_stream(lambda: next(chunks, b""), lambda: None),
+            media_type=media_type_by_key(key),
+            size=size,
+            total_size=total_size,
+            content_range=content_range,
+        )
+
+    @staticmethod
+    def _invalid_range_blob_size(blob_client: BlobClient) -> int | None:
+        try:
+            return blob_client.get_blob_properties().size
+        except HttpResponseError:
+            return None
+
     def _generate_presigned_url(self, key: str):
         blob_client = self.client.get_blob_client(self.default_container_name, key)
         permissions = BlobSasPermissions(read=True)
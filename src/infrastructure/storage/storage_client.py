@@ -3,8 +3,9 @@ import http
 import io
 import json
 import mimetypes
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, BinaryIO
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, BinaryIO, Callable
 
 import boto3
 import httpx
@@ -16,6 +17,7 @@ from typing_extensions import deprecated
 from apps.file.errors import FileNotFoundError
 from apps.shared.exception import NotFoundError
 from infrastructure.logger import logger
+from infrastructure.storage.executor import storage_executor
 from infrastructure.storage.storage_config import StorageConfig
 
 
@@ -23,6 +25,63 @@ class ObjectNotFoundError(Exception):
     pass
 
 
+class InvalidRangeError(Exception):
+    """The requested range is outside of the object, `size` is the object size when it is known"""
+
+    def __init__(self, size: int | None = None):
+        super().__init__()
+        self.size = size
+
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# (first byte, last byte), a suffix range has no first byte, an open range has no last byte
+ByteRange = tuple[int | None, int | None]
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(value: str | None) -> ByteRange | None:
+    """Parses a single byte range of the `Range` header.
+
+    Multiple ranges and malformed values are ignored, the whole object is
+    returned for them as allowed by RFC 9110.
+    """
+    if not value or not (match := _RANGE_RE.match(value.strip())):
+        return None
+    start, end = (int(group) if group else None for group in match.groups())
+    if start is None and end is None:
+        return None
+    if start is not None and end is not None and end < start:
+        return None
+    return start, end
+
+
+def media_type_by_key(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+@dataclass
+class StorageObject:
+    """Object body opened for streaming, `size` is the number of bytes in `body`"""
+
+    body: AsyncGenerator[bytes, None]
+    media_type: str
+    size: int
+    total_size: int
+    # Set only when a range was requested, e.g. "bytes 0-99/1000"
+    content_range: str | None = None
+
+
+async def iter_blocking_stream(read: Callable[[], bytes], close: Callable[[], Any]) -> AsyncGenerator[bytes, None]:
+    """Reads chunks of a blocking stream in the storage executor"""
+    try:
+        while chunk := await storage_executor.run(read):
+            yield chunk
+    finally:
+        close()
+
+
 class StorageClient:
     """A client for storing files, likely in an object store like S3"""
 
@@ -32,6 +91,12 @@ class StorageClient:
     default_container_name = "mindlogger"
     meta_last_modified = "last_modified_orig"
 
+    # A batched existence check lists the common prefix only when it is cheaper than checking
+    # every key. A list request returns a page of EXISTENCE_LIST_PAGE_SIZE objects and costs
+    # about EXISTENCE_LIST_PAGE_COST existence checks (S3 prices LIST 12.5 times a HEAD)
+    EXISTENCE_LIST_PAGE_SIZE = 1000
+    EXISTENCE_LIST_PAGE_COST = 12
+
     def __init__(self, config: StorageConfig, env: str, *, max_concurrent_tasks: int = 10):
         self.config = config
         self.env = env
@@ -100,9 +165,7 @@ class StorageClient:
 
     @tracer.wrap("storage.warn.upload")
     async def upload(self, path, body: BinaryIO):
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._upload, path, body)
-        await asyncio.wrap_future(future)
+        await storage_executor.run(self._upload, path, body)
 
     def _check_existence(self, key: str):
         try:
@@ -113,9 +176,54 @@ class StorageClient:
             raise NotFoundError
 
     async def check_existence(self, key: str):
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._check_existence, key)
-            return await asyncio.wrap_future(future)
+        return await storage_executor.run(self._check_existence, key)
+
+    async def _exists(self, key: str) -> bool:
+        try:
+            await self.check_existence(key)
+        except NotFoundError:
+            return False
+        return True
+
+    def _list_keys(self, prefix: str, max_keys: int) -> set[str] | None:
+        """Keys under the prefix, None when there are more than `max_keys` of them or listing failed"""
+        keys: set[str] = set()
+        try:
+            for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.config.bucket, Prefix=prefix):
+                keys.update(item["Key"] for item in page.get("Contents", []))
+                if len(keys) > max_keys:
+                    return None
+        except ClientError as e:
+            logger.warning(f"Error when trying to list {prefix} in {self.config.bucket}: {e}")
+            return None
+        return keys
+
+    async def list_keys(self, prefix: str, max_keys: int) -> set[str] | None:
+        """Keys under the prefix, None when there are more than `max_keys` of them or listing failed"""
+        async with self.semaphore:
+            return await storage_executor.run(self._list_keys, prefix, max_keys)
+
+    async def check_existence_many(self, keys: list[str], prefix: str | None = None) -> dict[str, bool]:
+        """Checks existence of many keys at once.
+
+        When all keys share the `prefix`, it is listed with a single request
+        (paginated), otherwise keys are checked concurrently, limited by the
+        client semaphore.
+        """
+        keys = list(dict.fromkeys(keys))
+        # The listing is given up when the prefix has more pages than the key checks are worth
+        max_listed = len(keys) // self.EXISTENCE_LIST_PAGE_COST * self.EXISTENCE_LIST_PAGE_SIZE
+        if prefix and max_listed and all(key.startswith(prefix) for key in keys):
+            listed = await storage_executor.run(self._list_keys, prefix, max_listed)
+            if listed is not None:
+                return {key: key in listed for key in keys}
+
+        async def _check(key: str) -> bool:
+            async with self.semaphore:
+                return await self._exists(key)
+
+        results = await asyncio.gather(*(_check(key) for key in keys))
+        return dict(zip(keys, results))
 
     @tracer.wrap("storage.warn.download")
     def download(self, key, file: BinaryIO | None = None):
@@ -142,6 +250,56 @@ class StorageClient:
         media_type = mimetypes.guess_type(key)[0] if mimetypes.guess_type(key)[0] else "application/octet-stream"
         return file, media_type
 
+    def _open_stream(self, key: str, byte_range: ByteRange | None, chunk_size: int) -> StorageObject:
+        params = dict(Bucket=self.config.bucket, Key=key)
+        if byte_range:
+            start, end = byte_range
+            params["Range"] = f"bytes={'' if start is None else start}-{'' if end is None else end}"
+        try:
+            res = self.client.get_object(**params)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            if error.get("Code") in ("404", "NoSuchKey"):
+                logger.warning(f"Trying to download not existing file {key}")
+                raise ObjectNotFoundError()
+            if error.get("Code") == "InvalidRange":
+                raise InvalidRangeError(self._invalid_range_object_size(key, error))
+            logger.error(f"Error when trying to download file {key}: {e}")
+            raise
+        except EndpointConnectionError as e:
+            logger.error(f"Error when trying to download file {key}: {e}")
+            raise FileNotFoundError
+
+        body = res["Body"]
+        size = res["ContentLength"]
+        content_range = res.get("ContentRange") if byte_range else None
+        total_size = int(content_range.rsplit("/", 1)[1]) if content_range else size
+        return StorageObject(
+            body=iter_blocking_stream(lambda: body.read(chunk_size), body.close),
+            media_type=media_type_by_key(key),
+            size=size,
+            total_size=total_size,
+            content_range=content_range,
+        )
+
+    def _invalid_range_object_size(self, key: str, error: dict) -> int | None:
+        if size := error.get("ActualObjectSize"):
+            return int(size)
+        try:
+            return self.client.head_object(Bucket=self.config.bucket, Key=key)["ContentLength"]
+        except ClientError:
+            return None
+
+    async def open_stream(
+        self, key: str, byte_range: ByteRange | None = None, *, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> StorageObject:
+        """Opens an object (or a byte range of it) to stream its body by chunks.
+
+        Raises `ObjectNotFoundError` when there is no object and
+        `InvalidRangeError` when the range is outside of the object.
+        """
+        return await storage_executor.run(self._open_stream, key, byte_range, chunk_size)
+
     def _generate_presigned_url(self, key):
         url = self.client.generate_presigned_url(
             "get_object",
@@ -155,24 +313,17 @@ class StorageClient:
 
     async def generate_presigned_url(self, key) -> str:
         """Generate a presigned url to retrieve an object from S3"""
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._generate_presigned_url, key)
-            url = await asyncio.wrap_future(future)
-            return url
+        return await storage_executor.run(self._generate_presigned_url, key)
 
     @tracer.wrap("storage.danger.delete")
     async def delete_object(self, key: str | None):
         async with self.semaphore:
-            with ThreadPoolExecutor() as executor:
-                future = executor.submit(self.client.delete_object, Bucket=self.config.bucket, Key=key)
-                await asyncio.wrap_future(future)
+            await storage_executor.run(self.client.delete_object, Bucket=self.config.bucket, Key=key)
 
     async def list_object(self, key: str):
         async with self.semaphore:
-            with ThreadPoolExecutor() as executor:
-                future = executor.submit(self.client.list_objects, Bucket=self.config.bucket, Prefix=key)
-                result = await asyncio.wrap_future(future)
-                return result.get("Contents", [])
+            result = await storage_executor.run(self.client.list_objects, Bucket=self.config.bucket, Prefix=key)
+            return result.get("Contents", [])
 
     def generate_presigned_post(self, key) -> dict[str, Any]:
         # Not needed ThreadPoolExecutor because there is no any IO operation (no API calls to s3)
@@ -200,10 +351,7 @@ class StorageClient:
 
     async def copy(self, key, storage_from: "StorageClient", key_from: str | None = None) -> int:
         async with self.semaphore:
-            with ThreadPoolExecutor() as executor:
-                future = executor.submit(self._copy, key, storage_from, key_from=key_from)
-                res = await asyncio.wrap_future(future)
-                return res
+            return await storage_executor.run(self._copy, key, storage_from, key_from=key_from)
 
     async def check(self):
         """Check if a bucket is available and writeable"""
@@ -273,6 +421,4 @@ class StorageClient:
 
     @deprecated("This check is no longer used")
     async def is_object_public(self, key) -> bool:
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._is_object_public, key)
-            return await asyncio.wrap_future(future)
+        return await storage_executor.run(self._is_object_public, key)
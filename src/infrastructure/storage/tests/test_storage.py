@@ -42,6 +42,12 @@ class TestStorageClients:
         assert presign is not None
         assert normal_storage_settings.cdn.bucket_answer in presign["url"]
 
+    def test_create_answer_client_reused(self, normal_storage_settings: Settings) -> None:
+        """Clients are cached per storage config"""
+        client = create_answer_client(app_settings=normal_storage_settings)
+
+        assert create_answer_client(app_settings=normal_storage_settings) is client
+
     async def test_select_answer_storage_client(
         self, tom: User, session: AsyncSession, normal_storage_settings: Settings
     ) -> None:
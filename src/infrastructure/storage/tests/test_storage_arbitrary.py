@@ -1,9 +1,11 @@
 from uuid import uuid4
 
+from pytest_mock import MockerFixture
+
 from apps.workspaces.domain.workspace import WorkspaceArbitrary
 from config import Settings
 from infrastructure.storage.storage import create_answer_client
-from infrastructure.storage.storage_arbitrary import ArbitraryS3StorageClient
+from infrastructure.storage.storage_arbitrary import ArbitraryAzureStorageClient, ArbitraryS3StorageClient
 
 
 class TestArbitraryStorageClients:
@@ -68,3 +70,20 @@ class TestArbitraryStorageClients:
 
         presign = client.generate_presigned_post("asdf.jpg")
         assert storage_region in presign["url"]
+
+
+def test_azure_open_stream__downloads_by_chunk_size(mocker: MockerFixture):
+    mocker.patch("infrastructure.storage.storage_arbitrary.BlobServiceClient")
+    from_connection_string = mocker.patch("infrastructure.storage.storage_arbitrary.BlobClient.from_connection_string")
+    downloader = from_connection_string.return_value.download_blob.return_value
+    downloader.properties.size = downloader.size = 6
+    downloader.chunks.return_value = iter([b"abcd", b"ef"])
+    client = ArbitraryAzureStorageClient("connection string", "bucket")
+
+    obj = client._open_stream("key", None, 4)
+
+    from_connection_string.assert_called_once_with(
+        "connection string", client.default_container_name, "key", max_single_get_size=4, max_chunk_get_size=4
+    )
+    assert obj.size == 6
+    assert obj.content_range is None
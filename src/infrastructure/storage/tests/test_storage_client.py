@@ -1,6 +1,11 @@
 import pytest
 
-from infrastructure.storage.storage_client import StorageClient
+from infrastructure.storage.storage_client import (
+    InvalidRangeError,
+    ObjectNotFoundError,
+    StorageClient,
+    parse_range_header,
+)
 from infrastructure.storage.storage_config import StorageConfig
 from infrastructure.storage.tests import ANSWER_BUCKET_NAME, ANSWER_OVERRIDE, MEDIA_BUCKET_NAME
 
@@ -86,6 +91,78 @@ class TestStorageClient:
     async def test_check_existence(self, answer_storage_client: StorageClient):
         await answer_storage_client.check_existence(FILE_KEY)
 
+    @pytest.mark.usefixtures("populate_s3")
+    async def test_open_stream(self, answer_storage_client: StorageClient):
+        obj = await answer_storage_client.open_stream(FILE_KEY, chunk_size=4)
+        assert obj.media_type == "image/jpeg"
+        assert obj.size == obj.total_size == 14
+        assert obj.content_range is None
+        assert [chunk async for chunk in obj.body] == [b"this", b" is ", b"a fi", b"le"]
+
+    @pytest.mark.usefixtures("populate_s3")
+    @pytest.mark.parametrize(
+        "byte_range,content,content_range",
+        (
+            ((0, 3), b"this", "bytes 0-3/14"),
+            ((10, None), b"file", "bytes 10-13/14"),
+            ((None, 4), b"file", "bytes 10-13/14"),
+        ),
+    )
+    async def test_open_stream__range(
+        self, answer_storage_client: StorageClient, byte_range, content: bytes, content_range: str
+    ):
+        obj = await answer_storage_client.open_stream(FILE_KEY, byte_range)
+        assert obj.size == len(content)
+        assert obj.total_size == 14
+        assert obj.content_range == content_range
+        assert b"".join([chunk async for chunk in obj.body]) == content
+
+    @pytest.mark.usefixtures("populate_s3")
+    async def test_open_stream__invalid_range(self, answer_storage_client: StorageClient):
+        with pytest.raises(InvalidRangeError) as exc_info:
+            await answer_storage_client.open_stream(FILE_KEY, (100, None))
+        assert exc_info.value.size == 14
+
+    async def test_open_stream__not_found(self, answer_storage_client: StorageClient, answer_bucket):
+        with pytest.raises(ObjectNotFoundError):
+            await answer_storage_client.open_stream("not-existing")
+
+    @pytest.mark.usefixtures("populate_s3")
+    @pytest.mark.parametrize("missing_count", (1, StorageClient.EXISTENCE_LIST_PAGE_COST))
+    async def test_check_existence_many(self, answer_storage_client: StorageClient, mocker, missing_count: int):
+        list_keys = mocker.spy(answer_storage_client, "_list_keys")
+        missing = [f"/some/missing-{i}.jpg" for i in range(missing_count)]
+
+        result = await answer_storage_client.check_existence_many([FILE_KEY, *missing, FILE_KEY], prefix="/some/")
+
+        assert result == {FILE_KEY: True, **{key: False for key in missing}}
+        assert list_keys.call_count == int(len(result) >= StorageClient.EXISTENCE_LIST_PAGE_COST)
+
+    @pytest.mark.usefixtures("populate_s3")
+    async def test_check_existence_many__prefix_too_large_to_list(self, answer_storage_client: StorageClient, mocker):
+        mocker.patch.object(StorageClient, "EXISTENCE_LIST_PAGE_SIZE", 1)
+        list_keys = mocker.spy(answer_storage_client, "_list_keys")
+        missing = [f"/some/missing-{i}.jpg" for i in range(StorageClient.EXISTENCE_LIST_PAGE_COST)]
+        answer_storage_client.client.put_object(
+            Bucket=answer_storage_client.config.bucket, Key="/some/another.jpg", Body=b"another file"
+        )
+
+        result = await answer_storage_client.check_existence_many([FILE_KEY, *missing], prefix="/some/")
+
+        # The prefix has 2 objects, more than the single page worth listing
+        list_keys.assert_called_once_with("/some/", 1)
+        assert result == {FILE_KEY: True, **{key: False for key in missing}}
+
+    @pytest.mark.usefixtures("populate_s3")
+    async def test_check_existence_many__keys_outside_prefix(self, answer_storage_client: StorageClient, mocker):
+        list_keys = mocker.spy(answer_storage_client, "_list_keys")
+        keys = [FILE_KEY] + [f"/other/{i}.jpg" for i in range(StorageClient.EXISTENCE_LIST_PAGE_COST)]
+
+        result = await answer_storage_client.check_existence_many(keys, prefix="/some/")
+
+        assert result == {key: key == FILE_KEY for key in keys}
+        list_keys.assert_not_called()
+
     async def test_invalid_public_url_config(self):
         client = StorageClient(config=StorageConfig(), env="test")
         with pytest.raises(ValueError):
@@ -101,3 +178,21 @@ class TestStorageClient:
         assert DOMAIN not in url
         assert STORAGE_ADDRESS in url
         assert FILE_KEY in url
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    (
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, None)),
+        ("bytes=-100", (None, 100)),
+        (None, None),
+        ("", None),
+        ("bytes=-", None),
+        ("bytes=10-5", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ),
+)
+def test_parse_range_header(value, expected):
+    assert parse_range_header(value) == expected
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from infrastructure.storage.executor import StorageExecutor
+
+
+async def test_storage_executor_run():
+    executor = StorageExecutor(max_workers=2)
+
+    result = await executor.run(lambda a, b=0: (threading.current_thread().name, a + b), 1, b=2)
+
+    assert result[0].startswith("storage")
+    assert result[1] == 3
+    metrics = executor.metrics()
+    assert metrics["completed"] == 1
+    assert metrics["queued"] == metrics["active"] == 0
+    executor.shutdown()
+
+
+async def test_storage_executor_reused_until_shutdown():
+    executor = StorageExecutor(max_workers=1)
+
+    first = await executor.run(threading.get_ident)
+    assert await executor.run(threading.get_ident) == first
+    executor.shutdown()
+
+    # A new pool is created on the next call after shutdown
+    await executor.run(threading.get_ident)
+    assert executor.metrics()["completed"] == 3
+    executor.shutdown()
+
+
+async def test_storage_executor_cancelled_while_queued():
+    executor = StorageExecutor(max_workers=1)
+    release = threading.Event()
+    running = asyncio.create_task(executor.run(release.wait))
+    queued = asyncio.create_task(executor.run(threading.get_ident))
+    await asyncio.sleep(0.01)
+    assert executor.metrics()["queued"] == 1
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await running
+
+    metrics = executor.metrics()
+    assert metrics["queued"] == metrics["active"] == 0
+    assert metrics["completed"] == 1
+    executor.shutdown()
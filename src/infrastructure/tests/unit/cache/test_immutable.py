@@ -0,0 +1,101 @@
+import uuid
+
+from pytest_mock import MockerFixture
+
+from apps.shared.domain import InternalModel
+from infrastructure.cache.immutable import ImmutableCache, immutable_caches
+
+
+class _Version(InternalModel):
+    id_version: str
+    items: list[int]
+
+
+def _cache(ttl: int = 60) -> ImmutableCache[_Version]:
+    return ImmutableCache(f"Test{uuid.uuid4().hex}", _Version, ttl=ttl, local_ttl=60, maxsize=10)
+
+
+async def test_immutable_cache__get_or_load_counts_hits_and_misses():
+    cache = _cache()
+    calls = 0
+
+    async def _load() -> _Version:
+        nonlocal calls
+        calls += 1
+        return _Version(id_version="a_1.0.0", items=[1, 2])
+
+    first = await cache.get_or_load("a_1.0.0", _load)
+    second = await cache.get_or_load("a_1.0.0", _load)
+
+    assert first == second == _Version(id_version="a_1.0.0", items=[1, 2])
+    assert first is not second
+    assert calls == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["local_hits"] == 1
+    assert immutable_caches[cache.name] is cache
+
+
+async def test_immutable_cache__shared_through_redis():
+    cache = _cache()
+    await cache.set("a_1.0.0", _Version(id_version="a_1.0.0", items=[]))
+    other_process = ImmutableCache(cache.name, _Version, ttl=60, local_ttl=60, maxsize=10)
+
+    assert await other_process.get("a_1.0.0") == _Version(id_version="a_1.0.0", items=[])
+    assert other_process.stats()["redis_hits"] == 1
+
+
+async def test_immutable_cache__get_many_or_load_loads_only_missed(mocker: MockerFixture):
+    cache = ImmutableCache(f"Test{uuid.uuid4().hex}", list[int], ttl=60, local_ttl=60, maxsize=10)
+    await cache.set("a", [1])
+    loaded: list[list[str]] = []
+
+    async def _load(keys: list[str]) -> dict[str, list[int]]:
+        loaded.append(keys)
+        return {key: [] for key in keys}
+
+    assert await cache.get_many_or_load(["a", "b", "b"], _load) == {"a": [1], "b": []}
+    assert loaded == [["b"]]
+
+    # Values of other processes are read from Redis at once
+    other_process = ImmutableCache(cache.name, list[int], ttl=60, local_ttl=60, maxsize=10)
+    mget = mocker.spy(other_process.redis_client, "mget")
+    assert await other_process.get_many_or_load(["a", "b", "c"], _load) == {"a": [1], "b": [], "c": []}
+    assert mget.call_count == 1
+    assert loaded == [["b"], ["c"]]
+    assert other_process.stats()["redis_hits"] == 2
+
+
+async def test_immutable_cache__redis_errors_are_not_raised(mocker: MockerFixture):
+    cache = _cache()
+    mocker.patch.object(cache.redis_client, "set", side_effect=ConnectionError("redis is down"))
+    mocker.patch.object(cache.redis_client, "mget", side_effect=ConnectionError("redis is down"))
+
+    await cache.set("a", _Version(id_version="a", items=[]))
+
+    async def _load(keys: list[str]) -> dict[str, _Version]:
+        return {key: _Version(id_version=key, items=[]) for key in keys}
+
+    # The value set is kept in-process still
+    assert await cache.get_many_or_load(["a", "b"], _load) == await _load(["a", "b"])
+
+
+async def test_immutable_cache__delete_and_disabled():
+    cache = _cache()
+    await cache.set("a", _Version(id_version="a", items=[]))
+    await cache.delete("a")
+    assert await cache.get("a") is None
+
+    disabled = _cache(ttl=0)
+    await disabled.set("a", _Version(id_version="a", items=[]))
+    assert await disabled.get("a") is None
+
+
+async def test_immutable_cache__delete_does_not_raise_redis_errors(mocker: MockerFixture):
+    cache = _cache()
+    await cache.set("a", _Version(id_version="a", items=[]))
+    mocker.patch.object(cache.redis_client, "delete", side_effect=ConnectionError("redis is down"))
+    mocker.patch.object(cache.redis_client, "get", return_value=None)
+
+    await cache.delete("a", "b")
+
+    assert await cache.get("a") is None
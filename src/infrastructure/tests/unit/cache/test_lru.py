@@ -0,0 +1,40 @@
+import time
+
+from pytest_mock import MockerFixture
+
+from infrastructure.cache.lru import MISSING, LRUCache
+
+
+def test_lru_cache__evicts_least_recently_used():
+    cache = LRUCache[int](maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache__none_is_cached():
+    cache = LRUCache[int | None](maxsize=2)
+    cache.set("a", None)
+    assert cache.get("a") is None
+    assert cache.get("b") is MISSING
+    assert cache.stats() == dict(size=1, maxsize=2, hits=1, misses=1)
+
+
+def test_lru_cache__entry_expires(mocker: MockerFixture):
+    now = time.monotonic()
+    mocker.patch("infrastructure.cache.lru.time.monotonic", return_value=now)
+    cache = LRUCache[int](maxsize=2, ttl=10)
+    cache.set("a", 1)
+    mocker.patch("infrastructure.cache.lru.time.monotonic", return_value=now + 11)
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_lru_cache__disabled_with_zero_ttl():
+    cache = LRUCache[int](maxsize=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
@@ -0,0 +1,33 @@
+import json
+
+from infrastructure.utility.redis_client import RedisCache, RedisCacheTest
+
+
+async def test_redis_cache__publish_many_and_pattern_messages():
+    RedisCacheTest._storage.clear()
+    cache = RedisCache()
+    await cache.publish_many([("channel_1", {"id": 1}), ("channel_2", {"id": 2}), ("other", {"id": 3})])
+
+    received = []
+    async for channel, data in cache.pattern_messages("channel_*", heartbeat=0):
+        received.append((channel, json.loads(data)))
+        if len(received) == 2:
+            break
+
+    assert received == [("channel_1", {"id": 1}), ("channel_2", {"id": 2})]
+    RedisCacheTest._storage.clear()
+
+
+async def test_redis_cache__sets_and_getdel():
+    RedisCacheTest._storage.clear()
+    cache = RedisCache()
+    assert await cache.sadd("users", "1", "2") == 2
+    assert await cache.sadd("users", "1") == 0
+    assert await cache.smembers("users") == {"1", "2"}
+    assert await cache.srem("users", "1", "3") == 1
+    assert await cache.smembers("users") == {"2"}
+
+    await cache.set("counter", "3")
+    assert await cache.getdel("counter") == "3"
+    assert await cache.getdel("counter") is None
+    RedisCacheTest._storage.clear()
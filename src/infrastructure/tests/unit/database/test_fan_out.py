@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from config import settings
+from infrastructure.database.core import build_engine
+from infrastructure.database.fan_out import ReadFanOut
+
+URI = settings.database.url
+
+
+async def _state(session: AsyncSession) -> tuple:
+    result = await session.execute(
+        text(
+            "SELECT pg_backend_pid(), pg_current_snapshot()::text, "
+            "current_setting('transaction_isolation'), current_setting('transaction_read_only')"
+        )
+    )
+    return tuple(result.one())
+
+
+async def test_read_fan_out__parallel_on_engine_session():
+    engine = create_async_engine(URI)
+    session = AsyncSession(bind=engine)
+    assert ReadFanOut(session, concurrency=3).parallel
+    assert not ReadFanOut(session, concurrency=1).parallel
+    await engine.dispose()
+
+
+async def test_read_fan_out__workers_limited_by_spare_connections():
+    engine = build_engine(URI, pool_size=2, max_overflow=3)
+    session = AsyncSession(bind=engine)
+    # 5 connections, 1 is left to other requests
+    assert ReadFanOut(session, concurrency=10)._workers(10) == 4
+    assert ReadFanOut(session, concurrency=3)._workers(10) == 3
+    assert ReadFanOut(session, concurrency=3)._workers(2) == 2
+    await engine.dispose()
+    engine = build_engine(URI, pool_size=1, max_overflow=1)
+    # A single spare connection gives no concurrency, the reads run sequentially
+    assert ReadFanOut(AsyncSession(bind=engine), concurrency=3)._workers(3) == 1
+    await engine.dispose()
+
+
+async def test_read_fan_out__sequential_on_connection_session():
+    session = MagicMock(spec=AsyncSession)
+    session.bind = MagicMock()
+    calls = []
+
+    def _reader(value):
+        async def _read(session_):
+            calls.append(value)
+            assert session_ is session
+            return value
+
+        return _read
+
+    fan_out = ReadFanOut(session, concurrency=3)
+    assert not fan_out.parallel
+    assert await fan_out.gather(_reader(1), _reader(2)) == [1, 2]
+    assert calls == [1, 2]
+
+
+async def test_read_fan_out__readers_share_the_request_snapshot(engine: AsyncEngine):
+    async with AsyncSession(bind=engine) as session:
+        await session.connection(execution_options=dict(isolation_level="REPEATABLE READ"))
+        request_pid, request_snapshot, *_ = await _state(session)
+
+        states = await ReadFanOut(session, concurrency=3).gather(_state, _state, _state)
+
+        for pid, snapshot, isolation, read_only in states:
+            assert pid != request_pid
+            assert snapshot == request_snapshot
+            assert isolation == "repeatable read"
+            assert read_only == "on"
+
+
+async def test_read_fan_out__committed_after_export_is_not_visible(engine: AsyncEngine):
+    async with AsyncSession(bind=engine) as session:
+        await session.connection(execution_options=dict(isolation_level="REPEATABLE READ"))
+        await session.execute(text("CREATE TABLE IF NOT EXISTS fan_out_test (id int)"))
+        await session.commit()
+        try:
+            await session.connection(execution_options=dict(isolation_level="REPEATABLE READ"))
+            # Takes the snapshot of the request transaction
+            await session.execute(text("SELECT count(*) FROM fan_out_test"))
+            async with engine.begin() as conn:
+                await conn.execute(text("INSERT INTO fan_out_test VALUES (1)"))
+
+            async def _count(session_: AsyncSession) -> int:
+                return (await session_.execute(text("SELECT count(*) FROM fan_out_test"))).scalar_one()
+
+            assert await ReadFanOut(session, concurrency=2).gather(_count, _count) == [0, 0]
+        finally:
+            await session.rollback()
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP TABLE fan_out_test"))
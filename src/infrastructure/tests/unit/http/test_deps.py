@@ -4,7 +4,7 @@ import pytest
 import pytz
 from fastapi import HTTPException, Request
 
-from infrastructure.http import get_local_tz, get_tz_utc_offset
+from infrastructure.http import get_if_none_match, get_local_tz, get_tz_utc_offset
 
 
 @pytest.mark.parametrize(
@@ -63,3 +63,21 @@ def test_get_tz_utc_offset(timezone: str | None, offset: int):
         now_dst_delta = now.dst()
         offset_without_dst = offset + int(now_dst_delta.total_seconds() if now_dst_delta else 0)
     assert get_tz_utc_offset()(timezone) == offset_without_dst
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    (
+        ([(b"if-none-match", b'"abc"')], {"abc"}),
+        ([(b"if-none-match", b'W/"abc", "def"')], {"abc", "def"}),
+        ([], set()),
+    ),
+)
+def test_get_if_none_match(headers: list, expected: set[str]):
+    request = Request(
+        {
+            "type": "http",
+            "headers": headers,
+        }
+    )
+    assert get_if_none_match(request) == expected
@@ -6,9 +6,11 @@ from collections import defaultdict
 
 import firebase_admin
 from firebase_admin import credentials, messaging
+from firebase_admin.exceptions import InvalidArgumentError
 
 from apps.shared.domain import InternalModel
 from config import settings
+from infrastructure.logger import logger
 
 
 class FirebaseNotificationType(enum.StrEnum):
@@ -30,8 +32,22 @@ class FirebaseMessage(InternalModel):
     data: FirebaseData
 
 
+class NotificationResult(InternalModel):
+    success_count: int = 0
+    failure_count: int = 0
+    invalid_devices: list[str] = []
+
+
+def _is_invalid_token(exception: Exception | None) -> bool:
+    """Whether FCM rejected the token itself, it will never be delivered"""
+    if isinstance(exception, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+        return True
+    return isinstance(exception, InvalidArgumentError) and "registration token" in str(exception)
+
+
 class FCMNotificationTest:
     notifications: dict[str, list] = defaultdict(list)
+    invalid_devices: set[str] = set()
 
     async def notify(
         self,
@@ -42,11 +58,16 @@ class FCMNotificationTest:
         extra_kwargs: dict | None = None,
         *args,
         **kwargs,
-    ):
-        if not devices:
-            return
+    ) -> NotificationResult:
+        result = NotificationResult()
         for device in devices:
+            if device in self.invalid_devices:
+                result.failure_count += 1
+                result.invalid_devices.append(device)
+                continue
+            result.success_count += 1
             self.notifications[device].append(json.dumps(message.model_dump(by_alias=True), default=str))
+        return result
 
 
 class FCMNotification:
@@ -83,37 +104,48 @@ class FCMNotification:
         extra_kwargs: dict | None = None,
         *args,
         **kwargs,
-    ):
+    ) -> NotificationResult:
+        """Sends the message to the devices, returns per token results.
+
+        Tokens are sent in multicast chunks, a bounded number of chunks is in
+        flight at once. A failed chunk does not fail the others, the tokens
+        FCM reported as unregistered or invalid are returned to be removed.
+        """
+        result = NotificationResult()
         if not self._initialized:
-            return
-        devices = list(set(devices))
-        if len(devices) == 0:
-            return
-        elif devices and len(devices) > 1:
-            await asyncio.to_thread(
-                messaging.send_each_for_multicast,
-                messaging.MulticastMessage(
-                    devices,
-                    android=messaging.AndroidConfig(ttl=settings.fcm.ttl, priority="high"),
-                    data=dict(message=json.dumps(message.model_dump(by_alias=True), default=str)),
-                    apns=messaging.APNSConfig(
-                        headers={"apns-priority": "5"},
-                        payload=messaging.APNSPayload(aps=messaging.Aps(content_available=True)),
-                    ),
-                ),
-                app=self._app,
-            )
-        else:
-            await asyncio.to_thread(
-                messaging.send,
-                messaging.Message(
-                    android=messaging.AndroidConfig(ttl=settings.fcm.ttl, priority="high"),
-                    data=dict(message=json.dumps(message.model_dump(by_alias=True), default=str)),
-                    token=devices[0],
-                    apns=messaging.APNSConfig(
-                        headers={"apns-priority": "5"},
-                        payload=messaging.APNSPayload(aps=messaging.Aps(content_available=True)),
-                    ),
-                ),
-                app=self._app,
-            )
+            return result
+        devices = list(dict.fromkeys(devices))
+        size = settings.fcm.multicast_size
+        chunks = [devices[i : i + size] for i in range(0, len(devices), size)]
+        semaphore = asyncio.Semaphore(settings.fcm.concurrency)
+
+        async def _send(chunk: list[str]) -> messaging.BatchResponse:
+            async with semaphore:
+                return await messaging.send_each_for_multicast_async(
+                    self._multicast_message(chunk, message), app=self._app
+                )
+
+        responses = await asyncio.gather(*(_send(chunk) for chunk in chunks), return_exceptions=True)
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, BaseException):
+                logger.error(f"FCM multicast of {len(chunk)} tokens failed: {type(response).__name__}: {response}")
+                result.failure_count += len(chunk)
+                continue
+            result.success_count += response.success_count
+            result.failure_count += response.failure_count
+            for device, send_response in zip(chunk, response.responses):
+                if _is_invalid_token(send_response.exception):
+                    result.invalid_devices.append(device)
+        return result
+
+    @staticmethod
+    def _multicast_message(devices: list[str], message: FirebaseMessage) -> messaging.MulticastMessage:
+        return messaging.MulticastMessage(
+            devices,
+            android=messaging.AndroidConfig(ttl=settings.fcm.ttl, priority="high"),
+            data=dict(message=json.dumps(message.model_dump(by_alias=True), default=str)),
+            apns=messaging.APNSConfig(
+                headers={"apns-priority": "5"},
+                payload=messaging.APNSPayload(aps=messaging.Aps(content_available=True)),
+            ),
+        )
@@ -1,4 +1,6 @@
+import asyncio
 import datetime
+import fnmatch
 import json
 import re
 import typing
@@ -10,6 +12,62 @@ from sentry_sdk import capture_exception
 from config import settings
 
 
+class _PipelineTest:
+    """Pipeline of `RedisCacheTest`, commands are run on `execute`"""
+
+    def __init__(self, cache: "RedisCacheTest"):
+        self._cache = cache
+        self._messages: list[tuple[str, str]] = []
+
+    async def __aenter__(self) -> "_PipelineTest":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._messages.clear()
+
+    def publish(self, channel: str, data: str) -> "_PipelineTest":
+        self._messages.append((channel, data))
+        return self
+
+    async def execute(self) -> list[int]:
+        for channel, data in self._messages:
+            self._cache.append_message(channel, data)
+        result, self._messages = [1] * len(self._messages), []
+        return result
+
+
+class _PubSubTest:
+    """Pub/sub of `RedisCacheTest`, delivers the stored messages of the channels once"""
+
+    def __init__(self, cache: "RedisCacheTest"):
+        self._cache = cache
+        self._patterns: list[str] = []
+        self._delivered: dict[str, int] = {}
+        self._pending: list[dict] = []
+
+    async def psubscribe(self, pattern: str) -> None:
+        self._patterns.append(pattern)
+
+    async def ping(self) -> None:
+        self._pending.append(dict(type="pong", pattern=None, channel=None, data=b"PONG"))
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0) -> dict | None:
+        for channel, (values, _) in list(self._cache._storage.items()):
+            pattern = next((p for p in self._patterns if fnmatch.fnmatchcase(channel, p)), None)
+            delivered = self._delivered.get(channel, 0)
+            if pattern is None or not isinstance(values, list) or delivered >= len(values):
+                continue
+            self._delivered[channel] = delivered + 1
+            return dict(type="pmessage", pattern=pattern, channel=channel, data=values[delivered])
+        if self._pending:
+            return self._pending.pop(0)
+        await asyncio.sleep(timeout)
+        return None
+
+    async def aclose(self) -> None:
+        self._patterns.clear()
+
+
 class RedisCacheTest:
     _storage: dict = {}
 
@@ -22,7 +80,9 @@ class RedisCacheTest:
 
         return value
 
-    async def set(self, name, value, ex=None, **kwargs):
+    async def set(self, name, value, ex=None, nx=False, **kwargs):
+        if nx and await self.get(name) is not None:
+            return None
         now = datetime.datetime.now(datetime.UTC)
         self._storage[name] = [value, (now + datetime.timedelta(seconds=ex)) if ex else None]
         return True
@@ -59,6 +119,29 @@ class RedisCacheTest:
         entry[1] = datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=seconds)
         return True
 
+    async def getdel(self, key: str):
+        value = await self.get(key)
+        self._storage.pop(key, None)
+        return value
+
+    async def sadd(self, key: str, *values: str) -> int:
+        members, expiry = self._storage.setdefault(key, [set(), None])
+        added = set(values) - members
+        members.update(added)
+        return len(added)
+
+    async def srem(self, key: str, *values: str) -> int:
+        members, _ = self._storage.get(key, [set(), None])
+        removed = members & set(values)
+        members.difference_update(removed)
+        if not members:
+            self._storage.pop(key, None)
+        return len(removed)
+
+    async def smembers(self, key: str) -> set[str]:
+        members, _ = self._storage.get(key, [set(), None])
+        return set(members)
+
     async def keys(self, pattern: str = "*") -> list[str]:
         if pattern == "*":
             pattern = ".+"
@@ -72,24 +155,33 @@ class RedisCacheTest:
         return filtered_keys
 
     async def mget(self, keys) -> list[typing.Any]:
-        results = []
-        for key in keys:
-            result, expire = self._storage.get(key, [None, None])
-            if expire > datetime.datetime.now(datetime.UTC):
-                results.append(result)
-        return results
+        # None for missing and expired keys, as Redis returns
+        return [await self.get(key) for key in keys]
 
-    async def publish(self, channel: str, value: dict):
+    def append_message(self, channel: str, data: str) -> None:
         values, expiry = self._storage.get(channel, ([], None))
-        values.append(json.dumps(value, default=str))
+        values.append(data)
         self._storage[channel] = (values, expiry)
 
+    async def publish(self, channel: str, value: dict):
+        self.append_message(channel, json.dumps(value, default=str))
+
+    def pipeline(self, transaction: bool = True) -> _PipelineTest:
+        return _PipelineTest(self)
+
+    def pubsub(self) -> _PubSubTest:
+        return _PubSubTest(self)
+
     async def messages(self, channel_name: str):
         values, expiry = self._storage.get(channel_name, ([], None))
         for value in values:
             yield value
 
 
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
 class RedisCache:
     """Singleton Redis cache client"""
 
@@ -154,12 +246,13 @@ class RedisCache:
         except redis.RedisError:
             return None
 
-    async def set(self, key: str, value: EncodableT, ex=None) -> bool:
+    async def set(self, key: str, value: EncodableT, ex=None, nx: bool = False) -> bool:
+        """Sets the value, with `nx` only when the key does not exist yet"""
         if not self._cache:
             return False
         if not ex:
             ex = self.expire_duration
-        result = await self._cache.set(key, value, ex=ex)
+        result = await self._cache.set(key, value, ex=ex, nx=nx)
         return result
 
     async def delete(self, key) -> bool:
@@ -173,6 +266,27 @@ class RedisCache:
             return []
         return await self._cache.keys(key)
 
+    async def getdel(self, key: str) -> typing.Optional[str]:
+        """Gets the value and deletes the key atomically"""
+        if not self._cache:
+            return None
+        return await self._cache.getdel(key)
+
+    async def sadd(self, key: str, *values: EncodableT) -> int:
+        if not self._cache:
+            return 0
+        return await self._cache.sadd(key, *values)
+
+    async def srem(self, key: str, *values: EncodableT) -> int:
+        if not self._cache:
+            return 0
+        return await self._cache.srem(key, *values)
+
+    async def smembers(self, key: str) -> set[str]:
+        if not self._cache:
+            return set()
+        return {_decode(member) for member in await self._cache.smembers(key)}
+
     async def mget(self, keys: list[str]) -> list[typing.Any]:
         if not self._cache:
             return []
@@ -182,6 +296,14 @@ class RedisCache:
         assert self._cache
         await self._cache.publish(channel, json.dumps(value, default=str))
 
+    async def publish_many(self, messages: list[tuple[str, dict]]):
+        """Publishes the messages in one round trip"""
+        assert self._cache
+        async with self._cache.pipeline(transaction=False) as pipe:
+            for channel, value in messages:
+                pipe.publish(channel, json.dumps(value, default=str))
+            await pipe.execute()
+
     async def messages(self, channel_name: str):
         assert self._cache
         pubsub = self._cache.pubsub()
@@ -189,6 +311,32 @@ class RedisCache:
         async for message in pubsub.listen():
             yield message
 
+    async def pattern_messages(self, pattern: str, heartbeat: float):
+        """Yields `(channel, data)` of the messages of channels matching the pattern.
+
+        The connection is pinged when no message came for `heartbeat` seconds,
+        a connection which does not answer the ping raises `ConnectionError`
+        instead of waiting forever.
+        """
+        assert self._cache
+        pubsub = self._cache.pubsub()
+        try:
+            await pubsub.psubscribe(pattern)
+            awaiting_pong = False
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat)
+                if message is None:
+                    if awaiting_pong:
+                        raise redis.ConnectionError("Redis did not answer the pub/sub ping")
+                    await pubsub.ping()
+                    awaiting_pong = True
+                    continue
+                awaiting_pong = False
+                if message["type"] == "pmessage":
+                    yield _decode(message["channel"]), _decode(message["data"])
+        finally:
+            await pubsub.aclose()
+
     async def incr(self, key: str) -> int:
         if not self._cache:
             return 0